@@ -0,0 +1,111 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compare the throughput of SALM generation on random-length synthetic audios with:
+* batch size 1,
+* fixed-size batches in the input order,
+* ``SALM.generate_in_buckets``, which batches audios of similar lengths.
+
+$ python examples/speechlm2/salm_benchmark_bucketed_generation.py pretrained_name=<model> num_examples=256
+"""
+from dataclasses import dataclass
+from time import perf_counter
+
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.speechlm2 import SALM
+from nemo.core.config import hydra_runner
+from nemo.utils import logging
+
+
+@dataclass
+class SalmBenchmarkConfig:
+    pretrained_name: str
+    num_examples: int = 256
+    min_duration: float = 1.0
+    max_duration: float = 30.0
+    batch_size: int = 32
+    max_length_ratio: float = 1.25
+    max_new_tokens: int = 32
+    prompt: str = "Transcribe the following: "
+    device: str = "cuda"
+    dtype: str = "bfloat16"
+    seed: int = 0
+
+
+@hydra_runner(config_name="SalmBenchmarkConfig", schema=SalmBenchmarkConfig)
+def main(cfg: SalmBenchmarkConfig):
+    logging.info(f"Hydra config:\n{OmegaConf.to_yaml(cfg)}")
+
+    model = SALM.from_pretrained(cfg.pretrained_name).eval().to(getattr(torch, cfg.dtype)).to(cfg.device)
+
+    generator = torch.Generator().manual_seed(cfg.seed)
+    durations = torch.empty(cfg.num_examples).uniform_(cfg.min_duration, cfg.max_duration, generator=generator)
+    audio_lens = (durations * model.sampling_rate).long()
+    audios = torch.randn(cfg.num_examples, audio_lens.max(), generator=generator)
+    audios = audios * (torch.arange(audios.shape[1]) < audio_lens[:, None])
+    audios, audio_lens = audios.to(model.device), audio_lens.to(model.device)
+    prompts = [[{"role": "user", "slots": {"message": f"{cfg.prompt}{model.audio_locator_tag}"}}]] * cfg.num_examples
+    generate_kwargs = dict(max_new_tokens=cfg.max_new_tokens)
+
+    def run_batch_size_1():
+        for i in range(cfg.num_examples):
+            model.generate(
+                prompts=prompts[i : i + 1],
+                audios=audios[i : i + 1, : audio_lens[i]],
+                audio_lens=audio_lens[i : i + 1],
+                **generate_kwargs,
+            )
+
+    def run_fixed_batches():
+        for i in range(0, cfg.num_examples, cfg.batch_size):
+            batch_audio_lens = audio_lens[i : i + cfg.batch_size]
+            model.generate(
+                prompts=prompts[i : i + cfg.batch_size],
+                audios=audios[i : i + cfg.batch_size, : batch_audio_lens.max()],
+                audio_lens=batch_audio_lens,
+                **generate_kwargs,
+            )
+
+    def run_buckets():
+        model.generate_in_buckets(
+            prompts=prompts,
+            audios=audios,
+            audio_lens=audio_lens,
+            batch_size=cfg.batch_size,
+            max_length_ratio=cfg.max_length_ratio,
+            **generate_kwargs,
+        )
+
+    total_duration = durations.sum().item()
+    for name, fn in [("batch_size=1", run_batch_size_1), ("fixed", run_fixed_batches), ("buckets", run_buckets)]:
+        elapsed = timed(fn)
+        logging.info(
+            f"{name}: {elapsed:.2f}s, {cfg.num_examples / elapsed:.2f} examples/s, RTFx={total_duration / elapsed:.2f}"
+        )
+
+
+def timed(fn) -> float:
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = perf_counter()
+    fn()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    return perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
@@ -12,8 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from nemo.collections.asr import data, losses, models, modules
+from typing import TYPE_CHECKING
+
 from nemo.package_info import __version__
+from nemo.utils.import_utils import lazy_import_attributes
+
+if TYPE_CHECKING:
+    from nemo.collections.asr import data, losses, metrics, models, modules, parts
 
 # Set collection version equal to NeMo version.
 __version = __version__
@@ -23,3 +28,8 @@ __author__ = "NVIDIA Corporation"
 
 # Set collection name.
 __description__ = "Automatic Speech Recognition collection"
+
+# submodules are imported lazily on the first access to reduce the import time
+__getattr__, __dir__, _ = lazy_import_attributes(
+    __name__, {}, submodules=("data", "losses", "metrics", "models", "modules", "parts")
+)
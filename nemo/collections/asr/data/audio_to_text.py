@@ -16,6 +16,8 @@ import json
 import math
 import multiprocessing
 import os
+import re
+import tarfile
 from collections.abc import Iterable as IterableABC
 from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
@@ -44,10 +46,14 @@ __all__ = [
     'AudioToBPEDataset',
     'TarredAudioToCharDataset',
     'TarredAudioToBPEDataset',
+    'IndexedTarredAudioToBPEDataset',
 ]
 
 VALID_FILE_FORMATS = ';'.join(['wav', 'mp3', 'flac', 'opus'] + [fmt.lower() for fmt in valid_sf_formats.keys()])
 
+# suffix of the sidecar index of the tarball: `<tar filepath>.idx` with `<member name>\t<data offset>\t<size>` lines
+TAR_INDEX_SUFFIX = '.idx'
+
 
 def _speech_collate_fn(batch, pad_id):
     """collate batch of audio sig, audio len, tokens, tokens len
@@ -1319,6 +1325,202 @@ class TarredAudioToBPEDataset(_TarredAudioToTextDataset):
         )
 
 
+def build_tar_index(tar_filepath: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Scans the headers of the (uncompressed) tarball to build the index of its members.
+
+    Returns:
+        Mapping from the member name to (offset of the member data in the tarball, size of the member data).
+    """
+    index = {}
+    with tarfile.open(tar_filepath, mode='r:') as tar:
+        for member in tar:
+            if member.isfile():
+                index[member.name] = (member.offset_data, member.size)
+    return index
+
+
+def write_tar_index(tar_filepath: str, index: Optional[Dict[str, Tuple[int, int]]] = None) -> str:
+    """
+    Writes the sidecar index of the tarball to `<tar_filepath>.idx`.
+
+    Args:
+        tar_filepath: path to the tarball.
+        index: index of the tarball, built with `build_tar_index` if not provided.
+
+    Returns:
+        Path to the index file.
+    """
+    if index is None:
+        index = build_tar_index(tar_filepath)
+    index_filepath = tar_filepath + TAR_INDEX_SUFFIX
+    with open(index_filepath, 'w', encoding='utf-8') as f:
+        for name, (offset, size) in index.items():
+            f.write(f"{name}\t{offset}\t{size}\n")
+    return index_filepath
+
+
+def read_tar_index(tar_filepath: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Reads the sidecar index of the tarball (written by `write_tar_index` or
+    `scripts/speech_recognition/convert_to_tarred_audio_dataset.py`).
+    If the index file does not exist, the index is built by scanning the headers of the tarball.
+
+    Returns:
+        Mapping from the member name to (offset of the member data in the tarball, size of the member data).
+    """
+    index_filepath = tar_filepath + TAR_INDEX_SUFFIX
+    if not os.path.exists(index_filepath):
+        logging.info(f"Index file {index_filepath} not found, scanning the headers of {tar_filepath}")
+        return build_tar_index(tar_filepath)
+    index = {}
+    with open(index_filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            name, offset, size = line.rstrip('\n').rsplit('\t', 2)
+            index[name] = (int(offset), int(size))
+    return index
+
+
+class IndexedTarredAudioToBPEDataset(AudioToBPEDataset):
+    """
+    A map-style version of the TarredAudioToBPEDataset, which reads individual utterances from the tarballs
+    using the sidecar index of member offsets and sizes (see `read_tar_index`), without reading entire shards.
+
+    As any map-style dataset, it can be used with any sampler, e.g. for evaluation on subsets,
+    exact resumption of the epoch after preemption (by skipping the consumed indices of a deterministic sampler),
+    or weighted per-utterance sampling with `torch.utils.data.WeightedRandomSampler`.
+
+    Accepts the manifest of the tarred dataset (the same as for TarredAudioToBPEDataset) and the path(s)
+    to the (uncompressed) tarballs. Manifest entries with audio files not found in the tarballs are skipped.
+
+    Args:
+        audio_tar_filepaths: Either a list of audio tarball filepaths, or a
+            string (can be brace-expandable).
+        manifest_filepath (str): Path to the manifest. Can be comma-separated paths.
+        tokenizer (TokenizerSpec): Either a Word Piece Encoding tokenizer (BERT),
+            or a Sentence Piece Encoding tokenizer (BPE). The CTC blank
+            symbol is automatically added later for models using ctc.
+        sample_rate (int): Sample rate to resample loaded audio to
+        int_values (bool): If true, load samples as 32-bit integers. Defauts to False.
+        augmentor (nemo.collections.asr.parts.perturb.AudioAugmentor): An AudioAugmentor
+            object used to augment loaded audio
+        max_duration: If audio exceeds this length, do not include in dataset
+        min_duration: If audio is less than this length, do not include
+            in dataset
+        trim: Whether to trim silence segments
+        use_start_end_token: Boolean which dictates whether to add [BOS] and [EOS]
+            tokens to beginning and ending of speech respectively.
+        return_sample_id (bool): whether to return the sample_id as a part of each sample
+        manifest_parse_func: Optional function to parse manifest entries. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        audio_tar_filepaths: Union[str, List[str]],
+        manifest_filepath: str,
+        tokenizer: 'nemo.collections.common.tokenizers.TokenizerSpec',
+        sample_rate: int,
+        int_values: bool = False,
+        augmentor: 'nemo.collections.asr.parts.perturb.AudioAugmentor' = None,
+        max_duration: Optional[int] = None,
+        min_duration: Optional[int] = None,
+        trim: bool = False,
+        use_start_end_token: bool = True,
+        return_sample_id: bool = False,
+        manifest_parse_func: Optional[Callable] = None,
+    ):
+        super().__init__(
+            manifest_filepath=manifest_filepath,
+            tokenizer=tokenizer,
+            sample_rate=sample_rate,
+            int_values=int_values,
+            augmentor=augmentor,
+            max_duration=max_duration,
+            min_duration=min_duration,
+            trim=trim,
+            use_start_end_token=use_start_end_token,
+            return_sample_id=return_sample_id,
+            manifest_parse_func=manifest_parse_func,
+        )
+
+        self.audio_tar_filepaths = expand_sharded_filepaths(
+            sharded_filepaths=audio_tar_filepaths, shard_strategy='replicate', world_size=0, global_rank=0
+        )
+        # file ID (member name without extension) -> (tarball id, offset, size)
+        members = {}
+        for tar_id, tar_filepath in enumerate(self.audio_tar_filepaths):
+            for name, (offset, size) in read_tar_index(tar_filepath).items():
+                file_id, _ = os.path.splitext(os.path.basename(name))
+                members[file_id] = (tar_id, offset, size)
+
+        self.sample_ids = []
+        self.sample_members = []
+        for sample_id, sample in enumerate(self.manifest_processor.collection):
+            file_id, _ = os.path.splitext(os.path.basename(sample.audio_file))
+            # entries with the duplicate audio files reference the same tarball member
+            member = members.get(file_id, members.get(re.sub(r'-sub\d+$', '', file_id)))
+            if member is not None:
+                self.sample_ids.append(sample_id)
+                self.sample_members.append(member)
+        num_skipped = len(self.manifest_processor.collection) - len(self.sample_ids)
+        if num_skipped > 0:
+            logging.warning(f"{num_skipped} manifest entries were not found in the tarballs and will be skipped")
+
+        # file descriptors are opened lazily in each process
+        self._fds = {}
+        self._fds_pid = None
+
+    def _read_member(self, tar_id: int, offset: int, size: int) -> bytes:
+        if self._fds_pid != os.getpid():
+            # do not share file descriptors with the parent process (e.g. in dataloader workers)
+            self._fds = {}
+            self._fds_pid = os.getpid()
+        fd = self._fds.get(tar_id)
+        if fd is None:
+            fd = self._fds[tar_id] = os.open(self.audio_tar_filepaths[tar_id], os.O_RDONLY)
+        return os.pread(fd, size, offset)
+
+    def _process_sample(self, index):
+        sample_id = self.sample_ids[index]
+        sample = self.manifest_processor.collection[sample_id]
+        offset = sample.offset
+
+        if offset is None:
+            offset = 0
+
+        audio_filestream = io.BytesIO(self._read_member(*self.sample_members[index]))
+        features = self.featurizer.process(
+            audio_filestream,
+            offset=offset,
+            duration=sample.duration,
+            trim=self.trim,
+            orig_sr=sample.orig_sr,
+        )
+        audio_filestream.close()
+        f, fl = features, torch.tensor(features.shape[0]).long()
+
+        t, tl = self.manifest_processor.process_text_by_sample(sample=sample)
+
+        if self.return_sample_id:
+            output = f, fl, torch.tensor(t).long(), torch.tensor(tl).long(), sample_id
+        else:
+            output = f, fl, torch.tensor(t).long(), torch.tensor(tl).long()
+
+        return output
+
+    def __len__(self):
+        return len(self.sample_ids)
+
+    def __del__(self):
+        try:
+            if self._fds_pid == os.getpid():
+                for fd in self._fds.values():
+                    os.close(fd)
+        except Exception:
+            # the dataset was not fully initialized, or the interpreter is shutting down
+            pass
+
+
 class BucketingDataset(IterableDataset):
     """
     A Dataset which wraps another IterableDataset and adopts it for bucketing
@@ -11,34 +11,71 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import TYPE_CHECKING
 
-from nemo.collections.asr.models.aed_multitask_models import EncDecMultiTaskModel
-from nemo.collections.asr.models.asr_model import ASRModel
-from nemo.collections.asr.models.classification_models import (
-    ClassificationInferConfig,
-    EncDecClassificationModel,
-    EncDecFrameClassificationModel,
-)
-from nemo.collections.asr.models.clustering_diarizer import ClusteringDiarizer
-from nemo.collections.asr.models.ctc_bpe_models import EncDecCTCModelBPE
-from nemo.collections.asr.models.ctc_models import EncDecCTCModel
-from nemo.collections.asr.models.hybrid_rnnt_ctc_bpe_models import EncDecHybridRNNTCTCBPEModel
-from nemo.collections.asr.models.hybrid_rnnt_ctc_models import EncDecHybridRNNTCTCModel
-from nemo.collections.asr.models.k2_sequence_models import (
-    EncDecK2RnntSeqModel,
-    EncDecK2RnntSeqModelBPE,
-    EncDecK2SeqModel,
-    EncDecK2SeqModelBPE,
-)
-from nemo.collections.asr.models.label_models import EncDecSpeakerLabelModel
-from nemo.collections.asr.models.msdd_models import EncDecDiarLabelModel, NeuralDiarizer
-from nemo.collections.asr.models.rnnt_bpe_models import EncDecRNNTBPEModel
-from nemo.collections.asr.models.rnnt_models import EncDecRNNTModel
-from nemo.collections.asr.models.slu_models import SLUIntentSlotBPEModel
-from nemo.collections.asr.models.sortformer_diar_models import SortformerEncLabelModel
-from nemo.collections.asr.models.ssl_models import (
-    EncDecDenoiseMaskedTokenPredModel,
-    EncDecMaskedTokenPredModel,
-    SpeechEncDecSelfSupervisedModel,
-)
-from nemo.collections.asr.models.transformer_bpe_models import EncDecTransfModelBPE
+from nemo.utils.import_utils import lazy_import_attributes
+
+if TYPE_CHECKING:
+    from nemo.collections.asr.models.aed_multitask_models import EncDecMultiTaskModel
+    from nemo.collections.asr.models.asr_model import ASRModel
+    from nemo.collections.asr.models.classification_models import (
+        ClassificationInferConfig,
+        EncDecClassificationModel,
+        EncDecFrameClassificationModel,
+    )
+    from nemo.collections.asr.models.clustering_diarizer import ClusteringDiarizer
+    from nemo.collections.asr.models.ctc_bpe_models import EncDecCTCModelBPE
+    from nemo.collections.asr.models.ctc_models import EncDecCTCModel
+    from nemo.collections.asr.models.hybrid_rnnt_ctc_bpe_models import EncDecHybridRNNTCTCBPEModel
+    from nemo.collections.asr.models.hybrid_rnnt_ctc_models import EncDecHybridRNNTCTCModel
+    from nemo.collections.asr.models.k2_sequence_models import (
+        EncDecK2RnntSeqModel,
+        EncDecK2RnntSeqModelBPE,
+        EncDecK2SeqModel,
+        EncDecK2SeqModelBPE,
+    )
+    from nemo.collections.asr.models.label_models import EncDecSpeakerLabelModel
+    from nemo.collections.asr.models.msdd_models import EncDecDiarLabelModel, NeuralDiarizer
+    from nemo.collections.asr.models.rnnt_bpe_models import EncDecRNNTBPEModel
+    from nemo.collections.asr.models.rnnt_models import EncDecRNNTModel
+    from nemo.collections.asr.models.slu_models import SLUIntentSlotBPEModel
+    from nemo.collections.asr.models.sortformer_diar_models import SortformerEncLabelModel
+    from nemo.collections.asr.models.ssl_models import (
+        EncDecDenoiseMaskedTokenPredModel,
+        EncDecMaskedTokenPredModel,
+        SpeechEncDecSelfSupervisedModel,
+    )
+    from nemo.collections.asr.models.transformer_bpe_models import EncDecTransfModelBPE
+
+# submodules are imported lazily on the first access of their attributes
+_LAZY_ATTRIBUTES = {
+    "EncDecMultiTaskModel": "aed_multitask_models",
+    "ASRModel": "asr_model",
+    "ClassificationInferConfig": "classification_models",
+    "EncDecClassificationModel": "classification_models",
+    "EncDecFrameClassificationModel": "classification_models",
+    "ClusteringDiarizer": "clustering_diarizer",
+    "EncDecCTCModelBPE": "ctc_bpe_models",
+    "EncDecCTCModel": "ctc_models",
+    "EncDecHybridRNNTCTCBPEModel": "hybrid_rnnt_ctc_bpe_models",
+    "EncDecHybridRNNTCTCModel": "hybrid_rnnt_ctc_models",
+    "EncDecK2RnntSeqModel": "k2_sequence_models",
+    "EncDecK2RnntSeqModelBPE": "k2_sequence_models",
+    "EncDecK2SeqModel": "k2_sequence_models",
+    "EncDecK2SeqModelBPE": "k2_sequence_models",
+    "EncDecSpeakerLabelModel": "label_models",
+    "EncDecDiarLabelModel": "msdd_models",
+    "NeuralDiarizer": "msdd_models",
+    "EncDecRNNTBPEModel": "rnnt_bpe_models",
+    "EncDecRNNTModel": "rnnt_models",
+    "SLUIntentSlotBPEModel": "slu_models",
+    "SortformerEncLabelModel": "sortformer_diar_models",
+    "EncDecDenoiseMaskedTokenPredModel": "ssl_models",
+    "EncDecMaskedTokenPredModel": "ssl_models",
+    "SpeechEncDecSelfSupervisedModel": "ssl_models",
+    "EncDecTransfModelBPE": "transformer_bpe_models",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__, _import_all = lazy_import_attributes(__name__, _LAZY_ATTRIBUTES)
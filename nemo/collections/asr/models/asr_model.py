@@ -94,6 +94,11 @@ class ASRModel(ModelPT, ABC):
         Returns:
             List of available pre-trained models.
         """
+        # model families are imported lazily, import all of them to make the subclasses visible
+        from nemo.collections.asr import models
+
+        models._import_all()
+
         # recursively walk the subclasses to generate pretrained model info
         list_of_models = model_utils.resolve_subclass_pretrained_model_info(cls)
         return list_of_models
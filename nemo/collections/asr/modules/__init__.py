@@ -11,44 +11,90 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import TYPE_CHECKING
 
-from nemo.collections.asr.modules.audio_preprocessing import (
-    AudioToMelSpectrogramPreprocessor,
-    AudioToMFCCPreprocessor,
-    CropOrPadSpectrogramAugmentation,
-    MaskedPatchAugmentation,
-    SpectrogramAugmentation,
-)
-from nemo.collections.asr.modules.beam_search_decoder import BeamSearchDecoderWithLM
-from nemo.collections.asr.modules.conformer_encoder import ConformerEncoder, ConformerEncoderAdapter
-from nemo.collections.asr.modules.conv_asr import (
-    ConvASRDecoder,
-    ConvASRDecoderClassification,
-    ConvASRDecoderReconstruction,
-    ConvASREncoder,
-    ConvASREncoderAdapter,
-    ECAPAEncoder,
-    ParallelConvASREncoder,
-    SpeakerDecoder,
-)
-from nemo.collections.asr.modules.graph_decoder import ViterbiDecoderWithGraph
-from nemo.collections.asr.modules.hybrid_autoregressive_transducer import HATJoint
-from nemo.collections.asr.modules.lstm_decoder import LSTMDecoder
-from nemo.collections.asr.modules.msdd_diarizer import MSDD_module
-from nemo.collections.asr.modules.rnn_encoder import RNNEncoder
-from nemo.collections.asr.modules.rnnt import (
-    RNNTDecoder,
-    RNNTDecoderJointSSL,
-    RNNTJoint,
-    SampledRNNTJoint,
-    StatelessTransducerDecoder,
-)
-from nemo.collections.asr.modules.squeezeformer_encoder import SqueezeformerEncoder, SqueezeformerEncoderAdapter
-from nemo.collections.asr.modules.ssl_modules import (
-    ConformerMultiLayerFeatureExtractor,
-    ConformerMultiLayerFeaturePreprocessor,
-    ConvFeatureMaksingWrapper,
-    MultiSoftmaxDecoder,
-    RandomBlockMasking,
-    RandomProjectionVectorQuantizer,
-)
+from nemo.utils.import_utils import lazy_import_attributes
+
+if TYPE_CHECKING:
+    from nemo.collections.asr.modules.audio_preprocessing import (
+        AudioToMelSpectrogramPreprocessor,
+        AudioToMFCCPreprocessor,
+        CropOrPadSpectrogramAugmentation,
+        MaskedPatchAugmentation,
+        SpectrogramAugmentation,
+    )
+    from nemo.collections.asr.modules.beam_search_decoder import BeamSearchDecoderWithLM
+    from nemo.collections.asr.modules.conformer_encoder import ConformerEncoder, ConformerEncoderAdapter
+    from nemo.collections.asr.modules.conv_asr import (
+        ConvASRDecoder,
+        ConvASRDecoderClassification,
+        ConvASRDecoderReconstruction,
+        ConvASREncoder,
+        ConvASREncoderAdapter,
+        ECAPAEncoder,
+        ParallelConvASREncoder,
+        SpeakerDecoder,
+    )
+    from nemo.collections.asr.modules.graph_decoder import ViterbiDecoderWithGraph
+    from nemo.collections.asr.modules.hybrid_autoregressive_transducer import HATJoint
+    from nemo.collections.asr.modules.lstm_decoder import LSTMDecoder
+    from nemo.collections.asr.modules.msdd_diarizer import MSDD_module
+    from nemo.collections.asr.modules.rnn_encoder import RNNEncoder
+    from nemo.collections.asr.modules.rnnt import (
+        RNNTDecoder,
+        RNNTDecoderJointSSL,
+        RNNTJoint,
+        SampledRNNTJoint,
+        StatelessTransducerDecoder,
+    )
+    from nemo.collections.asr.modules.squeezeformer_encoder import SqueezeformerEncoder, SqueezeformerEncoderAdapter
+    from nemo.collections.asr.modules.ssl_modules import (
+        ConformerMultiLayerFeatureExtractor,
+        ConformerMultiLayerFeaturePreprocessor,
+        ConvFeatureMaksingWrapper,
+        MultiSoftmaxDecoder,
+        RandomBlockMasking,
+        RandomProjectionVectorQuantizer,
+    )
+
+# submodules are imported lazily on the first access of their attributes
+_LAZY_ATTRIBUTES = {
+    "AudioToMelSpectrogramPreprocessor": "audio_preprocessing",
+    "AudioToMFCCPreprocessor": "audio_preprocessing",
+    "CropOrPadSpectrogramAugmentation": "audio_preprocessing",
+    "MaskedPatchAugmentation": "audio_preprocessing",
+    "SpectrogramAugmentation": "audio_preprocessing",
+    "BeamSearchDecoderWithLM": "beam_search_decoder",
+    "ConformerEncoder": "conformer_encoder",
+    "ConformerEncoderAdapter": "conformer_encoder",
+    "ConvASRDecoder": "conv_asr",
+    "ConvASRDecoderClassification": "conv_asr",
+    "ConvASRDecoderReconstruction": "conv_asr",
+    "ConvASREncoder": "conv_asr",
+    "ConvASREncoderAdapter": "conv_asr",
+    "ECAPAEncoder": "conv_asr",
+    "ParallelConvASREncoder": "conv_asr",
+    "SpeakerDecoder": "conv_asr",
+    "ViterbiDecoderWithGraph": "graph_decoder",
+    "HATJoint": "hybrid_autoregressive_transducer",
+    "LSTMDecoder": "lstm_decoder",
+    "MSDD_module": "msdd_diarizer",
+    "RNNEncoder": "rnn_encoder",
+    "RNNTDecoder": "rnnt",
+    "RNNTDecoderJointSSL": "rnnt",
+    "RNNTJoint": "rnnt",
+    "SampledRNNTJoint": "rnnt",
+    "StatelessTransducerDecoder": "rnnt",
+    "SqueezeformerEncoder": "squeezeformer_encoder",
+    "SqueezeformerEncoderAdapter": "squeezeformer_encoder",
+    "ConformerMultiLayerFeatureExtractor": "ssl_modules",
+    "ConformerMultiLayerFeaturePreprocessor": "ssl_modules",
+    "ConvFeatureMaksingWrapper": "ssl_modules",
+    "MultiSoftmaxDecoder": "ssl_modules",
+    "RandomBlockMasking": "ssl_modules",
+    "RandomProjectionVectorQuantizer": "ssl_modules",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__, _import_all = lazy_import_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -26,6 +26,7 @@ from nemo.collections.asr.modules.transformer.transformer_generators import (
     BeamSearchSequenceGenerator,
     BeamSearchSequenceGeneratorWithFusionModels,
     BeamSearchSequenceGeneratorWithLanguageModel,
+    DecoderPromptCache,
     EnsembleBeamSearchSequenceGenerator,
     GreedySequenceGenerator,
     TopKSequenceGenerator,
@@ -45,6 +46,7 @@ __all__ = [
     "BeamSearchSequenceGenerator",
     "BeamSearchSequenceGeneratorWithLanguageModel",
     "BeamSearchSequenceGeneratorWithFusionModels",
+    "DecoderPromptCache",
     "EnsembleBeamSearchSequenceGenerator",
     "GreedySequenceGenerator",
     "TopKSequenceGenerator",
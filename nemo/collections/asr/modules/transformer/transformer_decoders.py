@@ -71,10 +71,10 @@ class TransformerDecoderBlock(nn.Module, AttentionAdapterModuleMixin):
         # Information for the adapter module mixin
         self.self_attention_model = "transf_abs"
 
-    def forward_preln(self, decoder_query, decoder_mask, decoder_keys, encoder_states, encoder_mask):
+    def self_attention_preln(self, decoder_query, decoder_mask, decoder_keys):
         """
-        Pre-LayerNorm block
-        Order of operations: LN -> Self-Attn -> Residual -> LN -> Cross-Attn -> Residual -> LN -> FFN
+        Pre-LayerNorm self-attention sub-block: LN -> Self-Attn -> Residual.
+        Its output does not depend on the encoder states.
         """
         residual = decoder_query
         decoder_query = self.layer_norm_1(decoder_query)
@@ -93,6 +93,12 @@ class TransformerDecoderBlock(nn.Module, AttentionAdapterModuleMixin):
             pack_input = self.forward_enabled_adapters(pack_input)
             self_attn_output = pack_input['x']
 
+        return self_attn_output
+
+    def cross_attention_preln(self, self_attn_output, encoder_states, encoder_mask):
+        """
+        Pre-LayerNorm cross-attention and feed-forward sub-blocks: LN -> Cross-Attn -> Residual -> LN -> FFN
+        """
         residual = self_attn_output
         self_attn_output = self.layer_norm_2(self_attn_output)
         enc_dec_attn_output = self.second_sub_layer(self_attn_output, encoder_states, encoder_states, encoder_mask)
@@ -114,10 +120,18 @@ class TransformerDecoderBlock(nn.Module, AttentionAdapterModuleMixin):
 
         return output_states
 
-    def forward_postln(self, decoder_query, decoder_mask, decoder_keys, encoder_states, encoder_mask):
+    def forward_preln(self, decoder_query, decoder_mask, decoder_keys, encoder_states, encoder_mask):
         """
-        Post-LayerNorm block
-        Order of operations: Self-Attn -> Residual -> LN -> Cross-Attn -> Residual -> LN -> FFN -> Residual -> LN
+        Pre-LayerNorm block
+        Order of operations: LN -> Self-Attn -> Residual -> LN -> Cross-Attn -> Residual -> LN -> FFN
+        """
+        self_attn_output = self.self_attention_preln(decoder_query, decoder_mask, decoder_keys)
+        return self.cross_attention_preln(self_attn_output, encoder_states, encoder_mask)
+
+    def self_attention_postln(self, decoder_query, decoder_mask, decoder_keys):
+        """
+        Post-LayerNorm self-attention sub-block: Self-Attn -> Residual -> LN.
+        Its output does not depend on the encoder states.
         """
         self_attn_output = self.first_sub_layer(decoder_query, decoder_keys, decoder_keys, decoder_mask)
         self_attn_output += decoder_query
@@ -133,8 +147,13 @@ class TransformerDecoderBlock(nn.Module, AttentionAdapterModuleMixin):
             pack_ip = self.forward_enabled_adapters(pack_ip)
             self_attn_output = pack_ip['x']
 
-        self_attn_output = self.layer_norm_1(self_attn_output)
+        return self.layer_norm_1(self_attn_output)
 
+    def cross_attention_postln(self, self_attn_output, encoder_states, encoder_mask):
+        """
+        Post-LayerNorm cross-attention and feed-forward sub-blocks:
+        Cross-Attn -> Residual -> LN -> FFN -> Residual -> LN
+        """
         enc_dec_attn_output = self.second_sub_layer(self_attn_output, encoder_states, encoder_states, encoder_mask)
         enc_dec_attn_output += self_attn_output
         enc_dec_attn_output = self.layer_norm_2(enc_dec_attn_output)
@@ -153,6 +172,28 @@ class TransformerDecoderBlock(nn.Module, AttentionAdapterModuleMixin):
 
         return self.layer_norm_3(output_states)
 
+    def forward_postln(self, decoder_query, decoder_mask, decoder_keys, encoder_states, encoder_mask):
+        """
+        Post-LayerNorm block
+        Order of operations: Self-Attn -> Residual -> LN -> Cross-Attn -> Residual -> LN -> FFN -> Residual -> LN
+        """
+        self_attn_output = self.self_attention_postln(decoder_query, decoder_mask, decoder_keys)
+        return self.cross_attention_postln(self_attn_output, encoder_states, encoder_mask)
+
+    def self_attention(self, decoder_query, decoder_mask, decoder_keys):
+        """Self-attention sub-block of the layer, which depends only on the decoder inputs."""
+        if self.pre_ln:
+            return self.self_attention_preln(decoder_query, decoder_mask, decoder_keys)
+        else:
+            return self.self_attention_postln(decoder_query, decoder_mask, decoder_keys)
+
+    def cross_attention(self, self_attn_output, encoder_states, encoder_mask):
+        """Cross-attention and feed-forward sub-blocks of the layer, applied to the self-attention output."""
+        if self.pre_ln:
+            return self.cross_attention_preln(self_attn_output, encoder_states, encoder_mask)
+        else:
+            return self.cross_attention_postln(self_attn_output, encoder_states, encoder_mask)
+
     def forward(self, decoder_query, decoder_mask, decoder_keys, encoder_states, encoder_mask):
         if self.pre_ln:
             return self.forward_preln(decoder_query, decoder_mask, decoder_keys, encoder_states, encoder_mask)
@@ -228,6 +269,7 @@ class TransformerDecoder(nn.Module):
         decoder_mems_list=None,
         return_mems=False,
         return_mems_as_list=True,
+        first_layer_self_attn_output=None,
     ):
         """
         Args:
@@ -241,6 +283,9 @@ class TransformerDecoder(nn.Module):
             return_mems: bool, whether to return outputs of all decoder layers
                 or the last layer only
             return_mems_as_list: bool, when True, mems returned are as a list; otherwise mems are Tensor
+            first_layer_self_attn_output: optional precomputed output of the self-attention sub-block
+                of the first layer for decoder_states (B x L_dec x H), e.g., from a prompt cache;
+                when provided, the first layer only computes cross-attention and feed-forward sub-blocks
         """
         decoder_attn_mask = form_attention_mask(decoder_mask, diagonal=self.diagonal)
         encoder_attn_mask = form_attention_mask(encoder_mask)
@@ -252,7 +297,12 @@ class TransformerDecoder(nn.Module):
                 cached_mems_list = memory_states.unsqueeze(0)
 
         for i, layer in enumerate(self.layers):
-            decoder_states = layer(decoder_states, decoder_attn_mask, memory_states, encoder_states, encoder_attn_mask)
+            if i == 0 and first_layer_self_attn_output is not None:
+                decoder_states = layer.cross_attention(first_layer_self_attn_output, encoder_states, encoder_attn_mask)
+            else:
+                decoder_states = layer(
+                    decoder_states, decoder_attn_mask, memory_states, encoder_states, encoder_attn_mask
+                )
             memory_states = self._get_memory_states(decoder_states, decoder_mems_list, i + 1)
             if return_mems:
                 if return_mems_as_list:
@@ -12,8 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Optional
+from typing import Optional, Tuple
 
 import torch
 from omegaconf import DictConfig
@@ -21,9 +22,10 @@ from torch.distributions import Categorical
 
 from nemo.collections.asr.parts.submodules.token_classifier import TokenClassifier
 from nemo.collections.asr.parts.utils.asr_confidence_utils import ConfidenceMethodMixin
-from nemo.collections.common.parts import NEG_INF, mask_padded_tokens
+from nemo.collections.common.parts import NEG_INF, form_attention_mask, mask_padded_tokens
 
 __all__ = [
+    "DecoderPromptCache",
     "GreedySequenceGenerator",
     "TopKSequenceGenerator",
     "BeamSearchSequenceGenerator",
@@ -33,6 +35,99 @@ __all__ = [
 ]
 
 
+class DecoderPromptCache:
+    """
+    Cache of the decoder states of prompts (e.g., Canary task, language, punctuation and timestamp tokens),
+    keyed by the prompt token ids.
+
+    Every layer of the AED decoder attends to the encoder states, so only the parts of the prompt processing which
+    precede the first cross-attention are independent of the audio: the prompt embeddings and the output
+    of the first layer self-attention sub-block. These are computed once per distinct prompt and gathered
+    into the batch at the start of decoding. Since deployments typically use only a handful of distinct prompts,
+    this removes the embedding and the first layer self-attention of the prompt from the per-utterance work.
+
+    The cached states are valid for a single device and dtype: the cache is cleared automatically when the
+    device of the prompts, the dtype of the decoder weights or the autocast dtype change.
+    The cache is not aware of the weight updates, use :meth:`clear` after modifying the decoder.
+
+    Args:
+        embedding: nn.Module, transforms input_ids into vector embeddings
+        decoder: TransformerDecoder module
+        pad: index of padding token in the vocabulary
+        max_entries: maximum number of distinct prompts kept in the cache (least recently used ones are evicted)
+    """
+
+    def __init__(self, embedding, decoder, pad: int = 0, max_entries: int = 128):
+        self.embedding = embedding
+        self.decoder = decoder
+        self.pad = pad
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        # device and dtypes of the cached states, see `_get_context`
+        self._context = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Removes all the cached prompts."""
+        self._entries.clear()
+
+    def is_applicable(self) -> bool:
+        """The cache is bypassed when the first decoder layer has adapters, which may be switched at any time."""
+        first_layer = self.decoder.layers[0]
+        return not (hasattr(first_layer, "is_adapter_available") and first_layer.is_adapter_available())
+
+    def _get_context(self, device: torch.device) -> tuple:
+        """Returns the device and dtypes which determine the computed states besides the prompts."""
+        weight_dtype = next(self.decoder.parameters()).dtype
+        autocast_dtype = torch.get_autocast_dtype(device.type) if torch.is_autocast_enabled(device.type) else None
+        return device, weight_dtype, autocast_dtype
+
+    def _compute(self, decoder_input_ids: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        decoder_hidden_states = self.embedding.forward(decoder_input_ids, start_pos=0)
+        decoder_input_mask = mask_padded_tokens(decoder_input_ids, self.pad).float()
+        decoder_attn_mask = form_attention_mask(decoder_input_mask, diagonal=self.decoder.diagonal)
+        self_attn_output = self.decoder.layers[0].self_attention(
+            decoder_hidden_states, decoder_attn_mask, decoder_hidden_states
+        )
+        return decoder_hidden_states, self_attn_output
+
+    def __call__(self, decoder_input_ids: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Args:
+            decoder_input_ids: prompt token ids of size (batch, prompt_len)
+
+        Returns:
+            a tuple of prompt embeddings and the first decoder layer self-attention output,
+            both of size (batch, prompt_len, hidden)
+        """
+        context = self._get_context(decoder_input_ids.device)
+        if context != self._context:
+            self.clear()
+            self._context = context
+
+        prompts = [tuple(row) for row in decoder_input_ids.tolist()]
+        unique_prompts = list(dict.fromkeys(prompts))
+        missing = [prompt for prompt in unique_prompts if prompt not in self._entries]
+        if missing:
+            missing_ids = torch.tensor(missing, dtype=decoder_input_ids.dtype, device=decoder_input_ids.device)
+            hidden_states, self_attn_output = self._compute(missing_ids)
+            for i, prompt in enumerate(missing):
+                self._entries[prompt] = (hidden_states[i].clone(), self_attn_output[i].clone())
+
+        for prompt in unique_prompts:
+            self._entries.move_to_end(prompt)
+        hidden_states = torch.stack([self._entries[prompt][0] for prompt in unique_prompts])
+        self_attn_output = torch.stack([self._entries[prompt][1] for prompt in unique_prompts])
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        prompt_to_index = {prompt: i for i, prompt in enumerate(unique_prompts)}
+        index = torch.tensor([prompt_to_index[prompt] for prompt in prompts], device=hidden_states.device)
+        return hidden_states[index], self_attn_output[index]
+
+
 class GreedySequenceGenerator(ConfidenceMethodMixin):
     """
     Greedy sequence generator based on the decoder followed by log_softmax.
@@ -55,6 +150,16 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
         n_samples: number of sequences to generate (requires ``temperature`` to be set)
         temperature: temperature for temperature sampling. Even with ``n_samples`` set to 1,
             enabling temperature will sample hypotheses instead of returning the best ones.
+        compact_finished: Bool flag which enables removal of finished sequences from the active batch.
+            When set to true, the rows which emitted <eos> are dropped together with their decoder memories
+            and encoder states, so that the decoding cost follows the actual output lengths
+            instead of the longest sequence in the batch. The greedy (argmax) tokens are identical to
+            the default mode. With sampling (``temperature`` or :class:`TopKSequenceGenerator`), the random numbers
+            are drawn only for the active rows, so the sampled tokens differ from the default mode.
+            The step confidence after <eos> is zero. Not used by the beam search generators.
+        prompt_cache_size: maximum number of distinct prompts (``decoder_input_ids``) kept in
+            a :class:`DecoderPromptCache`, which stores the audio-independent decoder states of the prompts.
+            0 disables the cache. The cache is cleared on :meth:`freeze` and :meth:`unfreeze`.
 
         preserve_step_confidence: Bool flag which preserves the history of per-step confidence scores generated
             during greedy decoding. When set to true, the results will contain additional List of tensor floats.
@@ -103,6 +208,8 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
         temperature=None,
         preserve_step_confidence=False,
         confidence_method_cfg: Optional[DictConfig] = None,
+        compact_finished=False,
+        prompt_cache_size=0,
     ):
         super().__init__()
         self.embedding = embedding
@@ -115,6 +222,12 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
         self.n_samples = n_samples
         self.temperature = temperature
         self.preserve_step_confidence = preserve_step_confidence
+        self.compact_finished = compact_finished
+        self.prompt_cache = (
+            DecoderPromptCache(embedding, decoder, pad=pad, max_entries=prompt_cache_size)
+            if prompt_cache_size > 0
+            else None
+        )
 
         # set confidence calculation method
         self.num_tokens = getattr(self.classifier.mlp, f'layer{self.classifier.mlp.layers - 1}').out_features
@@ -144,8 +257,19 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
             pos: starting position in positional encoding
         """
 
-        decoder_hidden_states = self.embedding.forward(decoder_input_ids, start_pos=pos)
         decoder_input_mask = mask_padded_tokens(decoder_input_ids, self.pad).float()
+        prompt_kwargs = {}
+        if (
+            self.prompt_cache is not None
+            and encoder_hidden_states is not None
+            and decoder_mems_list is None
+            and pos == 0
+            and self.prompt_cache.is_applicable()
+        ):
+            # the prompt states which do not depend on the audio are taken from the cache
+            decoder_hidden_states, prompt_kwargs["first_layer_self_attn_output"] = self.prompt_cache(decoder_input_ids)
+        else:
+            decoder_hidden_states = self.embedding.forward(decoder_input_ids, start_pos=pos)
 
         if encoder_hidden_states is not None:
             decoder_mems_list = self.decoder.forward(
@@ -155,6 +279,7 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
                 encoder_input_mask,
                 decoder_mems_list,
                 return_mems=True,
+                **prompt_kwargs,
             )
         else:
             decoder_mems_list = self.decoder.forward(
@@ -209,11 +334,6 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
             orig_batch_size = batch_size
             batch_size = batch_size * self.n_samples
 
-        # pad profile tracks sequences ending with <eos> token to replace
-        # everything after <eos> with <pad> token
-        decoder_parameter = next(self.decoder.parameters())
-        pad_profile = torch.zeros(batch_size).long().to(decoder_parameter.device)
-
         if self.preserve_step_confidence:
             if encoder_hidden_states is None:
                 raise RuntimeError("`encoder_hidden_states` must be provided to compute confidence scores.")
@@ -222,6 +342,47 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
         else:
             step_confidence = None
 
+        decode_fn = self._decode_with_compaction if self.compact_finished else self._decode
+        tgt, step_confidence_tensor = decode_fn(
+            tgt,
+            encoder_hidden_states,
+            encoder_input_mask,
+            max_generation_length,
+            step_confidence,
+            return_beam_scores,
+        )
+
+        samples = None
+        if is_sampling:
+            samples = list(tgt.view(orig_batch_size, self.n_samples, -1))
+            tgt = tgt[:: self.n_samples]
+
+        return tgt, samples, step_confidence_tensor
+
+    def _select_next_tokens(self, logits):
+        if self.temperature is None:  # Greedy decoding
+            return torch.argmax(logits[:, -1], dim=-1)
+        # Temperature sampling
+        return Categorical(logits=logits[:, -1] / self.temperature).sample()
+
+    def _decode(
+        self,
+        tgt,
+        encoder_hidden_states,
+        encoder_input_mask,
+        max_generation_length,
+        step_confidence,
+        return_beam_scores,
+    ):
+        """
+        Default decoding loop: every sequence stays in the batch until all sequences emit <eos>,
+        and the finished ones are masked with <pad> using ``pad_profile``.
+        """
+        batch_size = tgt.shape[0]
+        # pad profile tracks sequences ending with <eos> token to replace
+        # everything after <eos> with <pad> token
+        pad_profile = torch.zeros(batch_size, dtype=torch.long, device=tgt.device)
+
         decoder_mems_list = None
         for i in range(max_generation_length):
 
@@ -239,10 +400,7 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
                 return_scores=return_beam_scores,
             )
 
-            if self.temperature is None:  # Greedy decoding
-                next_tokens = torch.argmax(logits[:, -1], dim=-1)
-            else:  # Temperature sampling
-                next_tokens = Categorical(logits=logits[:, -1] / self.temperature).sample()
+            next_tokens = self._select_next_tokens(logits)
 
             next_tokens = self.pad * pad_profile + next_tokens * (1 - pad_profile)
             pad_profile = torch.max(pad_profile, (next_tokens == self.eos).long())
@@ -262,13 +420,80 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
         step_confidence_tensor = (
             torch.cat(step_confidence, dim=1) if self.preserve_step_confidence and len(step_confidence) > 0 else None
         )
+        return tgt, step_confidence_tensor
 
-        samples = None
-        if is_sampling:
-            samples = list(tgt.view(orig_batch_size, self.n_samples, -1))
-            tgt = tgt[:: self.n_samples]
+    def _decode_with_compaction(
+        self,
+        tgt,
+        encoder_hidden_states,
+        encoder_input_mask,
+        max_generation_length,
+        step_confidence,
+        return_beam_scores,
+    ):
+        """
+        Decoding loop which removes finished sequences from the active batch.
+
+        The generated tokens are written into a preallocated buffer filled with <pad>, indexed by the original
+        batch positions of the active rows. Whenever some rows emit <eos>, the remaining rows are selected
+        from the decoder memories, encoder states and encoder mask, so that the following steps run
+        only over the unfinished sequences. The greedy tokens are identical to :meth:`_decode`, but not the sampled
+        tokens (the random numbers are drawn only for the active rows), and the confidence of the steps
+        after <eos> is zero instead of the confidence computed for the <pad> tokens.
+        """
+        batch_size, prompt_len = tgt.shape
+        device = tgt.device
+        output = torch.full((batch_size, prompt_len + max_generation_length), self.pad, dtype=tgt.dtype, device=device)
+        output[:, :prompt_len] = tgt
+        if self.preserve_step_confidence:
+            confidence = torch.zeros(
+                (batch_size, prompt_len + max_generation_length), dtype=step_confidence[0].dtype, device=device
+            )
+            confidence[:, :prompt_len] = step_confidence[0]
+        else:
+            confidence = None
 
-        return tgt, samples, step_confidence_tensor
+        # original batch positions of the sequences which are still being decoded
+        active_idx = torch.arange(batch_size, device=device)
+        input_ids = tgt
+        decoder_mems_list = None
+        num_steps = 0
+        for i in range(max_generation_length):
+            logits, decoder_mems_list = self._one_step_forward(
+                input_ids,
+                encoder_hidden_states,
+                encoder_input_mask,
+                decoder_mems_list,
+                i,
+                return_scores=return_beam_scores,
+            )
+            next_tokens = self._select_next_tokens(logits)
+            output[active_idx, prompt_len + i] = next_tokens
+            if self.preserve_step_confidence:
+                confidence[active_idx, prompt_len + i] = self._get_confidence_tensor(
+                    torch.nn.functional.log_softmax(logits, dim=-1) if not return_beam_scores else logits
+                ).squeeze(1)
+            num_steps = i + 1
+
+            is_active = next_tokens != self.eos
+            num_active = is_active.sum().item()
+            # abort generation if all sequences end with <eos>
+            if num_active == 0:
+                break
+            if num_active < active_idx.shape[0]:
+                keep = is_active.nonzero(as_tuple=True)[0]
+                active_idx = active_idx[keep]
+                next_tokens = next_tokens[keep]
+                decoder_mems_list = [mems[keep] for mems in decoder_mems_list]
+                if encoder_hidden_states is not None:
+                    encoder_hidden_states = encoder_hidden_states[keep]
+                    encoder_input_mask = encoder_input_mask[keep]
+            input_ids = next_tokens.unsqueeze(1)
+
+        output = output[:, : prompt_len + num_steps]
+        if confidence is not None:
+            confidence = confidence[:, : prompt_len + num_steps]
+        return output, confidence
 
     def __call__(
         self, decoder_input_ids=None, encoder_hidden_states=None, encoder_input_mask=None, return_beam_scores=False
@@ -289,6 +514,8 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
 
     def freeze(self) -> None:
         """Freeze weights of embedding, decoder, and classification layers to prevent memory leak."""
+        if self.prompt_cache is not None:
+            self.prompt_cache.clear()
         for param in self.embedding.parameters():
             param.requires_grad = False
         self.embedding.eval()
@@ -301,6 +528,8 @@ class GreedySequenceGenerator(ConfidenceMethodMixin):
 
     def unfreeze(self) -> None:
         """Unfreeze weights of embedding, decoder, and classification layers."""
+        if self.prompt_cache is not None:
+            self.prompt_cache.clear()
         for param in self.embedding.parameters():
             param.requires_grad = True
         self.embedding.train()
@@ -109,10 +109,16 @@ class TransformerEmbedding(nn.Module):
                 f"Input sequence is longer than maximum allowed sequence length for positional encoding. "
                 f"Got {seq_length} and {self.max_sequence_length}"
             )
-        position_ids = torch.arange(
-            start=start_pos, end=start_pos + seq_length, dtype=torch.long, device=input_ids.device
-        )
-        position_ids = position_ids.unsqueeze(0).repeat(input_ids.size(0), 1)
+        if torch.is_tensor(start_pos) and start_pos.dim() == 1:
+            # per-example starting positions, e.g., when sequences in the batch were admitted at different steps
+            position_ids = start_pos.unsqueeze(1) + torch.arange(
+                seq_length, dtype=torch.long, device=input_ids.device
+            ).unsqueeze(0)
+        else:
+            position_ids = torch.arange(
+                start=start_pos, end=start_pos + seq_length, dtype=torch.long, device=input_ids.device
+            )
+            position_ids = position_ids.unsqueeze(0).repeat(input_ids.size(0), 1)
 
         token_embeddings = self.token_embedding(input_ids)
         position_embeddings = self.position_embedding(position_ids)
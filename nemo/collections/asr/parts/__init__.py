@@ -11,3 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+from nemo.utils.import_utils import lazy_import_attributes
+
+# submodules are imported lazily on the first access, e.g., ``nemo.collections.asr.parts.utils``
+__getattr__, __dir__, _ = lazy_import_attributes(
+    __name__,
+    {},
+    submodules=("context_biasing", "features", "k2", "mixins", "numba", "preprocessing", "submodules", "utils"),
+)
@@ -21,7 +21,11 @@ from nemo.collections.asr.parts.context_biasing.context_biasing_utils import (
     merge_alignment_with_ws_hyps,
 )
 from nemo.collections.asr.parts.context_biasing.context_graph_ctc import ContextGraphCTC
-from nemo.collections.asr.parts.context_biasing.ctc_based_word_spotter import run_word_spotter
+from nemo.collections.asr.parts.context_biasing.ctc_based_word_spotter import (
+    CompiledContextGraphCTC,
+    run_word_spotter,
+    run_word_spotter_batch,
+)
 
 __all__ = [
     "GPUBoostingTreeModel",
@@ -29,5 +33,7 @@ __all__ = [
     "compute_fscore",
     "merge_alignment_with_ws_hyps",
     "ContextGraphCTC",
+    "CompiledContextGraphCTC",
     "run_word_spotter",
+    "run_word_spotter_batch",
 ]
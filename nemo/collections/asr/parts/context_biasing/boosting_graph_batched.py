@@ -12,13 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import itertools
 import os
+import threading
 from collections import deque
+from contextlib import contextmanager
 from dataclasses import InitVar, dataclass, field
-from typing import List, NamedTuple, Optional
+from typing import Callable, Iterator, List, NamedTuple, Optional
 
 import numpy as np
 import torch
+import torch.nn as nn
 from lightning.pytorch import Trainer
 from omegaconf import MISSING, DictConfig, OmegaConf
 
@@ -57,6 +62,7 @@ class BoostingTreeModelConfig:
         5  # The number of alternative transcriptions to generate for each context-biasing phrase
     )
     bpe_alpha: float = 0.3  # The alpha parameter for BPE dropout
+    spare_capacity: float = 0.0  # Relative spare capacity of states/arcs to apply phrase list updates in-place
 
 
 class TBranch(NamedTuple):
@@ -243,11 +249,26 @@ class BoostingTreeConfig:
     use_triton: bool | None = None
 
 
+# names of parameters and buffers of the tree with the first dimension corresponding to states (others - to arcs)
+_STATES_TENSORS = ("backoff_weights", "final_weights", "backoff_to_states", "start_end_arcs", "state_order")
+
+
 class GPUBoostingTreeModel(NGramGPULanguageModel):
     """
     GPU-accelerated boosting tree supporting batched queries.
     Fast implementation for parallel queries for full vocabulary.
     Supports autograd (differentiable weights).
+
+    The tree built from the phrase list (`from_phrases`, `from_config`) supports live updates:
+    `add_phrases`, `remove_phrases`, `set_phrase_scores`. Each update triggers the compaction (full rebuild of the tree
+    in the background thread). Removed phrases are tombstoned and changed scores are updated in-place
+    in the existing states and arcs (for non-uniform weights) without waiting for the compaction.
+    Added phrases take effect only after the compaction: the tree is not extended in-place,
+    `spare_capacity` only allows loading the rebuilt tree without reallocating the tensors (keeps CUDA graphs valid).
+    All the changes of the tree tensors (tombstones, scores, compacted tree) are staged and applied
+    at the start of the next decoding (`get_init_states`), so the tree is never modified during the decoding step.
+    Per-request phrases can be merged with the tree at decoding time using `request_phrases` context manager
+    (not supported with CUDA graphs decoding).
     """
 
     START_STATE = 0
@@ -278,6 +299,26 @@ class GPUBoostingTreeModel(NGramGPULanguageModel):
         super().__init__(cfg=cfg, trainer=trainer)
         self.bos_state = self.START_STATE  # Always START_STATE for gpu boosting tree
 
+        # phrase list (phrase -> (transcriptions, score)) and build parameters; available for trees built from phrases
+        self._phrases: Optional[dict[str, tuple[list[list[int]], float]]] = None
+        self._build_params: Optional[dict] = None
+        self.spare_capacity = 0.0
+        # state for live updates
+        self._update_lock = threading.Lock()
+        self._phrases_version = 0
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._compacted_tree: Optional["GPUBoostingTreeModel"] = None
+        self._compacted_version = 0
+        # in-place updates of the tree tensors (version, update), applied at the start of the next decoding
+        self._staged_updates: list[tuple[int, Callable[[], None]]] = []
+        # per-request tree merged at decoding time
+        self._request_tree: Optional["GPUBoostingTreeModel"] = None
+        # the tree was queried while capturing CUDA graphs (per-request tree can't be merged into the captured graphs)
+        self._captured_in_cuda_graphs = False
+        # cached accumulated scores and end flags of states for tombstoning
+        self._node_scores: Optional[torch.Tensor] = None
+        self._is_end: Optional[torch.Tensor] = None
+
     @classmethod
     def _read_context_graph(
         cls,
@@ -408,6 +449,666 @@ class GPUBoostingTreeModel(NGramGPULanguageModel):
         model._resolve_final()
         return model
 
+    @classmethod
+    def from_phrases(
+        cls,
+        phrases: List[str],
+        token_ids: List[List[int] | List[List[int]]],
+        vocab_size: int,
+        scores: Optional[List[float]] = None,
+        context_score: float = 1.0,
+        depth_scaling: float = 1.0,
+        unk_score: float = 0.0,
+        final_eos_score: float = 0.0,
+        use_triton: bool | None = None,
+        uniform_weights: bool = False,
+        spare_capacity: float = 0.0,
+    ) -> "GPUBoostingTreeModel":
+        """
+        Constructor from the list of phrases. The model keeps the phrase list to support live updates.
+
+        Args:
+            phrases: context-biasing phrases
+            token_ids: transcription (list of token ids) or list of alternative transcriptions for each phrase
+            vocab_size: vocabulary size (existing vocabulary units in LM; should not include blank etc.)
+            scores: custom token-level score for each phrase, 0 means using the default `context_score`
+            context_score: the score for each arc transition in the context graph
+            depth_scaling: the scaling factor for the depth of the context graph
+            unk_score: score for unknown tokens
+            final_eos_score: score for eos token after detected end of context phrase
+            use_triton: allow using Triton implementation;
+                None (default) means "auto" (used if available), True means forced mode
+                (will crash if Triton is unavailable)
+            uniform_weights: whether to use uniform weights for the context-biasing tree as in Icefall
+            spare_capacity: relative spare capacity of states/arcs to apply updates without reallocating tensors
+
+        Returns:
+            GPUBoostingTreeModel instance
+        """
+        if scores is None:
+            scores = [0.0] * len(phrases)
+        if not len(phrases) == len(token_ids) == len(scores):
+            raise ValueError("Lengths of phrases, token_ids and scores do not match")
+        phrases_dict = {
+            phrase: (cls._as_transcriptions(phrase_token_ids), score)
+            for phrase, phrase_token_ids, score in zip(phrases, token_ids, scores)
+        }
+        build_params = dict(
+            vocab_size=vocab_size,
+            context_score=context_score,
+            depth_scaling=depth_scaling,
+            unk_score=unk_score,
+            final_eos_score=final_eos_score,
+            use_triton=use_triton,
+            uniform_weights=uniform_weights,
+        )
+        model = cls._build_from_phrases(phrases_dict=phrases_dict, **build_params)
+        model._phrases = phrases_dict
+        model._build_params = build_params
+        model.spare_capacity = spare_capacity
+        if spare_capacity > 0:
+            model._load_tree(model, reallocate=True)
+        return model
+
+    @staticmethod
+    def _as_transcriptions(token_ids: List[int] | List[List[int]]) -> list[list[int]]:
+        """Convert one transcription or list of alternative transcriptions to the list of transcriptions"""
+        if len(token_ids) > 0 and isinstance(token_ids[0], (list, tuple)):
+            return [list(transcription) for transcription in token_ids]
+        return [list(token_ids)]
+
+    @classmethod
+    def _build_from_phrases(
+        cls,
+        phrases_dict: dict[str, tuple[list[list[int]], float]],
+        vocab_size: int,
+        context_score: float,
+        depth_scaling: float,
+        unk_score: float,
+        final_eos_score: float,
+        use_triton: bool | None,
+        uniform_weights: bool,
+    ) -> "GPUBoostingTreeModel":
+        """Build the boosting tree from the phrase list (phrase -> (transcriptions, score))"""
+        if not any(transcriptions for transcriptions, _ in phrases_dict.values()):
+            # empty phrase list: trivial tree without boosting
+            return cls.dummy_boosting_tree(vocab_size=vocab_size, use_triton=use_triton)
+
+        context_graph = cls._build_context_graph(
+            phrases_dict=phrases_dict,
+            context_score=context_score,
+            depth_scaling=depth_scaling,
+            uniform_weights=uniform_weights,
+        )
+        return cls.from_context_graph(
+            context_graph=context_graph,
+            vocab_size=vocab_size,
+            unk_score=unk_score,
+            final_eos_score=final_eos_score,
+            use_triton=use_triton,
+            uniform_weights=uniform_weights,
+        )
+
+    @staticmethod
+    def _build_context_graph(
+        phrases_dict: dict[str, tuple[list[list[int]], float]],
+        context_score: float,
+        depth_scaling: float,
+        uniform_weights: bool,
+    ) -> ContextGraph:
+        """Build the context graph from the phrase list (phrase -> (transcriptions, score))"""
+        contexts, scores, phrases = [], [], []
+        for phrase, (transcriptions, score) in phrases_dict.items():
+            for transcription in transcriptions:
+                contexts.append(transcription)
+                scores.append(score)
+                phrases.append(phrase)
+        context_graph = ContextGraph(context_score=context_score, depth_scaling=depth_scaling)
+        context_graph.build(token_ids=contexts, scores=scores, phrases=phrases, uniform_weights=uniform_weights)
+        return context_graph
+
+    def _check_phrases_available(self):
+        """Check that the tree keeps the phrase list necessary for the updates"""
+        if self._phrases is None:
+            raise ValueError(
+                f"{self.__class__.__name__} was not built from the phrase list, updates are not supported; "
+                f"use `from_phrases` or `from_config` with key phrases to build the tree"
+            )
+
+    def add_phrases(
+        self,
+        phrases: List[str],
+        token_ids: List[List[int] | List[List[int]]],
+        scores: Optional[List[float]] = None,
+        blocking: bool = False,
+    ):
+        """
+        Add phrases to the tree (existing phrases are replaced).
+        The phrases are boosted only after the full rebuild of the tree (`compact`) is finished
+        and swapped in at the start of the next decoding; use `blocking=True` to apply them immediately.
+
+        Args:
+            phrases: context-biasing phrases
+            token_ids: transcription (list of token ids) or list of alternative transcriptions for each phrase
+            scores: custom token-level score for each phrase, 0 means using the default `context_score`
+            blocking: compact the tree in the current thread and apply the changes immediately
+        """
+        self._check_phrases_available()
+        if scores is None:
+            scores = [0.0] * len(phrases)
+        if not len(phrases) == len(token_ids) == len(scores):
+            raise ValueError("Lengths of phrases, token_ids and scores do not match")
+        with self._update_lock:
+            for phrase, phrase_token_ids, score in zip(phrases, token_ids, scores):
+                self._phrases[phrase] = (self._as_transcriptions(phrase_token_ids), score)
+        self.compact(blocking=blocking)
+
+    def remove_phrases(self, phrases: List[str], blocking: bool = False):
+        """
+        Remove phrases from the tree. The phrases are tombstoned at the start of the next decoding
+        (the phrases are not boosted anymore; scores of the prefixes shared with the remaining phrases
+        are updated after the compaction).
+
+        Args:
+            phrases: context-biasing phrases to remove
+            blocking: compact the tree in the current thread and apply the changes immediately
+        """
+        self._check_phrases_available()
+        with self._update_lock:
+            removed = [self._phrases.pop(phrase) for phrase in phrases if phrase in self._phrases]
+            remaining_transcriptions = {
+                tuple(transcription)
+                for transcriptions, _ in self._phrases.values()
+                for transcription in transcriptions
+            }
+            self._stage_update(
+                functools.partial(
+                    self._tombstone,
+                    transcriptions=[
+                        transcription for transcriptions, _ in removed for transcription in transcriptions
+                    ],
+                    remaining_transcriptions=remaining_transcriptions,
+                )
+            )
+        self.compact(blocking=blocking)
+
+    def set_phrase_scores(self, phrases: List[str], scores: List[float], blocking: bool = False):
+        """
+        Change custom token-level scores of the existing phrases. The weights of the existing arcs and backoffs
+        are updated in-place at the start of the next decoding (without waiting for the compaction);
+        with uniform weights the new scores are applied only after the compaction.
+
+        Args:
+            phrases: context-biasing phrases
+            scores: custom token-level score for each phrase, 0 means using the default `context_score`
+            blocking: compact the tree in the current thread and apply the changes immediately
+        """
+        self._check_phrases_available()
+        if len(phrases) != len(scores):
+            raise ValueError("Lengths of phrases and scores do not match")
+        with self._update_lock:
+            for phrase in phrases:
+                if phrase not in self._phrases:
+                    raise KeyError(f"Phrase '{phrase}' not found in the boosting tree")
+            # only the subtrees starting with the first tokens of the changed phrases are affected
+            first_tokens = {
+                transcription[0] for phrase in phrases for transcription in self._phrases[phrase][0] if transcription
+            }
+            affected_phrases = [
+                phrase
+                for phrase, (transcriptions, _) in self._phrases.items()
+                if any(transcription and transcription[0] in first_tokens for transcription in transcriptions)
+            ]
+            phrases_before = {phrase: self._phrases[phrase] for phrase in affected_phrases}
+            for phrase, score in zip(phrases, scores):
+                self._phrases[phrase] = (self._phrases[phrase][0], score)
+            if not self._build_params["uniform_weights"]:
+                phrases_after = {phrase: self._phrases[phrase] for phrase in affected_phrases}
+                self._stage_update(
+                    functools.partial(
+                        self._update_scores,
+                        **self._score_changes(
+                            phrases_before=phrases_before, phrases_after=phrases_after, first_tokens=first_tokens
+                        ),
+                        transcriptions=[
+                            transcription
+                            for transcriptions, _ in self._phrases.values()
+                            for transcription in transcriptions
+                        ],
+                    )
+                )
+        self.compact(blocking=blocking)
+
+    def _stage_update(self, update: Callable[[], None]):
+        """
+        Stage the in-place update of the tree tensors until the start of the next decoding;
+        should be called under the update lock after changing the phrase list.
+        The update is dropped if the compacted tree built from the changed phrase list is swapped in before it.
+        """
+        self._phrases_version += 1
+        self._staged_updates.append((self._phrases_version, update))
+
+    def _score_changes(
+        self,
+        phrases_before: dict[str, tuple[list[list[int]], float]],
+        phrases_after: dict[str, tuple[list[list[int]], float]],
+        first_tokens: set[int],
+    ) -> dict[str, list]:
+        """
+        Compute new token scores and changes of accumulated scores for the tree nodes starting with `first_tokens`.
+        The scores of these nodes depend only on the phrases passing through them, so they are computed
+        with the context graphs built only from the affected phrases (the same as in the full rebuild).
+
+        Args:
+            phrases_before: affected phrases with the old scores
+            phrases_after: affected phrases with the new scores (the same order)
+            first_tokens: first tokens of the transcriptions of the changed phrases
+
+        Returns:
+            dict with prefixes (transcriptions of the nodes), new token scores and changes of accumulated scores
+        """
+        graph_params = {key: self._build_params[key] for key in ("context_score", "depth_scaling", "uniform_weights")}
+        root_before = self._build_context_graph(phrases_dict=phrases_before, **graph_params).root
+        root_after = self._build_context_graph(phrases_dict=phrases_after, **graph_params).root
+        prefixes, token_scores, node_score_deltas = [], [], []
+        queue = deque(
+            (root_before.next[token], root_after.next[token], [token])
+            for token in sorted(first_tokens)
+            if token in root_after.next
+        )
+        while queue:
+            node_before, node_after, prefix = queue.popleft()
+            prefixes.append(prefix)
+            token_scores.append(node_after.token_score)
+            node_score_deltas.append(node_after.node_score - node_before.node_score)
+            for token, next_node_after in node_after.next.items():
+                queue.append((node_before.next[token], next_node_after, prefix + [token]))
+        return dict(prefixes=prefixes, token_scores=token_scores, node_score_deltas=node_score_deltas)
+
+    def _find_phrase_path(self, token_ids: List[int]) -> list[int] | None:
+        """Find the tree states for the transcription prefixes (following only tree arcs), None if not found"""
+        path = []
+        state = self.START_STATE
+        for token in token_ids:
+            start, end = self.start_end_arcs[state].tolist()
+            to_states = self.to_states[start:end]
+            is_tree_arc = (self.ilabels[start:end] == token) & (
+                self.state_order[to_states] == self.state_order[state] + 1
+            )
+            if not is_tree_arc.any():
+                return None
+            state = int(to_states[is_tree_arc][0])
+            path.append(state)
+        return path
+
+    def _has_live_children(self, state: int, dead_states: set[int]) -> bool:
+        """Check if the state has outgoing tree arcs to states which are not removed"""
+        start, end = self.start_end_arcs[state].tolist()
+        to_states = self.to_states[start:end]
+        children = to_states[self.state_order[to_states] == self.state_order[state] + 1].tolist()
+        return any(child not in dead_states for child in children)
+
+    def _find_states(self, transcriptions: List[List[int]]) -> torch.Tensor:
+        """Find the tree states for the transcriptions (following only tree arcs), -1 if not found"""
+        device = self.to_states.device
+        from_states, to_states = self.from_states.to(torch.long), self.to_states.to(torch.long)
+        is_tree_arc = self.state_order[to_states] == self.state_order[from_states] + 1
+        arc_keys = from_states[is_tree_arc] * self.vocab_size + self.ilabels[is_tree_arc].to(torch.long)
+        arc_keys, sort_indices = torch.sort(arc_keys)
+        arc_to_states = to_states[is_tree_arc][sort_indices]
+
+        max_length = max((len(transcription) for transcription in transcriptions), default=0)
+        tokens = torch.full([len(transcriptions), max_length], fill_value=-1, dtype=torch.long)
+        for i, transcription in enumerate(transcriptions):
+            tokens[i, : len(transcription)] = torch.tensor(transcription, dtype=torch.long)
+        tokens = tokens.to(device)
+        states = torch.full([len(transcriptions)], fill_value=self.START_STATE, dtype=torch.long, device=device)
+        for i in range(max_length):
+            active = (tokens[:, i] >= 0) & (states >= 0)
+            keys = states * self.vocab_size + tokens[:, i]
+            indices = torch.searchsorted(arc_keys, keys).clamp(max=max(arc_keys.shape[0] - 1, 0))
+            found = (arc_keys.shape[0] > 0) & (arc_keys[indices] == keys)
+            states = torch.where(active, torch.where(found, arc_to_states[indices], -1), states)
+        return states
+
+    def _init_tombstone_cache(self, transcriptions: List[List[int]]):
+        """
+        Compute accumulated boosting score from the start state and end flag for each state.
+
+        Args:
+            transcriptions: all transcriptions of phrases in the current tree
+        """
+        node_scores = torch.zeros_like(self.backoff_weights.data)
+        from_order = self.state_order[self.from_states]
+        to_order = self.state_order[self.to_states]
+        is_tree_arc = to_order == from_order + 1
+        for order in range(2, self.max_order + 1):
+            arcs_mask = is_tree_arc & (to_order == order)
+            node_scores[self.to_states[arcs_mask]] = (
+                node_scores[self.from_states[arcs_mask]] + self.arcs_weights.data[arcs_mask]
+            )
+        is_end = torch.zeros_like(self.state_order, dtype=torch.bool)
+        end_states = self._find_states(transcriptions)
+        is_end[end_states[end_states >= 0]] = True
+        self._node_scores = node_scores
+        self._is_end = is_end
+
+    @torch.no_grad()
+    def _tombstone(self, transcriptions: List[List[int]], remaining_transcriptions: set[tuple[int, ...]]):
+        """
+        Remove phrase transcriptions from the tree in-place (without changing the structure).
+        End states of the transcriptions become regular states, states not used by the remaining phrases
+        become unreachable: backoffs to these states are redirected to the next state in the backoff chain,
+        arcs to these states are redirected to the states reachable through backoff (as in the rebuilt tree).
+
+        Args:
+            transcriptions: transcriptions to remove
+            remaining_transcriptions: transcriptions of the remaining phrases
+        """
+        if self._build_params["uniform_weights"]:
+            # the scores of end states are distributed over the arcs, the phrase is removed after compaction
+            return
+        if self._node_scores is None:
+            self._init_tombstone_cache(
+                transcriptions=[list(transcription) for transcription in remaining_transcriptions] + transcriptions
+            )
+        node_scores, is_end = self._node_scores, self._is_end
+
+        removed_states, dead_states = [], set()
+        for transcription in transcriptions:
+            if tuple(transcription) in remaining_transcriptions:
+                # the same transcription is used by the remaining phrase
+                continue
+            path = self._find_phrase_path(transcription)
+            if path is None:
+                # not in the tree: the phrase was added, but the tree is not compacted yet
+                continue
+            removed_states.append(path[-1])
+            is_end[path[-1]] = False
+            # remove states (from the end of the transcription) which are not used by remaining phrases
+            for prefix_length in range(len(path), 0, -1):
+                state = path[prefix_length - 1]
+                if tuple(transcription[:prefix_length]) in remaining_transcriptions or self._has_live_children(
+                    state, dead_states
+                ):
+                    break
+                dead_states.add(state)
+        if not removed_states:
+            return
+
+        # redirect backoffs from the removed states to the next states in the backoff chain
+        device = self.to_states.device
+        dead_states_tensor = torch.tensor(sorted(dead_states), dtype=self.to_states.dtype, device=device)
+        states = torch.nonzero(torch.isin(self.backoff_to_states, dead_states_tensor)).squeeze(-1)
+        states = torch.cat([states, torch.tensor(removed_states, dtype=states.dtype, device=device)])
+        backoff_states = self.backoff_to_states[states]
+        while (is_dead := torch.isin(backoff_states, dead_states_tensor)).any():
+            backoff_states = torch.where(is_dead, self.backoff_to_states[backoff_states], backoff_states)
+        self.backoff_to_states[states] = backoff_states
+        # end states keep the accumulated score, for other states the accumulated score is canceled
+        self.backoff_weights.data[states] = torch.where(
+            is_end[states], 0.0, node_scores[backoff_states] - node_scores[states]
+        )
+
+        # redirect arcs to the removed states and recompute previously redirected arcs (backoffs can be changed)
+        self._redirect_arcs(dead_states=dead_states_tensor)
+        self.final_weights.data[removed_states] = 0.0
+
+    @torch.no_grad()
+    def _update_scores(
+        self,
+        prefixes: List[List[int]],
+        token_scores: List[float],
+        node_score_deltas: List[float],
+        transcriptions: List[List[int]],
+    ):
+        """
+        Update the weights of the tree in-place (without changing the structure) after changing the phrase scores:
+        weights of the arcs to the nodes, backoff weights of the states with changed accumulated scores
+        (of the state or its backoff state), and the redirected arcs.
+
+        Args:
+            prefixes: transcriptions of the affected nodes
+            token_scores: new token scores of the affected nodes
+            node_score_deltas: changes of the accumulated scores of the affected nodes
+            transcriptions: all transcriptions of phrases in the current tree
+        """
+        if self._node_scores is None:
+            self._init_tombstone_cache(transcriptions=transcriptions)
+        device = self.to_states.device
+        states = self._find_states(prefixes)
+        # nodes of the phrases added after the last compaction are not in the tree yet
+        found = states >= 0
+        states = states[found]
+        new_token_scores = torch.zeros_like(self.backoff_weights.data)
+        new_token_scores[states] = torch.tensor(token_scores, dtype=new_token_scores.dtype, device=device)[found]
+        deltas = torch.zeros_like(self.backoff_weights.data)
+        deltas[states] = torch.tensor(node_score_deltas, dtype=deltas.dtype, device=device)[found]
+
+        from_states = self.from_states.to(torch.long)
+        to_states = self.to_states.to(torch.long)
+        tree_arcs = (self.state_order[to_states] == self.state_order[from_states] + 1) & torch.isin(to_states, states)
+        self.arcs_weights.data[tree_arcs] = new_token_scores[to_states[tree_arcs]]
+        # end states keep zero backoff weight, for other states the weight is the difference of accumulated scores
+        self.backoff_weights.data += torch.where(
+            self._is_end, 0.0, deltas[self.backoff_to_states.to(torch.long)] - deltas
+        )
+        self._node_scores += deltas
+        self._redirect_arcs()
+
+    def _redirect_arcs(self, dead_states: Optional[torch.Tensor] = None):
+        """
+        Redirect arcs to the dead states and recompute previously redirected arcs
+        to the states reachable through backoff (as in the rebuilt tree).
+
+        Args:
+            dead_states: states which became unreachable
+        """
+        # process arcs in the order of the source state order, so the transitions through backoff states
+        # (with lower order) are already resolved
+        from_states = self.from_states.to(torch.long)
+        from_order = self.state_order[from_states]
+        is_redirected = (from_states != self.START_STATE) & (self.state_order[self.to_states] != from_order + 1)
+        arcs_to_redirect = is_redirected
+        if dead_states is not None:
+            arcs_to_redirect = arcs_to_redirect | torch.isin(self.to_states, dead_states)
+        start_arcs = arcs_to_redirect & (from_states == self.START_STATE)
+        # unknown token for the start state
+        self.to_states[start_arcs] = self.START_STATE
+        self.arcs_weights.data[start_arcs] = self._build_params["unk_score"]
+        arcs_to_redirect &= ~start_arcs
+        for order in torch.unique(from_order[arcs_to_redirect]).tolist():
+            arcs = torch.nonzero(arcs_to_redirect & (from_order == order)).squeeze(-1)
+            scores, next_states = self._advance_sparse_pytorch(
+                states=self.backoff_to_states[from_states[arcs]].to(torch.long),
+                labels=self.ilabels[arcs].to(torch.long).unsqueeze(-1),
+            )
+            self.to_states[arcs] = next_states[:, 0].to(self.to_states.dtype)
+            self.arcs_weights.data[arcs] = self.backoff_weights.data[from_states[arcs]] + scores[:, 0]
+
+    def compact(self, blocking: bool = False):
+        """
+        Rebuild the tree from the current phrase list. In non-blocking mode the tree is rebuilt in the background
+        thread and swapped in at the start of the next decoding (`get_init_states`).
+
+        Args:
+            blocking: rebuild the tree in the current thread and apply it immediately
+        """
+        self._check_phrases_available()
+        if blocking:
+            with self._update_lock:
+                self._phrases_version += 1
+                version = self._phrases_version
+                phrases_dict = dict(self._phrases)
+            tree = self._build_from_phrases(phrases_dict=phrases_dict, **self._build_params)
+            with self._update_lock:
+                if version > self._compacted_version:
+                    self._compacted_tree, self._compacted_version = tree, version
+            self.apply_updates()
+            return
+
+        with self._update_lock:
+            self._phrases_version += 1
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                # the running compaction will pick up the changes
+                return
+            self._compaction_thread = threading.Thread(target=self._compaction_loop, daemon=True)
+            self._compaction_thread.start()
+
+    def _compaction_loop(self):
+        """Rebuild the tree in the background until the phrase list is not changed during the rebuild"""
+        while True:
+            with self._update_lock:
+                version = self._phrases_version
+                phrases_dict = dict(self._phrases)
+            tree = self._build_from_phrases(phrases_dict=phrases_dict, **self._build_params)
+            with self._update_lock:
+                if version > self._compacted_version:
+                    self._compacted_tree, self._compacted_version = tree, version
+                if version == self._phrases_version:
+                    self._compaction_thread = None
+                    return
+
+    def wait_for_compaction(self):
+        """Wait for the background compaction to finish"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+
+    def apply_updates(self) -> bool:
+        """
+        Swap in the compacted tree if it is available and apply the staged in-place updates
+        not included in the compacted tree; should be called between decoding calls
+        (states of the current tree are invalid after the update).
+
+        Returns:
+            True if the tree was updated
+        """
+        with self._update_lock:
+            tree, self._compacted_tree = self._compacted_tree, None
+            updates = [
+                update for version, update in self._staged_updates if tree is None or version > self._compacted_version
+            ]
+            self._staged_updates = []
+            if tree is not None:
+                self._load_tree(tree)
+            for update in updates:
+                update()
+        return tree is not None or len(updates) > 0
+
+    @torch.no_grad()
+    def _load_tree(self, tree: "GPUBoostingTreeModel", reallocate: bool = False):
+        """
+        Load the structure and weights of the tree into the current model.
+        Tensors are updated in-place (compatible with CUDA graphs) if the allocated capacity is enough,
+        otherwise they are reallocated with spare capacity.
+
+        Args:
+            tree: boosting tree to load
+            reallocate: force reallocation of tensors
+        """
+        if reallocate or tree.num_states > self.num_states or tree.num_arcs > self.num_arcs:
+            num_states = int(tree.num_states * (1 + self.spare_capacity))
+            num_arcs = int(tree.num_arcs * (1 + self.spare_capacity))
+            reallocate = True
+        else:
+            num_states, num_arcs = self.num_states, self.num_arcs
+        num_arcs_extended = num_arcs + self.vocab_size
+
+        device = self.arcs_weights.device
+        tree_tensors = list(itertools.chain(tree.named_parameters(recurse=False), tree.named_buffers(recurse=False)))
+        for name, tree_tensor in tree_tensors:
+            size = num_states if name in _STATES_TENSORS else num_arcs_extended
+            used_size = tree_tensor.shape[0]
+            if reallocate:
+                tensor = torch.zeros([size, *tree_tensor.shape[1:]], dtype=tree_tensor.dtype, device=device)
+            else:
+                tensor = getattr(self, name).data
+            tensor[:used_size].copy_(tree_tensor.data)
+            # unused states: no arcs, backoff to the start state
+            tensor[used_size:] = 1 if name == "state_order" else 0
+            if reallocate:
+                if isinstance(tree_tensor, nn.Parameter):
+                    setattr(self, name, nn.Parameter(tensor, requires_grad=tree_tensor.requires_grad))
+                else:
+                    setattr(self, name, tensor)
+
+        self.num_states = num_states
+        self.num_arcs = num_arcs
+        self.num_arcs_extended = num_arcs_extended
+        self.max_order = tree.max_order
+        self.cfg.num_states = num_states
+        self.cfg.num_arcs = num_arcs
+        self.cfg.max_order = tree.max_order
+        self._final_resolved = tree._final_resolved
+        self._node_scores = None
+        self._is_end = None
+
+    @contextmanager
+    def request_phrases(
+        self,
+        phrases: List[str],
+        token_ids: List[List[int] | List[List[int]]],
+        scores: Optional[List[float]] = None,
+    ) -> Iterator["GPUBoostingTreeModel"]:
+        """
+        Context manager to merge per-request phrases with the tree at decoding time without rebuilding the tree.
+        The small tree is built from the request phrases; the scores of both trees are summed,
+        the state of the merged model is `state * request_tree.num_states + request_state`.
+        The states obtained inside the context are valid only inside it.
+        The merged states are decomposed before querying the trees, so both PyTorch and Triton implementations
+        are supported. CUDA graphs decoding is not supported (the graphs captured without the per-request tree
+        would ignore it), RuntimeError is raised if the tree was queried while capturing CUDA graphs;
+        disable CUDA graphs in the decoding strategy to use per-request phrases.
+
+        Args:
+            phrases: per-request context-biasing phrases
+            token_ids: transcription (list of token ids) or list of alternative transcriptions for each phrase
+            scores: custom token-level score for each phrase, 0 means using the default `context_score`
+
+        Returns:
+            per-request boosting tree
+        """
+        self._check_phrases_available()
+        if scores is None:
+            scores = [0.0] * len(phrases)
+        if not len(phrases) == len(token_ids) == len(scores):
+            raise ValueError("Lengths of phrases, token_ids and scores do not match")
+        if self._request_tree is not None:
+            raise RuntimeError("Nested request phrases are not supported")
+        if self._captured_in_cuda_graphs:
+            raise RuntimeError(
+                "Request phrases are not supported with CUDA graphs decoding: "
+                "the boosting tree is already captured in CUDA graphs, disable CUDA graphs in the decoding strategy"
+            )
+        phrases_dict = {
+            phrase: (self._as_transcriptions(phrase_token_ids), score)
+            for phrase, phrase_token_ids, score in zip(phrases, token_ids, scores)
+        }
+        # unknown tokens score is applied only once (by the main tree)
+        build_params = {**self._build_params, "unk_score": 0.0}
+        request_tree = self._build_from_phrases(phrases_dict=phrases_dict, **build_params)
+        self._request_tree = request_tree.to(self.arcs_weights.device)
+        try:
+            yield self._request_tree
+        finally:
+            self._request_tree = None
+
+    def get_init_states(self, batch_size: int, bos=True) -> torch.Tensor:
+        """
+        Get batch of the initial states; swap in the compacted tree if available
+
+        Args:
+            batch_size: batch size
+            bos: use begin-of-sentence state
+
+        Returns:
+            tensor [B] of initial states
+        """
+        self.apply_updates()
+        # initial state of the merged model with the per-request tree is also START_STATE
+        return super().get_init_states(batch_size=batch_size, bos=bos)
+
     def advance(self, states: torch.Tensor, eos_id: Optional[int] = None) -> tuple[torch.Tensor, torch.Tensor]:
         """
         Advance `states` [B]: return scores [B, V] and next states [B, V] for full vocab
@@ -415,6 +1116,59 @@ class GPUBoostingTreeModel(NGramGPULanguageModel):
             states: batch of states
             eos_id: if not None, for eos symbol use final state weight
 
+        Returns:
+            tuple with next states and scores
+        """
+        self._check_cuda_graphs_capture()
+        if self._request_tree is not None:
+            num_request_states = self._request_tree.num_states
+            scores, next_states = self._advance_tree(states=states // num_request_states, eos_id=eos_id)
+            request_scores, request_next_states = self._request_tree.advance(
+                states=states % num_request_states, eos_id=eos_id
+            )
+            return scores + request_scores, next_states * num_request_states + request_next_states
+        return self._advance_tree(states=states, eos_id=eos_id)
+
+    def advance_sparse(
+        self, states: torch.Tensor, labels: torch.Tensor, eos_id: Optional[int] = None
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Advance `states` [B] only for the given candidate `labels` [B, K]: return scores [B, K] and next states [B, K]
+
+        Args:
+            states: batch of states
+            labels: batch of candidate labels for each state
+            eos_id: if not None, for eos symbol use final state weight
+
+        Returns:
+            tuple with scores and next states for the candidate labels
+        """
+        self._check_cuda_graphs_capture()
+        if self._request_tree is not None:
+            num_request_states = self._request_tree.num_states
+            scores, next_states = super().advance_sparse(
+                states=states // num_request_states, labels=labels, eos_id=eos_id
+            )
+            request_scores, request_next_states = self._request_tree.advance_sparse(
+                states=states % num_request_states, labels=labels, eos_id=eos_id
+            )
+            return scores + request_scores, next_states * num_request_states + request_next_states
+        return super().advance_sparse(states=states, labels=labels, eos_id=eos_id)
+
+    def _check_cuda_graphs_capture(self):
+        """Remember that the tree is captured in CUDA graphs; per-request tree can't be captured"""
+        if torch.cuda.is_available() and torch.cuda.is_current_stream_capturing():
+            if self._request_tree is not None:
+                raise RuntimeError("Request phrases are not supported with CUDA graphs decoding")
+            self._captured_in_cuda_graphs = True
+
+    def _advance_tree(self, states: torch.Tensor, eos_id: Optional[int] = None) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Advance `states` [B] of the current tree (without per-request phrases) for full vocab
+        Args:
+            states: batch of states
+            eos_id: if not None, for eos symbol use final state weight
+
         Returns:
             tuple with next states and scores
         """
@@ -429,7 +1183,7 @@ class GPUBoostingTreeModel(NGramGPULanguageModel):
             scores[:, eos_id] = torch.clamp(torch.max(scores, dim=1).values, min=0.0)
 
             # 2. increase eos score after detected end of context phrase
-            scores[:, eos_id] += self.get_final(states)
+            scores[:, eos_id] += self.final_weights[states]
 
             next_states[:, eos_id] = states
         return scores, next_states
@@ -444,7 +1198,12 @@ class GPUBoostingTreeModel(NGramGPULanguageModel):
         Returns:
             tensor [B] with final weights for each state
         """
-
+        self._check_cuda_graphs_capture()
+        if self._request_tree is not None:
+            num_request_states = self._request_tree.num_states
+            return self.final_weights[states // num_request_states] + self._request_tree.get_final(
+                states % num_request_states
+            )
         return self.final_weights[states]
 
     @classmethod
@@ -543,33 +1302,23 @@ class GPUBoostingTreeModel(NGramGPULanguageModel):
                 else:
                     phrases_dict[phrase] = tokenizer.text_to_ids(phrase)
 
-        # 3. build pythoncontext graph
-        contexts, scores, phrases = [], [], []
-        for phrase in phrases_dict:
-            if cfg.use_bpe_dropout:
-                for transcript in phrases_dict[phrase]:
-                    contexts.append(transcript)
-                    scores.append(round(cfg.score_per_phrase / len(phrase), 2))
-                    phrases.append(phrase)
-            else:
-                contexts.append(phrases_dict[phrase])
-                scores.append(round(cfg.score_per_phrase / len(phrase), 2))
-                phrases.append(phrase)
-
-        context_graph = ContextGraph(context_score=cfg.context_score, depth_scaling=cfg.depth_scaling)
-        context_graph.build(token_ids=contexts, scores=scores, phrases=phrases, uniform_weights=cfg.uniform_weights)
-
-        # 4. build GPU boosting tree model from python context graph
-        boosting_tree_model = GPUBoostingTreeModel.from_context_graph(
-            context_graph=context_graph,
+        # 3. build boosting tree model from the phrase list
+        scores = [round(cfg.score_per_phrase / len(phrase), 2) for phrase in phrases_dict]
+        boosting_tree_model = cls.from_phrases(
+            phrases=list(phrases_dict.keys()),
+            token_ids=list(phrases_dict.values()),
             vocab_size=tokenizer.vocab_size,
+            scores=scores,
+            context_score=cfg.context_score,
+            depth_scaling=cfg.depth_scaling,
             unk_score=cfg.unk_score,
             final_eos_score=cfg.final_eos_score,
             use_triton=cfg.use_triton,
             uniform_weights=cfg.uniform_weights,
+            spare_capacity=getattr(cfg, "spare_capacity", 0.0),
         )
 
-        # 5. save model
+        # 4. save model
         if cfg.model_path is not None:
             boosting_tree_model.save(cfg.model_path)
 
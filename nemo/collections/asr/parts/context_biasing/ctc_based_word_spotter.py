@@ -13,9 +13,10 @@
 # limitations under the License.
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import numpy as np
+import torch
 
 from nemo.collections.asr.parts.context_biasing.context_graph_ctc import ContextGraphCTC, ContextState
 
@@ -363,3 +364,309 @@ def run_word_spotter(
     best_hyp_list = filter_wb_hyps(best_hyp_list, ctc_word_alignment)
 
     return best_hyp_list
+
+
+@dataclass
+class CompiledContextGraphCTC:
+    """
+    Context-Biasing graph compiled into flat arc arrays (tensors) for batched word spotting.
+    Arcs of each state are stored contiguously: arcs_start[state] <= arc < arcs_end[state].
+
+    Args:
+        arcs_start: first arc index for each state [num_states]
+        arcs_end: end arc index (exclusive) for each state [num_states]
+        arcs_to: destination state for each arc [num_arcs]
+        arcs_ilabel: label (token) for each arc [num_arcs]
+        word_ids: word index for end states, -1 for other states [num_states]
+        words: list of context biasing words
+        blank_id: the id of blank token in ASR model
+        root: index of the root state
+    """
+
+    arcs_start: torch.Tensor
+    arcs_end: torch.Tensor
+    arcs_to: torch.Tensor
+    arcs_ilabel: torch.Tensor
+    word_ids: torch.Tensor
+    words: List[str]
+    blank_id: int
+    root: int = 0
+
+    @property
+    def num_states(self) -> int:
+        """Number of states in the graph"""
+        return self.arcs_start.shape[0]
+
+    @classmethod
+    def from_context_graph(cls, context_graph: ContextGraphCTC) -> "CompiledContextGraphCTC":
+        """
+        Compile ContextGraphCTC (prefix tree of python objects) into flat arc arrays.
+
+        Args:
+            context_graph: Context-Biasing graph
+
+        Returns:
+            compiled graph
+        """
+        # enumerate states in the order of traversal, root gets index 0
+        state_ids = {id(context_graph.root): 0}
+        states = [context_graph.root]
+        arcs_start, arcs_end, arcs_to, arcs_ilabel, word_ids = [], [], [], [], []
+        words, word_to_id = [], {}
+        i = 0
+        while i < len(states):
+            state = states[i]
+            arcs_start.append(len(arcs_to))
+            for token, next_state in state.next.items():
+                if id(next_state) not in state_ids:
+                    state_ids[id(next_state)] = len(states)
+                    states.append(next_state)
+                arcs_to.append(state_ids[id(next_state)])
+                arcs_ilabel.append(int(token))
+            arcs_end.append(len(arcs_to))
+            if state.is_end:
+                if state.word not in word_to_id:
+                    word_to_id[state.word] = len(words)
+                    words.append(state.word)
+                word_ids.append(word_to_id[state.word])
+            else:
+                word_ids.append(-1)
+            i += 1
+        return cls(
+            arcs_start=torch.tensor(arcs_start, dtype=torch.long),
+            arcs_end=torch.tensor(arcs_end, dtype=torch.long),
+            arcs_to=torch.tensor(arcs_to, dtype=torch.long),
+            arcs_ilabel=torch.tensor(arcs_ilabel, dtype=torch.long),
+            word_ids=torch.tensor(word_ids, dtype=torch.long),
+            words=words,
+            blank_id=context_graph.blank_token,
+        )
+
+    def to(self, device: torch.device) -> "CompiledContextGraphCTC":
+        """Move graph tensors to the device"""
+        if self.arcs_start.device == torch.device(device):
+            return self
+        return CompiledContextGraphCTC(
+            arcs_start=self.arcs_start.to(device),
+            arcs_end=self.arcs_end.to(device),
+            arcs_to=self.arcs_to.to(device),
+            arcs_ilabel=self.arcs_ilabel.to(device),
+            word_ids=self.word_ids.to(device),
+            words=self.words,
+            blank_id=self.blank_id,
+            root=self.root,
+        )
+
+
+def spot_words_batch(
+    logprobs: torch.Tensor,
+    logprobs_lengths: Optional[torch.Tensor],
+    context_graph: CompiledContextGraphCTC,
+    beam_threshold: float = 5.0,
+    cb_weight: float = 3.0,
+    keyword_threshold: float = -5.0,
+    blank_threshold: float = 0.8,
+    non_blank_threshold: float = 0.001,
+) -> List[List[WSHyp]]:
+    """
+    Batched tensorized Token Passing Algorithm (TPA) over the compiled Context-Biasing graph.
+    Active tokens of all utterances are stored as flat tensors; state pruning keeps the best token
+    for each (utterance, state) pair, beam pruning is applied for each utterance relative to the best token
+    in the frame (instead of the running best score in `run_word_spotter`).
+
+    Args:
+        logprobs: CTC logprobs [B, Time, Vocab+blank]
+        logprobs_lengths: lengths of logprobs [B], None means all utterances have full length
+        context_graph: compiled Context-Biasing graph
+        beam_threshold: threshold for beam pruning
+        cb_weight: context biasing weight
+        keyword_threshold: auxiliary weight for pruning final hypotheses
+        blank_threshold: blank threshold (probability) for preliminary hypotheses pruning
+        non_blank_threshold: non-blank threshold (probability) for preliminary hypotheses pruning
+
+    Returns:
+        spotted hypotheses WSHyp for each utterance (before filtering overlapping hypotheses)
+    """
+    batch_size, max_time, _ = logprobs.shape
+    device = logprobs.device
+    graph = context_graph.to(device)
+    logprobs = logprobs.float()
+    if logprobs_lengths is None:
+        logprobs_lengths = torch.full([batch_size], fill_value=max_time, dtype=torch.long, device=device)
+    logprobs_lengths = logprobs_lengths.to(device)
+
+    # move threshold probabilities to log space
+    blank_threshold = np.log(blank_threshold)
+    non_blank_threshold = np.log(non_blank_threshold)
+
+    # number of outgoing arcs: end states with only self-loop transition are not extended after spotting
+    num_state_arcs = graph.arcs_end - graph.arcs_start
+    batch_indices = torch.arange(batch_size, device=device)
+
+    # active tokens: utterance index, graph state, score, start frame
+    tokens_batch = torch.zeros([0], dtype=torch.long, device=device)
+    tokens_state = torch.zeros([0], dtype=torch.long, device=device)
+    tokens_score = torch.zeros([0], dtype=torch.float32, device=device)
+    tokens_start = torch.zeros([0], dtype=torch.long, device=device)
+
+    spotted_batch, spotted_word, spotted_score, spotted_start, spotted_end = [], [], [], [], []
+    for frame in range(max_time):
+        # remove tokens of finished utterances
+        active_mask = frame < logprobs_lengths[tokens_batch]
+        tokens_batch, tokens_state = tokens_batch[active_mask], tokens_state[active_mask]
+        tokens_score, tokens_start = tokens_score[active_mask], tokens_start[active_mask]
+        # add an empty token (located in the graph root) for each utterance to start new word spotting;
+        # skip the empty token by the blank_threshold
+        new_tokens_batch = batch_indices[
+            (frame < logprobs_lengths) & (logprobs[:, frame, graph.blank_id] <= blank_threshold)
+        ]
+        tokens_batch = torch.cat([tokens_batch, new_tokens_batch])
+        tokens_state = torch.cat([tokens_state, torch.full_like(new_tokens_batch, graph.root)])
+        tokens_score = torch.cat([tokens_score, torch.zeros_like(new_tokens_batch, dtype=tokens_score.dtype)])
+        tokens_start = torch.cat([tokens_start, torch.full_like(new_tokens_batch, frame)])
+        if tokens_batch.shape[0] == 0:
+            continue
+
+        # expand all tokens with all outgoing arcs
+        num_token_arcs = num_state_arcs[tokens_state]
+        candidate_token = torch.repeat_interleave(torch.arange(tokens_state.shape[0], device=device), num_token_arcs)
+        candidate_offsets = torch.cumsum(num_token_arcs, dim=0) - num_token_arcs
+        candidate_arc = (
+            graph.arcs_start[tokens_state[candidate_token]]
+            + torch.arange(candidate_token.shape[0], device=device)
+            - candidate_offsets[candidate_token]
+        )
+        candidate_batch = tokens_batch[candidate_token]
+        candidate_label = graph.arcs_ilabel[candidate_arc]
+        candidate_logprob = logprobs[candidate_batch, frame, candidate_label]
+        # skip non-blank transitions from the root by the non_blank_threshold
+        keep = (tokens_state[candidate_token] != graph.root) | (candidate_logprob >= non_blank_threshold)
+        # add cb_weight only for non-blank tokens
+        candidate_score = (
+            tokens_score[candidate_token] + candidate_logprob + cb_weight * (candidate_label != graph.blank_id)
+        )
+
+        # beam pruning (for each utterance)
+        best_score = torch.full([batch_size], fill_value=float("-inf"), device=device)
+        best_score.scatter_reduce_(0, candidate_batch[keep], candidate_score[keep], reduce="amax", include_self=True)
+        keep &= candidate_score > best_score[candidate_batch] - beam_threshold
+
+        candidate_token, candidate_batch = candidate_token[keep], candidate_batch[keep]
+        candidate_score, candidate_state = candidate_score[keep], graph.arcs_to[candidate_arc[keep]]
+
+        # add a word as spotted if token reached the end of word state in context graph
+        candidate_word = graph.word_ids[candidate_state]
+        is_spotted = (candidate_word >= 0) & (candidate_score > keyword_threshold)
+        if is_spotted.any():
+            spotted_batch.append(candidate_batch[is_spotted])
+            spotted_word.append(candidate_word[is_spotted])
+            spotted_score.append(candidate_score[is_spotted])
+            spotted_start.append(tokens_start[candidate_token[is_spotted]])
+            spotted_end.append(torch.full_like(candidate_word[is_spotted], frame))
+        # the current state is the last in the branch (only one self-loop transition)
+        keep = ~(is_spotted & (num_state_arcs[candidate_state] == 1))
+        candidate_token, candidate_batch = candidate_token[keep], candidate_batch[keep]
+        candidate_score, candidate_state = candidate_score[keep], candidate_state[keep]
+
+        # state pruning: leave only the best token for each (utterance, state), the first one in case of ties
+        state_keys = candidate_batch * graph.num_states + candidate_state
+        unique_keys, key_indices = torch.unique(state_keys, return_inverse=True)
+        best_key_score = torch.full([unique_keys.shape[0]], fill_value=float("-inf"), device=device)
+        best_key_score.scatter_reduce_(0, key_indices, candidate_score, reduce="amax", include_self=True)
+        candidate_indices = torch.arange(candidate_score.shape[0], device=device)
+        best_key_candidate = torch.full_like(unique_keys, fill_value=candidate_score.shape[0])
+        best_key_candidate.scatter_reduce_(
+            0,
+            key_indices[candidate_score == best_key_score[key_indices]],
+            candidate_indices[candidate_score == best_key_score[key_indices]],
+            reduce="amin",
+            include_self=True,
+        )
+        # preserve the order of tokens (the order of spotted words depends on it)
+        best_key_candidate = torch.sort(best_key_candidate).values
+
+        tokens_batch = candidate_batch[best_key_candidate]
+        tokens_state = candidate_state[best_key_candidate]
+        tokens_score = candidate_score[best_key_candidate]
+        tokens_start = tokens_start[candidate_token[best_key_candidate]]
+
+    spotted_words = [[] for _ in range(batch_size)]
+    if spotted_batch:
+        spotted = zip(
+            torch.cat(spotted_batch).tolist(),
+            torch.cat(spotted_word).tolist(),
+            torch.cat(spotted_score).tolist(),
+            torch.cat(spotted_start).tolist(),
+            torch.cat(spotted_end).tolist(),
+        )
+        for batch_i, word_id, score, start_frame, end_frame in spotted:
+            spotted_words[batch_i].append(
+                WSHyp(word=graph.words[word_id], score=score, start_frame=start_frame, end_frame=end_frame)
+            )
+    return spotted_words
+
+
+def run_word_spotter_batch(
+    logprobs: torch.Tensor,
+    logprobs_lengths: Optional[torch.Tensor],
+    context_graph: Union[ContextGraphCTC, CompiledContextGraphCTC],
+    asr_model,
+    blank_idx: int = 0,
+    beam_threshold: float = 5.0,
+    cb_weight: float = 3.0,
+    ctc_ali_token_weight: float = 0.5,
+    keyword_threshold: float = -5.0,
+    blank_threshold: float = 0.8,
+    non_blank_threshold: float = 0.001,
+) -> List[List[WSHyp]]:
+    """
+    Batched version of CTC-based Word Spotter `run_word_spotter`: token passing is done for the whole batch
+    over the compiled Context-Biasing graph with vectorized beam and state pruning (on CPU or GPU).
+    For large context biasing lists compile the graph once with `CompiledContextGraphCTC.from_context_graph`.
+
+    Args:
+        logprobs: CTC logprobs [B, Time, Vocab+blank]
+        logprobs_lengths: lengths of logprobs [B], None means all utterances have full length
+        context_graph: Context-Biasing graph (compiled or not)
+        asr_model: ASR model (ctc or hybrid-transducer-ctc)
+        blank_idx: blank index in ASR model
+        beam_threshold: threshold for beam pruning
+        cb_weight: context biasing weight
+        ctc_ali_token_weight: additional token weight for word-level ctc alignment
+        keyword_threshold: auxiliary weight for pruning final hypotheses
+        blank_threshold: blank threshold (probability) for preliminary hypotheses pruning
+        non_blank_threshold: non-blank threshold (probability) for preliminary hypotheses pruning
+
+    Returns:
+        final list of spotted hypotheses WSHyp for each utterance
+    """
+    if isinstance(context_graph, ContextGraphCTC):
+        context_graph = CompiledContextGraphCTC.from_context_graph(context_graph)
+    if context_graph.blank_id != blank_idx:
+        raise ValueError(f"Blank index {blank_idx} does not match the graph blank id {context_graph.blank_id}")
+    if not isinstance(logprobs, torch.Tensor):
+        logprobs = torch.from_numpy(logprobs)
+
+    spotted_words = spot_words_batch(
+        logprobs=logprobs,
+        logprobs_lengths=logprobs_lengths,
+        context_graph=context_graph,
+        beam_threshold=beam_threshold,
+        cb_weight=cb_weight,
+        keyword_threshold=keyword_threshold,
+        blank_threshold=blank_threshold,
+        non_blank_threshold=non_blank_threshold,
+    )
+
+    logprobs_np = logprobs.cpu().float().numpy()
+    best_hyp_lists = []
+    for i, utterance_spotted_words in enumerate(spotted_words):
+        length = logprobs_np.shape[1] if logprobs_lengths is None else int(logprobs_lengths[i])
+        # find best hyps for spotted keywords (in case of hyps overlapping):
+        best_hyp_list = find_best_hyps(utterance_spotted_words)
+        # filter hyps according to word-level ctc alignment to avoid a high false accept rate
+        ctc_word_alignment = get_ctc_word_alignment(
+            logprobs_np[i, :length], asr_model, token_weight=ctc_ali_token_weight, blank_idx=blank_idx
+        )
+        best_hyp_lists.append(filter_wb_hyps(best_hyp_list, ctc_word_alignment))
+    return best_hyp_lists
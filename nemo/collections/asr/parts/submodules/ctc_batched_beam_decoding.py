@@ -183,6 +183,7 @@ class BatchedBeamCTCComputer(WithOptionalCudaGraphs, ConfidenceMethodMixin):
         beam_threshold: float = 20.0,
         ngram_lm_model: str = None,
         allow_cuda_graphs: bool = True,
+        ngram_lm_topk: Optional[int] = None,
     ):
         """
         Init method.
@@ -197,6 +198,8 @@ class BatchedBeamCTCComputer(WithOptionalCudaGraphs, ConfidenceMethodMixin):
             beam_beta: word insertion weight.
             beam_threshold: threshold for pruning candidates.
             allow_cuda_graphs: whether to allow CUDA graphs. Defaults to True.
+            ngram_lm_topk: if not None, in PyTorch (non-CUDA graphs) decoding the n-gram LM is queried only
+                for top-k acoustic labels in each frame, other non-blank labels are pruned (fast on CPU).
         """
 
         super().__init__()
@@ -211,6 +214,7 @@ class BatchedBeamCTCComputer(WithOptionalCudaGraphs, ConfidenceMethodMixin):
         self.ngram_lm_alpha = ngram_lm_alpha
         self.beam_beta = beam_beta
         self.beam_threshold = beam_threshold
+        self.ngram_lm_topk = ngram_lm_topk
 
         assert not self.preserve_alignments, "Preserve aligments is not supported"
 
@@ -271,6 +275,36 @@ class BatchedBeamCTCComputer(WithOptionalCudaGraphs, ConfidenceMethodMixin):
         self.full_graph = None
         self.separate_graphs = None
 
+    def _advance_lm_topk(
+        self, batch_lm_states: torch.Tensor, log_probs: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Queries the n-gram LM only for the top-k acoustic labels (sparse advance).
+        Other labels get zero scores and -1 as next states; such labels should be pruned.
+
+        Args:
+            batch_lm_states: LM states of hypotheses, shape [(B x Beam)]
+            log_probs: acoustic log probabilities for the current frame without blank, shape [B, V]
+
+        Returns:
+            tuple of LM scores and next LM states, shape [(B x Beam), V] (next states are -1 for pruned labels)
+        """
+        batch_size, vocab_size = log_probs.shape
+        top_k = min(self.ngram_lm_topk, vocab_size)
+        # acoustic scores are the same for all hypotheses in the beam
+        labels_top_k = torch.topk(log_probs, k=top_k, dim=-1, largest=True, sorted=False).indices
+        labels_top_k = labels_top_k.unsqueeze(1).expand(batch_size, self.beam_size, top_k).reshape(-1, top_k)
+        lm_scores_top_k, lm_states_top_k = self.ngram_lm_batch.advance_sparse(
+            states=batch_lm_states.view(-1), labels=labels_top_k
+        )
+        lm_scores = torch.zeros([batch_size * self.beam_size, vocab_size], device=log_probs.device).scatter_(
+            dim=-1, index=labels_top_k, src=lm_scores_top_k.to(torch.float32)
+        )
+        lm_states = torch.full(
+            [batch_size * self.beam_size, vocab_size], fill_value=-1, device=log_probs.device, dtype=torch.long
+        ).scatter_(dim=-1, index=labels_top_k, src=lm_states_top_k.to(torch.long))
+        return lm_scores, lm_states
+
     @torch.no_grad()
     def batched_beam_search_torch(
         self, decoder_outputs: torch.Tensor, decoder_output_lengths: torch.Tensor
@@ -320,11 +354,25 @@ class BatchedBeamCTCComputer(WithOptionalCudaGraphs, ConfidenceMethodMixin):
             log_probs = torch.where(repeated_or_blank_mask, log_probs, log_probs + self.beam_beta)
 
             if self.ngram_lm_batch is not None:
-                lm_scores, batch_lm_states_candidates = self.ngram_lm_batch.advance(states=batch_lm_states.view(-1))
+                if self.ngram_lm_topk is None:
+                    lm_scores, batch_lm_states_candidates = self.ngram_lm_batch.advance(
+                        states=batch_lm_states.view(-1)
+                    )
+                else:
+                    lm_scores, batch_lm_states_candidates = self._advance_lm_topk(
+                        batch_lm_states=batch_lm_states, log_probs=decoder_outputs[:, frame_idx, :-1]
+                    )
                 lm_scores = torch.where(
                     repeated_mask[..., :-1], 0, lm_scores.view(curr_batch_size, self.beam_size, -1)
                 )
                 log_probs[..., :-1] += self.ngram_lm_alpha * lm_scores.view(curr_batch_size, self.beam_size, -1)
+                if self.ngram_lm_topk is not None:
+                    # prune labels outside acoustic top-k (not scored with LM), preserve repeated labels
+                    log_probs[..., :-1].masked_fill_(
+                        (batch_lm_states_candidates.view(curr_batch_size, self.beam_size, -1) < 0)
+                        & ~repeated_mask[..., :-1],
+                        INACTIVE_SCORE,
+                    )
 
             # step 2.3: getting `beam_size` best candidates
             next_scores, next_candidates_indices = torch.topk(
@@ -366,6 +414,9 @@ class BatchedBeamCTCComputer(WithOptionalCudaGraphs, ConfidenceMethodMixin):
                     batch_lm_states_candidates, dim=-1, index=next_labels_masked.unsqueeze(-1)
                 ).squeeze(-1)
 
+                if self.ngram_lm_topk is not None:
+                    # pruned labels (not scored with LM) can be selected only for hypotheses with inactive scores
+                    preserve_state_mask |= batch_lm_states < 0
                 batch_lm_states = torch.where(preserve_state_mask, batch_lm_states_prev, batch_lm_states).view(-1)
 
             # step 2.5: masking inactive hypotheses, updating + recombining batched beam hypoteses
@@ -899,6 +899,8 @@ class BeamBatchedCTCInfer(AbstractBeamCTCInfer, WithOptionalCudaGraphs):
         beam_threshold: float, the beam pruning threshold.
         ngram_lm_model: str, the path to the ngram model.
         allow_cuda_graphs: bool, whether to allow cuda graphs for the beam search algorithm.
+        ngram_lm_topk: int, if not None, the ngram model is queried only for the top-k acoustic labels
+            in each frame (other non-blank labels are pruned), speeds up decoding without cuda graphs (e.g., on CPU).
     """
 
     def __init__(
@@ -913,6 +915,7 @@ class BeamBatchedCTCInfer(AbstractBeamCTCInfer, WithOptionalCudaGraphs):
         beam_threshold: float = 20.0,
         ngram_lm_model: str = None,
         allow_cuda_graphs: bool = True,
+        ngram_lm_topk: Optional[int] = None,
     ):
         super().__init__(blank_id=blank_index, beam_size=beam_size)
 
@@ -944,6 +947,7 @@ class BeamBatchedCTCInfer(AbstractBeamCTCInfer, WithOptionalCudaGraphs):
             beam_threshold=beam_threshold,
             ngram_lm_model=ngram_lm_model,
             allow_cuda_graphs=allow_cuda_graphs,
+            ngram_lm_topk=ngram_lm_topk,
         )
 
     def disable_cuda_graphs(self):
@@ -1028,6 +1032,7 @@ class BeamCTCInferConfig:
     kenlm_path: Optional[str] = None  # Deprecated, default should be None
     ngram_lm_alpha: Optional[float] = 1.0
     ngram_lm_model: Optional[str] = None
+    ngram_lm_topk: Optional[int] = None
 
     flashlight_cfg: Optional[FlashlightConfig] = field(default_factory=lambda: FlashlightConfig())
     pyctcdecode_cfg: Optional[PyCTCDecodeConfig] = field(default_factory=lambda: PyCTCDecodeConfig())
@@ -386,6 +386,7 @@ class AbstractCTCDecoding(ConfidenceMixin):
                 beam_threshold=self.cfg.beam.get('beam_threshold', 20.0),
                 ngram_lm_model=self.cfg.beam.get('ngram_lm_model', None),
                 allow_cuda_graphs=self.cfg.beam.get('allow_cuda_graphs', True),
+                ngram_lm_topk=self.cfg.beam.get('ngram_lm_topk', None),
             )
 
             self.decoding.override_fold_consecutive_value = False
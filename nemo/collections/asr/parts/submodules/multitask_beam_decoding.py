@@ -139,6 +139,7 @@ class TransformerAEDBeamInfer(AEDBeamInfer, Typing):
         ngram_lm_alpha: float = 0.0,
         boosting_tree: BoostingTreeModelConfig | None = None,
         boosting_tree_alpha: float = 0.0,
+        prompt_cache_size: int = 0,
     ):
         super().__init__(
             transformer_decoder=transformer_decoder,
@@ -183,6 +184,7 @@ class TransformerAEDBeamInfer(AEDBeamInfer, Typing):
                 eos=self.eos,
                 len_pen=length_penalty,
                 max_delta_length=max_generation_delta,
+                prompt_cache_size=prompt_cache_size,
             )
         else:
             self.beam_search = BeamSearchSequenceGeneratorWithFusionModels(
@@ -198,6 +200,7 @@ class TransformerAEDBeamInfer(AEDBeamInfer, Typing):
                 max_delta_length=max_generation_delta,
                 fusion_models=fusion_models,
                 fusion_models_alpha=fusion_models_alpha,
+                prompt_cache_size=prompt_cache_size,
             )
 
         self.preserve_alignments = preserve_alignments
@@ -314,3 +317,4 @@ class AEDBeamInferConfig:
     ngram_lm_alpha: float = 0.0
     boosting_tree: BoostingTreeModelConfig = field(default_factory=BoostingTreeModelConfig)
     boosting_tree_alpha: float = 0.0
+    prompt_cache_size: int = 0  # number of distinct prompts with cached decoder states; 0 disables the cache
@@ -0,0 +1,344 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import torch
+
+from nemo.collections.asr.parts.utils.rnnt_utils import Hypothesis
+from nemo.collections.common.parts import NEG_INF, form_attention_mask, mask_padded_tokens
+from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec
+
+__all__ = ["AEDContinuousBatchingGreedyInfer"]
+
+
+@dataclass
+class _AEDDecodingRequest:
+    """A single utterance waiting for a free decoder slot."""
+
+    request_id: Hashable
+    encoder_hidden_states: torch.Tensor  # [T, D]
+    decoder_input_ids: torch.Tensor  # [L]
+
+
+class AEDContinuousBatchingGreedyInfer:
+    """
+    Greedy decoder engine for AED Transformer models with continuous batching, intended for serving.
+
+    The engine keeps a fixed pool of ``max_slots`` decoder slots. Each slot stores the encoder states of one
+    utterance and the cached decoder states (one tensor per decoder layer, the same states that
+    :class:`~nemo.collections.asr.modules.transformer.transformer_generators.GreedySequenceGenerator` keeps
+    in ``decoder_mems_list``). Every call to :meth:`step`:
+
+        * runs one decoding step for all occupied slots, each slot at its own position;
+        * evicts the utterances which emitted ``<eos>`` (or reached the maximum length) and returns them;
+        * admits the waiting utterances into the free slots by running the prompt (prefill) through the decoder.
+
+    As a result, short utterances are returned as soon as they are finished, regardless of the longest
+    utterance in flight, and new utterances do not wait for the whole batch to drain.
+    The produced hypotheses are the same as the ones of :class:`TransformerAEDGreedyInfer`.
+
+    Example:
+        >>> engine = AEDContinuousBatchingGreedyInfer(model.transformer_decoder, model.log_softmax, model.tokenizer)
+        >>> engine.submit(encoder_hidden_states, encoder_input_mask, decoder_input_ids, request_ids=["a", "b"])
+        >>> while not engine.is_idle:
+        ...     for request_id, hypothesis in engine.step():
+        ...         ...
+
+    Args:
+        transformer_decoder: Transformer decoder module (with ``embedding`` and ``decoder`` attributes).
+        log_softmax_module: Log Softmax projection module to the vocab size.
+        tokenizer: tokenizer providing ``bos``, ``eos`` and ``pad`` ids.
+        max_slots: maximum number of utterances decoded simultaneously.
+        max_generation_delta: forbids generated sequences to be longer than the length of the encoder output
+            plus max_generation_delta; -1 means up to the max length of the decoder. Unlike the static batch
+            decoding, the limit is computed from the (unpadded) encoder output length of each utterance.
+    """
+
+    def __init__(
+        self,
+        transformer_decoder: torch.nn.Module,
+        log_softmax_module: torch.nn.Module,
+        tokenizer: TokenizerSpec,
+        max_slots: int = 32,
+        max_generation_delta: int = -1,
+    ):
+        if max_slots < 1:
+            raise ValueError(f"max_slots must be positive, got {max_slots}")
+        self.embedding = transformer_decoder.embedding
+        self.decoder = transformer_decoder.decoder
+        self.classifier = log_softmax_module
+        self.max_sequence_length = transformer_decoder.max_sequence_length
+        self.max_slots = max_slots
+        self.max_generation_delta = max_generation_delta
+        self.bos = tokenizer.bos
+        self.pad = tokenizer.pad
+        self.eos = tokenizer.eos
+
+        self._request_counter = count()
+        self._pending: deque = deque()
+        self._slot_requests: List[Optional[_AEDDecodingRequest]] = [None] * max_slots
+        self._slot_tokens: List[List[int]] = [[] for _ in range(max_slots)]
+        self._reset_pool()
+
+    def _reset_pool(self):
+        # pool tensors are allocated lazily, when the device and dtypes are known
+        self._encoder_states: Optional[torch.Tensor] = None  # [S, T_cap, D]
+        self._encoder_mask: Optional[torch.Tensor] = None  # [S, T_cap]
+        self._decoder_mems: Optional[List[torch.Tensor]] = None  # num_states x [S, L_cap, H]
+        self._cached_len: Optional[torch.Tensor] = None  # [S], number of cached decoder positions
+        self._prompt_len: Optional[torch.Tensor] = None  # [S]
+        self._max_len: Optional[torch.Tensor] = None  # [S], maximum length of the sequence (prompt included)
+        self._last_tokens: Optional[torch.Tensor] = None  # [S]
+        self._active: Optional[torch.Tensor] = None  # [S]
+
+    @property
+    def num_pending(self) -> int:
+        """Number of utterances waiting for a free slot."""
+        return len(self._pending)
+
+    @property
+    def num_active(self) -> int:
+        """Number of utterances currently being decoded."""
+        return sum(request is not None for request in self._slot_requests)
+
+    @property
+    def is_idle(self) -> bool:
+        """True if there are no pending and no active utterances."""
+        return self.num_pending == 0 and self.num_active == 0
+
+    def submit(
+        self,
+        encoder_hidden_states: torch.Tensor,
+        encoder_input_mask: torch.Tensor,
+        decoder_input_ids: torch.Tensor,
+        request_ids: Optional[List[Hashable]] = None,
+    ) -> List[Hashable]:
+        """
+        Queues a batch of utterances for decoding. The utterances are admitted into free slots by :meth:`step`.
+
+        Args:
+            encoder_hidden_states: encoder output of size (batch, time, features)
+            encoder_input_mask: encoder output mask of size (batch, time)
+            decoder_input_ids: decoder prompt of size (batch, prompt_len)
+            request_ids: optional identifiers of the utterances; generated if not provided
+
+        Returns:
+            list of request identifiers, in the order of the batch
+        """
+        batch_size = encoder_hidden_states.shape[0]
+        if request_ids is None:
+            request_ids = [next(self._request_counter) for _ in range(batch_size)]
+        if len(request_ids) != batch_size:
+            raise ValueError(f"Expected {batch_size} request ids, got {len(request_ids)}")
+        encoder_lengths = encoder_input_mask.sum(dim=-1).long().tolist()
+        for i in range(batch_size):
+            self._pending.append(
+                _AEDDecodingRequest(
+                    request_id=request_ids[i],
+                    encoder_hidden_states=encoder_hidden_states[i, : encoder_lengths[i]],
+                    decoder_input_ids=decoder_input_ids[i],
+                )
+            )
+        return list(request_ids)
+
+    @torch.inference_mode()
+    def step(self) -> List[Tuple[Hashable, Hypothesis]]:
+        """
+        Runs one decoding step for the active slots, evicts the finished utterances
+        and admits the pending ones into free slots.
+
+        Returns:
+            list of (request_id, hypothesis) tuples for the utterances finished at this step
+        """
+        finished = []
+        if self._active is not None and self._active.any():
+            finished.extend(self._decode_active_slots())
+        if self._pending:
+            finished.extend(self._admit_pending())
+        return finished
+
+    def __call__(
+        self,
+        encoder_hidden_states: torch.Tensor,
+        encoder_input_mask: torch.Tensor,
+        decoder_input_ids: torch.Tensor,
+    ) -> List[Hypothesis]:
+        """Decodes a batch until all of its utterances are finished. Returns hypotheses in the batch order."""
+        request_ids = self.submit(encoder_hidden_states, encoder_input_mask, decoder_input_ids)
+        results: Dict[Hashable, Hypothesis] = {}
+        while not all(request_id in results for request_id in request_ids):
+            results.update(self.step())
+        return [results[request_id] for request_id in request_ids]
+
+    def _free_slots(self) -> List[int]:
+        return [slot for slot, request in enumerate(self._slot_requests) if request is None]
+
+    def _allocate_pool(self, encoder_states: torch.Tensor, decoder_mems: List[torch.Tensor]):
+        num_slots = self.max_slots
+        device = encoder_states.device
+        self._encoder_states = encoder_states.new_zeros(num_slots, encoder_states.shape[1], encoder_states.shape[2])
+        self._encoder_mask = torch.zeros(num_slots, encoder_states.shape[1], device=device)
+        self._decoder_mems = [mems.new_zeros(num_slots, mems.shape[1], mems.shape[2]) for mems in decoder_mems]
+        self._cached_len = torch.zeros(num_slots, dtype=torch.long, device=device)
+        self._prompt_len = torch.zeros(num_slots, dtype=torch.long, device=device)
+        self._max_len = torch.zeros(num_slots, dtype=torch.long, device=device)
+        self._last_tokens = torch.full((num_slots,), self.pad, dtype=torch.long, device=device)
+        self._active = torch.zeros(num_slots, dtype=torch.bool, device=device)
+
+    @staticmethod
+    def _grow(tensor: torch.Tensor, size: int) -> torch.Tensor:
+        """Zero-pads dim 1 of the tensor up to at least ``size`` (doubling the capacity to amortize the growth)."""
+        capacity = tensor.shape[1]
+        if size <= capacity:
+            return tensor
+        new_capacity = max(size, 2 * capacity)
+        padding = tensor.new_zeros(tensor.shape[0], new_capacity - capacity, *tensor.shape[2:])
+        return torch.cat((tensor, padding), dim=1)
+
+    def _ensure_capacity(self, encoder_len: int = 0, decoder_len: int = 0):
+        self._encoder_states = self._grow(self._encoder_states, encoder_len)
+        self._encoder_mask = self._grow(self._encoder_mask, encoder_len)
+        self._decoder_mems = [self._grow(mems, decoder_len) for mems in self._decoder_mems]
+
+    def _admit_pending(self) -> List[Tuple[Hashable, Hypothesis]]:
+        free_slots = self._free_slots()
+        admitted = [self._pending.popleft() for _ in range(min(len(free_slots), len(self._pending)))]
+        # prompts of different length are processed in separate prefill batches to keep the results
+        # identical to the static batch decoding
+        groups: Dict[int, List[Tuple[int, _AEDDecodingRequest]]] = {}
+        for slot, request in zip(free_slots, admitted):
+            groups.setdefault(request.decoder_input_ids.shape[0], []).append((slot, request))
+
+        finished = []
+        for group in groups.values():
+            finished.extend(self._prefill([slot for slot, _ in group], [request for _, request in group]))
+        return finished
+
+    def _prefill(self, slots: List[int], requests: List[_AEDDecodingRequest]) -> List[Tuple[Hashable, Hypothesis]]:
+        encoder_states = torch.nn.utils.rnn.pad_sequence(
+            [request.encoder_hidden_states for request in requests], batch_first=True
+        )
+        encoder_lengths = torch.tensor(
+            [request.encoder_hidden_states.shape[0] for request in requests], device=encoder_states.device
+        )
+        encoder_mask = (
+            torch.arange(encoder_states.shape[1], device=encoder_states.device)[None, :] < encoder_lengths[:, None]
+        ).float()
+        decoder_input_ids = torch.stack([request.decoder_input_ids for request in requests]).to(encoder_states.device)
+
+        decoder_hidden_states = self.embedding.forward(decoder_input_ids, start_pos=0)
+        decoder_input_mask = mask_padded_tokens(decoder_input_ids, self.pad).float()
+        decoder_mems = self.decoder.forward(
+            decoder_hidden_states, decoder_input_mask, encoder_states, encoder_mask, None, return_mems=True
+        )
+        with self.classifier.with_log_softmax_enabled(False) as clf:
+            logits = clf.forward(hidden_states=decoder_mems[-1][:, -1:])
+        next_tokens = torch.argmax(logits[:, -1], dim=-1)
+
+        if self._decoder_mems is None:
+            self._allocate_pool(encoder_states, decoder_mems)
+        prompt_len = decoder_input_ids.shape[1]
+        self._ensure_capacity(encoder_len=encoder_states.shape[1], decoder_len=prompt_len)
+
+        slots_t = torch.tensor(slots, dtype=torch.long, device=encoder_states.device)
+        self._encoder_states[slots_t] = 0.0
+        self._encoder_states[slots_t, : encoder_states.shape[1]] = encoder_states
+        self._encoder_mask[slots_t] = 0.0
+        self._encoder_mask[slots_t, : encoder_states.shape[1]] = encoder_mask
+        for pool_mems, mems in zip(self._decoder_mems, decoder_mems):
+            pool_mems[slots_t, :prompt_len] = mems
+        self._cached_len[slots_t] = prompt_len
+        self._prompt_len[slots_t] = prompt_len
+        if self.max_generation_delta >= 0:
+            self._max_len[slots_t] = torch.clamp(
+                encoder_lengths + self.max_generation_delta, max=self.max_sequence_length
+            )
+        else:
+            self._max_len[slots_t] = self.max_sequence_length
+        self._last_tokens[slots_t] = next_tokens
+        self._active[slots_t] = True
+
+        for slot, request in zip(slots, requests):
+            self._slot_requests[slot] = request
+            self._slot_tokens[slot] = request.decoder_input_ids.tolist()
+        return self._record_tokens(slots_t, next_tokens)
+
+    def _decode_active_slots(self) -> List[Tuple[Hashable, Hypothesis]]:
+        slots_t = self._active.nonzero(as_tuple=True)[0]
+        positions = self._cached_len[slots_t]
+        max_len = int(positions.max().item()) + 1
+        self._ensure_capacity(decoder_len=max_len)
+
+        # each slot attends to its own cached positions and the current one
+        key_mask = torch.arange(max_len, device=positions.device)[None, :] <= positions[:, None]
+        self_attn_mask = ((~key_mask).float() * NEG_INF)[:, None, None, :]
+        encoder_states = self._encoder_states[slots_t]
+        encoder_attn_mask = form_attention_mask(self._encoder_mask[slots_t])
+
+        # the positional encoding follows the step index (as in GreedySequenceGenerator), not the cache position
+        step_index = positions - self._prompt_len[slots_t] + 1
+        decoder_states = self.embedding.forward(self._last_tokens[slots_t].unsqueeze(1), start_pos=step_index)
+        self._decoder_mems[0][slots_t, positions] = decoder_states[:, 0]
+        for i, layer in enumerate(self.decoder.layers):
+            decoder_states = layer(
+                decoder_states,
+                self_attn_mask,
+                self._decoder_mems[i][slots_t, :max_len],
+                encoder_states,
+                encoder_attn_mask,
+            )
+            self._decoder_mems[i + 1][slots_t, positions] = decoder_states[:, 0]
+        if self.decoder.final_layer_norm is not None:
+            decoder_states = self.decoder.final_layer_norm(decoder_states)
+            self._decoder_mems[-1][slots_t, positions] = decoder_states[:, 0]
+
+        with self.classifier.with_log_softmax_enabled(False) as clf:
+            logits = clf.forward(hidden_states=decoder_states)
+        next_tokens = torch.argmax(logits[:, -1], dim=-1)
+        self._cached_len[slots_t] += 1
+        self._last_tokens[slots_t] = next_tokens
+        return self._record_tokens(slots_t, next_tokens)
+
+    def _record_tokens(self, slots_t: torch.Tensor, next_tokens: torch.Tensor) -> List[Tuple[Hashable, Hypothesis]]:
+        """Appends the emitted tokens to the slots and evicts the finished utterances."""
+        # the sequence consists of the cached positions and the last emitted token
+        is_finished = (next_tokens == self.eos) | (self._cached_len[slots_t] + 1 >= self._max_len[slots_t])
+        finished = []
+        for slot, token, done in zip(slots_t.tolist(), next_tokens.tolist(), is_finished.tolist()):
+            self._slot_tokens[slot].append(token)
+            if done:
+                finished.append(self._evict(slot))
+        return finished
+
+    def _evict(self, slot: int) -> Tuple[Hashable, Hypothesis]:
+        request = self._slot_requests[slot]
+        tokens = self._slot_tokens[slot][request.decoder_input_ids.shape[0] :]
+        while tokens and tokens[-1] in (self.eos, self.pad):
+            tokens.pop()
+        self._slot_requests[slot] = None
+        self._slot_tokens[slot] = []
+        self._active[slot] = False
+        hypothesis = Hypothesis(score=0.0, y_sequence=torch.tensor(tokens, dtype=torch.long), timestamp=[])
+        return request.request_id, hypothesis
+
+    def reset(self):
+        """Drops all pending and active utterances and releases the slot pool memory."""
+        self._pending.clear()
+        self._slot_requests = [None] * self.max_slots
+        self._slot_tokens = [[] for _ in range(self.max_slots)]
+        self._reset_pool()
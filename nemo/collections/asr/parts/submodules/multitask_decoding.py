@@ -113,6 +113,12 @@ class AbstractMultiTaskDecoding(ConfidenceMixin):
                 temperature: None (disabled) or float, specifying this enables temperature sampling instead of greedy decoding.
                 max_generation_delta: int = -1  # -1 means up to the max length of the decoder
                 preserve_alignments: bool = False (unsupported)
+                compact_finished: bool = False, when True, sequences which emitted <eos> are removed from
+                    the active batch together with their decoder states, so that the decoding cost
+                    follows the actual output lengths. Greedy tokens are unchanged, sampled tokens
+                    (with temperature) and the step confidence after <eos> differ.
+                prompt_cache_size: int = 0, number of distinct prompts whose audio-independent decoder states
+                    (embeddings and the first layer self-attention) are cached across calls; 0 disables the cache.
 
             "beam":
                 beam_size: int, defining the beam size for beam search. Must be >= 1.
@@ -127,6 +133,8 @@ class AbstractMultiTaskDecoding(ConfidenceMixin):
                 return_best_hypothesis: optional bool, whether to return just the best hypothesis or all of the
                     hypotheses after beam search has concluded. This flag is set by default.
 
+                prompt_cache_size: int = 0, same as for greedy decoding.
+
 
         transformer_decoder: Transformer decoder module.
         log_softmax_module: Log Softmax projection module to the vocab size.
@@ -188,6 +196,8 @@ class AbstractMultiTaskDecoding(ConfidenceMixin):
                 confidence_method_cfg=self.confidence_method_cfg,
                 temperature=self.cfg.greedy.temperature,
                 n_samples=self.cfg.greedy.n_samples,
+                compact_finished=self.cfg.greedy.get('compact_finished', False),
+                prompt_cache_size=self.cfg.greedy.get('prompt_cache_size', 0),
             )
 
         elif strategy == 'beam':
@@ -206,6 +216,7 @@ class AbstractMultiTaskDecoding(ConfidenceMixin):
                 ngram_lm_alpha=self.cfg.beam.get('ngram_lm_alpha', 0.0),
                 boosting_tree=self.cfg.beam.get('boosting_tree', None),
                 boosting_tree_alpha=self.cfg.beam.get('boosting_tree_alpha', 0.0),
+                prompt_cache_size=self.cfg.beam.get('prompt_cache_size', 0),
             )
 
         else:
@@ -134,6 +134,8 @@ class TransformerAEDGreedyInfer(AEDGreedyInfer, Typing):
         preserve_token_confidence: bool = False,
         confidence_method_cfg: Optional[DictConfig] = None,
         n_samples: int = 1,
+        compact_finished: bool = False,
+        prompt_cache_size: int = 0,
     ):
         super().__init__(
             transformer_decoder=transformer_decoder,
@@ -159,6 +161,8 @@ class TransformerAEDGreedyInfer(AEDGreedyInfer, Typing):
             n_samples=n_samples,
             preserve_step_confidence=preserve_token_confidence,
             confidence_method_cfg=confidence_method_cfg,
+            compact_finished=compact_finished,
+            prompt_cache_size=prompt_cache_size,
         )
 
         self.preserve_alignments = preserve_alignments
@@ -266,6 +270,8 @@ class AEDGreedyInferConfig:
     preserve_token_confidence: bool = False
     confidence_method_cfg: Optional[ConfidenceMethodConfig] = field(default_factory=lambda: ConfidenceMethodConfig())
     n_samples: int = 1
+    compact_finished: bool = False  # drop finished sequences from the active batch during decoding
+    prompt_cache_size: int = 0  # number of distinct prompts with cached decoder states; 0 disables the cache
 
     def __post_init__(self):
         # OmegaConf.structured ensures that post_init check is always executed
@@ -196,9 +196,13 @@ def read_train_file(
 
 
 def tokenize_str(texts, tokenizer):
+    # each item is either [text] or (text, lang) for aggregate tokenizers
+    if len(texts) > 0 and len(texts[0]) > 1:
+        token_ids = tokenizer.batch_text_to_ids([text[0] for text in texts], [text[1] for text in texts])
+    else:
+        token_ids = tokenizer.batch_text_to_ids([text[0] for text in texts])
     tokenized_text = []
-    for text in texts:
-        tok_text = tokenizer.text_to_ids(*text)
+    for tok_text in token_ids:
         tok_text = [chr(token + DEFAULT_TOKEN_OFFSET) for token in tok_text]
         tokenized_text.append(tok_text)
     return tokenized_text
@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import mmap
 import re
 from collections import defaultdict
 from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import InitVar, dataclass, field
 from pathlib import Path
 from typing import NamedTuple, Optional, Union, cast
@@ -46,6 +49,14 @@ _BOS_ID = -1  # Begin-of-Sentence
 _EOS_ID = -2  # End-of-Sentence
 _UNK_ID = -3  # Unk
 _SPECIAL_SYMBOLS_MAP = {"<s>": _BOS_ID, "</s>": _EOS_ID, "<unk>": _UNK_ID}
+# special symbols are replaced with single characters from the end of the Unicode range for vectorized parsing
+_SPECIAL_SYMBOLS_CODEPOINTS = {"<s>": 0x10FFFD, "</s>": 0x10FFFE, "<unk>": 0x10FFFF}
+_ARPA_CHUNK_SIZE = 64 * 2**20  # bytes, chunk size for reading ARPA n-grams
+_MISSING_BACKOFF_PATTERN = re.compile(r"^([^\t\n]*\t[^\t\n]*)$", flags=re.MULTILINE)
+
+# Binary (memory-mappable) format for NGramGPULanguageModel
+_BINARY_MAGIC = b"NGPULM\x00\x01"
+_BINARY_ALIGNMENT = 64
 
 
 def _log_10_to_e(score):
@@ -53,6 +64,105 @@ def _log_10_to_e(score):
     return score / np.log10(np.e)
 
 
+def _parse_arpa_lines_np(
+    text: str, order: int, token_offset: int, pattern: re.Pattern
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a chunk of ARPA n-grams of the same order (vectorized).
+    Falls back to line-by-line parsing if the chunk does not follow the regular
+    "weight<TAB>symbols[<TAB>backoff]" layout with single-character space-separated symbols.
+
+    Args:
+        text: n-gram lines, separated by newline
+        order: order of n-grams
+        token_offset: offset for the tokens used for building ARPA LM
+        pattern: regular expression to split symbols (used for fallback)
+
+    Returns:
+        tuple of symbols [N, order], weights [N], backoffs [N]
+    """
+    text = text.strip("\n")
+    if not text:
+        return np.zeros([0, order], dtype=np.int32), np.zeros([0], dtype=np.float32), np.zeros([0], dtype=np.float32)
+    num_lines = text.count("\n") + 1
+    num_tabs = text.count("\t")
+    if num_tabs != 2 * num_lines:
+        # add zero backoffs for lines without backoff
+        text = _MISSING_BACKOFF_PATTERN.sub("\\1\t0", text)
+    fields = text.replace("\n", "\t").split("\t")
+    symbols = None
+    if len(fields) == 3 * num_lines:
+        symbols_str = "".join(fields[1::3])
+        for symbol, codepoint in _SPECIAL_SYMBOLS_CODEPOINTS.items():
+            symbols_str = symbols_str.replace(symbol, chr(codepoint))
+        codes = np.frombuffer(symbols_str.encode("utf-32-le"), dtype=np.uint32)
+        if codes.shape[0] == num_lines * (2 * order - 1):
+            codes = codes.reshape(num_lines, 2 * order - 1)
+            if (codes[:, 1::2] == ord(" ")).all():
+                codes = codes[:, ::2]
+                symbols = codes.astype(np.int64) - token_offset
+                for symbol, codepoint in _SPECIAL_SYMBOLS_CODEPOINTS.items():
+                    symbols[codes == codepoint] = _SPECIAL_SYMBOLS_MAP[symbol]
+                symbols = symbols.astype(np.int32)
+    if symbols is None:
+        # irregular chunk: slow path
+        ngrams = [
+            NGramGPULanguageModel._line_to_ngram(line=line, pattern=pattern, token_offset=token_offset)
+            for line in text.split("\n")
+        ]
+        symbols = np.array([ngram.symbols for ngram in ngrams], dtype=np.int32).reshape(-1, order)
+        weights = np.array([ngram.weight for ngram in ngrams], dtype=np.float32)
+        backoffs = np.array([ngram.backoff for ngram in ngrams], dtype=np.float32)
+        return symbols, weights, backoffs
+    weights = _log_10_to_e(np.array(fields[0::3], dtype=np.float64)).astype(np.float32)
+    backoffs = _log_10_to_e(np.array(fields[2::3], dtype=np.float64)).astype(np.float32)
+    return symbols, weights, backoffs
+
+
+def _read_arpa_section_np(
+    lm_path: str, start: int, end: int, order: int, token_offset: int, chunk_size: int = _ARPA_CHUNK_SIZE
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read n-grams of the given order from the ARPA file section (bytes from `start` to `end`) chunk by chunk.
+
+    Args:
+        lm_path: path to ARPA file
+        start: start of the section (byte offset), after the section header
+        end: end of the section (byte offset)
+        order: order of n-grams in the section
+        token_offset: offset for the tokens used for building ARPA LM
+        chunk_size: size of the chunk to read (in bytes)
+
+    Returns:
+        tuple of symbols [N, order], weights [N], backoffs [N]
+    """
+    special_words_pattern = '|'.join(re.escape(symbol) for symbol in _SPECIAL_SYMBOLS_MAP)
+    pattern = re.compile(rf'({special_words_pattern}|.)\s?')
+    parsed = []
+    with open(lm_path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        tail = b""
+        while remaining > 0 or tail:
+            data = f.read(min(chunk_size, remaining)) if remaining > 0 else b""
+            if remaining > 0 and not data:
+                raise ValueError(f"Unexpected end of ARPA file {lm_path}")
+            remaining -= len(data)
+            data = tail + data
+            if remaining > 0:
+                cut = data.rfind(b"\n") + 1
+                data, tail = data[:cut], data[cut:]
+            else:
+                tail = b""
+            parsed.append(
+                _parse_arpa_lines_np(
+                    text=data.decode("utf-8"), order=order, token_offset=token_offset, pattern=pattern
+                )
+            )
+    symbols, weights, backoffs = zip(*parsed)
+    return np.concatenate(symbols), np.concatenate(weights), np.concatenate(backoffs)
+
+
 class KenLMBatchedWrapper:
     """
     KenLM model wrapper for single element and batched queries (slow) for reference decoding and testing purposes.
@@ -482,6 +592,119 @@ class SuffixTreeStorage:
                 self.states[from_state]["arcs_start"] = arc_i
             self.states[from_state]["arcs_end"] = arc_i + 1
 
+    def _find_next_states_np(self, states: np.ndarray, labels: np.ndarray, arc_keys: np.ndarray) -> np.ndarray:
+        """
+        Vectorized transition search: find states reachable from `states` by `labels`.
+        Uses binary search over arcs, which are stored sorted by (from, ilabel).
+
+        Args:
+            states: batch of states
+            labels: batch of labels
+            arc_keys: sorted keys for existing arcs (from * vocab_size + ilabel)
+
+        Returns:
+            next states
+        """
+        if ((labels < 0) | (labels >= self.vocab_size)).any():
+            raise ValueError("Invalid symbol in n-gram context")
+        keys = states.astype(np.int64) * self.vocab_size + labels
+        arc_ids = np.searchsorted(arc_keys, keys)
+        arc_ids_clamped = np.minimum(arc_ids, arc_keys.shape[0] - 1)
+        if not (arc_keys[arc_ids_clamped] == keys).all():
+            raise ValueError("Invalid LM: context (or suffix) for some n-grams is not found")
+        return self.arcs["to"][arc_ids_clamped]
+
+    def _find_states_np(self, symbols: np.ndarray, bos_id: int, arc_keys: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of `_find_state`: find the states given batch of symbol sequences
+
+        Args:
+            symbols: sequences of symbols [N, L]
+            bos_id: ID of the Begin-of-Sentence symbol
+            arc_keys: sorted keys for existing arcs (from * vocab_size + ilabel)
+
+        Returns:
+            states for the last symbols
+        """
+        first_symbols = symbols[:, 0]
+        if ((first_symbols < 0) & (first_symbols != bos_id)).any():
+            raise ValueError("Invalid symbol at the start of n-gram context")
+        states = np.where(
+            first_symbols == bos_id, self.bos_state, self.arcs["to"][np.maximum(first_symbols, 0)]
+        ).astype(self.arcs["to"].dtype)
+        for i in range(1, symbols.shape[1]):
+            states = self._find_next_states_np(states=states, labels=symbols[:, i], arc_keys=arc_keys)
+        return states
+
+    def _add_ngrams_order_np(
+        self, symbols: np.ndarray, weights: np.ndarray, backoffs: np.ndarray, order: int, bos_id: int
+    ):
+        """
+        Add all ngrams for the order > 1 (vectorized); should be called after adding unigrams, using increasing order.
+        Instead of dictionary lookups, states are resolved by binary search over arcs sorted by (from, ilabel).
+
+        Args:
+            symbols: n-gram symbols [N, order]
+            weights: n-gram weights [N]
+            backoffs: n-gram backoff weights [N] (ignored for the maximum order)
+            order: order of n-grams
+            bos_id: ID of the Begin-of-Sentence symbol
+        """
+        assert order > 1 and symbols.shape[1] == order
+        arc_keys = self.arcs["from"][: self.num_arcs].astype(np.int64) * self.vocab_size
+        arc_keys += self.arcs["ilabel"][: self.num_arcs]
+        from_states = self._find_states_np(symbols[:, :-1], bos_id=bos_id, arc_keys=arc_keys)
+        ilabels = symbols[:, -1]
+
+        # final weights
+        is_eos = ilabels == _EOS_ID
+        self.states["final"][from_states[is_eos]] = weights[is_eos]
+        is_arc = ~is_eos
+        from_states, ilabels, weights, backoffs = (
+            from_states[is_arc],
+            ilabels[is_arc],
+            weights[is_arc],
+            backoffs[is_arc],
+        )
+        assert (ilabels >= 0).all() and (ilabels < self.vocab_size).all()
+
+        # sort arcs by (from, ilabel); equivalent to sorting n-grams by symbols
+        sort_indices = np.lexsort((ilabels, from_states))
+        from_states, ilabels = from_states[sort_indices], ilabels[sort_indices]
+        weights, backoffs = weights[sort_indices], backoffs[sort_indices]
+        # suffix state: state(symbols[1:]) is reachable by the last label from backoff of state(symbols[:-1])
+        backoff_states = self._find_next_states_np(
+            states=self.states["backoff_to"][from_states], labels=ilabels, arc_keys=arc_keys
+        )
+
+        num_new_arcs = from_states.shape[0]
+        arcs_slice = slice(self.num_arcs, self.num_arcs + num_new_arcs)
+        self.arcs["from"][arcs_slice] = from_states
+        self.arcs["ilabel"][arcs_slice] = ilabels
+        self.arcs["weight"][arcs_slice] = weights
+        if order == self.max_order:
+            self.arcs["to"][arcs_slice] = backoff_states
+        else:
+            next_states = np.arange(self.num_states, self.num_states + num_new_arcs)
+            self.arcs["to"][arcs_slice] = next_states
+            self.states["arcs_start"][next_states] = 0
+            self.states["arcs_end"][next_states] = 0
+            self.states["order"][next_states] = self.states["order"][from_states] + 1
+            self.states["backoff_to"][next_states] = backoff_states
+            self.states["backoff_w"][next_states] = backoffs
+            self.states["final"][next_states] = NEG_INF
+            self.num_states += num_new_arcs
+
+        # arcs boundaries for states
+        if num_new_arcs > 0:
+            is_first_arc = np.ones([num_new_arcs], dtype=bool)
+            is_first_arc[1:] = from_states[1:] != from_states[:-1]
+            arcs_start = np.nonzero(is_first_arc)[0] + self.num_arcs
+            arcs_end = np.append(arcs_start[1:], self.num_arcs + num_new_arcs)
+            self.states["arcs_start"][from_states[is_first_arc]] = arcs_start
+            self.states["arcs_end"][from_states[is_first_arc]] = arcs_end
+        self.num_arcs += num_new_arcs
+
     def sanity_check(self):
         """Sanity check for the model"""
         assert (self.arcs["ilabel"][: self.num_arcs] < self.vocab_size).all()
@@ -619,10 +842,10 @@ class NGramGPULanguageModel(ModelPT):
         token_offset: int = DEFAULT_TOKEN_OFFSET,
     ) -> "NGramGPULanguageModel":
         """
-        Constructor from ARPA or Nemo (`.nemo`) checkpoint.
+        Constructor from ARPA, Nemo (`.nemo`) checkpoint or binary (see `save_binary`) file.
 
         Args:
-            lm_path: path to .nemo checkpoint or ARPA (text) file
+            lm_path: path to .nemo checkpoint, binary file or ARPA (text) file
             vocab_size: model vocabulary size:
             normalize_unk: normalize unk probabilities (for tokens missing in LM) to make
                 all unigram probabilities sum to 1.0 (default: True)
@@ -636,6 +859,8 @@ class NGramGPULanguageModel(ModelPT):
             lm_path = Path(lm_path)
         if lm_path.suffix == ".nemo":
             return cls.from_nemo(lm_path=lm_path, vocab_size=vocab_size, use_triton=use_triton)
+        if cls._is_binary(lm_path):
+            return cls.from_binary(lm_path=lm_path, vocab_size=vocab_size, use_triton=use_triton)
         return cls.from_arpa(
             lm_path=lm_path,
             vocab_size=vocab_size,
@@ -652,6 +877,8 @@ class NGramGPULanguageModel(ModelPT):
         normalize_unk: bool = True,
         use_triton: bool | None = None,
         token_offset: int = DEFAULT_TOKEN_OFFSET,
+        fast_compile: bool = True,
+        num_workers: int = 1,
     ) -> "NGramGPULanguageModel":
         """
         Constructor from ARPA LM (text format).
@@ -665,11 +892,23 @@ class NGramGPULanguageModel(ModelPT):
                 None (default) means "auto" (used if available), True means forced mode
                 (will crash if Triton is unavailable)
             token_offset: offset for the tokens used for building ARPA LM
+            fast_compile: use vectorized ARPA reader and sort-based state resolution (default: True);
+                False means line-by-line reading with dictionary lookups (slow, reference implementation)
+            num_workers: number of processes to read n-grams of different orders in parallel (fast compile only)
 
         Returns:
             NGramGPULanguageModel instance
         """
         logging.info(f"{cls.__name__}: reading LM from {lm_path}")
+        if fast_compile:
+            suffix_tree_np = cls._arpa_to_suffix_tree_np(
+                lm_path=lm_path,
+                vocab_size=vocab_size,
+                normalize_unk=normalize_unk,
+                token_offset=token_offset,
+                num_workers=num_workers,
+            )
+            return NGramGPULanguageModel.from_suffix_tree(suffix_tree_np=suffix_tree_np, use_triton=use_triton)
         with open(lm_path, "r", encoding="utf-8") as f:
             order2cnt = cls._read_header(f=f)
             # init suffix tree storage
@@ -704,6 +943,214 @@ class NGramGPULanguageModel(ModelPT):
             suffix_tree_np.sanity_check()
         return NGramGPULanguageModel.from_suffix_tree(suffix_tree_np=suffix_tree_np, use_triton=use_triton)
 
+    @classmethod
+    def _arpa_to_suffix_tree_np(
+        cls,
+        lm_path: Path | str,
+        vocab_size: int,
+        normalize_unk: bool = True,
+        token_offset: int = DEFAULT_TOKEN_OFFSET,
+        num_workers: int = 1,
+    ) -> SuffixTreeStorage:
+        """
+        Fast compile of ARPA LM to suffix tree: n-grams are read in chunks with vectorized parsing
+        (in parallel across orders if `num_workers > 1`), states are resolved with binary search instead of
+        dictionary lookups.
+
+        Args:
+            lm_path: path to ARPA model (human-readable)
+            vocab_size: vocabulary size (existing vocabulary units in LM; should not include blank etc.)
+            normalize_unk: unk normalization to make all output probabilities sum to 1.0
+            token_offset: offset for the tokens used for building ARPA LM
+            num_workers: number of processes to read n-grams of different orders in parallel
+
+        Returns:
+            suffix tree storage
+        """
+        if vocab_size + token_offset > min(_SPECIAL_SYMBOLS_CODEPOINTS.values()):
+            raise ValueError(f"Vocabulary size {vocab_size} with offset {token_offset} is too large for ARPA LM")
+        with open(lm_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                order2cnt, sections = cls._find_arpa_sections(mm)
+        max_order = max(order2cnt.keys())
+        total_ngrams = sum(order2cnt.values())
+        max_states = 2 + vocab_size + sum(order2cnt[o] for o in range(2, max_order))  # without last!
+        suffix_tree_np = SuffixTreeStorage(
+            num_states_max=max_states,
+            num_states=0,
+            num_arcs=0,
+            num_arcs_max=total_ngrams + vocab_size * 2 + 1,
+            normalize_unk=normalize_unk,
+            vocab_size=vocab_size,
+            max_order=max_order,
+        )
+
+        read_kwargs = [
+            dict(lm_path=str(lm_path), start=start, end=end, order=order, token_offset=token_offset)
+            for order, (start, end) in sorted(sections.items())
+        ]
+        if num_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(num_workers, max_order)) as executor:
+                futures = [executor.submit(_read_arpa_section_np, **kwargs) for kwargs in read_kwargs]
+                # orders are added sequentially, while the next orders are still being read
+                for kwargs, future in zip(read_kwargs, futures):
+                    cls._add_ngrams_np(suffix_tree_np, kwargs["order"], *future.result(), order2cnt=order2cnt)
+        else:
+            for kwargs in read_kwargs:
+                cls._add_ngrams_np(
+                    suffix_tree_np, kwargs["order"], *_read_arpa_section_np(**kwargs), order2cnt=order2cnt
+                )
+        suffix_tree_np.sanity_check()
+        return suffix_tree_np
+
+    @staticmethod
+    def _add_ngrams_np(
+        suffix_tree_np: SuffixTreeStorage,
+        order: int,
+        symbols: np.ndarray,
+        weights: np.ndarray,
+        backoffs: np.ndarray,
+        order2cnt: dict[int, int],
+    ):
+        """Helper to add parsed n-grams of the given order to the suffix tree"""
+        if symbols.shape[0] != order2cnt[order]:
+            raise ValueError(f"Expected {order2cnt[order]} n-grams of order {order}, found {symbols.shape[0]}")
+        if order == 1:
+            suffix_tree_np._start_adding_ngrams_for_order(order=order, max_ngrams=order2cnt[order])
+            suffix_tree_np._ngrams["symbols"]["0"] = symbols[:, 0]
+            suffix_tree_np._ngrams["weight"] = weights
+            suffix_tree_np._ngrams["backoff"] = backoffs
+            suffix_tree_np._ngrams_cnt = order2cnt[order]
+            suffix_tree_np._end_adding_ngrams_for_order(order=order, bos_id=_BOS_ID, unk_id=_UNK_ID)
+        else:
+            suffix_tree_np._add_ngrams_order_np(
+                symbols=symbols, weights=weights, backoffs=backoffs, order=order, bos_id=_BOS_ID
+            )
+        logging.info(f"Processed {order2cnt[order]} n-grams of order {order}")
+
+    @classmethod
+    def _find_arpa_sections(cls, mm: mmap.mmap) -> tuple[dict[int, int], dict[int, tuple[int, int]]]:
+        """
+        Parse ARPA header and find byte ranges of n-gram sections (without reading them)
+
+        Args:
+            mm: memory-mapped ARPA file
+
+        Returns:
+            tuple: dictionary with order -> number of ngrams, dictionary with order -> (start, end) of the section
+        """
+        data_start = mm.find(b"\\data\\")
+        if data_start < 0:
+            raise ValueError("Invalid ARPA file: \\data\\ section not found")
+        header_end = mm.find(b"\n\n", data_start)
+        order2cnt: dict[int, int] = defaultdict(int)
+        for line in mm[data_start:header_end].decode("utf-8").splitlines()[1:]:
+            ngram_order, cnt = line.strip().split("=")
+            order2cnt[int(ngram_order.split()[-1])] = int(cnt)
+
+        sections: dict[int, tuple[int, int]] = dict()
+        position = header_end
+        for order in sorted(order2cnt.keys()):
+            section_header = f"\\{order}-grams:".encode("utf-8")
+            section_start = mm.find(section_header, position)
+            if section_start < 0:
+                raise ValueError(f"Invalid ARPA file: section {section_header.decode('utf-8')} not found")
+            section_start += len(section_header)
+            section_end = mm.find(b"\n\\", section_start)
+            if section_end < 0:
+                raise ValueError("Invalid ARPA file: \\end\\ not found")
+            sections[order] = (section_start, section_end)
+            position = section_end
+        return order2cnt, sections
+
+    def save_binary(self, lm_path: Path | str):
+        """
+        Save the model in binary format, which can be memory-mapped by `from_binary` (fast loading without unpickling).
+        Format: magic bytes, header size (uint64), JSON header (config, arrays layout), aligned raw arrays.
+
+        Args:
+            lm_path: path to the output file
+        """
+        self._resolve_final()
+        config = dict(
+            num_states=self.num_states,
+            num_arcs=self.num_arcs,
+            max_order=self.max_order,
+            vocab_size=self.vocab_size,
+            separate_bos_state=self.bos_state != self.START_STATE,
+        )
+        arrays = {name: tensor.detach().cpu().numpy() for name, tensor in self.state_dict().items()}
+        arrays_layout = dict()
+        offset = 0
+        for name, array in arrays.items():
+            arrays_layout[name] = dict(offset=offset, dtype=array.dtype.str, shape=list(array.shape))
+            offset += -(-array.nbytes // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+        header = json.dumps(dict(config=config, arrays=arrays_layout)).encode("utf-8")
+        data_start = len(_BINARY_MAGIC) + 8 + len(header)
+        data_start = -(-data_start // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+        with open(lm_path, "wb") as f:
+            f.write(_BINARY_MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + arrays_layout[name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(data_start + offset)
+
+    @classmethod
+    def _is_binary(cls, lm_path: Path | str) -> bool:
+        """Check if the file is in binary format (see `save_binary`)"""
+        with open(lm_path, "rb") as f:
+            return f.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC
+
+    @classmethod
+    def from_binary(
+        cls,
+        lm_path: Path | str,
+        vocab_size: int,
+        use_triton: bool | None = None,
+    ) -> "NGramGPULanguageModel":
+        """
+        Constructor from binary file (see `save_binary`). Arrays are memory-mapped (copy-on-write),
+        so the loading is fast and the data is read lazily.
+
+        Args:
+            lm_path: path to binary file
+            vocab_size: model vocabulary size
+            use_triton: allow using Triton implementation; None (default) means "auto" (used if available)
+
+        Returns:
+            NGramGPULanguageModel instance
+        """
+        with open(lm_path, "rb") as f:
+            if f.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+                raise ValueError(f"File {lm_path} is not a binary N-Gram LM")
+            header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_size).decode("utf-8"))
+        data_start = len(_BINARY_MAGIC) + 8 + header_size
+        data_start = -(-data_start // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+        assert header["config"]["vocab_size"] == vocab_size
+
+        model = NGramGPULanguageModel(
+            OmegaConf.structured(NGramLMConfig(**header["config"], use_triton=use_triton)),
+        )
+        parameters = dict(model.named_parameters())
+        for name, layout in header["arrays"].items():
+            array = np.memmap(
+                lm_path,
+                dtype=np.dtype(layout["dtype"]),
+                mode="c",
+                offset=data_start + layout["offset"],
+                shape=tuple(layout["shape"]),
+            )
+            tensor = torch.from_numpy(array)
+            if name in parameters:
+                setattr(model, name, nn.Parameter(tensor, requires_grad=parameters[name].requires_grad))
+            else:
+                setattr(model, name, tensor)
+        model._final_resolved = True
+        return model
+
     @classmethod
     def dummy_unigram_lm(
         cls,
@@ -1043,6 +1490,84 @@ class NGramGPULanguageModel(ModelPT):
             )
         return out_scores, out_states
 
+    def advance_sparse(
+        self, states: torch.Tensor, labels: torch.Tensor, eos_id: Optional[int] = None
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Advance `states` [B] only for the given candidate `labels` [B, K] (e.g., top-k acoustic tokens):
+        return scores [B, K] and next states [B, K].
+        The labels are searched in the sorted arcs of each state with binary search,
+        the complexity is O(B * K * order * log(V)) instead of O(B * V * order) for the full vocab `advance`.
+
+        Args:
+            states: batch of states
+            labels: batch of candidate labels for each state
+            eos_id: if not None, for eos symbol use final state weight
+
+        Returns:
+            tuple with scores and next states for the candidate labels
+        """
+        scores, next_states = self._advance_sparse_pytorch(states=states, labels=labels)
+        if eos_id is not None:
+            is_eos = labels == eos_id
+            scores = torch.where(is_eos, self.get_final(states=states).unsqueeze(-1), scores)
+            next_states = torch.where(is_eos, states.unsqueeze(-1), next_states)
+        return scores, next_states
+
+    def _advance_sparse_pytorch(self, states: torch.Tensor, labels: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Advance `states` [B] for candidate `labels` [B, K]: return scores [B, K] and next states [B, K].
+        PyTorch implementation (differentiable).
+
+        Args:
+            states: batch of states
+            labels: batch of candidate labels for each state
+
+        Returns:
+            tuple of scores and next states
+        """
+        device = states.device
+        states_dtype = states.dtype
+        current_states = states.unsqueeze(-1).expand_as(labels).clone()
+        labels = labels.to(self.ilabels.dtype)
+
+        # init output tensors
+        out_scores = torch.zeros(labels.shape, device=device, dtype=self.arcs_weights.dtype)
+        out_states = torch.full(labels.shape, fill_value=-1, dtype=states_dtype, device=device)
+
+        # backoff weight accumulator
+        accumulated_backoff = torch.zeros(labels.shape, device=device, dtype=self.arcs_weights.dtype)
+        # loop condition
+        not_found = torch.full(labels.shape, fill_value=True, dtype=torch.bool, device=device)
+        # number of arcs for each state cannot be larger than vocab size
+        num_search_steps = self.vocab_size.bit_length()
+        max_arc_index = self.num_arcs_extended - 1
+
+        num_iterations = 0
+        while not_found.any():
+            assert num_iterations <= self.max_order, "Infinite loop in LM advance"
+            num_iterations += 1
+            # get arc boundaries
+            start, end = self.start_end_arcs[current_states].to(torch.long).unbind(dim=-1)
+            # binary search: find the first arc with ilabel >= label (arcs are sorted by ilabel for each state)
+            low, high = start, end
+            for _ in range(num_search_steps):
+                middle = (low + high) // 2
+                in_range = low < high
+                go_right = self.ilabels[middle.clamp(max=max_arc_index)] < labels
+                low = torch.where(in_range & go_right, middle + 1, low)
+                high = torch.where(in_range & ~go_right, middle, high)
+            arc_indices = low.clamp(max=max_arc_index)
+            found = not_found & (low < end) & (self.ilabels[arc_indices] == labels)
+            # fill out_scores and out_states with new values where state is found
+            out_scores = torch.where(found, accumulated_backoff + self.arcs_weights[arc_indices], out_scores)
+            out_states = torch.where(found, self.to_states[arc_indices].to(states_dtype), out_states)
+            not_found &= ~found
+            # process backoffs; start state contains all labels, so the loop will end
+            accumulated_backoff = accumulated_backoff + self.backoff_weights[current_states] * not_found
+            current_states = torch.where(not_found, self.backoff_to_states[current_states], current_states)
+        return out_scores, out_states
+
     @triton_required
     def _advance_triton(self, states: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
         """
@@ -400,14 +400,16 @@ class ModifiedALSDBatchedRNNTComputer(WithOptionalCudaGraphs, ConfidenceMethodMi
         active_mask = time_indices <= last_timesteps
 
         # setup N-gram LM if available
+        use_sparse_lm = self._use_sparse_lm(device)
         if self.ngram_lm_batch is not None:
             self.ngram_lm_batch.to(device)
 
             batch_lm_states = self.ngram_lm_batch.get_init_states(batch_size=batch_size * self.beam_size, bos=True)
-            lm_scores, batch_lm_states_candidates = self.ngram_lm_batch.advance(
-                states=batch_lm_states
-            )  # vocab_size_no_blank
-            lm_scores = lm_scores.to(dtype=float_dtype).view(batch_size, self.beam_size, -1) * self.ngram_lm_alpha
+            if not use_sparse_lm:
+                lm_scores, batch_lm_states_candidates = self.ngram_lm_batch.advance(
+                    states=batch_lm_states
+                )  # vocab_size_no_blank
+                lm_scores = lm_scores.to(dtype=float_dtype).view(batch_size, self.beam_size, -1) * self.ngram_lm_alpha
 
         decoder_state = self.decoder.initialize_state(
             torch.empty(
@@ -440,7 +442,9 @@ class ModifiedALSDBatchedRNNTComputer(WithOptionalCudaGraphs, ConfidenceMethodMi
                 batch_size, self.beam_size, -1
             )  # [(B x Beam), V]
 
-            if self.ngram_lm_batch is not None:
+            if use_sparse_lm:
+                log_probs_top_k, labels_top_k, batch_lm_states_top_k = self.topk_sparse_lm(batch_lm_states, log_probs)
+            elif self.ngram_lm_batch is not None:
                 log_probs_top_k, labels_top_k = self.topk_lm(lm_scores, log_probs)
             else:
                 log_probs_top_k, labels_top_k = torch.topk(
@@ -543,7 +547,16 @@ class ModifiedALSDBatchedRNNTComputer(WithOptionalCudaGraphs, ConfidenceMethodMi
                 src_states=prev_decoder_state, dst_states=decoder_state, mask=preserve_state.view(-1)
             )
 
-            if self.ngram_lm_batch is not None:
+            if use_sparse_lm:
+                # batch_lm_states_top_k: [batch_size x beam_size x beam_size], states for top-k labels
+                batch_lm_states_prev = torch.gather(
+                    batch_lm_states.view(batch_size, self.beam_size), dim=1, index=hyps_indices
+                )
+                batch_lm_states = torch.gather(
+                    batch_lm_states_top_k.view(batch_size, -1), dim=-1, index=hyps_candidates_indices
+                )
+                batch_lm_states = torch.where(preserve_state, batch_lm_states_prev, batch_lm_states).view(-1)
+            elif self.ngram_lm_batch is not None:
                 # batch_lm_states: size: [(batch_size x beam_size)]
                 # batch_lm_states_candidates: [(batch_size x beam_size) x V (without blank)]
                 batch_lm_states_candidates = torch.gather(
@@ -575,6 +588,17 @@ class ModifiedALSDBatchedRNNTComputer(WithOptionalCudaGraphs, ConfidenceMethodMi
 
         return batched_hyps
 
+    def _use_sparse_lm(self, device: torch.device) -> bool:
+        """
+        With early pruning only top-k labels are scored with LM:
+        use sparse LM queries instead of full vocabulary if the Triton kernel is not used (e.g., on CPU)
+        """
+        return (
+            self.ngram_lm_batch is not None
+            and self.pruning_mode is PruningMode.EARLY
+            and not (self.ngram_lm_batch.use_triton and device.type == "cuda")
+        )
+
     def topk_lm(self, lm_scores, log_probs):
         """
         Computes the top-k log probabilities and corresponding labels for hypotheses,
@@ -606,30 +630,93 @@ class ModifiedALSDBatchedRNNTComputer(WithOptionalCudaGraphs, ConfidenceMethodMi
                     log_probs, self.beam_size, dim=-1, largest=True, sorted=True
                 )
 
-            case PruningMode.EARLY, BlankLMScoreMode.NO_SCORE:
+            case PruningMode.EARLY, _:
                 log_probs_top_k, labels_top_k = torch.topk(
                     log_probs, self.beam_size, dim=-1, largest=True, sorted=True
                 )
                 masked_labels = torch.where(labels_top_k == self._blank_index, 0, labels_top_k)
-                log_probs_top_k = torch.where(
+                log_probs_top_k = self._fuse_lm_top_k(
+                    log_probs=log_probs,
+                    log_probs_top_k=log_probs_top_k,
+                    labels_top_k=labels_top_k,
+                    lm_scores_top_k=torch.gather(lm_scores, dim=-1, index=masked_labels),
+                )
+
+            case _:
+                raise NotImplementedError(
+                    f"Unsupported pruning mode {self.pruning_mode} or blank LM score mode {self.blank_lm_score_mode}"
+                )
+
+        return log_probs_top_k, labels_top_k
+
+    def topk_sparse_lm(
+        self, batch_lm_states: torch.Tensor, log_probs: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Computes the top-k log probabilities and corresponding labels for hypotheses with early pruning,
+        querying the language model (LM) only for the top-k labels (instead of the full vocabulary).
+
+        Args:
+            batch_lm_states (torch.Tensor): LM states for hypotheses, shape [batch_size x beam_size].
+            log_probs (torch.Tensor): Log probabilities from the joint network, shape [batch_size, beam_size, vocab_size].
+
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+                - log_probs_top_k: Top-k log probabilities, shape [batch_size, beam_size, beam_size].
+                - labels_top_k: Corresponding top-k labels, shape [batch_size, beam_size, beam_size].
+                - lm_states_top_k: Next LM states for the top-k labels, shape [batch_size, beam_size, beam_size].
+        """
+        assert self.pruning_mode is PruningMode.EARLY
+        batch_size = log_probs.shape[0]
+        log_probs_top_k, labels_top_k = torch.topk(log_probs, self.beam_size, dim=-1, largest=True, sorted=True)
+        masked_labels = torch.where(labels_top_k == self._blank_index, 0, labels_top_k)
+        lm_scores_top_k, lm_states_top_k = self.ngram_lm_batch.advance_sparse(
+            states=batch_lm_states, labels=masked_labels.view(batch_size * self.beam_size, -1)
+        )
+        lm_scores_top_k = lm_scores_top_k.to(dtype=log_probs.dtype).view_as(log_probs_top_k) * self.ngram_lm_alpha
+        log_probs_top_k = self._fuse_lm_top_k(
+            log_probs=log_probs,
+            log_probs_top_k=log_probs_top_k,
+            labels_top_k=labels_top_k,
+            lm_scores_top_k=lm_scores_top_k,
+        )
+        return log_probs_top_k, labels_top_k, lm_states_top_k.view_as(labels_top_k)
+
+    def _fuse_lm_top_k(
+        self,
+        log_probs: torch.Tensor,
+        log_probs_top_k: torch.Tensor,
+        labels_top_k: torch.Tensor,
+        lm_scores_top_k: torch.Tensor,
+    ) -> torch.Tensor:
+        """
+        Fuses (weighted) LM scores with top-k log probabilities (early pruning) according to the blank scoring mode.
+
+        Args:
+            log_probs: log probabilities from the joint network, shape [batch_size, beam_size, vocab_size]
+            log_probs_top_k: top-k log probabilities, shape [batch_size, beam_size, beam_size]
+            labels_top_k: top-k labels, shape [batch_size, beam_size, beam_size]
+            lm_scores_top_k: weighted LM scores for top-k labels, shape [batch_size, beam_size, beam_size]
+
+        Returns:
+            top-k log probabilities fused with LM scores
+        """
+        match self.blank_lm_score_mode:
+            case BlankLMScoreMode.NO_SCORE:
+                return torch.where(
                     labels_top_k == self._blank_index,
                     log_probs_top_k,
-                    log_probs_top_k + torch.gather(lm_scores, dim=-1, index=masked_labels),
+                    log_probs_top_k + lm_scores_top_k,
                 )
 
-            case PruningMode.EARLY, BlankLMScoreMode.LM_WEIGHTED_FULL:
-                log_probs_top_k, labels_top_k = log_probs.topk(self.beam_size, dim=-1, largest=True, sorted=True)
-
+            case BlankLMScoreMode.LM_WEIGHTED_FULL:
                 blank_logprob = log_probs[..., -1]
                 non_blank_logprob = torch.log1p(-torch.clamp(torch.exp(blank_logprob), max=1.0 - 1e-6))
 
-                masked_labels = torch.where(labels_top_k == self._blank_index, 0, labels_top_k)
-                log_probs_top_k = torch.where(
+                return torch.where(
                     labels_top_k == self._blank_index,
                     log_probs_top_k * (1 + self.ngram_lm_alpha),
-                    log_probs_top_k
-                    + non_blank_logprob.unsqueeze(-1) * self.ngram_lm_alpha
-                    + torch.gather(lm_scores, dim=-1, index=masked_labels),
+                    log_probs_top_k + non_blank_logprob.unsqueeze(-1) * self.ngram_lm_alpha + lm_scores_top_k,
                 )
 
             case _:
@@ -637,8 +724,6 @@ class ModifiedALSDBatchedRNNTComputer(WithOptionalCudaGraphs, ConfidenceMethodMi
                     f"Unsupported pruning mode {self.pruning_mode} or blank LM score mode {self.blank_lm_score_mode}"
                 )
 
-        return log_probs_top_k, labels_top_k
-
     def modified_alsd_cuda_graphs(
         self,
         encoder_output: torch.Tensor,
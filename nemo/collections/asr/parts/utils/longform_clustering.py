@@ -25,7 +25,7 @@ from nemo.collections.asr.parts.utils.online_clustering import get_merge_quantit
 
 
 class LongFormSpeakerClustering(torch.nn.Module):
-    def __init__(self, cuda: bool = False):
+    def __init__(self, cuda: bool = False, eigen_solver: str = 'default'):
         """
         Initializes a speaker clustering class tailored for long-form audio, leveraging methods from the `SpeakerClustering` class.
         The clustering algorithm for long-form content is executed via the `forward_infer` function (not shown here). Input embedding 
@@ -38,9 +38,11 @@ class LongFormSpeakerClustering(torch.nn.Module):
         Args:
             cuda (bool):
                 Flag indicating whether CUDA is available for computation.
+            eigen_solver (str):
+                The eigen analysis method for the p-value search in NME-SC: 'default', 'batched' or 'lanczos'.
         """
         super().__init__()
-        self.speaker_clustering = SpeakerClustering(cuda=cuda)
+        self.speaker_clustering = SpeakerClustering(cuda=cuda, eigen_solver=eigen_solver)
         self.embeddings_in_scales: List[torch.Tensor] = [torch.tensor([0])]
         self.timestamps_in_scales: List[torch.Tensor] = [torch.tensor([0])]
         self.cuda = cuda
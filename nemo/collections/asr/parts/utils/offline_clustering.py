@@ -353,6 +353,32 @@ def getAffinityGraphMat(affinity_mat_raw: torch.Tensor, p_value: int) -> torch.T
     return symm_affinity_mat
 
 
+def getAffinityGraphMatBatch(affinity_mat_raw: torch.Tensor, p_value_list: torch.Tensor) -> torch.Tensor:
+    """
+    Calculate the symmetrized binarized graph matrices for multiple p-values at once.
+    The result for each p-value is identical to `getAffinityGraphMat(affinity_mat_raw, p_value)`.
+
+    Args:
+        affinity_mat_raw (Tensor):
+            A square matrix (tensor) containing normalized cosine similarity values
+        p_value_list (Tensor):
+            A tensor containing P p-values (the number of top values selected from each row).
+
+    Returns:
+        symm_affinity_mats (Tensor):
+            A stack of P symmetrized binarized affinity matrices with shape (P, N, N).
+    """
+    N = affinity_mat_raw.shape[0]
+    sorted_matrix = torch.argsort(affinity_mat_raw, dim=1, descending=True)
+    # ranks[i, j] is the position of the j-th column in the descending order of the i-th row
+    ranks = torch.empty_like(sorted_matrix)
+    ranks.scatter_(1, sorted_matrix, torch.arange(N, device=affinity_mat_raw.device).repeat(N, 1))
+    p_values = p_value_list.to(affinity_mat_raw.device).view(-1, 1, 1)
+    X = (ranks.unsqueeze(0) < p_values).float()
+    symm_affinity_mats = 0.5 * (X + X.transpose(1, 2))
+    return symm_affinity_mats
+
+
 def getMinimumConnection(
     mat: torch.Tensor, max_N: torch.Tensor, n_list: torch.Tensor, device: torch.device
 ) -> Tuple[torch.Tensor, torch.Tensor]:
@@ -568,6 +594,99 @@ def eigValueSh(laplacian: torch.Tensor, cuda: bool, device: torch.device) -> tor
     return lambdas
 
 
+def getLaplacianBatch(X: torch.Tensor) -> torch.Tensor:
+    """
+    Calculate laplacian matrices from a stack of affinity matrices X with shape (P, N, N).
+    """
+    X = X.clone()
+    torch.diagonal(X, dim1=1, dim2=2).zero_()
+    D = torch.sum(torch.abs(X), dim=2)
+    L = torch.diag_embed(D) - X
+    return L
+
+
+def eigValueShBatch(laplacians: torch.Tensor, cuda: bool, device: torch.device) -> torch.Tensor:
+    """
+    Calculate only eigenvalues for a stack of Laplacian matrices with a single batched decomposition.
+    Eigenvalues are returned in ascending order.
+    """
+    if cuda:
+        if device is None:
+            device = torch.cuda.current_device()
+        laplacians = laplacians.float().to(device)
+    else:
+        laplacians = laplacians.float().to(torch.device('cpu'))
+    return eigvalsh(laplacians)
+
+
+def getLanczosStartBlock(n: int, block_size: int, device: torch.device) -> torch.Tensor:
+    """
+    Deterministic orthonormal starting block with shape (n, block_size) for block Lanczos iterations.
+    A constant offset is added so that the block is not orthogonal to the all-ones vector, which is
+    the eigenvector of the zero eigenvalue of every Laplacian matrix.
+    """
+    golden_angle = 2.399963229728653
+    idx = torch.arange(n, device=device).float().unsqueeze(1)
+    seeds = torch.arange(block_size, device=device).float().unsqueeze(0) + 1.0
+    block = 1.0 + torch.cos(idx * golden_angle * seeds + 0.5)
+    return torch.linalg.qr(block)[0]
+
+
+def lanczosEigValues(
+    mats: torch.Tensor, num_iters: int, block_size: int, cuda: bool, device: torch.device
+) -> torch.Tensor:
+    """
+    Approximate the eigenvalues of a stack of symmetric matrices with shape (P, N, N) with batched block Lanczos
+    iterations (with full reorthogonalization). The Ritz values converge to the extreme eigenvalues first,
+    so a small Krylov subspace is enough for the smallest eigenvalues used by NME analysis and for the largest
+    eigenvalue used for the normalization. A block of starting vectors is used so that the (near) degenerate
+    eigenvalues close to zero, one for each well-separated speaker cluster, are all captured.
+    The cost is O(P * N^2 * num_iters) instead of O(P * N^3) for the full eigendecomposition.
+
+    Args:
+        mats (Tensor):
+            A stack of symmetric matrices with shape (P, N, N)
+        num_iters (int):
+            The dimension of the Krylov subspace (the number of returned Ritz values), capped at N.
+        block_size (int):
+            The number of starting vectors. Should be larger than the number of speakers to be detected.
+        cuda (bool):
+            Use cuda for the computation if cuda=True.
+        device (torch.device):
+            Torch device variable
+
+    Returns:
+        ritz_values (Tensor):
+            Ritz values in ascending order with shape (P, min(num_iters, N)).
+    """
+    if cuda:
+        if device is None:
+            device = torch.cuda.current_device()
+        mats = mats.float().to(device)
+    else:
+        mats = mats.float().to(torch.device('cpu'))
+    batch_size, n = mats.shape[0], mats.shape[1]
+    num_iters = min(num_iters, n)
+    block_size = max(1, min(block_size, num_iters))
+    block = getLanczosStartBlock(n, block_size, mats.device).unsqueeze(0).repeat(batch_size, 1, 1)
+    blocks: List[torch.Tensor] = [block]
+    basis_size = block_size
+    while basis_size < num_iters:
+        basis = torch.cat(blocks, dim=2)
+        block = torch.bmm(mats, blocks[-1])[:, :, : num_iters - basis_size]
+        # full reorthogonalization against all the previous Lanczos vectors (twice for numerical stability)
+        for _ in range(2):
+            block = block - torch.bmm(basis, torch.bmm(basis.transpose(1, 2), block))
+        blocks.append(torch.linalg.qr(block)[0])
+        basis_size += block.shape[2]
+    # Rayleigh-Ritz projection onto an orthonormal basis of the Krylov subspace. The Ritz values are interlaced
+    # with the true eigenvalues even if the Krylov subspace becomes (numerically) rank deficient.
+    basis = torch.linalg.qr(torch.cat(blocks, dim=2))[0]
+    T = torch.bmm(basis.transpose(1, 2), torch.bmm(mats, basis))
+    T = 0.5 * (T + T.transpose(1, 2))
+    return eigvalsh(T)
+
+
 def getLamdaGaplist(lambdas: torch.Tensor) -> torch.Tensor:
     """
     Calculate the gaps between lambda values.
@@ -910,6 +1029,8 @@ class NMESC:
         parallelism: bool = True,
         cuda: bool = False,
         device: torch.device = torch.device('cpu'),
+        eigen_solver: str = 'default',
+        lanczos_num_iters: int = 64,
     ):
         """
         Args:
@@ -948,7 +1069,19 @@ class NMESC:
                 Use cuda for Eigen decomposition if cuda=True.
             device (torch.device):
                 Torch device variable
+            eigen_solver (str):
+                The method used for the eigen analysis of the p-value candidates.
+                - 'default': decompose the Laplacian matrix of each p-value separately.
+                - 'batched': build the binarized affinity matrices for all p-values as one stacked tensor
+                    and decompose them with a single batched `eigvalsh` call. Gives the same results as 'default'.
+                - 'lanczos': same as 'batched', but approximates the eigenvalues with batched block Lanczos
+                    iterations, which is considerably faster for large matrices.
+            lanczos_num_iters (int):
+                The dimension of the Krylov subspace for `eigen_solver='lanczos'`.
+                Should be well above `max_num_speakers`.
         """
+        if eigen_solver not in ['default', 'batched', 'lanczos']:
+            raise ValueError(f"Unknown eigen_solver: {eigen_solver}")
         self.max_num_speakers: int = max_num_speakers
         self.max_rp_threshold: float = max_rp_threshold
         self.use_subsampling_for_nme: bool = use_subsampling_for_nme
@@ -965,6 +1098,8 @@ class NMESC:
         self.device: torch.device = device
         self.maj_vote_spk_count: bool = maj_vote_spk_count
         self.parallelism: bool = parallelism
+        self.eigen_solver: str = eigen_solver
+        self.lanczos_num_iters: int = lanczos_num_iters
 
     def forward(self) -> Tuple[torch.Tensor, torch.Tensor]:
         """
@@ -989,7 +1124,12 @@ class NMESC:
         eig_ratio_list = torch.zeros(p_volume,)
         est_num_of_spk_list = torch.zeros(p_volume,)
 
-        if self.parallelism:
+        if self.eigen_solver != 'default':
+            batch_results = self.getEigRatioBatch(self.p_value_list)
+            for p_idx in range(p_volume):
+                results.append(batch_results[p_idx])
+
+        elif self.parallelism:
             futures: List[torch.jit.Future[torch.Tensor]] = []
             for p_idx, p_value in enumerate(self.p_value_list):
                 futures.append(torch.jit.fork(self.getEigRatio, p_value))
@@ -1080,6 +1220,46 @@ class NMESC:
         g_p = (p_neighbors / self.mat.shape[0]) / (max_eig_gap + self.eps)
         return torch.stack([g_p, est_num_of_spk])
 
+    def getEigRatioBatch(self, p_value_list: torch.Tensor) -> torch.Tensor:
+        """
+        Calculate g_p values and the estimated numbers of speakers for all the given p-values at once.
+        The binarized affinity matrices are built as one stacked tensor and their Laplacian matrices are
+        decomposed in a batched manner (see `eigen_solver`), in chunks limited by the memory footprint.
+
+        Args:
+            p_value_list (Tensor):
+                A tensor containing P p-values.
+
+        Returns:
+            eig_ratios (Tensor):
+                A tensor with shape (P, 2) containing g_p and the estimated number of speakers for each p-value.
+        """
+        N = self.mat.shape[0]
+        # limit the stacked affinity matrices to about 2^27 elements (512 MB in float32)
+        chunk_size = max(1, 134217728 // (N * N))
+        outputs: List[torch.Tensor] = []
+        for start in range(0, p_value_list.shape[0], chunk_size):
+            p_values = p_value_list[start : start + chunk_size]
+            laplacians = getLaplacianBatch(getAffinityGraphMatBatch(self.mat, p_values))
+            if self.eigen_solver == 'lanczos':
+                lambdas = lanczosEigValues(
+                    laplacians,
+                    num_iters=self.lanczos_num_iters,
+                    block_size=self.max_num_speakers + 2,
+                    cuda=self.cuda,
+                    device=self.device,
+                )
+            else:
+                lambdas = eigValueShBatch(laplacians, cuda=self.cuda, device=self.device)
+            lambda_gaps = lambdas[:, 1:] - lambdas[:, :-1]
+            lambda_gaps = lambda_gaps[:, : min(self.max_num_speakers, lambda_gaps.shape[1])]
+            max_eig_gaps, max_keys = torch.max(lambda_gaps, dim=1)
+            est_num_of_spk = max_keys + 1
+            max_eig_gaps = max_eig_gaps / (torch.max(lambdas, dim=1)[0] + self.eps)
+            g_p = (p_values.to(max_eig_gaps.device) / N) / (max_eig_gaps + self.eps)
+            outputs.append(torch.stack([g_p, est_num_of_spk.to(g_p.dtype)], dim=1).cpu())
+        return torch.cat(outputs, dim=0)
+
     def getPvalueList(self) -> torch.Tensor:
         """
         Generates a p-value (p_neighbour) list for searching. p_value_list must include 2 (min_p_value)
@@ -1130,6 +1310,7 @@ class SpeakerClustering(torch.nn.Module):
         maj_vote_spk_count: bool = False,
         parallelism: bool = False,
         cuda: bool = False,
+        eigen_solver: str = 'default',
     ):
         """
         Clustering method for speaker diarization based on cosine similarity.
@@ -1152,6 +1333,9 @@ class SpeakerClustering(torch.nn.Module):
                 Use dynamic parallelism feature in torch.jit compiler to accelerate the p-value search.
             cuda (bool):
                 Boolean variable for toggling cuda availability.
+            eigen_solver (str):
+                The eigen analysis method for the p-value search in NME-SC: 'default', 'batched' or 'lanczos'.
+                See `NMESC` for details.
         """
         super().__init__()
         self.min_samples_for_nmesc: int = min_samples_for_nmesc
@@ -1160,6 +1344,7 @@ class SpeakerClustering(torch.nn.Module):
         self.parallelism: bool = parallelism
         self.cuda: bool = cuda
         self.maj_vote_spk_count: bool = maj_vote_spk_count
+        self.eigen_solver: str = eigen_solver
         self.embeddings_in_scales: List[torch.Tensor] = [torch.Tensor(0)]
         self.timestamps_in_scales: List[torch.Tensor] = [torch.Tensor(0)]
         self.device = torch.device("cuda") if self.cuda else torch.device("cpu")
@@ -1220,6 +1405,7 @@ class SpeakerClustering(torch.nn.Module):
             parallelism=self.parallelism,
             cuda=self.cuda,
             device=self.device,
+            eigen_solver=self.eigen_solver,
         )
         # If there are less than `min_samples_for_nmesc` segments, est_num_of_spk is 1.
         if mat.shape[0] > self.min_samples_for_nmesc:
@@ -36,6 +36,7 @@ import torch
 
 from nemo.collections.asr.parts.utils.offline_clustering import (
     NMESC,
+    ScalerMinMax,
     SpeakerClustering,
     SpectralClustering,
     get_scale_interpolated_embs,
@@ -1193,3 +1194,319 @@ class OnlineSpeakerClustering(torch.nn.Module):
         # Match the permutation of the newly obtained speaker labels and the previous labels
         merged_clus_labels = self.match_labels(Y_merged=Y, add_new=add_new)
         return merged_clus_labels
+
+
+class IncrementalSpeakerClustering(OnlineSpeakerClustering):
+    """
+    Incremental version of `OnlineSpeakerClustering` for long streaming sessions.
+
+    Instead of taking the whole set of embeddings of the session at every step and recomputing the affinity matrix
+    of the history and current buffers, this class only takes the newly extracted embeddings and keeps:
+
+        - A ring buffer with the latest `buffer_size` (normalized) embedding vectors and the raw cosine affinity
+          matrix among them. New embeddings overwrite the oldest slots and only the rows and columns of the
+          overwritten slots are recomputed (append-only update).
+        - Per-speaker centroid statistics (sum and count of the embeddings evicted from the ring buffer).
+          Each speaker centroid takes part in clustering as a single row of the affinity matrix so that the
+          speaker labels of the previous part of the session are kept consistent.
+        - A speaker label table for all the segments in the session.
+
+    The per-step cost depends on `buffer_size` and `max_num_speakers` only and does not grow with the
+    length of the session. The speaker counting (NME analysis) of `OnlineSpeakerClustering` is reused.
+
+    Args:
+        buffer_size (int):
+            The number of the latest embedding vectors kept in the ring buffer.
+        Other arguments are the same as `OnlineSpeakerClustering`.
+    """
+
+    def __init__(
+        self,
+        max_num_speakers: int = 8,
+        max_rp_threshold: float = 0.15,
+        enhanced_count_thres: float = 40,
+        fixed_thres: float = -1.0,
+        sparse_search_volume: int = 10,
+        buffer_size: int = 300,
+        min_spk_counting_buffer_size: int = 3,
+        min_frame_per_spk: int = 15,
+        p_update_freq: int = 5,
+        p_value_skip_frame_thres: int = 50,
+        p_value_queue_size: int = 3,
+        cuda: bool = False,
+    ):
+        super().__init__(
+            max_num_speakers=max_num_speakers,
+            max_rp_threshold=max_rp_threshold,
+            enhanced_count_thres=enhanced_count_thres,
+            fixed_thres=fixed_thres,
+            sparse_search_volume=sparse_search_volume,
+            history_buffer_size=buffer_size // 2,
+            current_buffer_size=buffer_size - buffer_size // 2,
+            min_spk_counting_buffer_size=min_spk_counting_buffer_size,
+            min_frame_per_spk=min_frame_per_spk,
+            p_update_freq=p_update_freq,
+            p_value_skip_frame_thres=p_value_skip_frame_thres,
+            p_value_queue_size=p_value_queue_size,
+            cuda=cuda,
+        )
+        if buffer_size < 2:
+            raise ValueError(f"`buffer_size` should be at least 2 but got {buffer_size}.")
+        self.buffer_size = buffer_size
+        self.eps = 3.5e-4
+        self.reset_state()
+
+    def reset_state(self):
+        """
+        Reset the ring buffer, the speaker centroid statistics and the label table for a new session.
+        """
+        self.num_segments = 0
+        self.num_labels = 0
+        self.num_spk_stat = [torch.tensor(1)]
+        self.p_value_hist = [torch.tensor(2)]
+        # Ring buffer: embedding vectors, raw affinity matrix and the segment index stored in each slot
+        self.emb_buffer = torch.zeros(0)
+        self.affinity_buffer = torch.zeros(0)
+        self.buffer_segment_indexes = torch.full((self.buffer_size,), -1, dtype=torch.long)
+        # Running statistics of the embeddings evicted from the ring buffer
+        self.centroid_sum = torch.zeros(0)
+        self.centroid_count = torch.zeros(0)
+        # Speaker labels of all the segments, grown by doubling its capacity
+        self.label_table = torch.zeros(0, dtype=torch.long)
+
+    def init_buffers(self, emb_dim: int, device: torch.device):
+        """
+        Allocate the ring buffer and the speaker centroid statistics when the first embeddings arrive.
+        """
+        self.emb_buffer = torch.zeros((self.buffer_size, emb_dim), device=device)
+        self.affinity_buffer = torch.zeros((self.buffer_size, self.buffer_size), device=device)
+        self.buffer_segment_indexes = torch.full((self.buffer_size,), -1, dtype=torch.long, device=device)
+        self.centroid_sum = torch.zeros((0, emb_dim), device=device)
+        self.centroid_count = torch.zeros((0,), device=device)
+        self.label_table = torch.zeros((self.buffer_size,), dtype=torch.long, device=device)
+
+    def fold_evicted_embeddings(self, slots: torch.Tensor):
+        """
+        Add the embeddings in the given ring buffer slots to the centroid statistics of their speakers
+        before the slots are overwritten.
+
+        Args:
+            slots (Tensor):
+                Indices of the ring buffer slots to be overwritten
+        """
+        evicted_segment_indexes = self.buffer_segment_indexes[slots]
+        is_occupied = evicted_segment_indexes >= 0
+        if bool(is_occupied.any()):
+            evicted_slots = slots[is_occupied]
+            evicted_labels = self.label_table[evicted_segment_indexes[is_occupied]]
+            self.centroid_sum.index_add_(0, evicted_labels, self.emb_buffer[evicted_slots])
+            self.centroid_count.index_add_(
+                0, evicted_labels, torch.ones(evicted_labels.shape[0], device=self.centroid_count.device)
+            )
+
+    def append_embeddings(self, new_emb: torch.Tensor):
+        """
+        Write the new embedding vectors to the ring buffer and update the affinity matrix only for
+        the overwritten slots.
+
+        Args:
+            new_emb (Tensor):
+                Newly extracted embedding vectors with shape (number of new segments) x (embedding dimension)
+        """
+        num_new = new_emb.shape[0]
+        slots = (torch.arange(num_new, device=new_emb.device) + self.num_segments) % self.buffer_size
+        self.fold_evicted_embeddings(slots)
+
+        new_emb = new_emb.float()
+        new_emb = new_emb / (torch.norm(new_emb, dim=1).unsqueeze(1) + self.eps)
+        self.emb_buffer[slots] = new_emb
+        self.buffer_segment_indexes[slots] = torch.arange(num_new, device=new_emb.device) + self.num_segments
+
+        # Append-only update: recompute the rows and columns of the overwritten slots
+        new_affinity = torch.mm(new_emb, self.emb_buffer.transpose(0, 1))
+        self.affinity_buffer[slots] = new_affinity
+        self.affinity_buffer[:, slots] = new_affinity.transpose(0, 1)
+        self.affinity_buffer[slots, slots] = 1.0
+
+        self.num_segments += num_new
+        if self.label_table.shape[0] < self.num_segments:
+            capacity = max(2 * self.label_table.shape[0], self.num_segments)
+            label_table = torch.zeros((capacity,), dtype=torch.long, device=self.label_table.device)
+            label_table[: self.label_table.shape[0]] = self.label_table
+            self.label_table = label_table
+
+    def get_affinity_mat(self) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Assemble the affinity matrix of the speaker centroids and the embeddings in the ring buffer.
+        The raw affinity among the buffered embeddings is taken from the incrementally maintained buffer.
+
+        Returns:
+            mat (Tensor):
+                Min-max normalized affinity matrix. The rows of the centroids come first, followed by
+                the rows of the buffered embeddings in chronological order.
+            centroid_labels (Tensor):
+                Speaker labels of the centroids in `mat`
+            buffer_slots (Tensor):
+                Ring buffer slots of the embeddings in `mat`
+        """
+        filled_slots = torch.where(self.buffer_segment_indexes >= 0)[0]
+        buffer_slots = filled_slots[torch.argsort(self.buffer_segment_indexes[filled_slots])]
+        buffer_affinity = self.affinity_buffer[buffer_slots][:, buffer_slots]
+
+        centroid_labels = torch.where(self.centroid_count > 0)[0]
+        if centroid_labels.shape[0] > 0:
+            centroids = self.centroid_sum[centroid_labels]
+            centroids = centroids / (torch.norm(centroids, dim=1).unsqueeze(1) + self.eps)
+            centroid_affinity = torch.mm(centroids, centroids.transpose(0, 1))
+            centroid_affinity.fill_diagonal_(1)
+            cross_affinity = torch.mm(centroids, self.emb_buffer[buffer_slots].transpose(0, 1))
+            mat = torch.vstack(
+                (
+                    torch.hstack((centroid_affinity, cross_affinity)),
+                    torch.hstack((cross_affinity.transpose(0, 1), buffer_affinity)),
+                )
+            )
+        else:
+            mat = buffer_affinity
+        if mat.shape[0] > 1:
+            mat = ScalerMinMax(mat)
+        return mat, centroid_labels, buffer_slots
+
+    def match_labels_to_history(self, Y_old: torch.Tensor, Y_new: torch.Tensor) -> torch.Tensor:
+        """
+        Map the new clustering labels to the existing speaker labels of the session with Hungarian algorithm.
+        Unlike `stitch_cluster_labels`, the existing speaker labels are never renumbered since the labels of
+        the segments evicted from the ring buffer are fixed. New clusters that cannot be matched to existing
+        speakers get new speaker labels.
+
+        Args:
+            Y_old (Tensor):
+                Existing speaker labels of the first `len(Y_old)` rows of the affinity matrix
+            Y_new (Tensor):
+                New clustering labels of all the rows of the affinity matrix
+
+        Returns:
+            Y_out (Tensor):
+                Speaker labels of all the rows of the affinity matrix
+        """
+        Y_new = get_minimal_indices(Y_new)
+        num_new_clus = int(Y_new.max().item()) + 1
+        mapping_array = torch.full((num_new_clus,), -1, dtype=torch.long, device=Y_new.device)
+        if Y_old.shape[0] > 0 and self.num_labels > 0:
+            enc_old = torch.zeros((Y_old.shape[0], self.num_labels), device=Y_new.device)
+            enc_new = torch.zeros((Y_old.shape[0], num_new_clus), device=Y_new.device)
+            enc_old[torch.arange(Y_old.shape[0]), Y_old.to(Y_new.device)] = 1
+            enc_new[torch.arange(Y_old.shape[0]), Y_new[: Y_old.shape[0]]] = 1
+            co_occurrence = torch.matmul(enc_new.T, enc_old)
+            row_index, col_index = linear_sum_assignment(-1 * co_occurrence, max_size=max(100, self.num_labels))
+            for k in range(row_index.shape[0]):
+                if co_occurrence[row_index[k], col_index[k]] > 0:
+                    mapping_array[row_index[k]] = col_index[k]
+        for clus_idx in range(num_new_clus):
+            if mapping_array[clus_idx] < 0:
+                mapping_array[clus_idx] = self.num_labels
+                self.num_labels += 1
+        if self.centroid_sum.shape[0] < self.num_labels:
+            num_added = self.num_labels - self.centroid_sum.shape[0]
+            self.centroid_sum = torch.vstack(
+                (self.centroid_sum, torch.zeros((num_added, self.centroid_sum.shape[1]), device=Y_new.device))
+            )
+            self.centroid_count = torch.hstack((self.centroid_count, torch.zeros((num_added,), device=Y_new.device)))
+        return mapping_array[Y_new]
+
+    def forward(
+        self,
+        new_emb: torch.Tensor,
+        max_num_speakers: int,
+        max_rp_threshold: float,
+        enhanced_count_thres: int,
+        sparse_search_volume: int,
+        frame_index: int,
+        cuda: bool = False,
+    ) -> torch.Tensor:
+        """
+        Wrapper function for torch.jit.script compatibility.
+        NOTE: jit scripted classes only contain the methods which are included in the computation graph in the forward pass.
+        """
+        Y = self.forward_infer(
+            new_emb=new_emb,
+            max_num_speakers=max_num_speakers,
+            max_rp_threshold=max_rp_threshold,
+            enhanced_count_thres=enhanced_count_thres,
+            sparse_search_volume=sparse_search_volume,
+            frame_index=frame_index,
+            cuda=cuda,
+        )
+        return Y
+
+    def forward_infer(
+        self,
+        new_emb: torch.Tensor,
+        max_num_speakers: int = 4,
+        max_rp_threshold: float = 0.15,
+        enhanced_count_thres: int = 40,
+        sparse_search_volume: int = 10,
+        fixed_thres: float = -1.0,
+        frame_index: int = 0,
+        cuda: bool = False,
+    ) -> torch.Tensor:
+        """
+        Perform incremental speaker clustering with the newly extracted embedding vectors.
+
+        Args:
+            new_emb (Tensor):
+                Embedding vectors of the new segments since the last call.
+                Dimensions: (number of new segments) x (embedding dimension)
+            max_num_speakers (int):
+                Maximum number of speakers to be detected during online diarization session
+            max_rp_threshold (float):
+                Limits the range of parameter search.
+                Clustering performance can vary depending on this range.
+                Default is 0.15.
+            frame_index (int):
+                Unique index for each diarization step
+            cuda (bool):
+                Boolean that determines whether cuda is used or not
+
+        Returns:
+            Y (Tensor):
+                Speaker labels for all the segments from the start of the session
+        """
+        self.max_num_speakers = max_num_speakers
+        self.max_rp_threshold = max_rp_threshold
+        self.enhanced_count_thres = enhanced_count_thres
+        self.sparse_search_volume = sparse_search_volume
+        self.fixed_thres = fixed_thres
+
+        if cuda and new_emb.device == torch.device("cpu"):
+            raise ValueError(f"CUDA is enabled but the input {new_emb} is not on the GPU.")
+        if new_emb.shape[0] > self.buffer_size:
+            raise ValueError(
+                f"The number of new embedding vectors {new_emb.shape[0]} is larger than the buffer size "
+                f"{self.buffer_size}. Please either (1) increase the buffer size or (2) call the clustering more often."
+            )
+        if new_emb.shape[0] == 0:
+            return self.label_table[: self.num_segments]
+
+        if self.emb_buffer.shape[0] == 0:
+            self.init_buffers(emb_dim=new_emb.shape[1], device=new_emb.device)
+        num_old_buffered = int((self.buffer_segment_indexes >= 0).sum().item())
+        num_old_buffered = min(num_old_buffered, self.buffer_size - new_emb.shape[0])
+        self.append_embeddings(new_emb)
+
+        mat, centroid_labels, buffer_slots = self.get_affinity_mat()
+        if mat.shape[0] == 1:
+            Y = torch.zeros((1,), dtype=torch.long, device=new_emb.device)
+        else:
+            est_num_of_spk, affinity_mat = self.online_spk_num_estimation(mat, frame_index)
+            spectral_model = SpectralClustering(n_clusters=est_num_of_spk, cuda=cuda, device=new_emb.device)
+            Y = spectral_model.forward(affinity_mat).to(new_emb.device).long()
+
+        # The labels of the centroids and the previously clustered embeddings in the buffer are known
+        buffer_segment_indexes = self.buffer_segment_indexes[buffer_slots]
+        Y_old = torch.hstack(
+            (centroid_labels, self.label_table[buffer_segment_indexes[:num_old_buffered]].to(centroid_labels.device))
+        )
+        Y_matched = self.match_labels_to_history(Y_old=Y_old, Y_new=Y)
+        self.label_table[buffer_segment_indexes] = Y_matched[centroid_labels.shape[0] :]
+        return self.label_table[: self.num_segments]
@@ -473,7 +473,9 @@ def perform_clustering(
         logging.warning("cuda=False, using CPU for eigen decomposition. This might slow down the clustering process.")
         cuda = False
 
-    speaker_clustering = LongFormSpeakerClustering(cuda=cuda)
+    speaker_clustering = LongFormSpeakerClustering(
+        cuda=cuda, eigen_solver=clustering_params.get('eigen_solver', 'default')
+    )
 
     if clustering_params.get('export_script_module', False):
         speaker_clustering = torch.jit.script(speaker_clustering)
@@ -13,13 +13,19 @@
 # limitations under the License.
 
 import json
+import math
 import os
+import queue
 import tempfile
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import hydra
 import librosa
+import numpy as np
 import soundfile as sf
 import torch
 from lightning.pytorch import Trainer
@@ -27,7 +33,7 @@ from omegaconf import DictConfig, OmegaConf
 from tqdm import tqdm
 
 from nemo.collections.asr.data.audio_to_text_dataset import inject_dataloader_value_from_model_config
-from nemo.collections.asr.parts.preprocessing.segment import ChannelSelectorType
+from nemo.collections.asr.parts.preprocessing.segment import ChannelSelectorType, select_channels
 from nemo.collections.audio.data import audio_to_audio_dataset
 from nemo.collections.audio.data.audio_to_audio_lhotse import LhotseAudioToTargetDataset
 from nemo.collections.audio.metrics.audio import AudioMetricWrapper
@@ -340,11 +346,18 @@ class AudioToAudioModel(ModelPT, ABC):
         num_workers: Optional[int] = None,
         input_channel_selector: Optional[ChannelSelectorType] = None,
         input_dir: Optional[str] = None,
+        window_length: Optional[float] = None,
+        window_overlap: float = 0.5,
+        num_writer_workers: int = 1,
     ) -> List[str]:
         """
         Takes paths to audio files and returns a list of paths to processed
         audios.
 
+        If `window_length` is provided, long-form processing is used: the input signals are split into fixed windows
+        with overlap, windows are batched across files, and each output is reconstructed using windowed overlap-add
+        and written incrementally by background writers. Memory usage does not depend on the length of the files.
+
         Args:
             paths2audio_files: paths to audio files to be processed
             output_dir: directory to save the processed files
@@ -353,6 +366,9 @@ class AudioToAudioModel(ModelPT, ABC):
             input_channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio.
                             If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`.
             input_dir: Optional, directory that contains the input files. If provided, the output directory will mirror the input directory structure.
+            window_length: Optional, length of the processing window in seconds. If provided, long-form processing is used.
+            window_overlap: Overlap between the consecutive windows in seconds, used with `window_length`.
+            num_writer_workers: Number of background threads writing the outputs, used with `window_length`.
 
         Returns:
             Paths to processed audio signals.
@@ -379,6 +395,18 @@ class AudioToAudioModel(ModelPT, ABC):
             logging_level = logging.get_verbosity()
             logging.set_verbosity(logging.WARNING)
 
+            if window_length is not None:
+                return self._process_overlap_add(
+                    paths2audio_files=paths2audio_files,
+                    output_dir=output_dir,
+                    batch_size=batch_size,
+                    input_channel_selector=input_channel_selector,
+                    input_dir=input_dir,
+                    window_length=window_length,
+                    window_overlap=window_overlap,
+                    num_writer_workers=num_writer_workers,
+                )
+
             # Processing
             with tempfile.TemporaryDirectory() as tmpdir:
                 # Save temporary manifest
@@ -454,6 +482,215 @@ class AudioToAudioModel(ModelPT, ABC):
 
         return paths2processed_files
 
+    @staticmethod
+    def _get_output_filepath(audio_file: str, output_dir: str, input_dir: Optional[str] = None) -> str:
+        """Output file path for the input file, mirroring the directory structure of `input_dir` if provided."""
+        if input_dir is not None:
+            # Make sure the output has the same directory structure as the input
+            filepath_relative = os.path.relpath(audio_file, start=input_dir)
+        else:
+            # Input dir is not provided, save files in the output directory
+            filepath_relative = os.path.basename(audio_file)
+        return os.path.join(output_dir, filepath_relative)
+
+    @staticmethod
+    def _overlap_add_window(window_samples: int, overlap_samples: int) -> np.ndarray:
+        """Synthesis window with raised-cosine ramps over the overlapping regions and flat top.
+
+        The ramps of the consecutive windows sum to one, and the ramps do not reach zero,
+        so the overlap-add can be normalized by the sum of the windows also at the signal boundaries.
+        """
+        window = np.ones(window_samples, dtype=np.float32)
+        if overlap_samples > 0:
+            ramp = np.sin(0.5 * np.pi * (np.arange(overlap_samples) + 0.5) / overlap_samples) ** 2
+            window[:overlap_samples] = ramp
+            window[-overlap_samples:] = np.minimum(window[-overlap_samples:], ramp[::-1])
+        return window
+
+    def _iter_windows(
+        self,
+        paths2audio_files: List[str],
+        input_channel_selector: Optional[ChannelSelectorType],
+        window_samples: int,
+        hop_samples: int,
+    ) -> Iterator[Tuple[int, int, int, np.ndarray]]:
+        """Reads the input files window by window.
+
+        Files with a different sample rate are resampled window by window,
+        the windowed overlap-add attenuates the discontinuities at the window boundaries.
+
+        Yields:
+            Tuples (file index, number of output samples of the file, start of the window, window signal with shape (C, T)).
+        """
+        for file_idx, audio_file in enumerate(paths2audio_files):
+            with sf.SoundFile(audio_file) as f:
+                file_sample_rate = f.samplerate
+                num_samples = math.ceil(f.frames * self.sample_rate / file_sample_rate)
+                start = 0
+                while True:
+                    if file_sample_rate == self.sample_rate:
+                        f.seek(start)
+                        signal = f.read(window_samples, dtype='float32', always_2d=True)
+                    else:
+                        f.seek(int(start * file_sample_rate / self.sample_rate))
+                        signal = f.read(
+                            math.ceil(window_samples * file_sample_rate / self.sample_rate),
+                            dtype='float32',
+                            always_2d=True,
+                        )
+                        signal = librosa.resample(
+                            signal.T, orig_sr=file_sample_rate, target_sr=self.sample_rate, axis=-1
+                        ).T
+                        # Match the expected length of the window
+                        expected_length = min(window_samples, num_samples - start)
+                        signal = np.pad(
+                            signal[:expected_length], ((0, expected_length - len(signal[:expected_length])), (0, 0))
+                        )
+                    signal = select_channels(signal, input_channel_selector)
+                    if signal.ndim == 1:
+                        signal = signal[:, None]
+                    yield file_idx, num_samples, start, signal.T
+                    if start + window_samples >= num_samples:
+                        break
+                    start += hop_samples
+
+    def _process_overlap_add(
+        self,
+        paths2audio_files: List[str],
+        output_dir: str,
+        batch_size: int,
+        input_channel_selector: Optional[ChannelSelectorType],
+        input_dir: Optional[str],
+        window_length: float,
+        window_overlap: float,
+        num_writer_workers: int,
+    ) -> List[str]:
+        """Long-form processing with windowed overlap-add, see `process`."""
+        window_samples = int(window_length * self.sample_rate)
+        overlap_samples = int(window_overlap * self.sample_rate)
+        if window_samples <= 0:
+            raise ValueError(f'Window length must be positive, got {window_length}')
+        if overlap_samples < 0 or overlap_samples >= window_samples:
+            raise ValueError(f'Window overlap must be in [0, window_length), got {window_overlap}')
+        hop_samples = window_samples - overlap_samples
+        synthesis_window = self._overlap_add_window(window_samples, overlap_samples)
+        device = next(self.parameters()).device
+
+        paths2processed_files = [
+            self._get_output_filepath(audio_file, output_dir=output_dir, input_dir=input_dir)
+            for audio_file in paths2audio_files
+        ]
+        for output_file in paths2processed_files:
+            os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+
+        # Read windows in a background thread
+        windows_queue = queue.Queue(maxsize=2 * batch_size)
+        reader_errors = []
+
+        def _reader():
+            try:
+                for window in self._iter_windows(
+                    paths2audio_files, input_channel_selector, window_samples, hop_samples
+                ):
+                    windows_queue.put(window)
+            except Exception as e:
+                reader_errors.append(e)
+            finally:
+                windows_queue.put(None)
+
+        reader = threading.Thread(target=_reader, daemon=True)
+        reader.start()
+
+        # Each file is assigned to a single writer thread, which keeps the order of the writes to the file
+        writers = [ThreadPoolExecutor(max_workers=1) for _ in range(max(1, num_writer_workers))]
+        write_futures = deque()
+        # Overlap-add state for each file in progress: (output buffer, normalization buffer) starting at the current window
+        buffers = {}
+        # Output files opened for writing
+        output_files = {}
+
+        def _write(file_idx: int, signal: np.ndarray, is_last: bool):
+            output_file = output_files.get(file_idx)
+            if output_file is None:
+                output_file = output_files[file_idx] = sf.SoundFile(
+                    paths2processed_files[file_idx],
+                    'w',
+                    samplerate=self.sample_rate,
+                    channels=signal.shape[0],
+                    subtype='FLOAT',
+                )
+            output_file.write(signal.T)
+            if is_last:
+                output_files.pop(file_idx).close()
+
+        def _overlap_add(file_idx: int, num_samples: int, start: int, output: np.ndarray):
+            if file_idx not in buffers:
+                buffers[file_idx] = (
+                    np.zeros((output.shape[0], window_samples), dtype=np.float32),
+                    np.zeros(window_samples, dtype=np.float32),
+                )
+            acc, norm = buffers[file_idx]
+            length = output.shape[-1]
+            acc[:, :length] += output * synthesis_window[:length]
+            norm[:length] += synthesis_window[:length]
+            is_last = start + window_samples >= num_samples
+            num_ready = num_samples - start if is_last else hop_samples
+            ready = acc[:, :num_ready] / norm[:num_ready]
+            write_futures.append(writers[file_idx % len(writers)].submit(_write, file_idx, ready.copy(), is_last))
+            if is_last:
+                del buffers[file_idx]
+            else:
+                # Shift the buffers to the start of the next window
+                acc[:, :-num_ready] = acc[:, num_ready:].copy()
+                acc[:, -num_ready:] = 0
+                norm[:-num_ready] = norm[num_ready:].copy()
+                norm[-num_ready:] = 0
+            # Limit the number of pending writes to keep the memory usage constant
+            while len(write_futures) > 4 * batch_size * len(writers):
+                write_futures.popleft().result()
+
+        def _process_batch(batch: List[Tuple[int, int, int, np.ndarray]]):
+            num_channels = batch[0][-1].shape[0]
+            batch_length = max(signal.shape[-1] for _, _, _, signal in batch)
+            input_signal = torch.zeros(len(batch), num_channels, batch_length)
+            input_length = torch.zeros(len(batch), dtype=torch.long)
+            for b, (_, _, _, signal) in enumerate(batch):
+                input_signal[b, :, : signal.shape[-1]] = torch.from_numpy(signal)
+                input_length[b] = signal.shape[-1]
+            processed_batch, _ = self.forward(
+                input_signal=input_signal.to(device), input_length=input_length.to(device)
+            )
+            processed_batch = self.match_batch_length(processed_batch, batch_length).cpu().numpy()
+            for b, (file_idx, num_samples, start, _) in enumerate(batch):
+                _overlap_add(file_idx, num_samples, start, processed_batch[b, :, : input_length[b]])
+
+        try:
+            batch = []
+            with tqdm(desc="Processing windows") as pbar:
+                while True:
+                    window = windows_queue.get()
+                    if window is None:
+                        break
+                    batch.append(window)
+                    if len(batch) == batch_size:
+                        _process_batch(batch)
+                        pbar.update(len(batch))
+                        batch = []
+                if batch:
+                    _process_batch(batch)
+                    pbar.update(len(batch))
+            if reader_errors:
+                raise reader_errors[0]
+            while write_futures:
+                write_futures.popleft().result()
+        finally:
+            for writer in writers:
+                writer.shutdown(wait=True)
+            for output_file in output_files.values():
+                output_file.close()
+
+        return paths2processed_files
+
     @classmethod
     def list_available_models(cls) -> 'List[PretrainedModelInfo]':
         """
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Union
 
 import einops
 import hydra
@@ -21,6 +21,13 @@ from lightning.pytorch import Trainer
 from omegaconf import DictConfig
 
 from nemo.collections.audio.models.audio_to_audio import AudioToAudioModel
+from nemo.collections.audio.parts.submodules.ode_sampler import (
+    FewStepODESampler,
+    FlowMatchingODEProcess,
+    ODEProcess,
+    SchroedingerBridgeODEProcess,
+    ScoreBasedODEProcess,
+)
 from nemo.core.classes.common import PretrainedModelInfo, typecheck
 from nemo.core.neural_types import AudioSignal, LengthsType, LossType, NeuralType
 from nemo.utils import logging
@@ -358,7 +365,88 @@ class PredictiveAudioToAudioModel(AudioToAudioModel):
         return {f'{tag}_loss': loss}
 
 
-class ScoreBasedGenerativeAudioToAudioModel(AudioToAudioModel):
+class FewStepSamplingMixin:
+    """Few-step inference for generative audio-to-audio models.
+
+    The encoded input is computed once per utterance and used as the prior mean and the conditioning
+    for all sampler steps. The sampling process is defined by `_get_ode_process`.
+    """
+
+    def _get_ode_process(self) -> ODEProcess:
+        """Return the ODE process corresponding to the model."""
+        raise NotImplementedError(f'Few-step sampling is not supported for {self.__class__.__name__}')
+
+    def _get_few_step_condition(self, encoded: torch.Tensor) -> Optional[torch.Tensor]:
+        """Return the conditioning input for the estimator."""
+        return encoded
+
+    def get_few_step_sampler(self, num_steps: int = 4, solver: str = 'dpm2m') -> FewStepODESampler:
+        """Return a few-step ODE sampler for this model.
+
+        Args:
+            num_steps: default number of sampler steps
+            solver: ODE solver, see `FewStepODESampler.SOLVERS`
+
+        Returns:
+            Sampler using the estimator of this model.
+        """
+        return FewStepODESampler(
+            estimator=self.estimator, process=self._get_ode_process(), num_steps=num_steps, solver=solver, eps=self.eps
+        )
+
+    @torch.inference_mode()
+    def forward_few_step(
+        self,
+        input_signal: torch.Tensor,
+        input_length: Optional[torch.Tensor] = None,
+        num_steps: Union[int, Sequence[int], torch.Tensor] = 4,
+        solver: str = 'dpm2m',
+    ):
+        """Generate the output signal using a few-step ODE sampler instead of `self.sampler`.
+
+        Args:
+            input_signal: Tensor that represents a batch of time-domain audio signals, of shape [B, C, T].
+            input_length: Vector of length B, contains the individual lengths of the audio sequences.
+            num_steps: number of sampler steps, either a single value or one value for each example in the batch
+            solver: ODE solver, see `FewStepODESampler.SOLVERS`
+
+        Returns:
+            Output `output_signal` in the time domain and the length of the output signal `output_length`.
+        """
+        batch_length = input_signal.size(-1)
+
+        if self.normalize_input:
+            # max for each example in the batch
+            norm_scale = torch.amax(input_signal.abs(), dim=(-1, -2), keepdim=True)
+            # scale input signal
+            input_signal = input_signal / (norm_scale + self.eps)
+
+        # Encoder
+        encoded, encoded_length = self.encoder(input=input_signal, input_length=input_length)
+
+        # Sampler
+        sampler = self.get_few_step_sampler(solver=solver)
+        generated, generated_length = sampler(
+            prior_mean=encoded,
+            estimator_condition=self._get_few_step_condition(encoded),
+            state_length=encoded_length,
+            num_steps=num_steps,
+        )
+
+        # Decoder
+        output, output_length = self.decoder(input=generated, input_length=generated_length)
+
+        if self.normalize_input:
+            # rescale to the original scale
+            output = output * norm_scale
+
+        # Trim or pad the estimated signal to match input length
+        output = self.match_batch_length(input=output, batch_length=batch_length)
+
+        return output, output_length
+
+
+class ScoreBasedGenerativeAudioToAudioModel(FewStepSamplingMixin, AudioToAudioModel):
     """This models is using a score-based diffusion process to generate
     an encoded representation of the enhanced signal.
 
@@ -474,6 +562,10 @@ class ScoreBasedGenerativeAudioToAudioModel(AudioToAudioModel):
         output = self.match_batch_length(input=output, batch_length=batch_length)
         return output, output_length
 
+    def _get_ode_process(self) -> ODEProcess:
+        """Probability flow ODE of the model SDE."""
+        return ScoreBasedODEProcess(sde=self.sde)
+
     @typecheck(
         input_types={
             "target_signal": NeuralType(('B', 'C', 'T'), AudioSignal()),
@@ -619,7 +711,7 @@ class ScoreBasedGenerativeAudioToAudioModel(AudioToAudioModel):
         return {f'{tag}_loss': loss}
 
 
-class FlowMatchingAudioToAudioModel(AudioToAudioModel):
+class FlowMatchingAudioToAudioModel(FewStepSamplingMixin, AudioToAudioModel):
     """This models uses a flow matching process to generate
     an encoded representation of the enhanced signal.
 
@@ -799,6 +891,16 @@ class FlowMatchingAudioToAudioModel(AudioToAudioModel):
 
         return output, output_length
 
+    def _get_ode_process(self) -> ODEProcess:
+        """ODE of the flow, using the time range of the sampler."""
+        return FlowMatchingODEProcess(flow=self.flow, time_min=self.sampler.time_min, time_max=self.sampler.time_max)
+
+    def _get_few_step_condition(self, encoded: torch.Tensor) -> Optional[torch.Tensor]:
+        """Return the conditioning input, which is zero if the model is trained without it."""
+        if self.p_cond == 0:
+            return torch.zeros_like(encoded)
+        return encoded
+
     @typecheck(
         input_types={
             "target_signal": NeuralType(('B', 'C', 'T'), AudioSignal()),
@@ -937,7 +1039,7 @@ class FlowMatchingAudioToAudioModel(AudioToAudioModel):
         return {f'{tag}_loss': loss}
 
 
-class SchroedingerBridgeAudioToAudioModel(AudioToAudioModel):
+class SchroedingerBridgeAudioToAudioModel(FewStepSamplingMixin, AudioToAudioModel):
     """This models is using a Schrödinger Bridge process to generate
     an encoded representation of the enhanced signal.
 
@@ -1085,6 +1187,10 @@ class SchroedingerBridgeAudioToAudioModel(AudioToAudioModel):
 
         return output, output_length
 
+    def _get_ode_process(self) -> ODEProcess:
+        """ODE of the bridge, using the noise schedule of the sampler."""
+        return SchroedingerBridgeODEProcess(noise_schedule=self.sampler.noise_schedule)
+
     @typecheck(
         input_types={
             "target_signal": NeuralType(('B', 'C', 'T'), AudioSignal()),
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import math
-from typing import Dict, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import einops
 import einops.layers.torch
@@ -101,6 +101,53 @@ class SpectrogramNoiseConditionalScoreNetworkPlusPlus(NeuralModule):
         # Process using NCSN++
         output, output_length = self.ncsnpp(input=input, input_length=input_length, condition=condition)
 
+        return self._project_output(output, output_length)
+
+    def cache_input_condition(self, input_condition: torch.Tensor) -> List[torch.Tensor]:
+        """Precompute the contribution of a fixed conditioning input, see
+        `NoiseConditionalScoreNetworkPlusPlus.cache_input_condition`.
+
+        Args:
+            input_condition: complex-valued conditioning tensor, shape (B, C_cond, D, T)
+
+        Returns:
+            List of cached tensors, one for each resolution of the input pyramid.
+        """
+        condition_real_imag = torch.stack([input_condition.real, input_condition.imag], dim=2)
+        condition = einops.rearrange(condition_real_imag, 'B C RI F T -> B (C RI) F T')
+        return self.ncsnpp.cache_input_condition(input_condition=condition)
+
+    def forward_cached(
+        self,
+        input: torch.Tensor,
+        input_condition_cache: List[torch.Tensor],
+        input_length: Optional[torch.Tensor] = None,
+        condition: Optional[torch.Tensor] = None,
+    ):
+        """Forward pass with a precomputed conditioning input.
+
+        This is equivalent to calling `forward` on the concatenation of `input` and
+        the conditioning used to compute `input_condition_cache`.
+
+        Args:
+            input: complex-valued state without the conditioning channels, shape (B, C_state, D, T)
+            input_condition_cache: output of `cache_input_condition`
+            input_length: length of the valid time steps for each example in the batch, shape (B,)
+            condition: scalar condition (time) for the model
+        """
+        input_real_imag = torch.stack([input.real, input.imag], dim=2)
+        input = einops.rearrange(input_real_imag, 'B C RI F T -> B (C RI) F T')
+
+        output, output_length = self.ncsnpp.forward_cached(
+            input=input, input_condition_cache=input_condition_cache, input_length=input_length, condition=condition
+        )
+
+        return self._project_output(output, output_length)
+
+    def _project_output(self, output: torch.Tensor, output_length: torch.Tensor):
+        """Project the NCSN++ output to complex-valued output channels."""
+        B, _, D, T = output.shape
+
         # Output projection
         output = self.output_projection(output)
 
@@ -309,9 +356,90 @@ class NoiseConditionalScoreNetworkPlusPlus(NeuralModule):
         *_, D, T = input.shape
         input = self.pad_input(input=input)
 
+        # downsample and project input image to add later in the downsampling path
+        pyramid = [block(image) for image, block in zip(self._get_image_pyramid(input), self.input_pyramid)]
+
+        return self._forward_pyramid(
+            pyramid=pyramid, input_length=input_length, condition=condition, output_size=(D, T)
+        )
+
+    def _get_image_pyramid(self, input: torch.Tensor) -> List[torch.Tensor]:
+        """Downsample the padded input to all resolutions."""
+        pyramid = [input]
+        for resolution_num in range(self.num_resolutions - 1):
+            pyramid.append(self.downsample(pyramid[-1]))
+        return pyramid
+
+    def cache_input_condition(self, input_condition: torch.Tensor) -> List[torch.Tensor]:
+        """Precompute the contribution of a fixed conditioning input to the input pyramid.
+
+        The network input is a channel-wise concatenation of the current state and a conditioning signal,
+        e.g., the encoded noisy input. Since the input pyramid is linear in the input, the conditioning channels
+        can be downsampled and projected once and reused across all sampler steps, see `forward_cached`.
+
+        Args:
+            input_condition: conditioning tensor, shape (B, C_cond, D, T)
+
+        Returns:
+            List of cached tensors, one for each resolution, including the projection bias.
+        """
+        num_state_channels = self.in_channels - input_condition.size(1)
+        if num_state_channels < 1:
+            raise RuntimeError(
+                f'Unexpected condition channel size {input_condition.size(1)}, expected less than {self.in_channels}'
+            )
+
+        pyramid = self._get_image_pyramid(self.pad_input(input=input_condition))
+        return [
+            F.conv2d(image, block.weight[:, num_state_channels:], block.bias)
+            for image, block in zip(pyramid, self.input_pyramid)
+        ]
+
+    def forward_cached(
+        self,
+        *,
+        input: torch.Tensor,
+        input_condition_cache: List[torch.Tensor],
+        input_length: Optional[torch.Tensor],
+        condition: Optional[torch.Tensor] = None,
+    ):
+        """Forward pass with a precomputed conditioning input.
+
+        This is equivalent to calling `forward` on the concatenation of `input` and
+        the conditioning used to compute `input_condition_cache`.
+
+        Args:
+            input: state tensor without the conditioning channels, shape (B, C_state, D, T)
+            input_condition_cache: output of `cache_input_condition`
+            input_length: length of the valid time steps for each example in the batch, shape (B,)
+            condition: scalar condition (time) for the model, will be embedded using `self.time_embedding`
+        """
+        *_, D, T = input.shape
+        pyramid = self._get_image_pyramid(self.pad_input(input=input))
+        pyramid = [
+            F.conv2d(image, block.weight[:, : input.size(1)]) + cached
+            for image, block, cached in zip(pyramid, self.input_pyramid, input_condition_cache)
+        ]
+
+        return self._forward_pyramid(
+            pyramid=pyramid, input_length=input_length, condition=condition, output_size=(D, T)
+        )
+
+    def _forward_pyramid(
+        self,
+        pyramid: List[torch.Tensor],
+        input_length: Optional[torch.Tensor],
+        condition: Optional[torch.Tensor],
+        output_size: Tuple[int, int],
+    ):
+        """Process the projected input pyramid using the U-Net and crop the result to `output_size`."""
+        D, T = output_size
+        # shape of the padded input
+        input_shape = pyramid[0].shape[-2:]
+
         if input_length is None:
             # assume all time frames are valid
-            input_length = torch.LongTensor([input.shape[-1]] * input.shape[0]).to(input.device)
+            input_length = torch.LongTensor([input_shape[-1]] * pyramid[0].shape[0]).to(pyramid[0].device)
 
         lengths = input_length
 
@@ -320,19 +448,13 @@ class NoiseConditionalScoreNetworkPlusPlus(NeuralModule):
                 raise ValueError(
                     f"Expected conditon to be a 1-dim tensor, got a {len(condition.shape)}-dim tensor of shape {tuple(condition.shape)}"
                 )
-            if condition.shape[0] != input.shape[0]:
+            if condition.shape[0] != pyramid[0].shape[0]:
                 raise ValueError(
-                    f"Condition {tuple(condition.shape)} and input {tuple(input.shape)} should match along the batch dimension"
+                    f"Condition {tuple(condition.shape)} and input {tuple(pyramid[0].shape)} should match along the batch dimension"
                 )
 
             condition = self.time_embedding(torch.log(condition))
 
-        # downsample and project input image to add later in the downsampling path
-        pyramid = [input]
-        for resolution_num in range(self.num_resolutions - 1):
-            pyramid.append(self.downsample(pyramid[-1]))
-        pyramid = [block(image) for image, block in zip(pyramid, self.input_pyramid)]
-
         # downsampling path
         history = []
         hidden = torch.zeros_like(pyramid[0])
@@ -369,11 +491,11 @@ class NoiseConditionalScoreNetworkPlusPlus(NeuralModule):
         images = []
         for tensor, projection in zip(to_project, reversed(self.projection_blocks)):
             image = projection(tensor)
-            images.append(F.interpolate(image, size=input.shape[-2:]))  # TODO write this loop using self.upsample
+            images.append(F.interpolate(image, size=input_shape))  # TODO write this loop using self.upsample
 
         result = sum(images)
 
-        assert result.shape[-2:] == input.shape[-2:]
+        assert result.shape[-2:] == input_shape
 
         # remove padding
         result = result[:, :, :D, :T]
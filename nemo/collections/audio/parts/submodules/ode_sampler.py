@@ -0,0 +1,484 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Few-step ODE samplers for generative audio-to-audio models.
+
+Score-based diffusion, flow matching and Schrödinger bridge models used for speech enhancement share
+a Gaussian marginal of the following form
+
+    x_t = a(t) * x_0 + b(t) * y + s(t) * z
+
+where `x_0` is the target, `y` is the prior mean (e.g., the noisy input), and `z` is sampled from a normal
+distribution with zero mean and unit variance. The corresponding probability flow ODE can be solved using
+exponential integrators on the data prediction, as in DPM-Solver++, which provides good quality with
+a small number of estimator evaluations.
+
+References:
+    Lu et al., DPM-Solver++: Fast Solver for Guided Sampling of Diffusion Probabilistic Models, 2022
+    Karras et al., Elucidating the Design Space of Diffusion-Based Generative Models, NeurIPS 2022
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Sequence, Tuple, Union
+
+import torch
+
+from nemo.collections.audio.parts.submodules.diffusion import OrnsteinUhlenbeckVarianceExplodingSDE
+from nemo.collections.audio.parts.submodules.flow import OptimalTransportFlow
+from nemo.collections.audio.parts.submodules.schroedinger_bridge import SBNoiseSchedule
+from nemo.collections.common.parts.utils import mask_sequence_tensor
+from nemo.utils import logging
+
+
+class ODEProcess(ABC):
+    """Describes the marginal of a generative process as
+
+        x_t = a(t) * x_0 + b(t) * y + s(t) * z
+
+    and converts the estimator output to a data prediction of `x_0`.
+    """
+
+    @abstractmethod
+    def time_steps(self, num_steps: int, device: torch.device) -> torch.Tensor:
+        """Return a tensor with `num_steps + 1` time points, from the initial to the final time."""
+        pass
+
+    @abstractmethod
+    def coefficients(self, time: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Return coefficients `a`, `b` and `s` of the marginal at `time`, each with shape (B,)."""
+        pass
+
+    @abstractmethod
+    def initial_state(self, prior_mean: torch.Tensor) -> torch.Tensor:
+        """Return the initial state of the process."""
+        pass
+
+    @abstractmethod
+    def data_prediction(
+        self, estimate: torch.Tensor, state: torch.Tensor, prior_mean: torch.Tensor, time: torch.Tensor
+    ) -> torch.Tensor:
+        """Convert the estimator output at `time` to a prediction of `x_0`."""
+        pass
+
+
+class FlowMatchingODEProcess(ODEProcess):
+    """ODE for a flow matching model with `x_start = 0`, as in `FlowMatchingAudioToAudioModel`.
+
+    The estimator predicts the vector field, which is converted to a prediction of `x_end`.
+
+    Args:
+        flow: optimal transport flow used to train the model
+        time_min: initial time for sampling
+        time_max: final time for sampling
+    """
+
+    def __init__(self, flow: OptimalTransportFlow, time_min: float, time_max: float):
+        self.flow = flow
+        self.time_min = time_min
+        self.time_max = time_max
+
+    def time_steps(self, num_steps: int, device: torch.device) -> torch.Tensor:
+        return torch.linspace(self.time_min, self.time_max, num_steps + 1, device=device)
+
+    def coefficients(self, time: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        std = self.flow.std(time=time, x_start=None, x_end=None)
+        return time, torch.zeros_like(time), std
+
+    def initial_state(self, prior_mean: torch.Tensor) -> torch.Tensor:
+        return torch.randn_like(prior_mean) * self.flow.sigma_start
+
+    def data_prediction(
+        self, estimate: torch.Tensor, state: torch.Tensor, prior_mean: torch.Tensor, time: torch.Tensor
+    ) -> torch.Tensor:
+        # For x_t = t * x_end + s(t) * z, the vector field is v = x_end + s'(t) * z
+        std = self.flow.std(time=time, x_start=None, x_end=None)
+        std_derivative = self.flow.sigma_end - self.flow.sigma_start
+        scale = (std - std_derivative * time).view(-1, 1, 1, 1)
+        return (std.view(-1, 1, 1, 1) * estimate - std_derivative * state) / scale
+
+
+class ScoreBasedODEProcess(ODEProcess):
+    """Probability flow ODE for the Ornstein-Uhlenbeck SDE, as in `ScoreBasedGenerativeAudioToAudioModel`.
+
+    The estimator predicts the score, which is converted to a prediction of the clean signal using
+    Tweedie's formula. The last step goes to time zero, so the output is the denoised estimate.
+
+    Args:
+        sde: forward SDE used to train the model
+    """
+
+    def __init__(self, sde: OrnsteinUhlenbeckVarianceExplodingSDE):
+        self.sde = sde
+
+    def time_steps(self, num_steps: int, device: torch.device) -> torch.Tensor:
+        time_steps = torch.linspace(self.sde.time_max, self.sde.time_min, num_steps + 1, device=device)
+        time_steps[-1] = 0.0
+        return time_steps
+
+    def coefficients(self, time: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        weight = torch.exp(-self.sde.stiffness * time)
+        return weight, 1 - weight, self.sde.perturb_kernel_std(time=time)
+
+    def initial_state(self, prior_mean: torch.Tensor) -> torch.Tensor:
+        return self.sde.prior_sampling(prior_mean=prior_mean)
+
+    def data_prediction(
+        self, estimate: torch.Tensor, state: torch.Tensor, prior_mean: torch.Tensor, time: torch.Tensor
+    ) -> torch.Tensor:
+        a, b, s = (c.view(-1, 1, 1, 1) for c in self.coefficients(time))
+        return (state - b * prior_mean + s**2 * estimate) / a
+
+
+class SchroedingerBridgeODEProcess(ODEProcess):
+    """ODE for the Schrödinger bridge, as in `SchroedingerBridgeAudioToAudioModel`.
+
+    The estimator predicts the data directly. The first-order solver uses the same update as the ODE
+    sampler in `SBSampler` with `estimator_time='previous'`, but it is evaluated using the residual
+    of the current state, which avoids cancellation of large weights in the first step.
+
+    Args:
+        noise_schedule: noise schedule for the bridge, including `time_min` and `time_max` for sampling
+    """
+
+    def __init__(self, noise_schedule: SBNoiseSchedule):
+        self.noise_schedule = noise_schedule
+
+    def time_steps(self, num_steps: int, device: torch.device) -> torch.Tensor:
+        return torch.linspace(self.noise_schedule.time_max, self.noise_schedule.time_min, num_steps + 1, device=device)
+
+    def coefficients(self, time: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        alpha, _, alpha_t_max = self.noise_schedule.get_alphas(time)
+        sigma, sigma_bar, sigma_t_max = self.noise_schedule.get_sigmas(time)
+        a = alpha * sigma_bar**2 / sigma_t_max**2
+        b = alpha * sigma**2 / (alpha_t_max * sigma_t_max**2)
+        s = alpha * sigma * sigma_bar / sigma_t_max
+        return a, b, s
+
+    def initial_state(self, prior_mean: torch.Tensor) -> torch.Tensor:
+        return prior_mean
+
+    def data_prediction(
+        self, estimate: torch.Tensor, state: torch.Tensor, prior_mean: torch.Tensor, time: torch.Tensor
+    ) -> torch.Tensor:
+        return estimate
+
+
+class FewStepODESampler:
+    """Few-step sampler for generative audio-to-audio models.
+
+    The conditioning input (e.g., the encoded noisy signal) is fixed for each utterance. If the estimator
+    provides `cache_input_condition` and `forward_cached`, the conditioning path is computed once per
+    utterance and reused in every step. Otherwise, the conditioning is concatenated to the state in each step.
+
+    Supported solvers:
+        - `ddim`: first-order exponential integrator, one estimator evaluation per step
+        - `heun`: second-order predictor-corrector (trapezoidal), two estimator evaluations per step
+        - `dpm2m`: second-order multistep DPM-Solver++(2M), one estimator evaluation per step
+
+    The number of steps can be set per example in the batch. Examples with fewer steps
+    are removed from the batch once they are finished.
+
+    Args:
+        estimator: neural estimator
+        process: ODE process defining the marginal and the data prediction
+        num_steps: default number of steps
+        solver: one of `ddim`, `heun` or `dpm2m`
+        eps: small regularization to prevent division by zero
+    """
+
+    SOLVERS = ('ddim', 'heun', 'dpm2m')
+
+    def __init__(
+        self,
+        estimator: torch.nn.Module,
+        process: ODEProcess,
+        num_steps: int = 4,
+        solver: str = 'dpm2m',
+        eps: float = 1e-8,
+    ):
+        if num_steps <= 0:
+            raise ValueError(f'Expected num_steps > 0, got {num_steps}')
+        if solver not in self.SOLVERS:
+            raise ValueError(f'Unexpected solver: {solver}, expected one of {self.SOLVERS}')
+
+        self.estimator = estimator
+        self.process = process
+        self.num_steps = num_steps
+        self.solver = solver
+        self.eps = eps
+
+        logging.debug('Initialized %s with', self.__class__.__name__)
+        logging.debug('\tprocess:   %s', self.process.__class__.__name__)
+        logging.debug('\tnum_steps: %s', self.num_steps)
+        logging.debug('\tsolver:    %s', self.solver)
+        logging.debug('\teps:       %s', self.eps)
+
+    @property
+    def use_condition_cache(self) -> bool:
+        """Whether the estimator supports caching of the conditioning input."""
+        return hasattr(self.estimator, 'cache_input_condition') and hasattr(self.estimator, 'forward_cached')
+
+    def __call__(self, *args, **kwargs):
+        return self.forward(*args, **kwargs)
+
+    @torch.inference_mode()
+    def forward(
+        self,
+        prior_mean: torch.Tensor,
+        estimator_condition: Optional[torch.Tensor] = None,
+        state_length: Optional[torch.Tensor] = None,
+        num_steps: Optional[Union[int, Sequence[int], torch.Tensor]] = None,
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        """Generate a sample by solving the ODE.
+
+        Args:
+            prior_mean: prior mean, e.g., the encoded noisy input, shape (B, C, D, T)
+            estimator_condition: conditioning for the estimator, concatenated to the state along the channel dimension
+            state_length: length of the valid time steps for each example in the batch, shape (B,)
+            num_steps: number of steps, either a single value or one value for each example in the batch.
+                Defaults to `self.num_steps`.
+
+        Returns:
+            Generated `sample` and the corresponding `sample_length`.
+        """
+        batch_size = prior_mean.size(0)
+        num_steps = self._get_num_steps(num_steps, batch_size=batch_size, device=prior_mean.device)
+        time_steps = self._get_time_steps(num_steps)
+
+        # The conditioning does not change across steps
+        if estimator_condition is not None and self.use_condition_cache:
+            condition = self.estimator.cache_input_condition(input_condition=estimator_condition)
+        else:
+            condition = estimator_condition
+
+        state = self.process.initial_state(prior_mean)
+        if state_length is not None:
+            state = mask_sequence_tensor(state, state_length)
+
+        # Values from the previous step for the multistep solver
+        estimate_prev, lambda_prev = None, None
+
+        for step in range(int(num_steps.max())):
+            # Only examples which are not finished are processed
+            index = torch.nonzero(num_steps > step).squeeze(1)
+            active = len(index) < batch_size
+
+            step_state = state[index] if active else state
+            step_prior_mean = prior_mean[index] if active else prior_mean
+            step_condition = _select_batch(condition, index) if active else condition
+            step_length = state_length[index] if active and state_length is not None else state_length
+
+            time = time_steps[index, step]
+            time_next = time_steps[index, step + 1]
+            final = num_steps[index] == step + 1
+
+            estimate = self._data_prediction(
+                state=step_state,
+                prior_mean=step_prior_mean,
+                condition=step_condition,
+                state_length=step_length,
+                time=time,
+            )
+
+            if self.solver == 'heun':
+                estimate = self._heun_correction(
+                    state=step_state,
+                    estimate=estimate,
+                    prior_mean=step_prior_mean,
+                    condition=step_condition,
+                    state_length=step_length,
+                    time=time,
+                    time_next=time_next,
+                )
+            elif self.solver == 'dpm2m':
+                lambda_curr = self._log_snr(time)
+                estimate_curr = estimate
+                if step > 0:
+                    estimate = self._multistep_correction(
+                        estimate=estimate,
+                        estimate_prev=estimate_prev[index] if active else estimate_prev,
+                        lambda_prev=lambda_prev[index] if active else lambda_prev,
+                        lambda_curr=lambda_curr,
+                        lambda_next=self._log_snr(time_next),
+                        final=final,
+                    )
+                # Keep the full batch, finished examples are never used again
+                estimate_prev = _update_batch(estimate_prev, estimate_curr, index, active, batch_size)
+                lambda_prev = _update_batch(lambda_prev, lambda_curr, index, active, batch_size)
+
+            step_state = self._first_order_step(
+                state=step_state, estimate=estimate, prior_mean=step_prior_mean, time=time, time_next=time_next
+            )
+
+            if step_length is not None:
+                step_state = mask_sequence_tensor(step_state, step_length)
+
+            if active:
+                state = state.index_copy(0, index, step_state)
+            else:
+                state = step_state
+
+        return state, state_length
+
+    def _get_num_steps(
+        self, num_steps: Optional[Union[int, Sequence[int], torch.Tensor]], batch_size: int, device: torch.device
+    ) -> torch.Tensor:
+        """Return the number of steps for each example in the batch."""
+        if num_steps is None:
+            num_steps = self.num_steps
+
+        if isinstance(num_steps, int):
+            num_steps = [num_steps] * batch_size
+
+        num_steps = torch.as_tensor(num_steps, dtype=torch.long, device=device)
+
+        if num_steps.shape != (batch_size,):
+            raise ValueError(f'Expected num_steps with shape ({batch_size},), got {tuple(num_steps.shape)}')
+        if torch.any(num_steps <= 0):
+            raise ValueError(f'Expected num_steps > 0, got {num_steps.tolist()}')
+
+        return num_steps
+
+    def _get_time_steps(self, num_steps: torch.Tensor) -> torch.Tensor:
+        """Return time steps for each example, padded with the final time to the maximum number of steps."""
+        max_steps = int(num_steps.max())
+        time_steps = torch.empty(len(num_steps), max_steps + 1, device=num_steps.device)
+
+        for n in torch.unique(num_steps).tolist():
+            item_time_steps = self.process.time_steps(num_steps=n, device=num_steps.device)
+            item_time_steps = torch.cat([item_time_steps, item_time_steps[-1:].expand(max_steps - n)])
+            time_steps[num_steps == n] = item_time_steps
+
+        return time_steps
+
+    def _data_prediction(
+        self,
+        state: torch.Tensor,
+        prior_mean: torch.Tensor,
+        condition: Any,
+        state_length: Optional[torch.Tensor],
+        time: torch.Tensor,
+    ) -> torch.Tensor:
+        """Evaluate the estimator and return the data prediction."""
+        if condition is None:
+            estimate, _ = self.estimator(input=state, input_length=state_length, condition=time)
+        elif self.use_condition_cache:
+            estimate, _ = self.estimator.forward_cached(
+                input=state, input_condition_cache=condition, input_length=state_length, condition=time
+            )
+        else:
+            estimator_input = torch.cat([state, condition], dim=1)
+            estimate, _ = self.estimator(input=estimator_input, input_length=state_length, condition=time)
+
+        return self.process.data_prediction(estimate=estimate, state=state, prior_mean=prior_mean, time=time)
+
+    def _first_order_step(
+        self,
+        state: torch.Tensor,
+        estimate: torch.Tensor,
+        prior_mean: torch.Tensor,
+        time: torch.Tensor,
+        time_next: torch.Tensor,
+    ) -> torch.Tensor:
+        """Move from `time` to `time_next` assuming the data prediction is constant along the step."""
+        a, b, s = self.process.coefficients(time)
+        a_next, b_next, s_next = self.process.coefficients(time_next)
+
+        a, b, s, a_next, b_next, s_next = (c.view(-1, 1, 1, 1) for c in (a, b, s, a_next, b_next, s_next))
+
+        # Noise estimated from the current state is carried over to the next state.
+        # The residual is computed first to avoid cancellation when `s` is close to zero.
+        residual = state - a * estimate - b * prior_mean
+
+        return a_next * estimate + b_next * prior_mean + s_next / (s + self.eps) * residual
+
+    def _heun_correction(
+        self,
+        state: torch.Tensor,
+        estimate: torch.Tensor,
+        prior_mean: torch.Tensor,
+        condition: Any,
+        state_length: Optional[torch.Tensor],
+        time: torch.Tensor,
+        time_next: torch.Tensor,
+    ) -> torch.Tensor:
+        """Average the data prediction at the current time and at the predicted next state.
+
+        The correction is skipped for steps ending at a noise-free state.
+        """
+        _, _, s_next = self.process.coefficients(time_next)
+        index = torch.nonzero(s_next > self.eps).squeeze(1)
+
+        if len(index) == 0:
+            return estimate
+
+        predicted = self._first_order_step(
+            state=state[index],
+            estimate=estimate[index],
+            prior_mean=prior_mean[index],
+            time=time[index],
+            time_next=time_next[index],
+        )
+        estimate_next = self._data_prediction(
+            state=predicted,
+            prior_mean=prior_mean[index],
+            condition=_select_batch(condition, index),
+            state_length=state_length[index] if state_length is not None else None,
+            time=time_next[index],
+        )
+
+        return estimate.index_copy(0, index, (estimate[index] + estimate_next) / 2)
+
+    def _log_snr(self, time: torch.Tensor) -> torch.Tensor:
+        """Return log(a / s) for the given time."""
+        a, _, s = self.process.coefficients(time)
+        return torch.log(a.clamp(min=self.eps)) - torch.log(s.clamp(min=self.eps))
+
+    def _multistep_correction(
+        self,
+        estimate: torch.Tensor,
+        estimate_prev: torch.Tensor,
+        lambda_prev: torch.Tensor,
+        lambda_curr: torch.Tensor,
+        lambda_next: torch.Tensor,
+        final: torch.Tensor,
+    ) -> torch.Tensor:
+        """Second-order extrapolation of the data prediction using the previous step.
+
+        The final step for each example uses the first-order update.
+        """
+        h = lambda_next - lambda_curr
+        h_prev = lambda_curr - lambda_prev
+        # 1 / (2 r), where r = h_prev / h
+        weight = h / (2 * h_prev + self.eps)
+        weight = torch.where(final, torch.zeros_like(weight), weight).view(-1, 1, 1, 1)
+        return estimate + weight * (estimate - estimate_prev)
+
+
+def _select_batch(value: Any, index: torch.Tensor) -> Any:
+    """Select examples from a tensor or a list of tensors."""
+    if value is None:
+        return None
+    if isinstance(value, torch.Tensor):
+        return value[index]
+    return [v[index] for v in value]
+
+
+def _update_batch(
+    value: Optional[torch.Tensor], update: torch.Tensor, index: torch.Tensor, active: bool, batch_size: int
+) -> torch.Tensor:
+    """Write `update` to `value` at `index`, allocating `value` for the full batch if necessary."""
+    if not active:
+        return update
+    if value is None:
+        value = torch.zeros(batch_size, *update.shape[1:], dtype=update.dtype, device=update.device)
+    return value.index_copy(0, index, update)
@@ -496,7 +496,63 @@ class SpectrogramTransformerUNet(NeuralModule):
         input = einops.rearrange(input_real_imag, 'B C RI D T -> B T (C RI D)')
 
         x = self.proj_in(input)
-        key_padding_mask = self._get_key_padding_mask(input_length, max_length=T)
+
+        return self._forward_projected(x=x, input_length=input_length, condition=condition)
+
+    def cache_input_condition(self, input_condition: torch.Tensor) -> torch.Tensor:
+        """Precompute the contribution of a fixed conditioning input to the input projection.
+
+        The estimator input is a channel-wise concatenation of the current state and a conditioning signal,
+        e.g., the encoded noisy input. Since `self.proj_in` is linear, the conditioning channels can be
+        projected once and reused across all sampler steps, see `forward_cached`.
+
+        Args:
+            input_condition: conditioning tensor, shape (B, C_cond, D, T)
+
+        Returns:
+            Projected conditioning including the projection bias, shape (B, T, dim)
+        """
+        num_state_channels = self.in_channels - input_condition.size(1)
+        if num_state_channels < 1:
+            raise RuntimeError(
+                f'Unexpected condition channel size {input_condition.size(1)}, expected less than {self.in_channels}'
+            )
+
+        condition_real_imag = torch.stack([input_condition.real, input_condition.imag], dim=2)
+        condition = einops.rearrange(condition_real_imag, 'B C RI D T -> B T (C RI D)')
+
+        # Input features are ordered as (C RI D), with the conditioning channels after the state channels
+        weight = self.proj_in.weight[:, -condition.size(-1) :]
+        return F.linear(condition, weight, self.proj_in.bias)
+
+    def forward_cached(
+        self,
+        input: torch.Tensor,
+        input_condition_cache: torch.Tensor,
+        input_length: Optional[torch.Tensor] = None,
+        condition: Optional[torch.Tensor] = None,
+    ):
+        """Forward pass with a precomputed conditioning input.
+
+        This is equivalent to calling `forward` on the concatenation of `input` and
+        the conditioning used to compute `input_condition_cache`.
+
+        Args:
+            input: state tensor without the conditioning channels, shape (B, C_state, D, T)
+            input_condition_cache: output of `cache_input_condition`, shape (B, T, dim)
+            input_length: length of the valid time steps for each example in the batch, shape (B,)
+            condition: scalar condition (time) for the model, will be embedded using `self.time_embedding`
+        """
+        input_real_imag = torch.stack([input.real, input.imag], dim=2)
+        input = einops.rearrange(input_real_imag, 'B C RI D T -> B T (C RI D)')
+
+        x = F.linear(input, self.proj_in.weight[:, : input.size(-1)]) + input_condition_cache
+
+        return self._forward_projected(x=x, input_length=input_length, condition=condition)
+
+    def _forward_projected(self, x: torch.Tensor, input_length: torch.Tensor, condition: Optional[torch.Tensor]):
+        """Process the projected input of shape (B, T, dim) and return the complex-valued output."""
+        key_padding_mask = self._get_key_padding_mask(input_length, max_length=x.size(1))
         x = self.conv_embed(x, mask=key_padding_mask) + x
 
         if condition is None:
@@ -507,7 +563,7 @@ class SpectrogramTransformerUNet(NeuralModule):
         x = self.transformerunet(x=x, key_padding_mask=key_padding_mask, adaptive_rmsnorm_cond=time_emb)
 
         output = self.proj_out(x)
-        output = einops.rearrange(output, "B T (C RI D) -> B C D T RI", C=self.out_channels, RI=2, D=D)
+        output = einops.rearrange(output, "B T (C RI D) -> B C D T RI", C=self.out_channels, RI=2)
         output = torch.view_as_complex(output.contiguous())
 
         return output, input_length
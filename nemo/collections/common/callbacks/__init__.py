@@ -12,5 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from nemo.collections.common.callbacks.adaptive_batch_size import AdaptiveBucketBatchSizeCallback
 from nemo.collections.common.callbacks.callbacks import LogEpochTimeCallback
 from nemo.collections.common.callbacks.ema import EMA
@@ -0,0 +1,141 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from time import perf_counter
+from typing import Any
+
+import torch
+from lhotse.dataset import IterableDatasetWrapper
+from lightning.pytorch.callbacks import Callback
+
+from nemo.collections.common.data.lhotse.adaptive_batch_size import (
+    AdaptiveBatchSizeController,
+    AdaptiveBucketBatchSizes,
+)
+from nemo.utils import logging
+
+
+class AdaptiveBucketBatchSizeCallback(Callback):
+    """
+    Adjusts the per-bucket batch sizes of a Lhotse training dataloader created with
+    ``adaptive_bucket_batch_size=True`` and ``bucket_batch_size`` (e.g., estimated by the OOMptimizer),
+    based on the peak GPU memory and the duration of each training step.
+    See :class:`~nemo.collections.common.data.lhotse.adaptive_batch_size.AdaptiveBatchSizeController`
+    for the update rule. In distributed training, the measurements are combined across ranks, so that all ranks
+    use the same batch sizes. The state of the controller is saved in checkpoints.
+
+    Args:
+        memory_fraction: target peak memory as a fraction of the total device memory.
+        update_interval: number of steps observed in a bucket before its batch size is updated.
+        growth_factor: maximum relative increase of a batch size in a single update.
+        min_speedup: minimum relative improvement of throughput to keep increasing a batch size.
+        min_batch_size: lower bound of batch sizes.
+        max_batch_size_factor: upper bound of batch sizes relative to ``bucket_batch_size``.
+    """
+
+    def __init__(
+        self,
+        memory_fraction: float = 0.9,
+        update_interval: int = 10,
+        growth_factor: float = 1.25,
+        min_speedup: float = 0.02,
+        min_batch_size: int = 1,
+        max_batch_size_factor: float = 4.0,
+    ):
+        assert 0.0 < memory_fraction <= 1.0, f"{memory_fraction=}"
+        self.memory_fraction = memory_fraction
+        self.controller_kwargs = dict(
+            update_interval=update_interval,
+            growth_factor=growth_factor,
+            min_speedup=min_speedup,
+            min_batch_size=min_batch_size,
+            max_batch_size_factor=max_batch_size_factor,
+        )
+        self.controller = None
+        self._restored_state = None
+        self._static_memory = 0
+        self._step_start = None
+
+    def on_train_epoch_start(self, trainer, pl_module):
+        batch_sizes = _find_adaptive_batch_sizes(trainer.train_dataloader)
+        if batch_sizes is None or not torch.cuda.is_available():
+            if self.controller is None:
+                logging.warning(
+                    "AdaptiveBucketBatchSizeCallback is disabled: it requires CUDA and a Lhotse dataloader "
+                    "created with adaptive_bucket_batch_size=True."
+                )
+            self.controller = None
+            return
+        if self.controller is None or self.controller.batch_sizes is not batch_sizes:
+            # All ranks must use the same budget to make the same updates (see observe_all_ranks).
+            memory_budget = torch.tensor(
+                self.memory_fraction * torch.cuda.get_device_properties(pl_module.device).total_memory,
+                dtype=torch.float64,
+                device=pl_module.device,
+            )
+            if torch.distributed.is_available() and torch.distributed.is_initialized():
+                torch.distributed.all_reduce(memory_budget, op=torch.distributed.ReduceOp.MIN)
+            self.controller = AdaptiveBatchSizeController(
+                batch_sizes, memory_budget=memory_budget.item(), **self.controller_kwargs
+            )
+            if self._restored_state is not None:
+                self.controller.load_state_dict(self._restored_state)
+                self._restored_state = None
+
+    def on_train_batch_start(self, trainer, pl_module, batch, batch_idx):
+        if self.controller is None:
+            return
+        torch.cuda.synchronize()
+        torch.cuda.reset_peak_memory_stats()
+        self._static_memory = torch.cuda.memory_allocated()
+        self._step_start = perf_counter()
+
+    def on_train_batch_end(self, trainer, pl_module, outputs, batch, batch_idx):
+        if self.controller is None or self._step_start is None:
+            return
+        torch.cuda.synchronize()
+        step_time = perf_counter() - self._step_start
+        self._step_start = None
+        # The measurements are combined across ranks, so that all ranks keep the same batch sizes.
+        self.controller.observe_all_ranks(
+            self.controller.batch_sizes.pop_batch_info(),
+            peak_memory=torch.cuda.max_memory_allocated(),
+            static_memory=self._static_memory,
+            step_time=step_time,
+            device=pl_module.device,
+        )
+
+    def state_dict(self) -> dict[str, Any]:
+        if self.controller is not None:
+            return self.controller.state_dict()
+        return self._restored_state or {}
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        if not state_dict:
+            return
+        if self.controller is not None:
+            self.controller.load_state_dict(state_dict)
+        else:
+            # The dataloader is not created yet; the state is restored at the start of training epoch.
+            self._restored_state = state_dict
+
+
+def _find_adaptive_batch_sizes(dataloader) -> AdaptiveBucketBatchSizes | None:
+    if not isinstance(dataloader, torch.utils.data.DataLoader):
+        return None
+    if isinstance(dataloader.dataset, IterableDatasetWrapper):
+        sampler = dataloader.dataset.sampler
+    else:
+        sampler = dataloader.sampler
+    batch_sizes = getattr(getattr(sampler, "constraint", None), "batch_sizes", None)
+    return batch_sizes if isinstance(batch_sizes, AdaptiveBucketBatchSizes) else None
@@ -0,0 +1,369 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import torch
+from lhotse import CutSet
+from lhotse.dataset import IterableDatasetWrapper
+
+from nemo.utils import logging
+
+
+class AdaptiveBucketBatchSizes(Sequence):
+    """
+    Per-bucket batch sizes which can be updated during training, used as ``batch_sizes``
+    of :class:`~nemo.collections.common.data.lhotse.sampling.FixedBucketBatchSizeConstraint2D`.
+
+    The batch sizes are stored in shared memory, so that an update made in the training process
+    is visible to the samplers running in dataloading workers. Copies of a sampling constraint made by
+    Lhotse samplers keep referring to the same batch sizes.
+
+    The samplers also record the bucket index and size of each sampled mini-batch (see :func:`record_bucket`),
+    which allows the training process to attribute its measurements to buckets (see :meth:`pop_batch_info`).
+    There is one log of mini-batches per sampler replica, i.e., per dataloading worker for iterable datasets.
+    Each sampler replica starts a new generation of its log when a dataloader iterator is created
+    (see :meth:`start_iteration`), so that the mini-batches sampled for a previous iterator, e.g., prefetched
+    and discarded at the end of an epoch, are skipped. Within a generation, the mini-batches are assumed to be
+    consumed in the order of PyTorch DataLoader, i.e., round-robin over the workers which are not exhausted.
+
+    Args:
+        batch_sizes: initial batch size of each bucket.
+        num_batch_logs: number of sampler replicas.
+        batch_log_size: capacity of the log of each sampler replica.
+    """
+
+    def __init__(self, batch_sizes: Sequence[int], num_batch_logs: int = 1, batch_log_size: int = 1024):
+        self.initial_batch_sizes = [int(bs) for bs in batch_sizes]
+        self._batch_sizes = torch.tensor(self.initial_batch_sizes, dtype=torch.long).share_memory_()
+        # Ring buffers with (generation, bucket_idx, num_examples) of sampled mini-batches.
+        self._batch_log = torch.zeros(num_batch_logs, batch_log_size, 3, dtype=torch.long).share_memory_()
+        self._write_pos = torch.zeros(num_batch_logs, dtype=torch.long).share_memory_()
+        self._generations = torch.zeros(num_batch_logs, dtype=torch.long).share_memory_()
+        # Reading state is only used in the training process.
+        self._read_pos = [0] * num_batch_logs
+        self._read_generation = 0
+        self._next_log_idx = 0
+
+    def __getitem__(self, bucket_idx: int) -> int:
+        return int(self._batch_sizes[bucket_idx])
+
+    def __len__(self) -> int:
+        return len(self._batch_sizes)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.tolist()})"
+
+    def __deepcopy__(self, memo) -> "AdaptiveBucketBatchSizes":
+        # Lhotse samplers copy the sampling constraint for each bucket; all copies need to see the updates.
+        return self
+
+    def tolist(self) -> list[int]:
+        return self._batch_sizes.tolist()
+
+    def set(self, bucket_idx: int, batch_size: int) -> None:
+        self._batch_sizes[bucket_idx] = batch_size
+
+    @property
+    def num_batch_logs(self) -> int:
+        return self._batch_log.shape[0]
+
+    def _get_log_idx(self) -> int:
+        worker_info = torch.utils.data.get_worker_info()
+        return worker_info.id % self.num_batch_logs if worker_info is not None else 0
+
+    def start_iteration(self) -> None:
+        """Start a new generation of the log. Called when a dataloader iterator is created, possibly in a worker."""
+        self._generations[self._get_log_idx()] += 1
+
+    def record_batch(self, bucket_idx: int, num_examples: int) -> None:
+        """Record a sampled mini-batch. Called by the sampler, possibly in a dataloading worker."""
+        log_idx = self._get_log_idx()
+        pos = int(self._write_pos[log_idx])
+        entry = torch.tensor([int(self._generations[log_idx]), bucket_idx, num_examples])
+        self._batch_log[log_idx, pos % self._batch_log.shape[1]] = entry
+        self._write_pos[log_idx] = pos + 1
+
+    def pop_batch_info(self) -> tuple[int, int] | None:
+        """
+        Return ``(bucket_idx, num_examples)`` of the next mini-batch consumed by the training loop,
+        or ``None`` when it's not known (e.g., the log has been overwritten).
+        """
+        generation = int(self._generations[0])
+        if generation != self._read_generation:
+            # A new dataloader iterator was created; it starts with the first sampler replica.
+            self._read_generation = generation
+            self._next_log_idx = 0
+        # The mini-batch comes from the first replica (in round-robin order) with a pending entry,
+        # as the entries are written before the mini-batches are returned by the sampler.
+        # Replicas without pending entries are exhausted and skipped by the DataLoader as well.
+        for offset in range(self.num_batch_logs):
+            log_idx = (self._next_log_idx + offset) % self.num_batch_logs
+            batch_info = self._pop_log_entry(log_idx)
+            if batch_info is not None:
+                self._next_log_idx = (log_idx + 1) % self.num_batch_logs
+                return batch_info
+        return None
+
+    def _pop_log_entry(self, log_idx: int) -> tuple[int, int] | None:
+        log_size = self._batch_log.shape[1]
+        write_pos = int(self._write_pos[log_idx])
+        # Entries older than ``log_size`` have been overwritten.
+        pos = max(self._read_pos[log_idx], write_pos - log_size)
+        while pos < write_pos:
+            generation, bucket_idx, num_examples = self._batch_log[log_idx, pos % log_size].tolist()
+            pos += 1
+            if generation == self._read_generation:
+                self._read_pos[log_idx] = pos
+                return bucket_idx, num_examples
+        self._read_pos[log_idx] = pos
+        return None
+
+
+class AdaptiveBatchSizeIterableDatasetWrapper(IterableDatasetWrapper):
+    """
+    :class:`~lhotse.dataset.IterableDatasetWrapper` which starts a new generation of the mini-batch log
+    of :class:`AdaptiveBucketBatchSizes` in each dataloading worker whenever a dataloader iterator is created.
+    """
+
+    def __iter__(self):
+        self.sampler.constraint.batch_sizes.start_iteration()
+        return super().__iter__()
+
+
+class AdaptiveBatchSizeDataLoader(torch.utils.data.DataLoader):
+    """
+    DataLoader which starts a new generation of the mini-batch log of :class:`AdaptiveBucketBatchSizes`
+    whenever an iterator is created. Used with map-style datasets, i.e., when the sampler lives in
+    the training process.
+    """
+
+    def __iter__(self):
+        self.sampler.constraint.batch_sizes.start_iteration()
+        return super().__iter__()
+
+
+def record_bucket(cuts: CutSet, constraint) -> CutSet:
+    """
+    Sampler transform recording the bucket of each mini-batch in ``constraint.batch_sizes``,
+    which must be :class:`AdaptiveBucketBatchSizes`. Each mini-batch is sampled from a single bucket.
+    """
+    bucket_idx = constraint.select_bucket(constraint.max_seq_len_buckets, example=next(iter(cuts)))
+    constraint.batch_sizes.record_batch(bucket_idx, len(cuts))
+    return cuts
+
+
+@dataclass
+class _BucketStats:
+    # Measurements in the current update window.
+    num_steps: int = 0
+    num_examples: int = 0
+    step_time: float = 0.0
+    max_memory_per_example: float = 0.0
+    max_static_memory: float = 0.0
+    # Throughput (examples/s) observed with the previous batch size.
+    prev_batch_size: int | None = None
+    prev_throughput: float | None = None
+    # Upper bound found by the controller, e.g., when a larger batch size did not improve throughput.
+    max_batch_size: int | None = None
+
+    def reset_window(self) -> None:
+        self.num_steps = 0
+        self.num_examples = 0
+        self.step_time = 0.0
+        self.max_memory_per_example = 0.0
+        self.max_static_memory = 0.0
+
+
+class AdaptiveBatchSizeController:
+    """
+    Feedback controller adjusting per-bucket batch sizes based on the peak memory and duration of training steps.
+
+    For each bucket, the measurements are collected over ``update_interval`` steps. Then, the largest batch size
+    that fits ``memory_budget`` is extrapolated from the peak memory per example, assuming that memory grows
+    linearly with the batch size on top of the static memory (model weights, gradients and optimizer states).
+    The batch size grows by at most ``growth_factor`` per update while it fits the memory budget and improves
+    the throughput by at least ``min_speedup``; otherwise, the previous batch size is kept as the upper bound.
+    When a step exceeds the memory budget, the batch size of its bucket is decreased immediately.
+
+    Args:
+        batch_sizes: batch sizes used by the sampler.
+        memory_budget: target peak memory in bytes, which should leave a safety margin below the device memory.
+        update_interval: number of steps observed in a bucket before its batch size is updated.
+        growth_factor: maximum relative increase of a batch size in a single update.
+        min_speedup: minimum relative improvement of throughput to keep increasing a batch size.
+        min_batch_size: lower bound of batch sizes.
+        max_batch_size_factor: upper bound of batch sizes relative to the initial batch sizes.
+    """
+
+    def __init__(
+        self,
+        batch_sizes: AdaptiveBucketBatchSizes,
+        memory_budget: float,
+        update_interval: int = 10,
+        growth_factor: float = 1.25,
+        min_speedup: float = 0.02,
+        min_batch_size: int = 1,
+        max_batch_size_factor: float = 4.0,
+    ):
+        assert update_interval > 0, f"{update_interval=}"
+        assert growth_factor > 1.0, f"{growth_factor=}"
+        self.batch_sizes = batch_sizes
+        self.memory_budget = memory_budget
+        self.update_interval = update_interval
+        self.growth_factor = growth_factor
+        self.min_speedup = min_speedup
+        self.min_batch_size = min_batch_size
+        self.max_batch_sizes = [max(min_batch_size, int(bs * max_batch_size_factor)) for bs in batch_sizes]
+        self.buckets = [_BucketStats() for _ in range(len(batch_sizes))]
+
+    def observe(
+        self, bucket_idx: int, num_examples: int, peak_memory: float, static_memory: float, step_time: float
+    ) -> None:
+        """
+        Record the measurements of a training step on a mini-batch from ``bucket_idx`` bucket,
+        and update the batch size of this bucket if needed.
+
+        Args:
+            bucket_idx: bucket of the mini-batch.
+            num_examples: number of examples in the mini-batch.
+            peak_memory: peak memory allocated during the step in bytes.
+            static_memory: memory allocated before the step in bytes.
+            step_time: duration of the step in seconds.
+        """
+        if num_examples <= 0:
+            return
+        stats = self.buckets[bucket_idx]
+        memory_per_example = max(peak_memory - static_memory, 0) / num_examples
+        if peak_memory > self.memory_budget:
+            self._set(
+                bucket_idx,
+                min(num_examples - 1, self._max_batch_size_in_budget(memory_per_example, static_memory)),
+            )
+            # Don't try to grow this bucket again.
+            stats.max_batch_size = self.batch_sizes[bucket_idx]
+            stats.prev_batch_size = stats.prev_throughput = None
+            stats.reset_window()
+            return
+
+        stats.num_steps += 1
+        stats.num_examples += num_examples
+        stats.step_time += step_time
+        stats.max_memory_per_example = max(stats.max_memory_per_example, memory_per_example)
+        stats.max_static_memory = max(stats.max_static_memory, static_memory)
+        if stats.num_steps >= self.update_interval:
+            self._update(bucket_idx)
+
+    def observe_all_ranks(
+        self,
+        batch_info: tuple[int, int] | None,
+        peak_memory: float,
+        static_memory: float,
+        step_time: float,
+        device: torch.device | None = None,
+    ) -> None:
+        """
+        Combine the measurements of a training step from all distributed ranks and record them with :meth:`observe`.
+
+        Each rank has its own sampler, so the batch sizes must be updated identically on all ranks.
+        Otherwise, map-style samplers (which split a common stream of mini-batches between the ranks) would
+        overlap or skip data, and the ranks could run a different number of steps.
+        The measurements are all-reduced per bucket with their worst case (maximum), so that controllers which
+        start from the same state make the same updates on every rank. This method must be called
+        on every rank at every step, also when ``batch_info`` (see :meth:`AdaptiveBucketBatchSizes.pop_batch_info`)
+        is ``None``.
+
+        Args:
+            batch_info: ``(bucket_idx, num_examples)`` of the mini-batch of this rank, if known.
+            peak_memory: peak memory allocated during the step in bytes.
+            static_memory: memory allocated before the step in bytes.
+            step_time: duration of the step in seconds.
+            device: device of the tensor used for the collective operation, e.g., CUDA device for NCCL.
+        """
+        # Each row: num_examples, memory_per_example, static_memory, step_time.
+        measurements = torch.zeros(len(self.batch_sizes), 4, dtype=torch.float64, device=device)
+        if batch_info is not None and batch_info[1] > 0:
+            bucket_idx, num_examples = batch_info
+            memory_per_example = max(peak_memory - static_memory, 0) / num_examples
+            measurements[bucket_idx] = torch.tensor(
+                [num_examples, memory_per_example, static_memory, step_time], dtype=torch.float64
+            )
+        if torch.distributed.is_available() and torch.distributed.is_initialized():
+            torch.distributed.all_reduce(measurements, op=torch.distributed.ReduceOp.MAX)
+        for bucket_idx, (num_examples, memory_per_example, static_memory, step_time) in enumerate(
+            measurements.tolist()
+        ):
+            if num_examples > 0:
+                self.observe(
+                    bucket_idx,
+                    num_examples=int(num_examples),
+                    peak_memory=static_memory + memory_per_example * num_examples,
+                    static_memory=static_memory,
+                    step_time=step_time,
+                )
+
+    def _update(self, bucket_idx: int) -> None:
+        stats = self.buckets[bucket_idx]
+        batch_size = self.batch_sizes[bucket_idx]
+        throughput = stats.num_examples / max(stats.step_time, 1e-9)
+        if (
+            stats.prev_throughput is not None
+            and batch_size > stats.prev_batch_size
+            and throughput < stats.prev_throughput * (1.0 + self.min_speedup)
+        ):
+            # The larger batch size didn't pay off: go back and stop growing.
+            new_batch_size = stats.max_batch_size = stats.prev_batch_size
+        else:
+            new_batch_size = max(batch_size + 1, int(batch_size * self.growth_factor))
+        new_batch_size = min(
+            new_batch_size,
+            self.max_batch_sizes[bucket_idx],
+            stats.max_batch_size if stats.max_batch_size is not None else math.inf,
+            self._max_batch_size_in_budget(stats.max_memory_per_example, stats.max_static_memory),
+        )
+        if new_batch_size != batch_size:
+            stats.prev_batch_size, stats.prev_throughput = batch_size, throughput
+            self._set(bucket_idx, new_batch_size)
+        stats.reset_window()
+
+    def _max_batch_size_in_budget(self, memory_per_example: float, static_memory: float) -> int | float:
+        if memory_per_example <= 0:
+            return math.inf
+        return max(self.min_batch_size, int((self.memory_budget - static_memory) // memory_per_example))
+
+    def _set(self, bucket_idx: int, batch_size: int) -> None:
+        batch_size = max(self.min_batch_size, int(batch_size))
+        old_batch_size = self.batch_sizes[bucket_idx]
+        if batch_size != old_batch_size:
+            logging.info(f"Adaptive batch size: bucket {bucket_idx} batch size {old_batch_size} -> {batch_size}")
+            self.batch_sizes.set(bucket_idx, batch_size)
+
+    def state_dict(self) -> dict[str, Any]:
+        return {
+            "batch_sizes": self.batch_sizes.tolist(),
+            "max_batch_sizes": list(self.max_batch_sizes),
+            "buckets": [asdict(stats) for stats in self.buckets],
+        }
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        assert len(state_dict["batch_sizes"]) == len(self.batch_sizes), (
+            f"Cannot restore adaptive batch sizes for {len(state_dict['batch_sizes'])} buckets "
+            f"into a dataloader with {len(self.batch_sizes)} buckets."
+        )
+        for bucket_idx, batch_size in enumerate(state_dict["batch_sizes"]):
+            self.batch_sizes.set(bucket_idx, batch_size)
+        self.max_batch_sizes = list(state_dict["max_batch_sizes"])
+        self.buckets = [_BucketStats(**stats) for stats in state_dict["buckets"]]
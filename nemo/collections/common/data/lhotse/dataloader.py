@@ -38,6 +38,12 @@ from lhotse.lazy import LazyFlattener
 from lhotse.utils import fastcopy, fix_random_seed
 from omegaconf import DictConfig, OmegaConf
 
+from nemo.collections.common.data.lhotse.adaptive_batch_size import (
+    AdaptiveBatchSizeDataLoader,
+    AdaptiveBatchSizeIterableDatasetWrapper,
+    AdaptiveBucketBatchSizes,
+    record_bucket,
+)
 from nemo.collections.common.data.lhotse.cutset import (
     IncompleteConfigError,
     guess_parse_cutset,
@@ -94,6 +100,9 @@ class LhotseDataLoadingConfig:
     bucket_buffer_size: int = 10000
     concurrent_bucketing: bool = True  # fetches data in a background thread
     bucketing_2d_strict_mode: bool = True  # reduces padding by discarding significant outliers
+    # Adjusts bucket_batch_size during training based on the memory usage and step time.
+    # Requires AdaptiveBucketBatchSizeCallback in the trainer and is not supported with multi_config.
+    adaptive_bucket_batch_size: bool = False
     #   d. Other Lhotse sampling options.
     shuffle_buffer_size: int | None = 10000
     drop_last: bool = False
@@ -299,6 +308,14 @@ def get_lhotse_dataloader_from_single_config(
     )
 
     # 4. Creating dataloader.
+    dataset_wrapper_cls, dloader_cls = IterableDatasetWrapper, torch.utils.data.DataLoader
+    if config.adaptive_bucket_batch_size:
+        # Start a new generation of the mini-batch log of AdaptiveBucketBatchSizes with each dataloader iterator,
+        # in the process where the sampler lives.
+        if use_iterable_dataset:
+            dataset_wrapper_cls = AdaptiveBatchSizeIterableDatasetWrapper
+        else:
+            dloader_cls = AdaptiveBatchSizeDataLoader
     if use_iterable_dataset:
         # Wrapper here is necessary when using NeMo tarred data or Lhotse Shar data,
         # because then I/O happens upon sampler iteration. Normally, the sampler resides
@@ -308,7 +325,7 @@ def get_lhotse_dataloader_from_single_config(
         # worker_id, etc. to set a different random seed for each (node, worker) combination.
         # This together with infinite datasets removes the need to split data across nodes/workers.
         dloader_kwargs = dict(
-            dataset=IterableDatasetWrapper(dataset=dataset, sampler=sampler),
+            dataset=dataset_wrapper_cls(dataset=dataset, sampler=sampler),
             worker_init_fn=make_worker_init_fn(rank=global_rank, world_size=world_size, seed=config.seed),
             persistent_workers=config.num_workers > 0,  # helps Lhotse Shar maintain shuffling state
         )
@@ -317,7 +334,7 @@ def get_lhotse_dataloader_from_single_config(
         # reads only light-weight JSON objects; it samples mini-batches and passes
         # the meta-data to Dataset, which performs the actual I/O inside its __getitem__ method.
         dloader_kwargs = dict(dataset=dataset, sampler=sampler)
-    dloader = torch.utils.data.DataLoader(
+    dloader = dloader_cls(
         **dloader_kwargs,
         batch_size=None,
         num_workers=config.num_workers,
@@ -382,6 +399,10 @@ def get_lhotse_dataloader_from_multi_config(
         if isinstance(c, DictConfig) and name not in ("sampler_weights",)  # exclude dict opts
     }
 
+    assert not any(
+        c.get("adaptive_bucket_batch_size", False) for c in configs.values()
+    ), "adaptive_bucket_batch_size option is not supported with multi_config=True."
+
     source_samplers, source_use_iterable_dataset = {}, []
     for name, config in configs.items():
         try:
@@ -548,6 +569,16 @@ def get_lhotse_sampler_from_config(config, global_rank, world_size, tokenizer=No
     # Provides support for dynamic batch sizes, multimodal dataloading, 2D bucketing, etc.
     bucket_duration_bins = determine_bucket_duration_bins(config)
     cuts, constraint = determine_sampling_constraint(cuts, bucket_duration_bins, config)
+    if config.adaptive_bucket_batch_size:
+        assert (
+            config.bucket_batch_size is not None
+        ), "Cannot use adaptive_bucket_batch_size option if bucket_batch_size is not provided."
+        # The batch sizes are shared with the training process, which updates them.
+        # With iterable datasets, each dataloading worker has its own sampler replica that logs its mini-batches.
+        constraint.batch_sizes = AdaptiveBucketBatchSizes(
+            config.bucket_batch_size,
+            num_batch_logs=config.num_workers if use_iterable_dataset and config.num_workers > 0 else 1,
+        )
 
     # 3. The sampler.
     if config.use_bucketing:
@@ -594,6 +625,10 @@ def get_lhotse_sampler_from_config(config, global_rank, world_size, tokenizer=No
             world_size=1 if use_iterable_dataset else world_size,
         )
 
+    if config.adaptive_bucket_batch_size:
+        # Lets the training process know which bucket each mini-batch comes from.
+        sampler = sampler.map(partial(record_bucket, constraint=constraint))
+
     if config.concatenate_samples:
         # Cut concatenation will produce longer samples out of shorter samples
         # by gluing them together from the shortest to longest not to exceed a duration
@@ -755,9 +790,14 @@ def make_structured_with_schema_warnings(config: Union[DictConfig, dict]) -> Dic
 def tokenize(example, tokenizer):
     """Return the text in the example according to the provided tokenizer."""
     if isinstance(example, Cut):
-        for s in example.supervisions:
-            if s.text is not None:
-                s.tokens = np.asarray(tokenizer(s.text, s.language))
+        supervisions = [s for s in example.supervisions if s.text is not None]
+        if len(supervisions) > 1 and isinstance(tokenizer, TokenizerWrapper):
+            # encode all the supervisions of the cut in a single batched call
+            token_ids = tokenizer.batch([s.text for s in supervisions], [s.language for s in supervisions])
+        else:
+            token_ids = [tokenizer(s.text, s.language) for s in supervisions]
+        for s, ids in zip(supervisions, token_ids):
+            s.tokens = np.asarray(ids)
     elif hasattr(example, "tokenize") and callable(example.tokenize):
         example = example.tokenize(tokenizer)
     else:
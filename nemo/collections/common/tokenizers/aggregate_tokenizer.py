@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 import torch
@@ -88,24 +88,52 @@ class AggregateTokenizer(TokenizerSpec):
         self.tokenizers_by_token_id = tokenizers_by_token_id
         self.langs_by_token_id = langs_by_token_id
 
+        # flat lookup tables indexed by the aggregate token id, so that detokenization does not need
+        # to call the sub-tokenizers for every token:
+        # the token piece, the piece with '▁' replaced by space, the lang index and whether the piece starts a word
+        self._build_lookup_tables()
+
     def _calculate_offsets(self):
         offsets = {}
         tokenizers = {}
         langs = {}
+        offset_values = list(self.token_id_offset.values())
+        tokenizer_values = list(self.tokenizers_dict.values())
+        lang_values = list(self.tokenizers_dict.keys())
         cur_num = 0
         tot = len(self.tokenizers_dict)
         for id in range(len(self.vocabulary)):
-            off_id = id - list(self.token_id_offset.values())[cur_num]
+            off_id = id - offset_values[cur_num]
             if cur_num + 1 < tot:
-                if id >= list(self.token_id_offset.values())[cur_num + 1]:
+                if id >= offset_values[cur_num + 1]:
                     cur_num += 1
-                    off_id = id - list(self.token_id_offset.values())[cur_num]
+                    off_id = id - offset_values[cur_num]
             offsets[id] = off_id
-            tokenizers[id] = list(self.tokenizers_dict.values())[cur_num]
-            langs[id] = list(self.tokenizers_dict.keys())[cur_num]
+            tokenizers[id] = tokenizer_values[cur_num]
+            langs[id] = lang_values[cur_num]
 
         return offsets, tokenizers, langs
 
+    def _build_lookup_tables(self):
+        pieces = []
+        lang_indices = []
+        for lang_idx, tokenizer in enumerate(self.tokenizers_dict.values()):
+            num_tokens = len(tokenizer.vocab)
+            pieces.extend(tokenizer.ids_to_tokens(list(range(num_tokens))))
+            lang_indices.extend([lang_idx] * num_tokens)
+
+        self._pieces_by_token_id = np.array(pieces, dtype=object)
+        self._texts_by_token_id = np.array([piece.replace('▁', ' ') for piece in pieces], dtype=object)
+        self._lang_idx_by_token_id = np.array(lang_indices, dtype=np.int64)
+        self._is_word_start_by_token_id = np.array([piece.startswith('▁') for piece in pieces], dtype=bool)
+        self._langs = list(self.tokenizers_dict.keys())
+
+    @staticmethod
+    def _as_id_array(ids) -> np.ndarray:
+        if isinstance(ids, torch.Tensor):
+            ids = ids.cpu().numpy()
+        return np.asarray(ids, dtype=np.int64)
+
     def text_to_tokens(self, text, lang_id):
         tokenizer = self.tokenizers_dict[lang_id]
         return tokenizer.text_to_tokens(text)
@@ -117,6 +145,36 @@ class AggregateTokenizer(TokenizerSpec):
 
         return token_ids
 
+    def batch_text_to_ids(self, texts: List[str], lang_ids: Union[str, List[str]]) -> List[List[int]]:
+        """
+        Tokenize a list of texts. The texts are grouped by language and each group is encoded with
+        a single `batch_text_to_ids` call of the corresponding tokenizer.
+
+        Args:
+            texts: list of input texts
+            lang_ids: language id of all the texts, or a list with the language id of each text
+
+        Returns:
+            A list of token id lists, equal to calling `text_to_ids` for each text.
+        """
+        if isinstance(lang_ids, str):
+            lang_ids = [lang_ids] * len(texts)
+        if len(lang_ids) != len(texts):
+            raise ValueError(f"Expected {len(texts)} language ids, but got {len(lang_ids)}")
+
+        indices_by_lang = {}
+        for idx, lang_id in enumerate(lang_ids):
+            indices_by_lang.setdefault(lang_id, []).append(idx)
+
+        token_ids = [None] * len(texts)
+        for lang_id, indices in indices_by_lang.items():
+            tokenizer = self.tokenizers_dict[lang_id]
+            offset = self.token_id_offset[lang_id]
+            lang_token_ids = tokenizer.batch_text_to_ids([texts[idx] for idx in indices])
+            for idx, ids in zip(indices, lang_token_ids):
+                token_ids[idx] = [t + offset for t in ids]
+        return token_ids
+
     def tokens_to_text(self, tokens, lang_id):
         if isinstance(tokens, np.ndarray):
             tokens = tokens.tolist()
@@ -125,93 +183,83 @@ class AggregateTokenizer(TokenizerSpec):
         return tokenizer.decode_pieces(tokens)
 
     def ids_to_text(self, ids):
-        if isinstance(ids, (np.ndarray, torch.Tensor)):
-            ids = ids.tolist()
+        return ''.join(self._texts_by_token_id[self._as_id_array(ids)])
 
-        tokens = []
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            tokens.extend(tokenizer.ids_to_tokens([offset_id]))
-        text = ''.join(tokens).replace('▁', ' ')
+    def batch_ids_to_text(
+        self, ids: Union[torch.Tensor, np.ndarray, List[List[int]]], lengths: Optional[torch.Tensor] = None
+    ) -> List[str]:
+        """
+        Decode a batch of token id sequences to text with a single table lookup for the whole batch.
 
-        return text
+        Args:
+            ids: padded token ids with shape [B, T], or a list of token id lists
+            lengths: optional number of valid tokens in each row of `ids`; if not provided, whole rows are decoded
+
+        Returns:
+            A list of B decoded strings, equal to calling `ids_to_text` for each sequence.
+        """
+        if isinstance(ids, list) and (len(ids) == 0 or not isinstance(ids[0], (int, np.integer))):
+            if lengths is None:
+                lengths = [len(seq) for seq in ids]
+            max_len = max(lengths, default=0)
+            padded = np.zeros((len(ids), max_len), dtype=np.int64)
+            for i, seq in enumerate(ids):
+                padded[i, : len(seq)] = seq
+            ids = padded
+        ids = self._as_id_array(ids)
+        if ids.ndim != 2:
+            raise ValueError(f"Expected token ids of shape [B, T], but got an array of shape {ids.shape}")
+        if lengths is None:
+            lengths = [ids.shape[1]] * ids.shape[0]
+        elif isinstance(lengths, (torch.Tensor, np.ndarray)):
+            lengths = self._as_id_array(lengths).tolist()
+
+        texts = self._texts_by_token_id[ids]
+        return [''.join(row[:length]) for row, length in zip(texts, lengths)]
 
     def token_to_id(self, token, lang_id):
         tokenizer = self.tokenizers_dict[lang_id]
         return tokenizer.token_to_id(token) + self.token_id_offset[lang_id]
 
     def ids_to_tokens(self, ids):
-        tokens = []
-
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            token = tokenizer.ids_to_tokens([offset_id])[0]
-            tokens.append(token)
-
-        return tokens
+        return self._pieces_by_token_id[self._as_id_array(ids)].tolist()
 
     def ids_to_text_and_langs(self, ids):
-        text_and_langs = []
+        ids = self._as_id_array(ids)
+        texts = self._texts_by_token_id[ids]
+        lang_indices = self._lang_idx_by_token_id[ids]
+        # strip for display purposes
+        return [{'char': text.strip(), 'lang': self._langs[lang_idx]} for text, lang_idx in zip(texts, lang_indices)]
 
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            token = tokenizer.ids_to_tokens([offset_id])[0]
-            text = token.replace('▁', ' ')
-            text = text.strip()  # strip for display purposes
-            lang = self.langs_by_token_id[id]
-            text_and_langs.append({'char': text, 'lang': lang})
+    def ids_to_words_and_langs(self, ids):
+        ids = self._as_id_array(ids)
+        if len(ids) == 0:
+            return []
 
-        return text_and_langs
+        # every token starting with '▁' opens a new word, the first token always does
+        word_starts = np.flatnonzero(self._is_word_start_by_token_id[ids])
+        if len(word_starts) == 0 or word_starts[0] != 0:
+            word_starts = np.concatenate([[0], word_starts])
+        word_ends = np.append(word_starts[1:], len(ids))
 
-    def ids_to_words_and_langs(self, ids):
         words_and_langs = []
-
-        word_ids = []  # tokens belonging to the current word
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            token = tokenizer.ids_to_tokens([offset_id])[0]
-            if token.startswith('▁'):
-                if len(word_ids) > 0:  # if this isn't the first word
-                    word = self.ids_to_text(word_ids)
-                    word = word.strip()  # strip for display purposes
-                    lang = self.ids_to_lang(word_ids)
-                    wl = {'word': word, 'lang': lang}
-                    words_and_langs.append(wl)
-                word_ids = []
-            word_ids.append(id)
-
-        if len(word_ids) > 0:  # the last tokens
-            word = self.ids_to_text(word_ids)
-            word = word.strip()  # strip for display purposes
-            lang = self.ids_to_lang(word_ids)
-            wl = {'word': word, 'lang': lang}
-            words_and_langs.append(wl)
+        for start, end in zip(word_starts, word_ends):
+            word_ids = ids[start:end]
+            word = self.ids_to_text(word_ids).strip()  # strip for display purposes
+            words_and_langs.append({'word': word, 'lang': self.ids_to_lang(word_ids)})
 
         return words_and_langs
 
     def ids_to_lang(self, ids):
-        lang_cnts = {}
+        ids = self._as_id_array(ids)
+        if len(ids) == 0:
+            return ''
 
-        for id in ids:
-            lang = self.langs_by_token_id[id]
-            lang_cnt = lang_cnts.get(lang)
-            if lang_cnt is not None:
-                lang_cnts[lang] = lang_cnt + 1
-            else:
-                lang_cnts[lang] = 1
-
-        max_lang = ''
-        max_lang_cnt = -1
-        for lang, lang_cnt in lang_cnts.items():
-            if lang_cnt > max_lang_cnt:
-                max_lang = lang
-                max_lang_cnt = lang_cnt
-
-        return max_lang
+        lang_indices = self._lang_idx_by_token_id[ids]
+        lang_cnts = np.bincount(lang_indices, minlength=len(self._langs))
+        # on ties, the language that appears first in the sequence wins
+        is_max_lang = lang_cnts[lang_indices] == lang_cnts.max()
+        return self._langs[lang_indices[np.argmax(is_max_lang)]]
 
     def tokens_to_ids(self, tokens: Union[str, List[str]], langs: Union[str, List[str]]) -> Union[int, List[int]]:
         if isinstance(tokens, str):
@@ -257,6 +305,17 @@ class TokenizerWrapper:
     def __call__(self, text: str, lang: str | None = None):
         return self._impl(text, lang)
 
+    def batch(self, texts: list[str], langs: list[str | None] | None = None) -> list[list[int]]:
+        """Tokenize a list of texts, using the batched encoding of the tokenizer when available."""
+        if isinstance(self._tokenizer, AggregateTokenizer):
+            assert langs is not None and all(
+                lang is not None for lang in langs
+            ), "Expected 'lang' to be set for AggregateTokenizer."
+            return self._tokenizer.batch_text_to_ids(texts, langs)
+        elif isinstance(self._tokenizer, TokenizerSpec):
+            return self._tokenizer.batch_text_to_ids(texts)
+        return [self._tokenizer(text) for text in texts]
+
     def _call_agg_tokenizer(self, text: str, lang: str | None = None):
         assert lang is not None, "Expected 'lang' to be set for AggregateTokenizer."
         return self._tokenizer.text_to_ids(text, lang)
@@ -126,6 +126,38 @@ class CanaryTokenizer(AggregateTokenizer):
             return self._text_to_ids_maybe_with_timestamps(text[: -len(CANARY_EOS)], lang_id) + [self.eos_id]
         return self._text_to_ids_maybe_with_timestamps(text, lang_id)
 
+    def batch_text_to_ids(self, texts: list[str], lang_ids: str | list[str]) -> list[list[int]]:
+        """
+        Batched version of `text_to_ids`. Plain texts (without timestamps) are encoded in batches per language,
+        while special prompts and texts with timestamps fall back to `text_to_ids`.
+        """
+        if isinstance(lang_ids, str):
+            lang_ids = [lang_ids] * len(texts)
+        if len(lang_ids) != len(texts):
+            raise ValueError(f"Expected {len(texts)} language ids, but got {len(lang_ids)}")
+
+        token_ids = [None] * len(texts)
+        batch_indices, batch_texts, batch_langs, batch_has_eos = [], [], [], []
+        time_pattern = re.compile(r"<\|\d+\|>")
+        for idx, (text, lang_id) in enumerate(zip(texts, lang_ids)):
+            if lang_id == CANARY_SPECIAL_TOKENIZER:
+                token_ids[idx] = self._tokenize_special_prompt(text)
+                continue
+            has_eos = text.endswith(CANARY_EOS)
+            text_no_eos = text[: -len(CANARY_EOS)] if has_eos else text
+            if time_pattern.search(text_no_eos) is not None:
+                token_ids[idx] = self.text_to_ids(text, lang_id)
+                continue
+            batch_indices.append(idx)
+            batch_texts.append(text_no_eos)
+            batch_langs.append(_map_canary1_to_canary2_lang(lang_id, self.langs))
+            batch_has_eos.append(has_eos)
+
+        batch_token_ids = super().batch_text_to_ids(batch_texts, batch_langs)
+        for idx, ids, has_eos in zip(batch_indices, batch_token_ids, batch_has_eos):
+            token_ids[idx] = ids + [self.eos_id] if has_eos else ids
+        return token_ids
+
     def _tokenize_special_prompt(self, text: str) -> list[int]:
         """
         Tokenize the input special prompt of Canary family of models.
@@ -68,6 +68,8 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
         self.extra_space_token = '☯'
         self.special_token_to_id = {}
         self.id_to_special_token = {}
+        # compiled regex matching any of the special tokens, built lazily by `_split_special_tokens`
+        self._special_token_pattern = None
         self.trim_spm_separator_after_special_token = trim_spm_separator_after_special_token
         self.spm_separator = spm_separator
         self.spm_separator_id = self.tokenizer.piece_to_id(spm_separator)
@@ -97,24 +99,10 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
             text = re.sub(r'(?<= )(?= )|^ | $', f' {self.extra_space_token} ', text)
         if self.legacy:
             tokens = []
-            cur_idx = 0
-
-            while 1:
-                st_indices = {}
-
-                for token in self.special_token_to_id:
-                    try:
-                        st_indices[token] = text[cur_idx:].index(token)
-                    except ValueError:
-                        continue
-
-                if len(st_indices) == 0:
-                    break
-
-                next_special_token = min(st_indices, key=st_indices.get)
-                next_start_idx = cur_idx + st_indices[next_special_token]
+            segments, special_tokens = self._split_special_tokens(text)
+            for segment, special_token in zip(segments, special_tokens):
                 # tokens between the last special token and the next special token
-                text_tokens = self.tokenizer.encode_as_pieces(text[cur_idx:next_start_idx])
+                text_tokens = self.tokenizer.encode_as_pieces(segment)
                 # Chat-templates insert a space between a special token and first word (e.g.
                 # "[INST] who") which is tokenized as <inst-id> <space-id> <who-id> instead of
                 # <inst-id> <who-id>.
@@ -129,11 +117,9 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
                 # Add the text tokens between the last special token and this one
                 tokens.extend(text_tokens)
                 # add the next special token
-                tokens.append(next_special_token)
-                # increment
-                cur_idx = next_start_idx + len(next_special_token)
+                tokens.append(special_token)
 
-            tokens.extend(self.tokenizer.encode_as_pieces(text[cur_idx:]))
+            tokens.extend(self.tokenizer.encode_as_pieces(segments[-1]))
 
         else:
             tokens = self.tokenizer.encode_as_pieces(text)
@@ -174,49 +160,13 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
         if self.removed_extra_spaces and not self.ignore_extra_whitespaces:
             text = re.sub(r'(?<= )(?= )|^ | $', f' {self.extra_space_token} ', text).rstrip()
         if self.legacy:
-            ids = []
-            cur_idx = 0
-
-            # Account for special tokens
-            while 1:
-                st_indices = {}
-
-                for token in self.special_token_to_id:
-                    try:
-                        st_indices[token] = text[cur_idx:].index(token)
-                    except ValueError:
-                        continue
-
-                if len(st_indices) == 0:
-                    break
-
-                next_special_token = min(st_indices, key=st_indices.get)
-                next_start_idx = cur_idx + st_indices[next_special_token]
-                # tokens between the last special token and the next special token
-                text_tokens = self.tokenizer.encode(text[cur_idx:next_start_idx])
-                # Chat-templates insert a space between a special token and first word (e.g.
-                # "[INST] who") which is tokenized as <inst-id> <space-id> <who-id> instead of
-                # <inst-id> <who-id>.
-                if (
-                    self.trim_spm_separator_after_special_token
-                    and len(ids) > 0
-                    and ids[-1] in self.id_to_special_token
-                    and len(text_tokens) > 0
-                    and text_tokens[0] == self.spm_separator_id
-                ):
-                    text_tokens.pop(0)
-                # Add the text tokens between the last special token and this one
-                ids.extend(text_tokens)
-                # add the next special token
-                ids.append(self.special_token_to_id[next_special_token])
-                # increment
-                cur_idx = next_start_idx + len(next_special_token)
-
+            segments, special_tokens = self._split_special_tokens(text)
+            segment_ids = [self.tokenizer.encode(segment) for segment in segments[:-1]]
             if self.removed_extra_spaces and not self.ignore_extra_whitespaces:
-                ids.extend(self._text_to_ids_extra_space(text[cur_idx:]))
+                segment_ids.append(self._text_to_ids_extra_space(segments[-1]))
             else:
-                ids.extend(self.tokenizer.encode_as_ids(text[cur_idx:]))
-            return ids
+                segment_ids.append(self.tokenizer.encode_as_ids(segments[-1]))
+            return self._merge_legacy_segment_ids(segment_ids, special_tokens)
 
         if self.removed_extra_spaces and not self.ignore_extra_whitespaces:
             return self._text_to_ids_extra_space(text, sample_alpha)
@@ -226,6 +176,100 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
         else:
             return self.tokenizer.encode_as_ids(text)
 
+    def batch_text_to_ids(self, texts: List[str], sample_alpha=None, num_threads: int = 1) -> List[List[int]]:
+        """Converts a list of input texts to lists of token IDs with a single SentencePiece call.
+
+        The result is identical to calling `text_to_ids` for each text. In legacy mode, the special tokens are split
+        out of all the texts first and the remaining text segments are encoded in a single batch.
+
+        Args:
+            texts: A list of input strings.
+            sample_alpha: Optional alpha value for stochastic subword sampling (ignored in legacy mode).
+            num_threads: Number of threads used by SentencePiece; -1 uses all the available cores.
+                Defaults to 1, since the method is mostly called from worker processes (dataloader, joblib),
+                which would be oversubscribed by the SentencePiece threads.
+
+        Returns:
+            A list of lists of token IDs.
+        """
+        if self.removed_extra_spaces and not self.ignore_extra_whitespaces:
+            return [self._text_to_ids(text, sample_alpha) for text in texts]
+
+        encoding_kwargs = {'num_threads': num_threads}
+        if not self.legacy:
+            if sample_alpha is not None:
+                encoding_kwargs.update({'enable_sampling': True, 'alpha': sample_alpha, 'nbest_size': -1})
+            return self.tokenizer.encode(texts, out_type=int, **encoding_kwargs)
+
+        # flatten the text segments of all the texts so that they are encoded in one call
+        split_texts = [self._split_special_tokens(text) for text in texts]
+        flat_segments = [segment for segments, _ in split_texts for segment in segments]
+        flat_segment_ids = self.tokenizer.encode(flat_segments, out_type=int, **encoding_kwargs)
+        ids = []
+        offset = 0
+        for segments, special_tokens in split_texts:
+            segment_ids = flat_segment_ids[offset : offset + len(segments)]
+            offset += len(segments)
+            ids.append(self._merge_legacy_segment_ids(segment_ids, special_tokens))
+        return ids
+
+    def _split_special_tokens(self, text):
+        """Splits the input text on the special tokens (legacy mode) in a single regex pass.
+
+        At each position, the special tokens are tried in their insertion order, so the result is the same as
+        repeatedly searching for the special token with the smallest start index.
+
+        Args:
+            text: Input string.
+
+        Returns:
+            A tuple of the text segments and the special tokens between them (one less than the number of segments).
+        """
+        if getattr(self, '_special_token_pattern', None) is None:
+            special_tokens = [re.escape(token) for token in self.special_token_to_id if token]
+            if len(special_tokens) == 0:
+                return [text], []
+            self._special_token_pattern = re.compile('|'.join(special_tokens))
+        segments, special_tokens = [], []
+        cur_idx = 0
+        for match in self._special_token_pattern.finditer(text):
+            segments.append(text[cur_idx : match.start()])
+            special_tokens.append(match.group(0))
+            cur_idx = match.end()
+        segments.append(text[cur_idx:])
+        return segments, special_tokens
+
+    def _merge_legacy_segment_ids(self, segment_ids, special_tokens):
+        """Interleaves the token IDs of the text segments with the IDs of the special tokens between them.
+
+        Args:
+            segment_ids: Lists of token IDs of the text segments (one more than the number of special tokens).
+            special_tokens: Special tokens between the text segments.
+
+        Returns:
+            A list of token IDs.
+        """
+        ids = []
+        for text_tokens, special_token in zip(segment_ids, special_tokens):
+            text_tokens = list(text_tokens)
+            # Chat-templates insert a space between a special token and first word (e.g.
+            # "[INST] who") which is tokenized as <inst-id> <space-id> <who-id> instead of
+            # <inst-id> <who-id>.
+            if (
+                self.trim_spm_separator_after_special_token
+                and len(ids) > 0
+                and ids[-1] in self.id_to_special_token
+                and len(text_tokens) > 0
+                and text_tokens[0] == self.spm_separator_id
+            ):
+                text_tokens.pop(0)
+            # Add the text tokens between the last special token and this one
+            ids.extend(text_tokens)
+            # add the next special token
+            ids.append(self.special_token_to_id[special_token])
+        ids.extend(segment_ids[-1])
+        return ids
+
     def _text_to_ids_extra_space(self, text, sample_alpha=None):
         """Tokenizes text while preserving extra space tokens for legacy mode.
 
@@ -353,6 +397,7 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
         """
         if not self.legacy:
             raise AttributeError("Special Token addition does not work when legacy is set to False.")
+        self._special_token_pattern = None
 
         if isinstance(special_tokens, list):
             for token in special_tokens:
@@ -54,6 +54,11 @@ class TokenizerSpec(ABC):
         """Converts token IDs back to text."""
         pass
 
+    def batch_text_to_ids(self, texts: List[str]) -> List[List[int]]:
+        """Converts a list of texts to lists of token IDs.
+        Tokenizers with a batched (e.g. multi-threaded) encoding backend should override this method."""
+        return [self.text_to_ids(text) for text in texts]
+
     def add_special_tokens(self, special_tokens: List[str]):
         """Adds special tokens (eos, pad, cls...) to vocab."""
         raise NotImplementedError("To be implemented")
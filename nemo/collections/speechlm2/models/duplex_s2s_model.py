@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import time
 from typing import Any
 
 import torch
@@ -33,6 +34,7 @@ from transformers import DynamicCache
 from nemo.collections.audio.parts.utils.resampling import resample
 from nemo.collections.common.tokenizers import AutoTokenizer
 from nemo.collections.speechlm2.data.utils import get_pad_id
+from nemo.collections.speechlm2.modules.perception import CacheAwareStreamingPerception
 from nemo.collections.speechlm2.parts.hf_hub import HFHubMixin
 from nemo.collections.speechlm2.parts.lora import maybe_install_lora
 from nemo.collections.speechlm2.parts.metrics.asr_bleu import ASRBLEU
@@ -380,12 +382,46 @@ class DuplexS2SModel(LightningModule, HFHubMixin):
         The returned shape is (1, embedding_dim).
         """
         text_bos = torch.full((1,), fill_value=self.text_pad_id, device=self.device)
-        audio_bos = torch.full((1, self._codebook_size), fill_value=self.speech_delay_id, device=self.device)
+        audio_bos = torch.full((1, self._num_codebooks), fill_value=self.speech_delay_id, device=self.device)
         input_embeds = self.embed_tokens(text_bos)
-        for cbidx in range(self._num_codebooks):
-            input_embeds.add_(self.embed_audio_tokens[cbidx](audio_bos[..., cbidx]))
+        input_embeds.add_(self._embed_audio_codes(audio_bos))
         return input_embeds
 
+    def _embed_audio_codes(
+        self, audio_codes: torch.Tensor, fused_embedding: tuple[torch.Tensor, torch.Tensor] | None = None
+    ) -> torch.Tensor:
+        """
+        Return the sum of audio token embeddings of all codebooks.
+        The input shape is (..., K) where `K=num_codebooks`, and the output shape is (..., embedding_dim).
+        With ``fused_embedding`` returned by :meth:`_fuse_audio_embeddings`, all codebooks are embedded
+        with a single gather instead of one lookup per codebook.
+        """
+        if fused_embedding is not None:
+            table, offsets = fused_embedding
+            return torch.nn.functional.embedding(audio_codes + offsets, table).sum(dim=-2)
+
+        embeds = self.embed_audio_tokens[0](audio_codes[..., 0])
+        for cbidx in range(1, self._num_codebooks):
+            embeds = embeds + self.embed_audio_tokens[cbidx](audio_codes[..., cbidx])
+        return embeds
+
+    def _fuse_audio_embeddings(self) -> tuple[torch.Tensor, torch.Tensor] | None:
+        """
+        Concatenate the embedding tables of all codebooks into a single table for :meth:`_embed_audio_codes`.
+        The table is a copy of the weights, so it is meant to be held only during inference (e.g., a streaming
+        session) and it does not reflect later updates of the weights.
+        Returns None with FSDP or tensor parallelism, where the per-codebook lookups are used.
+
+        Returns:
+            Table of shape (K * speech_vocab_size, H), and offsets of codebooks in the table of shape (K,).
+        """
+        if self._use_fsdp or self._use_tp:
+            return None
+        with torch.no_grad():
+            table = torch.cat([emb.weight for emb in self.embed_audio_tokens], dim=0)
+        offsets = torch.arange(self._num_codebooks, device=table.device) * self.speech_vocab_size
+        return table, offsets
+
     @torch.no_grad()
     def offline_inference(
         self,
@@ -445,9 +481,7 @@ class DuplexS2SModel(LightningModule, HFHubMixin):
         gen_audio[:, 0] = ans["audio_logits"].argmax(dim=-1)[:, -1]
 
         for t in range(1, input_embeds.shape[1]):
-            input_embeds[:, t] += self.embed_tokens(gen_text[:, t - 1])
-            for cbidx in range(self._num_codebooks):
-                input_embeds[:, t] += self.embed_audio_tokens[cbidx](gen_audio[:, t - 1, cbidx])
+            input_embeds[:, t] += self.embed_tokens(gen_text[:, t - 1]) + self._embed_audio_codes(gen_audio[:, t - 1])
             ans = self(input_embeds[:, t : t + 1], cache=ans["cache"])
             gen_text[:, t] = ans["text_logits"].argmax(dim=-1)[:, -1]
             gen_audio[:, t] = ans["audio_logits"].argmax(dim=-1)[:, -1]
@@ -475,6 +509,46 @@ class DuplexS2SModel(LightningModule, HFHubMixin):
 
         return ans
 
+    def start_streaming_session(
+        self,
+        batch_size: int = 1,
+        decode_audio: bool = True,
+        codec_left_context_frames: int = 16,
+        codec_lookahead_frames: int = 4,
+        frame_latency_budget: float | None = None,
+    ) -> "DuplexS2SStreamingSession":
+        """
+        Start a real-time inference session, which receives the input audio in chunks and generates
+        the output text and audio frame-by-frame.
+        The perception encoder must support cache-aware streaming, see :class:`CacheAwareStreamingPerception`.
+
+        Example:
+
+            >>> session = model.start_streaming_session()
+            >>> for chunk in audio_chunks:  # e.g., (1, 1280) for 80ms frames at 16kHz
+            ...     out = session.step(chunk)
+            ...     play(out["audio"])
+            >>> ans = session.finalize()
+            >>> print(session.latency_stats())
+
+        Args:
+            batch_size: number of input streams processed together.
+            decode_audio: bool, whether to decode audio codes to waveform incrementally.
+            codec_left_context_frames: number of already decoded frames used as the left context in audio decoding.
+            codec_lookahead_frames: number of generated frames held back in audio decoding until more frames are
+                generated, which adds to the output audio latency.
+            frame_latency_budget: processing time budget for a single frame in seconds,
+                defaults to the frame duration.
+        """
+        return DuplexS2SStreamingSession(
+            self,
+            batch_size=batch_size,
+            decode_audio=decode_audio,
+            codec_left_context_frames=codec_left_context_frames,
+            codec_lookahead_frames=codec_lookahead_frames,
+            frame_latency_budget=frame_latency_budget,
+        )
+
     def backward(self, *args, **kwargs):
         with loss_parallel():
             super().backward(*args, **kwargs)
@@ -608,6 +682,182 @@ class DuplexS2SModel(LightningModule, HFHubMixin):
             self.perception = fully_shard(self.perception, **fsdp_config)
 
 
+class DuplexS2SStreamingSession:
+    """
+    Real-time inference session of :class:`DuplexS2SModel`, see :meth:`DuplexS2SModel.start_streaming_session`.
+
+    Each call of :meth:`step` encodes the new input audio with cache-aware streaming perception and advances
+    the LLM by one frame for each new perception frame, using a persistent KV cache. The generation is
+    equivalent to :meth:`DuplexS2SModel.offline_inference` when the streaming perception matches the offline one.
+
+    The processing time of each frame is recorded to verify real-time operation: all frames must be processed
+    within the frame duration, otherwise the latency of the session accumulates.
+    """
+
+    def __init__(
+        self,
+        model: DuplexS2SModel,
+        batch_size: int = 1,
+        decode_audio: bool = True,
+        codec_left_context_frames: int = 16,
+        codec_lookahead_frames: int = 4,
+        frame_latency_budget: float | None = None,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.decode_audio = decode_audio
+        self.codec_left_context_frames = codec_left_context_frames
+        self.codec_lookahead_frames = codec_lookahead_frames
+        self.perception = CacheAwareStreamingPerception(model.perception, batch_size=batch_size)
+        self.frame_duration = model.perception.token_equivalent_duration
+        self.frame_latency_budget = frame_latency_budget if frame_latency_budget is not None else self.frame_duration
+        self.sample_rate = model.perception.preprocessor.featurizer.sample_rate
+
+        self.cache = DynamicCache()
+        # Audio embedding table of all codebooks, which is released with the session
+        self.fused_audio_embedding = model._fuse_audio_embeddings()
+        # Embedding of the previous output text and audio frame, added to the next input frame: (B, H)
+        self.prev_embeds = model._get_bos_embedding().expand(batch_size, -1)
+        self.gen_text = []
+        self.gen_audio = []
+        self.gen_audio_chunks = []
+        self.codec_state = None
+        # Processing time of each generated frame, and of each step call with the duration of its input audio
+        self.frame_latencies = []
+        self.step_latencies = []
+        self.step_durations = []
+        self.is_finalized = False
+
+    @property
+    def num_frames(self) -> int:
+        """Number of generated frames."""
+        return len(self.gen_text)
+
+    @torch.no_grad()
+    def step(self, audio_chunk: torch.Tensor, is_final: bool = False) -> dict[str, torch.Tensor]:
+        """
+        Process the next chunk of the input audio.
+
+        Args:
+            audio_chunk: next samples of the input waveforms with shape (B, T) with source sampling rate.
+            is_final: if True, the input streams end with this chunk.
+
+        Returns:
+            A dict with keys:
+                * "tokens_text": generated text tokens of shape (B, T2), where T2 is the number of new frames.
+                * "tokens_audio": generated audio codes of shape (B, T2, K) where `K=num_codebooks`.
+                * "audio": newly decoded waveform of shape (B, T3) (when `decode_audio=True`).
+                * "audio_len": number of newly decoded samples of shape (B,) (when `decode_audio=True`).
+        """
+        if self.is_finalized:
+            raise RuntimeError("Streaming session has already been finalized.")
+        model = self.model
+        self._synchronize()
+        step_start = time.perf_counter()
+
+        # Perception frames: (B, T2, H)
+        frames = self.perception(audio_chunk.to(model.device), is_final=is_final)
+        frames = frames * model.cfg.get("duplex_user_channel_weight", 1.0)
+
+        gen_text, gen_audio = [], []
+        for t in range(frames.shape[1]):
+            frame_start = time.perf_counter()
+            ans = model(frames[:, t : t + 1] + self.prev_embeds[:, None], cache=self.cache)
+            self.cache = ans["cache"]
+            text_tokens = ans["text_logits"][:, -1].argmax(dim=-1)  # (B,)
+            audio_tokens = ans["audio_logits"][:, -1].argmax(dim=-1)  # (B, K)
+            self.prev_embeds = model.embed_tokens(text_tokens) + model._embed_audio_codes(
+                audio_tokens, fused_embedding=self.fused_audio_embedding
+            )
+            gen_text.append(text_tokens)
+            gen_audio.append(audio_tokens)
+            self._synchronize()
+            self.frame_latencies.append(time.perf_counter() - frame_start)
+        self.gen_text.extend(gen_text)
+        self.gen_audio.extend(gen_audio)
+
+        device = model.device
+        ans = {
+            "tokens_text": (
+                torch.stack(gen_text, dim=1)
+                if gen_text
+                else torch.empty(self.batch_size, 0, dtype=torch.long, device=device)
+            ),
+            "tokens_audio": (
+                torch.stack(gen_audio, dim=1)
+                if gen_audio
+                else torch.empty(self.batch_size, 0, model._num_codebooks, dtype=torch.long, device=device)
+            ),
+        }
+        if self.decode_audio:
+            ans["audio"], ans["audio_len"] = self._decode_audio(ans["tokens_audio"], is_final=is_final)
+
+        self._synchronize()
+        self.step_latencies.append(time.perf_counter() - step_start)
+        self.step_durations.append(audio_chunk.shape[-1] / self.sample_rate)
+        self.is_finalized = is_final
+        return ans
+
+    def finalize(self) -> dict[str, Any]:
+        """
+        Flush the remaining input frames and audio decoding, and return the complete outputs,
+        in the same format as :meth:`DuplexS2SModel.offline_inference`.
+        """
+        last = self.step(torch.zeros(self.batch_size, 0, device=self.model.device), is_final=True)
+        gen_text = torch.stack(self.gen_text, dim=1)
+        gen_audio = torch.stack(self.gen_audio, dim=1)
+        lengths = torch.full((self.batch_size,), self.num_frames, dtype=torch.long, device=gen_text.device)
+        ans = {
+            "text": tokens_to_str(gen_text, lengths, tokenizer=self.model.tokenizer, pad_id=self.model.text_pad_id),
+            "tokens_text": gen_text,
+            "tokens_audio": gen_audio,
+            "tokens_len": lengths,
+        }
+        if self.decode_audio:
+            ans["audio"] = torch.cat(self.gen_audio_chunks, dim=-1)
+            ans["audio_len"] = torch.full_like(last["audio_len"], ans["audio"].shape[-1])
+        return ans
+
+    def latency_stats(self) -> dict[str, float]:
+        """
+        Return statistics of the processing time of generated frames in seconds, the fraction of frames processed
+        within the latency budget, and the real-time factor of the session including perception and audio decoding.
+        """
+        latencies = torch.tensor(self.frame_latencies, dtype=torch.float64)
+        if len(latencies) == 0:
+            latencies = torch.zeros(1, dtype=torch.float64)
+        return {
+            "frame_duration": self.frame_duration,
+            "frame_latency_budget": self.frame_latency_budget,
+            "frame_latency_mean": latencies.mean().item(),
+            "frame_latency_p90": latencies.quantile(0.9).item(),
+            "frame_latency_max": latencies.max().item(),
+            "frames_within_budget": (latencies <= self.frame_latency_budget).double().mean().item(),
+            "rtf": sum(self.step_latencies) / max(sum(self.step_durations), 1e-8),
+        }
+
+    def _decode_audio(self, audio_codes: torch.Tensor, is_final: bool) -> tuple[torch.Tensor, torch.Tensor]:
+        if self.num_frames > 0:
+            # Replace control codes with the first frame, see `replace_control_speech_codes`
+            audio_codes = torch.where(
+                torch.isin(audio_codes, self.model._control_codes), self.gen_audio[0][:, None], audio_codes
+            )
+        with fp32_precision(), torch.no_grad():
+            audio, audio_len, self.codec_state = self.model.audio_codec.decode_chunk(
+                tokens=audio_codes.transpose(1, 2),
+                state=self.codec_state,
+                left_context_frames=self.codec_left_context_frames,
+                lookahead_frames=self.codec_lookahead_frames,
+                is_final=is_final,
+            )
+        self.gen_audio_chunks.append(audio)
+        return audio, audio_len
+
+    def _synchronize(self):
+        if self.model.device.type == "cuda":
+            torch.cuda.synchronize(self.model.device)
+
+
 def replace_control_speech_codes(speech_codes: torch.Tensor, control_codes: torch.Tensor) -> torch.Tensor:
     """
     Replaces control codes (speech BOS, EOS, etc) in `speech_codes` with the first frame which is
@@ -11,9 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
 import warnings
 from collections import defaultdict
-from itertools import repeat
+from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
 from typing import Any, Optional
 
@@ -34,13 +36,15 @@ from torch.distributed.tensor.parallel import (
     loss_parallel,
     parallelize_module,
 )
-from transformers import GenerationConfig
+from transformers import DynamicCache, GenerationConfig
 
 from nemo.collections.common.prompts import PromptFormatter
 from nemo.collections.common.tokenizers import AutoTokenizer
+from nemo.collections.speechlm2.modules.perception import encode_audio_in_length_buckets, make_length_buckets
 from nemo.collections.speechlm2.parts.hf_hub import HFHubMixin
 from nemo.collections.speechlm2.parts.lora import maybe_install_lora
 from nemo.collections.speechlm2.parts.optim_setup import configure_optimizers, is_frozen
+from nemo.collections.speechlm2.parts.perception_cache import PerceptionCache
 from nemo.collections.speechlm2.parts.pretrained import load_pretrained_hf, move_embedding, setup_speech_encoder
 from nemo.core.neural_types import AudioSignal, LabelsType, LengthsType, MaskType, NeuralType
 from nemo.utils import logging
@@ -294,6 +298,8 @@ class SALM(LightningModule, HFHubMixin):
         audios: torch.Tensor = None,
         audio_lens: torch.Tensor = None,
         generation_config: GenerationConfig = None,
+        perception_cache: PerceptionCache = None,
+        prompt_prefix: "SALMPromptPrefix" = None,
         **generation_kwargs,
     ) -> torch.Tensor:
         """
@@ -341,6 +347,21 @@ class SALM(LightningModule, HFHubMixin):
             ...    max_new_tokens=128,
             ... )
 
+        Example 4. Asking several questions about the same recording. The audio embeddings are cached
+        in ``perception_cache``, and the LLM KV cache of the prompt prefix with the audio is computed once
+        with :meth:`prepare_prompt_prefix`. The follow-up prompts are appended to the turns of the prefix::
+
+            >>> prefix = model.prepare_prompt_prefix(
+            ...    prompt=[{"role": "user", "content": f"{model.audio_locator_tag}", "audio": ["path/to/audio.wav"]}],
+            ...    perception_cache=cache,  # optional, PerceptionCache
+            ... )
+            >>> for question in ["Transcribe the audio.", "Summarize the audio."]:
+            ...     answer_ids = model.generate(
+            ...        prompts=[[{"role": "user", "content": question}]],
+            ...        prompt_prefix=prefix,
+            ...        max_new_tokens=128,
+            ...     )
+
         Inputs:
             prompts: batch of prompts Tensor or as list[dict] each in the following format
                 [
@@ -357,6 +378,11 @@ class SALM(LightningModule, HFHubMixin):
                 Each prompt can have multiple audios.
             audio_lens: Optional. Length of each audio example.
             generation_config: Optional HuggingFace GenerationConfig object.
+            perception_cache: Optional :class:`PerceptionCache` with audio embeddings reused across calls.
+            prompt_prefix: Optional prompt prefix with a precomputed LLM KV cache returned by
+                :meth:`prepare_prompt_prefix`. Each prompt is appended to the turns of the prefix,
+                and only the tokens following the prefix are processed by the LLM.
+                If ``prompts`` is a Tensor, it must contain complete prompts starting with the prefix tokens.
             generation_kwargs: Keyword arguments passed directly to the underlying LLM's ``generate`` method.
         """
         # Encode prompt dicts into int token ids.
@@ -370,28 +396,19 @@ class SALM(LightningModule, HFHubMixin):
                     audios is None and audio_lens is None
                 ), "Audios cannot be provided via ``prompts`` and ``audios``/``audio_lens`` arguments simultaneously."
                 audios, audio_lens = maybe_audio
-            formatter = PromptFormatter.resolve(self.cfg.prompt_format)(self.tokenizer)
-            tokens = collate_vectors(
-                [formatter.encode_dialog(turns=prompt)["input_ids"] for prompt in prompts],
-                padding_value=self.text_pad_id,
-            ).to(self.device)
-        if audios is not None:
+            if prompt_prefix is not None:
+                if prompt_prefix.turns is None:
+                    raise ValueError("Prompts provided as list[dict] require a prompt prefix created from list[dict].")
+                prompts = [prompt_prefix.turns + prompt for prompt in prompts]
+            tokens = self._encode_prompts(prompts)
+        if prompt_prefix is not None:
+            generation_inputs = self._prepare_generation_inputs_with_prefix(
+                prompt_prefix, tokens, audios=audios, audio_lens=audio_lens, perception_cache=perception_cache
+            )
+        elif audios is not None:
             # Audio + text input for generation.
-            # Prepare token embeddings and audio embeddings.
-            tokens_to_embed = tokens.where(tokens != self.audio_locator_tag_id, 0)
-            token_embeds = self.embed_tokens(tokens_to_embed)
-            # TODO: temporary workaround to perform batch_size=1 inference for audio encoder
-            #   due to accuracy issues at bs>1
-            audio_embeds, audio_embed_lens = self.perception(audios, audio_lens)
-            audio_embeds = [audio_embeds[i, :elen] for i, elen in enumerate(audio_embed_lens)]
-            # Insert audio embeddings into relevant positions in text embeddings.
-            input_embeds, _, attention_mask = replace_placeholders_and_build_targets(
-                input_ids=tokens,
-                embeds=token_embeds,
-                padding_id=self.text_pad_id,
-                placeholder_id=self.audio_locator_tag_id,
-                replacements=audio_embeds,
-                target_ids=None,
+            input_embeds, attention_mask = self._embed_prompts(
+                tokens, audios=audios, audio_lens=audio_lens, perception_cache=perception_cache
             )
             generation_inputs = {"inputs_embeds": input_embeds, "attention_mask": attention_mask}
         else:
@@ -414,6 +431,217 @@ class SALM(LightningModule, HFHubMixin):
             )
         return answer_tokens
 
+    def generate_in_buckets(
+        self,
+        prompts: list[list[dict[str]]] | torch.Tensor,
+        audios: torch.Tensor = None,
+        audio_lens: torch.Tensor = None,
+        batch_size: int = 32,
+        max_length_ratio: float = 1.25,
+        **generate_kwargs,
+    ) -> list[torch.Tensor]:
+        """
+        Generate LLM answers for a large number of prompts, e.g., for offline evaluation.
+        The prompts are sorted by the total length of their audios and grouped into batches of at most
+        ``batch_size`` prompts, where the longest audio length is at most ``max_length_ratio`` times the shortest one.
+        Each batch is processed with :meth:`generate`, which limits padding in perception and in the LLM.
+
+        Inputs:
+            prompts, audios, audio_lens: see :meth:`generate`.
+            batch_size: maximum number of prompts in a batch.
+            max_length_ratio: maximum ratio of the longest and the shortest audio length in a batch.
+            generate_kwargs: Keyword arguments passed to :meth:`generate`.
+
+        Returns:
+            List of generated token ids for each prompt in the input order.
+        """
+        if isinstance(prompts, torch.Tensor):
+            tokens = prompts
+        else:
+            if (
+                maybe_audio := _resolve_audios_in_prompt(prompts, sampling_rate=self.sampling_rate, device=self.device)
+            ) is not None:
+                assert (
+                    audios is None and audio_lens is None
+                ), "Audios cannot be provided via ``prompts`` and ``audios``/``audio_lens`` arguments simultaneously."
+                audios, audio_lens = maybe_audio
+            tokens = self._encode_prompts(prompts)
+
+        # Audios of each prompt, enumerated in the order of placeholders.
+        num_audios = (tokens == self.audio_locator_tag_id).sum(dim=1).tolist()
+        audio_offsets = [0] + list(accumulate(num_audios))
+        if audios is not None:
+            audio_lens_list = audio_lens.tolist()
+            prompt_audio_lens = [
+                sum(audio_lens_list[audio_offsets[i] : audio_offsets[i + 1]]) for i in range(len(tokens))
+            ]
+        else:
+            prompt_audio_lens = [0] * len(tokens)
+
+        answers = [None] * len(tokens)
+        for bucket in make_length_buckets(
+            prompt_audio_lens, max_batch_size=batch_size, max_length_ratio=max_length_ratio
+        ):
+            # Left-pad the prompts, so that generation starts right after the last token of each prompt
+            bucket_prompts = [tokens[i][tokens[i] != self.text_pad_id] for i in bucket]
+            max_len = max(len(prompt) for prompt in bucket_prompts)
+            bucket_tokens = tokens.new_full((len(bucket), max_len), self.text_pad_id)
+            for j, prompt in enumerate(bucket_prompts):
+                bucket_tokens[j, max_len - len(prompt) :] = prompt
+            bucket_audio_kwargs = {}
+            if audios is not None:
+                audio_indices = [j for i in bucket for j in range(audio_offsets[i], audio_offsets[i + 1])]
+                if audio_indices:
+                    bucket_audio_lens = audio_lens[audio_indices]
+                    bucket_audio_kwargs = {
+                        "audios": audios[audio_indices, : bucket_audio_lens.max()],
+                        "audio_lens": bucket_audio_lens,
+                    }
+            bucket_answers = self.generate(prompts=bucket_tokens, **bucket_audio_kwargs, **generate_kwargs)
+            for i, answer in zip(bucket, bucket_answers):
+                answers[i] = answer
+        return answers
+
+    @torch.no_grad()
+    def prepare_prompt_prefix(
+        self,
+        prompt: list[dict] | torch.Tensor,
+        audios: torch.Tensor = None,
+        audio_lens: torch.Tensor = None,
+        perception_cache: PerceptionCache = None,
+    ) -> "SALMPromptPrefix":
+        """
+        Encode a prompt prefix shared by several prompts, e.g., a system prompt and a user turn with a recording,
+        and run it through the LLM once to obtain its KV cache.
+        The result can be passed as ``prompt_prefix`` to :meth:`generate` to reuse the KV cache for follow-up prompts.
+
+        Inputs:
+            prompt: a single prompt as list[dict] (see :meth:`generate`), or a Tensor of token ids of shape (T,)
+                already formatted in the relevant chat template.
+            audios: Optional. Time-domain audio signal zero-padded batch of shape (N, T) for the N occurrences
+                of <audio_locator_tag> in ``prompt``.
+            audio_lens: Optional. Length of each audio example.
+            perception_cache: Optional :class:`PerceptionCache` with audio embeddings reused across calls.
+        """
+        if isinstance(prompt, torch.Tensor):
+            tokens, turns = prompt.to(self.device), None
+        else:
+            if (
+                maybe_audio := _resolve_audios_in_prompt(
+                    [prompt], sampling_rate=self.sampling_rate, device=self.device
+                )
+            ) is not None:
+                assert (
+                    audios is None and audio_lens is None
+                ), "Audios cannot be provided via ``prompt`` and ``audios``/``audio_lens`` arguments simultaneously."
+                audios, audio_lens = maybe_audio
+            tokens, turns = self._encode_prompts([prompt])[0], prompt
+        input_embeds, attention_mask, audio_embed_lens = self._embed_prompts(
+            tokens[None],
+            audios=audios,
+            audio_lens=audio_lens,
+            perception_cache=perception_cache,
+            return_audio_lens=True,
+        )
+        cache = DynamicCache()
+        self(input_embeds, attention_mask=attention_mask, cache=cache)
+        return SALMPromptPrefix(
+            turns=turns, tokens=tokens, input_embeds=input_embeds, cache=cache, audio_embed_lens=audio_embed_lens
+        )
+
+    def _encode_prompts(self, prompts: list[list[dict]]) -> torch.Tensor:
+        formatter = PromptFormatter.resolve(self.cfg.prompt_format)(self.tokenizer)
+        return collate_vectors(
+            [formatter.encode_dialog(turns=prompt)["input_ids"] for prompt in prompts],
+            padding_value=self.text_pad_id,
+        ).to(self.device)
+
+    def _embed_prompts(
+        self,
+        tokens: torch.Tensor,
+        audios: torch.Tensor = None,
+        audio_lens: torch.Tensor = None,
+        perception_cache: PerceptionCache = None,
+        return_audio_lens: bool = False,
+    ):
+        """Return input embeddings and attention mask for a batch of tokens with audio placeholders."""
+        # Prepare token embeddings and audio embeddings.
+        tokens_to_embed = tokens.where(tokens != self.audio_locator_tag_id, 0)
+        token_embeds = self.embed_tokens(tokens_to_embed)
+        if audios is None:
+            audio_embeds = []
+        elif perception_cache is not None:
+            audio_embeds = perception_cache(self.perception, audios, audio_lens)
+        else:
+            # Audios are encoded in batches of similar lengths to limit padding.
+            audio_embeds = encode_audio_in_length_buckets(self.perception, audios, audio_lens)
+        # Insert audio embeddings into relevant positions in text embeddings.
+        input_embeds, _, attention_mask = replace_placeholders_and_build_targets(
+            input_ids=tokens,
+            embeds=token_embeds,
+            padding_id=self.text_pad_id,
+            placeholder_id=self.audio_locator_tag_id,
+            replacements=audio_embeds,
+            target_ids=None,
+        )
+        if return_audio_lens:
+            return input_embeds, attention_mask, [emb.shape[0] for emb in audio_embeds]
+        return input_embeds, attention_mask
+
+    def _prepare_generation_inputs_with_prefix(
+        self,
+        prompt_prefix: "SALMPromptPrefix",
+        tokens: torch.Tensor,
+        audios: torch.Tensor = None,
+        audio_lens: torch.Tensor = None,
+        perception_cache: PerceptionCache = None,
+    ) -> dict[str, Any]:
+        """
+        Build HF generate inputs for prompts starting with the prompt prefix. The KV cache of the prefix is reused
+        for the longest token prefix shared by all prompts, and the remaining tokens are left-padded after it.
+        """
+        prefix_tokens = prompt_prefix.tokens
+        prompts = [prompt[prompt != self.text_pad_id] for prompt in tokens]
+        num_shared = len(prefix_tokens)
+        for prompt in prompts:
+            length = min(len(prompt), len(prefix_tokens))
+            mismatch = (prompt[:length] != prefix_tokens[:length]).nonzero()
+            num_shared = min(num_shared, mismatch[0].item() if len(mismatch) else length)
+            # the LLM needs at least one new input token to start generating
+            num_shared = min(num_shared, len(prompt) - 1)
+        prefix_placeholders = (prefix_tokens == self.audio_locator_tag_id).nonzero()[:, 0].tolist()
+        if prefix_placeholders and prefix_placeholders[-1] >= num_shared:
+            raise ValueError(
+                f"Prompts share only {num_shared} tokens with the prompt prefix, "
+                "which doesn't include all audio placeholders of the prefix."
+            )
+        # Position of the end of shared tokens in the prefix embeddings, where each placeholder is replaced by audio.
+        num_shared_embeds = num_shared + sum(elen - 1 for elen in prompt_prefix.audio_embed_lens)
+
+        # Left-pad the remaining tokens of each prompt.
+        suffixes = [prompt[num_shared:] for prompt in prompts]
+        suffix_len = max(len(suffix) for suffix in suffixes)
+        suffix_tokens = torch.full((len(suffixes), suffix_len), self.text_pad_id, dtype=torch.long, device=self.device)
+        for i, suffix in enumerate(suffixes):
+            suffix_tokens[i, suffix_len - len(suffix) :] = suffix
+        suffix_embeds, suffix_mask = self._embed_prompts(
+            suffix_tokens, audios=audios, audio_lens=audio_lens, perception_cache=perception_cache
+        )
+
+        batch_size = len(prompts)
+        prefix_embeds = prompt_prefix.input_embeds[:, :num_shared_embeds].expand(batch_size, -1, -1)
+        cache = copy.deepcopy(prompt_prefix.cache)
+        cache.crop(num_shared_embeds)
+        if batch_size > 1:
+            cache.batch_repeat_interleave(batch_size)
+        return {
+            "inputs_embeds": torch.cat([prefix_embeds, suffix_embeds.to(prefix_embeds.dtype)], dim=1),
+            "attention_mask": torch.cat(
+                [torch.ones(batch_size, num_shared_embeds, dtype=torch.bool, device=self.device), suffix_mask], dim=1
+            ),
+            "past_key_values": cache,
+        }
+
     def configure_optimizers(self):
         return configure_optimizers(self)
 
@@ -535,6 +763,24 @@ class SALM(LightningModule, HFHubMixin):
         }
 
 
+@dataclass
+class SALMPromptPrefix:
+    """
+    Prompt prefix shared by several prompts with the precomputed LLM KV cache, see :meth:`SALM.prepare_prompt_prefix`.
+    """
+
+    # Turns of the prefix, or None if the prefix was provided as token ids
+    turns: list[dict] | None
+    # Token ids of shape (T,)
+    tokens: torch.Tensor
+    # Input embeddings with audio placeholders replaced by audio embeddings of shape (1, T', H)
+    input_embeds: torch.Tensor
+    # LLM KV cache of input_embeds
+    cache: DynamicCache
+    # Number of audio embedding frames for each audio placeholder in tokens
+    audio_embed_lens: list[int]
+
+
 def replace_placeholders_and_build_targets(
     input_ids: torch.Tensor,
     embeds: torch.Tensor,
@@ -568,7 +814,7 @@ def replace_placeholders_and_build_targets(
         - Tensor of shape (batch, max_new_sequence_length) with attention padding masks
           updated to account for shape changes due to replacements.
     """
-    batch_size, seq_len = input_ids.size()
+    batch_size = input_ids.size(0)
     if target_ids is not None:
         assert target_ids.size() == input_ids.size(), "target_ids must have the same shape as input_ids"
 
@@ -576,94 +822,51 @@ def replace_placeholders_and_build_targets(
     device, dtype = embeds.device, embeds.dtype
     ignore_index = -100  # Standard ignore_index value for CrossEntropyLoss
 
-    output_sequences = []
-    output_target_ids = []
-    output_att_masks = []
-    replacement_idx = 0
-
-    for i in range(batch_size):
-        # Find all placeholder positions at once using tensor operations
-        placeholder_positions = (input_ids[i] == placeholder_id).nonzero(as_tuple=True)[0]
-
-        # Handle the case with no placeholders more efficiently
-        if len(placeholder_positions) == 0:
-            output_sequences.append(embeds[i])
-
-            # Start with original target_ids and replace positions where input was padding
-            if target_ids is not None:
-                new_target_ids = target_ids[i].clone()
-                new_target_ids[input_ids[i] == padding_id] = ignore_index
-                output_target_ids.append(new_target_ids)
-            output_att_masks.append(input_ids[i] != padding_id)
-            continue
-
-        # Build segments between placeholders
-        segments = []  # For embeddings
-        target_segments = []  # For target IDs
-        att_masks = []
-        prev_pos = 0
-
-        for pos in placeholder_positions:
-            # Add segment before placeholder (if any)
-            if pos > prev_pos:
-                segments.append(embeds[i, prev_pos:pos])
-
-                # For target IDs: keep original targets but mark positions that were padding in input
-                if target_ids is not None:
-                    segment_target_ids = target_ids[i, prev_pos:pos].clone()
-                    segment_target_ids[segment_target_ids == padding_id] = ignore_index
-                    target_segments.append(segment_target_ids)
-                att_masks.append(input_ids[i, prev_pos:pos] != padding_id)
-
-            # Add replacement for embeddings
-            rep = replacements[replacement_idx]
-            segments.append(rep)
-
-            # For target IDs: all replacement positions get ignore_index
-            target_segments.append(torch.full((rep.size(0),), ignore_index, dtype=torch.long, device=device))
-            att_masks.append(torch.ones((rep.size(0),), dtype=torch.bool, device=device))
-
-            replacement_idx += 1
-            prev_pos = pos + 1  # Skip placeholder
-
-        # Add remaining segment after last placeholder (if any)
-        if prev_pos < seq_len:
-            segments.append(embeds[i, prev_pos:seq_len])
-
-            # For target IDs: keep original targets but mark positions that were padding in input
-            if target_ids is not None:
-                segment_target_ids = target_ids[i, prev_pos:seq_len].clone()
-                segment_target_ids[segment_target_ids == padding_id] = ignore_index
-                target_segments.append(segment_target_ids)
-            att_masks.append(input_ids[i, prev_pos:seq_len] != padding_id)
-
-        # Concatenate all segments for this example
-        output_sequences.append(torch.cat(segments, dim=0))
-        output_att_masks.append(torch.cat(att_masks, dim=0))
-        if target_ids is not None:
-            output_target_ids.append(torch.cat(target_segments, dim=0))
-
-    # Verify all replacements were used
-    if replacement_idx != len(replacements):
-        raise ValueError(f"Expected {len(replacements)} replacements but used {replacement_idx}")
-
-    # Create padded output tensors
-    max_seq_length = max(seq.size(0) for seq in output_sequences)
+    # Placeholders are enumerated in row-major order, which is the order of replacements
+    is_placeholder = input_ids == placeholder_id
+    num_placeholders = int(is_placeholder.sum())
+    if num_placeholders != len(replacements):
+        raise ValueError(f"Expected {len(replacements)} replacements but found {num_placeholders} placeholders")
+
+    # Each input position is expanded to the length of its replacement for placeholders and to 1 otherwise.
+    # The output start position of each input position accounts for left padding of the shorter examples.
+    replacement_lens = torch.tensor([rep.size(0) for rep in replacements], dtype=torch.long, device=device)
+    position_lens = torch.ones_like(input_ids)
+    position_lens[is_placeholder] = replacement_lens
+    output_lens = position_lens.sum(dim=1)
+    max_seq_length = int(output_lens.max())
+    starts = (max_seq_length - output_lens)[:, None] + position_lens.cumsum(dim=1) - position_lens
+
     output = torch.zeros(batch_size, max_seq_length, hidden_dim, device=device, dtype=dtype)
+    attention_masks = torch.zeros((batch_size, max_seq_length), dtype=torch.bool, device=device)
+
+    # Copy token embeddings
+    rows, cols = (~is_placeholder).nonzero(as_tuple=True)
+    output_cols = starts[rows, cols]
+    output[rows, output_cols] = embeds[rows, cols]
+    attention_masks[rows, output_cols] = input_ids[rows, cols] != padding_id
+
+    # Copy replacements
+    if replacements:
+        ph_rows, ph_cols = is_placeholder.nonzero(as_tuple=True)
+        replacement_offsets = torch.arange(int(replacement_lens.sum()), device=device) - (
+            replacement_lens.cumsum(dim=0) - replacement_lens
+        ).repeat_interleave(replacement_lens)
+        replacement_rows = ph_rows.repeat_interleave(replacement_lens)
+        replacement_cols = starts[ph_rows, ph_cols].repeat_interleave(replacement_lens) + replacement_offsets
+        output[replacement_rows, replacement_cols] = torch.cat(replacements).to(dtype)
+        attention_masks[replacement_rows, replacement_cols] = True
+
+    # All replacement positions and added padding get ignore_index in targets
     if target_ids is not None:
+        # Padding is marked based on input ids for examples without placeholders and on target ids otherwise
+        is_padding = torch.where(
+            is_placeholder.any(dim=1, keepdim=True), target_ids == padding_id, input_ids == padding_id
+        )
         new_target_ids = torch.full((batch_size, max_seq_length), ignore_index, dtype=torch.long, device=device)
+        new_target_ids[rows, output_cols] = target_ids[rows, cols].masked_fill(is_padding[rows, cols], ignore_index)
     else:
         new_target_ids = None
-    attention_masks = torch.zeros((batch_size, max_seq_length), dtype=torch.bool, device=device)
-
-    if target_ids is None:
-        output_target_ids = repeat(None)
-    for i, (seq, tgt, att) in enumerate(zip(output_sequences, output_target_ids, output_att_masks)):
-        seq_len = seq.size(0)
-        output[i, -seq_len:] = seq
-        if tgt is not None:
-            new_target_ids[i, -seq_len:] = tgt
-        attention_masks[i, -seq_len:] = att
 
     return output, new_target_ids, attention_masks
 
@@ -15,8 +15,10 @@ import torch
 from omegaconf import DictConfig
 from torch import nn
 
+from nemo.collections.asr.parts.mixins.streaming import StreamingEncoder
 from nemo.core import Exportable, NeuralModule, typecheck
 from nemo.core.neural_types import AcousticEncodedRepresentation, AudioSignal, LengthsType, NeuralType, SpectrogramType
+from nemo.utils import logging
 
 
 class AudioPerceptionModule(NeuralModule, Exportable):
@@ -126,6 +128,246 @@ class AudioPerceptionModule(NeuralModule, Exportable):
         return encoded, encoded_len
 
 
+def make_length_buckets(lengths: list[int], max_batch_size: int, max_length_ratio: float) -> list[list[int]]:
+    """
+    Group indices of ``lengths`` sorted by length into buckets of at most ``max_batch_size`` items,
+    where the longest item is at most ``max_length_ratio`` times longer than the shortest one.
+    Each bucket is sorted by length.
+    """
+    buckets = []
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        if buckets and len(buckets[-1]) < max_batch_size and lengths[i] <= lengths[buckets[-1][0]] * max_length_ratio:
+            buckets[-1].append(i)
+        else:
+            buckets.append([i])
+    return buckets
+
+
+def encode_audio_in_length_buckets(
+    perception: nn.Module,
+    audios: torch.Tensor,
+    audio_lens: torch.Tensor,
+    max_batch_size: int = 32,
+    max_length_ratio: float = 1.25,
+) -> list[torch.Tensor]:
+    """
+    Run ``perception`` on batches of audios with similar lengths, and return the output of each audio without padding.
+
+    The audios are sorted by length and grouped into buckets of at most ``max_batch_size`` audios, where the longest
+    audio is at most ``max_length_ratio`` times longer than the shortest one. Each bucket is truncated to its longest
+    audio, which bounds the amount of padding processed by the encoder. Padded frames are masked in the preprocessor,
+    subsampling and encoder layers, so the outputs match running perception on each audio separately up to
+    floating point differences.
+
+    Args:
+        perception: perception module, e.g., :class:`AudioPerceptionModule`.
+        audios: zero-padded batch of time-domain audio signals of shape (B, T).
+        audio_lens: length of each audio of shape (B,).
+        max_batch_size: maximum number of audios in a bucket.
+        max_length_ratio: maximum ratio of the longest and the shortest audio length in a bucket.
+
+    Returns:
+        List of B embeddings in the input order, each of shape (T_i, H).
+    """
+    lens = audio_lens.tolist()
+    outputs = [None] * len(lens)
+    for bucket in make_length_buckets(lens, max_batch_size=max_batch_size, max_length_ratio=max_length_ratio):
+        bucket_lens = audio_lens[bucket]
+        encoded, encoded_len = perception(audios[bucket, : lens[bucket[-1]]], bucket_lens)
+        for i, enc, elen in zip(bucket, encoded, encoded_len.tolist()):
+            outputs[i] = enc[:elen]
+    return outputs
+
+
+class CacheAwareStreamingPerception:
+    """
+    Incremental inference with :class:`AudioPerceptionModule` on live audio which is received in chunks,
+    for a batch of streams of equal length.
+
+    The log-mel features are computed on a window with enough left context to match the features computed
+    on the complete signal. The encoder, and the modality adapter if it is also a streaming encoder
+    (e.g., ``ConformerEncoder``), are run with cache-aware streaming: they keep their attention and
+    convolution caches between steps, so that only new frames are encoded. This requires encoders trained
+    with a limited right context, e.g., ``att_context_size=[70, 1]`` and ``att_context_style=chunked_limited``,
+    in which case the outputs match processing the complete signal. Other modality adapters are assumed
+    to process each frame independently.
+
+    Args:
+        perception: perception module, in eval mode.
+        batch_size: number of streams.
+    """
+
+    def __init__(self, perception: AudioPerceptionModule, batch_size: int = 1):
+        self.perception = perception
+        self.batch_size = batch_size
+
+        featurizer = perception.preprocessor.featurizer
+        if featurizer.stft_pad_amount is not None:
+            raise ValueError("Streaming perception does not support preprocessor with exact_pad=True.")
+        if featurizer.normalize:
+            logging.warning(
+                f"Preprocessor uses normalize={featurizer.normalize}, which is computed on each window of "
+                "the streamed audio and will not match offline features. Streaming models typically use normalize=NA."
+            )
+        self.hop_length = featurizer.hop_length
+        self.n_fft = featurizer.n_fft
+        # Frames at the start of a window which are affected by the padding and pre-emphasis at the window start
+        self.num_feature_context_frames = self.n_fft // 2 // self.hop_length + 1
+
+        param = next(perception.parameters())
+        # samples received so far, starting from the global sample index `self.samples_start`
+        self.samples = torch.zeros(batch_size, 0, device=param.device, dtype=param.dtype)
+        self.samples_start = 0
+        self.num_samples = 0
+        self.num_features = 0
+
+        self.stages = [_CacheAwareStreamingStage(perception.encoder, batch_size=batch_size)]
+        if isinstance(perception.modality_adapter, StreamingEncoder):
+            self.stages.append(_CacheAwareStreamingStage(perception.modality_adapter, batch_size=batch_size))
+
+    @torch.no_grad()
+    def __call__(self, audio_chunk: torch.Tensor, is_final: bool = False) -> torch.Tensor:
+        """
+        Process the next chunk of the input signal.
+
+        Args:
+            audio_chunk: next samples of the input signals, shape (B, T_chunk). May be empty on the final call.
+            is_final: if True, the streams end with this chunk and all remaining frames are returned.
+
+        Returns:
+            Perception output for frames which can be computed from the received audio, shape (B, T_out, D).
+        """
+        self.samples = torch.cat([self.samples, audio_chunk.to(self.samples.dtype)], dim=-1)
+        self.num_samples += audio_chunk.size(-1)
+
+        encoded = self._compute_features(is_final=is_final)
+        for stage in self.stages:
+            encoded = stage(encoded, is_final=is_final)
+        if not isinstance(self.perception.modality_adapter, StreamingEncoder):
+            encoded, _ = self.perception.modality_adapter(
+                audio_signal=encoded, length=torch.full_like(self.stages[-1].output_length, encoded.size(-1))
+            )
+        # b, c, t -> b, t, c
+        return self.perception.proj(encoded.transpose(1, 2))
+
+    def _compute_features(self, is_final: bool) -> torch.Tensor:
+        if is_final:
+            # the complete signal has `num_samples // hop_length` valid frames
+            num_features = self.num_samples // self.hop_length
+        else:
+            # frame `i` is centered at sample `i * hop_length` and needs samples up to `i * hop_length + n_fft // 2`
+            num_features = max((self.num_samples - self.n_fft // 2) // self.hop_length + 1, 0)
+        num_new_features = num_features - self.num_features
+        if num_new_features <= 0:
+            return self.samples.new_zeros(self.batch_size, self.perception.preprocessor.featurizer.nfilt, 0)
+
+        window_start_frame = max(self.num_features - self.num_feature_context_frames, 0)
+        window = self.samples[:, window_start_frame * self.hop_length - self.samples_start :]
+        features, _ = self.perception.preprocessor(
+            input_signal=window,
+            length=torch.full((self.batch_size,), window.size(-1), device=window.device, dtype=torch.long),
+        )
+        offset = self.num_features - window_start_frame
+        features = features[:, :, offset : offset + num_new_features]
+        self.num_features = num_features
+
+        # keep only the samples needed for the next window
+        next_start = max(self.num_features - self.num_feature_context_frames, 0) * self.hop_length
+        self.samples = self.samples[:, next_start - self.samples_start :]
+        self.samples_start = next_start
+        return features
+
+
+class _CacheAwareStreamingStage:
+    """Buffers input frames and runs cache-aware streaming steps of an encoder on complete chunks."""
+
+    def __init__(self, encoder: NeuralModule, batch_size: int):
+        if encoder.att_context_size[1] < 0:
+            raise ValueError(
+                f"{type(encoder).__name__} with att_context_size={encoder.att_context_size} has unlimited right "
+                "context and does not support cache-aware streaming."
+            )
+        self.encoder = encoder
+        if encoder.streaming_cfg is None:
+            encoder.setup_streaming_params()
+        streaming_cfg = encoder.streaming_cfg
+        if not streaming_cfg.chunk_size:
+            # encoders without subsampling do not define the number of input frames per chunk
+            if encoder.att_context_style == "regular":
+                lookahead_steps = (encoder.att_context_size[1] + encoder.conv_context_size[1]) * encoder.n_layers
+            else:
+                lookahead_steps = encoder.att_context_size[1]
+            streaming_cfg.chunk_size = 1 + lookahead_steps
+            streaming_cfg.shift_size = 1 + lookahead_steps - streaming_cfg.cache_drop_size
+            streaming_cfg.valid_out_len = streaming_cfg.shift_size
+        self.streaming_cfg = streaming_cfg
+
+        param = next(encoder.parameters())
+        self.cache = encoder.get_initial_cache_state(batch_size=batch_size, dtype=param.dtype, device=param.device)
+        self.output_length = torch.zeros(batch_size, device=param.device, dtype=torch.long)
+        self.buffer = None
+        # number of already processed frames at the start of the buffer, used as pre-encode cache
+        self.num_context_frames = 0
+        self.step = 0
+
+    def _get_size(self, size):
+        if isinstance(size, list):
+            return size[0] if self.step == 0 else size[1]
+        return size
+
+    def __call__(self, frames: torch.Tensor, is_final: bool) -> torch.Tensor:
+        self.buffer = frames if self.buffer is None else torch.cat([self.buffer, frames], dim=-1)
+
+        outputs = []
+        while True:
+            chunk_size = self._get_size(self.streaming_cfg.chunk_size)
+            num_available_frames = self.buffer.size(-1) - self.num_context_frames
+            if num_available_frames <= 0 or (num_available_frames < chunk_size and not is_final):
+                break
+            chunk_size = min(chunk_size, num_available_frames)
+            is_last_chunk = is_final and num_available_frames <= chunk_size
+
+            pre_encode_cache_size = self._get_size(self.streaming_cfg.pre_encode_cache_size)
+            pre_encode_cache = self.buffer[
+                :, :, self.num_context_frames - pre_encode_cache_size : self.num_context_frames
+            ]
+            if self.step > 0 and pre_encode_cache.size(-1) < pre_encode_cache_size:
+                pre_encode_cache = torch.nn.functional.pad(
+                    pre_encode_cache, (pre_encode_cache_size - pre_encode_cache.size(-1), 0)
+                )
+            chunk = torch.cat(
+                [pre_encode_cache, self.buffer[:, :, self.num_context_frames : self.num_context_frames + chunk_size]],
+                dim=-1,
+            )
+            chunk_length = torch.full_like(self.output_length, chunk.size(-1))
+
+            encoded, encoded_len, *self.cache = self.encoder.cache_aware_stream_step(
+                processed_signal=chunk,
+                processed_signal_length=chunk_length,
+                cache_last_channel=self.cache[0],
+                cache_last_time=self.cache[1],
+                cache_last_channel_len=self.cache[2],
+                keep_all_outputs=is_last_chunk,
+                drop_extra_pre_encoded=0 if self.step == 0 else None,
+            )
+            outputs.append(encoded[:, :, : encoded_len.max()])
+            self.output_length += encoded_len
+
+            # advance to the next chunk, keeping frames for the pre-encode cache
+            shift_size = min(self._get_size(self.streaming_cfg.shift_size), num_available_frames)
+            self.step += 1
+            next_context_frames = self.num_context_frames + shift_size
+            num_keep = min(next_context_frames, self._get_size(self.streaming_cfg.pre_encode_cache_size))
+            self.buffer = self.buffer[:, :, next_context_frames - num_keep :]
+            self.num_context_frames = num_keep
+            if is_last_chunk:
+                break
+
+        if not outputs:
+            return self.buffer.new_zeros(self.buffer.size(0), self.encoder._feat_out, 0)
+        return torch.cat(outputs, dim=-1)
+
+
 class IdentityConnector(NeuralModule, Exportable):
     """User to pass encoder's representations as-is to the LLM."""
 
@@ -0,0 +1,117 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+from collections import OrderedDict
+
+import torch
+from omegaconf import OmegaConf
+from torch import nn
+
+from nemo.collections.speechlm2.modules.perception import encode_audio_in_length_buckets
+
+
+class PerceptionCache:
+    """
+    Content-addressed LRU cache of audio perception outputs, used to avoid re-encoding the same recording
+    when a model is prompted several times about it (e.g., transcribe, then summarize, then extract entities).
+
+    The key of an audio is a hash of its samples and of the perception module config.
+    The hash doesn't cover the weights of the perception module, so a cache should be used with a single model,
+    and cleared with :meth:`clear` when the weights change.
+    The least recently used entries are evicted when the total size of cached embeddings exceeds ``max_size_bytes``.
+
+    Example:
+
+        >>> cache = PerceptionCache(max_size_bytes=256 * 1024**2)
+        >>> for question in ["Transcribe the audio.", "Summarize the audio."]:
+        ...     answer_ids = model.generate(prompts=..., audios=audios, audio_lens=audio_lens, perception_cache=cache)
+
+    Args:
+        max_size_bytes: maximum total size of cached embeddings.
+    """
+
+    def __init__(self, max_size_bytes: int = 512 * 1024**2):
+        self.max_size_bytes = max_size_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._fingerprints = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._fingerprints.clear()
+        self.size_bytes = 0
+
+    def __call__(self, perception: nn.Module, audios: torch.Tensor, audio_lens: torch.Tensor) -> list[torch.Tensor]:
+        """
+        Return perception outputs for a batch of audios, running ``perception`` only on the audios missing
+        in the cache.
+        The missing audios are encoded in batches of similar lengths, see :func:`encode_audio_in_length_buckets`.
+
+        Args:
+            perception: perception module, e.g., :class:`AudioPerceptionModule`.
+            audios: zero-padded batch of time-domain audio signals of shape (B, T).
+            audio_lens: length of each audio of shape (B,).
+
+        Returns:
+            List of B embeddings, each of shape (T_i, H).
+        """
+        fingerprint = self._get_fingerprint(perception)
+        keys = [self._get_key(audio[:alen], fingerprint) for audio, alen in zip(audios, audio_lens.tolist())]
+        embeds = [self._get(key) for key in keys]
+
+        missing = [i for i, emb in enumerate(embeds) if emb is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            missing_embeds = encode_audio_in_length_buckets(perception, audios[missing], audio_lens[missing])
+            for i, emb in zip(missing, missing_embeds):
+                embeds[i] = emb.detach()
+                self._put(keys[i], embeds[i])
+        return embeds
+
+    def _get_fingerprint(self, perception: nn.Module) -> str:
+        if perception not in self._fingerprints:
+            cfg = getattr(perception, "cfg", None)
+            cfg = OmegaConf.to_yaml(cfg) if cfg is not None else repr(perception)
+            self._fingerprints[perception] = hashlib.blake2b(cfg.encode(), digest_size=16).hexdigest()
+        return self._fingerprints[perception]
+
+    @staticmethod
+    def _get_key(audio: torch.Tensor, fingerprint: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(fingerprint.encode())
+        h.update(str(audio.dtype).encode())
+        h.update(audio.detach().contiguous().view(torch.uint8).cpu().numpy().tobytes())
+        return h.hexdigest()
+
+    def _get(self, key: str) -> torch.Tensor | None:
+        embed = self._entries.get(key)
+        if embed is not None:
+            self._entries.move_to_end(key)
+        return embed
+
+    def _put(self, key: str, embed: torch.Tensor) -> None:
+        size = embed.numel() * embed.element_size()
+        if key in self._entries or size > self.max_size_bytes:
+            return
+        self._entries[key] = embed
+        self.size_bytes += size
+        while self.size_bytes > self.max_size_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= evicted.numel() * evicted.element_size()
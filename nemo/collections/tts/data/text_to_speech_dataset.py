@@ -26,6 +26,11 @@ import torch.utils.data
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
 from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import BaseTokenizer
 from nemo.collections.tts.parts.preprocessing.feature_processors import FeatureProcessor
+from nemo.collections.tts.parts.preprocessing.feature_store import (
+    ALIGN_PRIOR_STORE_NAME,
+    get_align_prior_key,
+    get_feature_store,
+)
 from nemo.collections.tts.parts.preprocessing.features import Featurizer
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
     _read_audio,
@@ -76,7 +81,8 @@ class TextToSpeechDataset(Dataset):
         speaker_path: Optional, path to JSON file with speaker indices, for multi-speaker training. Can be created with
             scripts.dataset_processing.tts.create_speaker_map.py
         featurizers: Optional, list of featurizers to load feature data from. Should be the same config provided
-            when running scripts.dataset_processing.tts.compute_features.py before training.
+            when running scripts.dataset_processing.tts.compute_features.py before training. Features are read
+            from feature stores created with scripts.dataset_processing.tts.pack_features.py if they exist.
         feature_processors: Optional, list of feature processors to run on training examples.
         align_prior_hop_length: Optional int, hop length of audio features.
             If provided alignment prior will be calculated and included in batch output. Must match hop length
@@ -241,9 +247,9 @@ class TextToSpeechDataset(Dataset):
 
         if self.include_align_prior:
             spec_len = 1 + librosa.core.samples_to_frames(audio_len, hop_length=self.align_prior_hop_length)
-            align_prior = beta_binomial_prior_distribution(phoneme_count=text_len, mel_count=spec_len)
-            align_prior = torch.tensor(align_prior, dtype=torch.float32)
-            example["align_prior"] = align_prior
+            example["align_prior"] = self._get_align_prior(
+                feature_dir=data.feature_dir, text_len=text_len, spec_len=spec_len
+            )
 
         for featurizer in self.featurizers:
             feature_dict = featurizer.load(
@@ -256,6 +262,27 @@ class TextToSpeechDataset(Dataset):
 
         return example
 
+    @staticmethod
+    def _get_align_prior(feature_dir: Path, text_len: int, spec_len: int, scaling_factor: float = 1.0) -> torch.Tensor:
+        """
+        Get the alignment prior matrix with shape [spec_len, text_len]. It is read from the alignment prior store
+        in feature_dir created with scripts/dataset_processing/tts/pack_features.py if the store contains it,
+        otherwise it is computed.
+        """
+        prior_store = get_feature_store(store_dir=feature_dir, name=ALIGN_PRIOR_STORE_NAME)
+        prior_key = get_align_prior_key(text_len=text_len, spec_len=spec_len)
+        if (
+            prior_store is not None
+            and prior_store.metadata.get("scaling_factor") == scaling_factor
+            and prior_key in prior_store
+        ):
+            align_prior = np.copy(prior_store[prior_key])
+        else:
+            align_prior = beta_binomial_prior_distribution(
+                phoneme_count=text_len, mel_count=spec_len, scaling_factor=scaling_factor
+            )
+        return torch.tensor(align_prior, dtype=torch.float32)
+
     def collate_fn(self, batch: List[dict]):
         dataset_name_list = []
         audio_filepath_list = []
@@ -597,11 +624,12 @@ class MagpieTTSDataset(TextToSpeechDataset):
             example['context_text_len'] = context_text_len
 
         if self.include_align_prior:
-            align_prior = beta_binomial_prior_distribution(
-                phoneme_count=text_len, mel_count=spec_len, scaling_factor=self.prior_scaling_factor
+            example["align_prior"] = self._get_align_prior(
+                feature_dir=data.feature_dir,
+                text_len=text_len,
+                spec_len=spec_len,
+                scaling_factor=self.prior_scaling_factor,
             )
-            align_prior = torch.tensor(align_prior, dtype=torch.float32)
-            example["align_prior"] = align_prior
 
         example['raw_text'] = data.text
 
@@ -16,7 +16,8 @@ import pathlib
 import random
 import re
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import List, Optional
 
 import nltk
 import torch
@@ -28,6 +29,9 @@ from nemo.utils.get_rank import is_global_rank_zero
 
 
 class EnglishG2p(BaseG2p):
+    # attributes which affect the parsed words; the word cache is cleared when they are assigned
+    _WORD_CACHE_DEPENDENCIES = ('phoneme_dict', 'heteronyms', 'ignore_ambiguous_words', 'apply_to_oov_word')
+
     def __init__(
         self,
         phoneme_dict=None,
@@ -38,6 +42,7 @@ class EnglishG2p(BaseG2p):
         encoding='latin-1',
         phoneme_probability: Optional[float] = None,
         mapping_file: Optional[str] = None,
+        word_cache_size: int = 0,
     ):
         """English G2P module. This module converts words from grapheme to phoneme representation using phoneme_dict in CMU dict format.
         Optionally, it can ignore words which are heteronyms, ambiguous or marked as unchangeable by word_tokenize_func (see code for details).
@@ -55,6 +60,10 @@ class EnglishG2p(BaseG2p):
             phoneme_probability (Optional[float]): The probability (0.<var<1.) that each word is phonemized. Defaults to None which is the same as 1.
                 Note that this code path is only run if the word can be phonemized. For example: If the word does not have an entry in the g2p dict, it will be returned
                 as characters. If the word has multiple entries and ignore_ambiguous_words is True, it will be returned as characters.
+            word_cache_size (int): Maximum number of words in the LRU cache of parsed words, which is shared across calls.
+                Defaults to 0 (disabled). The cache is cleared when `phoneme_dict`, `heteronyms`, `ignore_ambiguous_words`
+                or `apply_to_oov_word` are assigned, but not when they are modified in-place (call `clear_word_cache`).
+                Note that the cache assumes that `apply_to_oov_word` is deterministic.
         """
         phoneme_dict = (
             self._parse_as_cmu_dict(phoneme_dict, encoding)
@@ -85,6 +94,8 @@ class EnglishG2p(BaseG2p):
         )
         self.phoneme_probability = phoneme_probability
         self._rng = random.Random()
+        self.word_cache_size = word_cache_size
+        self._word_cache = OrderedDict()
 
     @staticmethod
     def _parse_as_cmu_dict(phoneme_dict_path=None, encoding='latin-1'):
@@ -151,6 +162,15 @@ class EnglishG2p(BaseG2p):
     def is_unique_in_phoneme_dict(self, word):
         return len(self.phoneme_dict[word]) == 1
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self._WORD_CACHE_DEPENDENCIES and '_word_cache' in self.__dict__:
+            self.clear_word_cache()
+
+    def clear_word_cache(self):
+        """Clear cached parsed words, e.g., after `phoneme_dict` or `heteronyms` have been modified in-place."""
+        self._word_cache.clear()
+
     def parse_one_word(self, word: str):
         """
         Returns parsed `word` and `status` as bool.
@@ -160,6 +180,21 @@ class EnglishG2p(BaseG2p):
         if self.phoneme_probability is not None and self._rng.random() > self.phoneme_probability:
             return word, True
 
+        if self.word_cache_size <= 0:
+            return self._parse_one_word(word)
+
+        parsed = self._word_cache.get(word)
+        if parsed is not None:
+            self._word_cache.move_to_end(word)
+            return parsed
+
+        parsed = self._parse_one_word(word)
+        self._word_cache[word] = parsed
+        if len(self._word_cache) > self.word_cache_size:
+            self._word_cache.popitem(last=False)
+        return parsed
+
+    def _parse_one_word(self, word: str):
         # punctuation or whitespace.
         if re.search(r"[a-zA-ZÀ-ÿ\d]", word) is None:
             return list(word), True
@@ -199,7 +234,37 @@ class EnglishG2p(BaseG2p):
 
     def __call__(self, text):
         words = self.word_tokenize_func(text)
+        return self._words_to_prons(words, self.parse_one_word)
+
+    def phonemize_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Convert a list of sentences to phonemes, equivalent to calling this module on each sentence.
+        All sentences are tokenized first and each distinct word is parsed once for the whole batch. If
+        `phoneme_probability` is set, the random choice whether to phonemize is still made for each occurrence.
 
+        Args:
+            texts: List of sentences.
+
+        Returns:
+            List with the phoneme sequence for each sentence.
+        """
+        batch_words = [self.word_tokenize_func(text) for text in texts]
+
+        if self.phoneme_probability is not None:
+            parse_fn = self.parse_one_word
+        else:
+            parsed_words = {}
+
+            def parse_fn(word):
+                parsed = parsed_words.get(word)
+                if parsed is None:
+                    parsed = parsed_words[word] = self.parse_one_word(word)
+                return parsed
+
+        return [self._words_to_prons(words, parse_fn) for words in batch_words]
+
+    @staticmethod
+    def _words_to_prons(words, parse_fn):
         prons = []
         for word, without_changes in words:
             if without_changes:
@@ -208,12 +273,12 @@ class EnglishG2p(BaseG2p):
 
             word_str = word[0]
             word_by_hyphen = word_str.split("-")
-            pron, is_handled = self.parse_one_word(word_str)
+            pron, is_handled = parse_fn(word_str)
 
             if not is_handled and len(word_by_hyphen) > 1:
                 pron = []
                 for sub_word in word_by_hyphen:
-                    p, _ = self.parse_one_word(sub_word)
+                    p, _ = parse_fn(sub_word)
                     pron.extend(p)
                     pron.extend(["-"])
                 pron.pop()
@@ -15,7 +15,7 @@
 import itertools
 from math import ceil
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import torch
 import torch.nn.functional as F
@@ -106,6 +106,8 @@ class AudioCodecModel(ModelPT):
 
         # Decoder setup
         self.audio_decoder = instantiate(cfg.audio_decoder)
+        # Number of frames before and after each frame which affect its decoded audio, computed on first use
+        self._decoder_receptive_field = None
 
         # Discriminator setup
         self.discriminator = instantiate(cfg.discriminator)
@@ -394,6 +396,124 @@ class AudioCodecModel(ModelPT):
 
         return audio, audio_len
 
+    def decode_chunk(
+        self,
+        tokens: torch.Tensor,
+        state: Optional[dict] = None,
+        left_context_frames: Optional[int] = None,
+        lookahead_frames: Optional[int] = None,
+        is_final: bool = False,
+    ) -> Tuple[torch.Tensor, torch.Tensor, dict]:
+        """Incrementally convert discrete tokens into a time-domain signal, e.g., while the tokens are being generated.
+
+        Each call appends `tokens` to the frames received so far and returns audio for the frames which can be
+        decoded. The last `lookahead_frames` received frames are held back until the following frames are
+        available, and up to `left_context_frames` already decoded frames are used as the left context, so that the
+        decoder sees a bounded window around the emitted frames. By default, the context and lookahead cover
+        the receptive field of the decoder, and the concatenated output matches `decode` on the complete sequence.
+        Smaller values reduce latency and compute, but the output only approximates `decode` near the chunk
+        boundaries.
+
+        Args:
+            tokens: new tokens for each codebook for each time frame, shape `(batch, number of codebooks, number of frames)`
+            state: state returned by the previous call, or `None` for the first chunk
+            left_context_frames: number of already decoded frames used as the left context,
+                defaults to the left receptive field of the decoder
+            lookahead_frames: number of frames held back until more frames are received,
+                defaults to the right receptive field of the decoder
+            is_final: if `True`, all received frames are decoded
+
+        Returns:
+            Decoded audio for the emitted frames, shape `(batch, number of emitted frames * self.samples_per_frame)`,
+            its length `audio_len`, shape `(batch,)`, and the state for the next call.
+        """
+        if left_context_frames is None or lookahead_frames is None:
+            receptive_field_left, receptive_field_right = self._get_decoder_receptive_field(
+                num_codebooks=tokens.size(1)
+            )
+            left_context_frames = receptive_field_left if left_context_frames is None else left_context_frames
+            lookahead_frames = receptive_field_right if lookahead_frames is None else lookahead_frames
+        if left_context_frames < 0 or lookahead_frames < 0:
+            raise ValueError(
+                f'Context and lookahead must be non-negative, got {left_context_frames} and {lookahead_frames}'
+            )
+
+        if state is not None:
+            tokens = torch.cat([state['tokens'], tokens], dim=-1)
+            num_context_frames = state['num_context_frames']
+        else:
+            num_context_frames = 0
+
+        batch_size, _, num_frames = tokens.shape
+        num_pending_frames = num_frames - num_context_frames
+        num_emit_frames = num_pending_frames if is_final else max(num_pending_frames - lookahead_frames, 0)
+
+        if num_emit_frames > 0:
+            tokens_len = torch.full((batch_size,), num_frames, dtype=torch.long, device=tokens.device)
+            audio, _ = self.decode(tokens=tokens, tokens_len=tokens_len)
+            start = num_context_frames * self.samples_per_frame
+            end = (num_context_frames + num_emit_frames) * self.samples_per_frame
+            audio = audio[:, start:end]
+        else:
+            audio = torch.zeros(batch_size, 0, device=tokens.device)
+        audio_len = torch.full((batch_size,), audio.size(-1), dtype=torch.long, device=tokens.device)
+
+        # Keep the left context for the next chunk and the frames which have not been decoded yet
+        num_decoded_frames = num_context_frames + num_emit_frames
+        next_num_context_frames = min(left_context_frames, num_decoded_frames)
+        state = {
+            'tokens': tokens[..., num_decoded_frames - next_num_context_frames :],
+            'num_context_frames': next_num_context_frames,
+        }
+        return audio, audio_len, state
+
+    def _get_decoder_receptive_field(self, num_codebooks: int, max_frames: int = 4096) -> Tuple[int, int]:
+        """Get the number of frames before and after a frame which affect its decoded audio.
+
+        The receptive field is found once from the gradient of the decoded audio of the middle frame with respect
+        to the decoder input. The number of probed frames is doubled until the receptive field is within the input.
+
+        Args:
+            num_codebooks: number of codebooks of the tokens
+            max_frames: maximum number of probed frames
+
+        Returns:
+            Number of frames on the left and on the right of a frame which affect its decoded audio.
+        """
+        if self._decoder_receptive_field is not None:
+            return self._decoder_receptive_field
+
+        num_frames = 64
+        while True:
+            tokens = torch.zeros(1, num_codebooks, num_frames, dtype=torch.long, device=self.device)
+            tokens_len = torch.full((1,), num_frames, dtype=torch.long, device=self.device)
+            middle_frame = num_frames // 2
+            with torch.inference_mode(False), torch.enable_grad():
+                inputs = self.dequantize(tokens=tokens, tokens_len=tokens_len).detach().requires_grad_()
+                audio, _ = self.decode_audio(inputs=inputs, input_len=tokens_len)
+                frame_audio = audio[
+                    :, middle_frame * self.samples_per_frame : (middle_frame + 1) * self.samples_per_frame
+                ]
+                (inputs_grad,) = torch.autograd.grad(frame_audio.sum(), inputs)
+            affected_frames = torch.nonzero(inputs_grad.abs().sum(dim=(0, 1))).squeeze(-1).tolist()
+            if not affected_frames:
+                raise ValueError(
+                    'Failed to find the receptive field of the decoder, '
+                    'set `left_context_frames` and `lookahead_frames` explicitly'
+                )
+            first_frame, last_frame = affected_frames[0], affected_frames[-1]
+            if first_frame > 0 and last_frame < num_frames - 1:
+                break
+            if num_frames >= max_frames:
+                raise ValueError(
+                    f'Receptive field of the decoder exceeds {max_frames} frames, '
+                    f'set `left_context_frames` and `lookahead_frames` explicitly'
+                )
+            num_frames *= 2
+
+        self._decoder_receptive_field = (middle_frame - first_frame, last_frame - middle_frame)
+        return self._decoder_receptive_field
+
     @typecheck(
         input_types={
             "audio": NeuralType(('B', 'T_audio'), AudioSignal()),
@@ -811,128 +811,318 @@ class MagpieTTS_Model(ModelPT):
 
         return val_output
 
-    def infer_batch(self, batch, max_decoder_steps=500, temperature=0.7, topk=80, use_cfg=False, cfg_scale=1.0):
-        with torch.no_grad():
-            self.decoder.reset_cache(use_cache=self.use_kv_cache_for_inference)
+    def prepare_inference_state(self, context_tensors, max_decoder_steps, use_cfg=False):
+        """
+        Prepare the decoder inputs which stay constant during autoregressive inference. The conditioning for
+        classifier-free guidance is combined with the unconditional conditioning once, and the embedded decoder input
+        is stored in a buffer preallocated for `max_decoder_steps`, which is filled in place at each step.
+
+        Returns dict with keys:
+            cond: Conditioning tensor (or list of tensors), with the unconditional items appended if use_cfg
+            cond_mask: Mask for the conditioning
+            dec_input_embedded <torch tensor> (B', T_ctx + max_decoder_steps, E): Decoder input buffer initialized
+                with the decoder context and the audio BOS embedding
+            dec_input_mask <torch tensor> (B', T_ctx + max_decoder_steps): Decoder input mask
+            dec_context_size <int>: Number of decoder context timesteps T_ctx
+            item_indices <torch tensor> (B,): Index in the original batch of each active item
+        where B' = 2B if use_cfg else B.
+        """
+        text = context_tensors['text']
+        batch_size = text.size(0)
+        cond = context_tensors['cond']
+        cond_mask = context_tensors['cond_mask']
+        additional_decoder_input = context_tensors['additional_decoder_input']
+        additional_decoder_mask = context_tensors['addtional_decoder_mask']
+
+        audio_codes_bos = torch.full(
+            (batch_size, self.cfg.num_audio_codebooks, 1), self.audio_bos_id, device=text.device
+        ).long()
+        audio_codes_bos_embedded = self.embed_audio_tokens(audio_codes_bos)  # (B, 1, E)
+        audio_codes_embedded = audio_codes_bos_embedded.new_zeros(
+            batch_size, max_decoder_steps, audio_codes_bos_embedded.size(2)
+        )
+        audio_codes_embedded[:, :1] = audio_codes_bos_embedded
+        audio_codes_mask = torch.ones(batch_size, max_decoder_steps, dtype=torch.bool, device=text.device)
 
-            context_tensors = self.prepare_context_tensors(batch)
-            text = context_tensors['text']
-            audio_codes_bos = torch.full(
-                (text.size(0), self.cfg.num_audio_codebooks, 1), self.audio_bos_id, device=text.device
-            ).long()
-            audio_codes_lens = torch.full((text.size(0),), 1, device=text.device).long()
-            audio_codes_input = audio_codes_bos
-            audio_codes_mask = get_mask_from_lengths(audio_codes_lens)
+        if additional_decoder_input is not None:
+            dec_input_embedded = torch.cat([additional_decoder_input, audio_codes_embedded], dim=1)
+            dec_input_mask = torch.cat([additional_decoder_mask, audio_codes_mask], dim=1)
+            dec_context_size = additional_decoder_input.size(1)
+        else:
+            dec_input_embedded = audio_codes_embedded
+            dec_input_mask = audio_codes_mask
+            dec_context_size = 0
 
-            all_predictions = []
-            end_indices = {}
+        if use_cfg:
+            dummy_cond, dummy_cond_mask, dummy_additional_decoder_input, dummy_addition_dec_mask, _ = (
+                self.prepare_dummy_cond_for_cfg(cond, cond_mask, additional_decoder_input, additional_decoder_mask)
+            )
+            # Combine conditional and unconditional inputs into one batch
+            if isinstance(cond, list):
+                cond = [torch.cat([cond_item, dummy_item], dim=0) for cond_item, dummy_item in zip(cond, dummy_cond)]
+                cond_mask = [
+                    torch.cat([mask_item, dummy_item], dim=0)
+                    for mask_item, dummy_item in zip(cond_mask, dummy_cond_mask)
+                ]
+            else:
+                cond = torch.cat([cond, dummy_cond], dim=0)
+                cond_mask = torch.cat([cond_mask, dummy_cond_mask], dim=0)
+            dec_input_embedded = torch.cat([dec_input_embedded, dec_input_embedded], dim=0)
+            dec_input_mask = torch.cat([dec_input_mask, dec_input_mask], dim=0)
+            if dummy_additional_decoder_input is not None:
+                dec_input_embedded[batch_size:, :dec_context_size] = dummy_additional_decoder_input
+                dec_input_mask[batch_size:, :dec_context_size] = dummy_addition_dec_mask
 
+        return {
+            'cond': cond,
+            'cond_mask': cond_mask,
+            'dec_input_embedded': dec_input_embedded,
+            'dec_input_mask': dec_input_mask,
+            'dec_context_size': dec_context_size,
+            'item_indices': torch.arange(batch_size, device=text.device),
+        }
+
+    def compact_inference_state(self, state, keep, use_cfg=False):
+        """
+        Keep only the items `keep` (indices into the active items) in the inference state and the decoder cache,
+        so that finished items are not processed in the following decoding steps.
+        """
+        rows = keep
+        if use_cfg:
+            # unconditional items are stored after the conditional items
+            rows = torch.cat([keep, keep + state['item_indices'].size(0)])
+
+        def _select(tensor):
+            return tensor.index_select(0, rows) if tensor is not None else None
+
+        if isinstance(state['cond'], list):
+            state['cond'] = [_select(cond_item) for cond_item in state['cond']]
+            state['cond_mask'] = [_select(mask_item) for mask_item in state['cond_mask']]
+        else:
+            state['cond'] = _select(state['cond'])
+            state['cond_mask'] = _select(state['cond_mask'])
+        state['dec_input_embedded'] = _select(state['dec_input_embedded'])
+        state['dec_input_mask'] = _select(state['dec_input_mask'])
+        state['item_indices'] = state['item_indices'].index_select(0, keep)
+        if self.use_kv_cache_for_inference:
+            self.decoder.reorder_cache(rows)
+        return state
+
+    @torch.no_grad()
+    def generate_codes(
+        self,
+        context_tensors,
+        max_decoder_steps=500,
+        temperature=0.7,
+        topk=80,
+        use_cfg=False,
+        cfg_scale=1.0,
+        compact_finished=True,
+    ):
+        """
+        Autoregressively generate audio codes for the items in the batch, yielding after each decoding step.
+        Items which predicted the end of audio are removed from the batch in the following steps
+        (`compact_finished`), or kept in the batch and not reported anymore.
+
+        Yields dict with keys:
+            item_indices <torch tensor> (B_active,): Index in the batch of the items decoded in this step
+            audio_codes <torch tensor> (B_active, num_codebooks): Sampled codes for the items
+            finished <bool tensor> (B_active,): True for items which predicted the end of audio in this step
+        """
+        self.decoder.reset_cache(use_cache=self.use_kv_cache_for_inference)
+        state = self.prepare_inference_state(context_tensors, max_decoder_steps, use_cfg=use_cfg)
+        dec_context_size = state['dec_context_size']
+        # Items of the batch which did not finish, used only if the finished items are not removed from the batch
+        active = torch.ones_like(state['item_indices'], dtype=torch.bool)
+
+        for idx in range(max_decoder_steps):
+            if idx % 20 == 0:
+                print(f"Decoding timestep {idx}")
+            dec_input_size = dec_context_size + idx + 1
+            decoder_out = self.decoder(
+                state['dec_input_embedded'][:, :dec_input_size],
+                state['dec_input_mask'][:, :dec_input_size],
+                cond=state['cond'],
+                cond_mask=state['cond_mask'],
+                attn_prior=None,
+                multi_encoder_mapping=context_tensors['multi_encoder_mapping'],
+            )
+            # Only the last timestep is needed for sampling
+            all_code_logits_t = self.final_proj(
+                decoder_out['output'][:, -1, :]
+            )  # (B', num_codebooks * num_tokens_per_codebook)
             if use_cfg:
-                dummy_cond, dummy_cond_mask, dummy_additional_decoder_input, dummy_addition_dec_mask, _ = (
-                    self.prepare_dummy_cond_for_cfg(
-                        context_tensors['cond'],
-                        context_tensors['cond_mask'],
-                        context_tensors['additional_decoder_input'],
-                        context_tensors['addtional_decoder_mask'],
-                    )
+                cond_logits, uncond_logits = all_code_logits_t.chunk(2, dim=0)
+                all_code_logits_t = (1 - cfg_scale) * uncond_logits + cfg_scale * cond_logits
+
+            audio_codes_next = self.sample_codes_from_logits(
+                all_code_logits_t, temperature=temperature, topk=topk
+            )  # (B, num_codebooks)
+            all_codes_next_argmax = self.sample_codes_from_logits(
+                all_code_logits_t, temperature=0.01
+            )  # (B, num_codebooks)
+
+            item_indices = state['item_indices']
+            audio_codes_step = audio_codes_next
+            finished = (all_codes_next_argmax[:, 0] == self.audio_eos_id) | (
+                audio_codes_next[:, 0] == self.audio_eos_id
+            )
+            if not compact_finished:
+                item_indices, audio_codes_step, finished = (
+                    item_indices[active],
+                    audio_codes_step[active],
+                    finished[active],
                 )
+            for item_idx in item_indices[finished].tolist():
+                print("End detected for item {} at timestep {}".format(item_idx, idx))
 
-            for idx in range(max_decoder_steps):
-                if idx % 20 == 0:
-                    print(f"Decoding timestep {idx}")
-                audio_codes_embedded = self.embed_audio_tokens(audio_codes_input)
-                if context_tensors['additional_decoder_input'] is not None:
-                    _audio_codes_embedded = torch.cat(
-                        [context_tensors['additional_decoder_input'], audio_codes_embedded], dim=1
-                    )
-                    _audio_codes_mask = torch.cat([context_tensors['addtional_decoder_mask'], audio_codes_mask], dim=1)
-                else:
-                    _audio_codes_embedded = audio_codes_embedded
-                    _audio_codes_mask = audio_codes_mask
+            yield {'item_indices': item_indices, 'audio_codes': audio_codes_step, 'finished': finished}
 
+            if finished.all():
+                print("All ends reached")
+                break
+
+            if idx + 1 < max_decoder_steps:
+                audio_codes_next_embedded = self.embed_audio_tokens(audio_codes_next.unsqueeze(-1))  # (B, 1, E)
                 if use_cfg:
-                    batch_size = audio_codes_embedded.size(0)
-                    # Combine conditional and unconditional inputs into one batch
-                    if isinstance(context_tensors['cond'], list):
-                        cfg_cond = [
-                            torch.cat([cond_item, dummy_cond_item], dim=0)
-                            for cond_item, dummy_cond_item in zip(context_tensors['cond'], dummy_cond)
-                        ]
-                        cfg_cond_mask = [
-                            torch.cat([cond_mask_item, dummy_cond_mask_item], dim=0)
-                            for cond_mask_item, dummy_cond_mask_item in zip(
-                                context_tensors['cond_mask'], dummy_cond_mask
-                            )
-                        ]
-                    else:
-                        cfg_cond = torch.cat([context_tensors['cond'], dummy_cond], dim=0)
-                        cfg_cond_mask = torch.cat([context_tensors['cond_mask'], dummy_cond_mask], dim=0)
-                    cfg_audio_codes_embedded = torch.cat([_audio_codes_embedded, _audio_codes_embedded], dim=0)
-                    cfg_audio_codes_mask = torch.cat([_audio_codes_mask, _audio_codes_mask], dim=0)
-                    if dummy_additional_decoder_input is not None:
-                        cfg_audio_codes_embedded[batch_size:, : dummy_additional_decoder_input.size(1)] = (
-                            dummy_additional_decoder_input
-                        )
-                        cfg_audio_codes_mask[batch_size:, : dummy_additional_decoder_input.size(1)] = (
-                            dummy_addition_dec_mask
-                        )
-
-                    combined_logits, _ = self.forward(
-                        dec_input_embedded=cfg_audio_codes_embedded,
-                        dec_input_mask=cfg_audio_codes_mask,
-                        cond=cfg_cond,
-                        cond_mask=cfg_cond_mask,
-                        attn_prior=None,
-                        multi_encoder_mapping=context_tensors['multi_encoder_mapping'],
-                    )
+                    audio_codes_next_embedded = torch.cat([audio_codes_next_embedded] * 2, dim=0)
+                state['dec_input_embedded'][:, dec_input_size : dec_input_size + 1] = audio_codes_next_embedded
 
-                    cond_logits = combined_logits[:batch_size]
-                    uncond_logits = combined_logits[batch_size:]
-                    all_code_logits = (1 - cfg_scale) * uncond_logits + cfg_scale * cond_logits
-                else:
-                    all_code_logits, _ = self.forward(
-                        dec_input_embedded=_audio_codes_embedded,
-                        dec_input_mask=_audio_codes_mask,
-                        cond=context_tensors['cond'],
-                        cond_mask=context_tensors['cond_mask'],
-                        attn_prior=None,
-                        multi_encoder_mapping=context_tensors['multi_encoder_mapping'],
-                    )
-                all_code_logits_t = all_code_logits[:, -1, :]  # (B, num_codebooks * num_tokens_per_codebook)
-                audio_codes_next = self.sample_codes_from_logits(
-                    all_code_logits_t, temperature=temperature, topk=topk
-                )  # (B, num_codebooks)
-                all_codes_next_argmax = self.sample_codes_from_logits(
-                    all_code_logits_t, temperature=0.01
-                )  # (B, num_codebooks)
-
-                for item_idx in range(all_codes_next_argmax.size(0)):
-                    if item_idx not in end_indices:
-                        pred_token = all_codes_next_argmax[item_idx][0].item()
-                        pred_token_multinomial = audio_codes_next[item_idx][0].item()
-                        if (pred_token == self.audio_eos_id) or (pred_token_multinomial == self.audio_eos_id):
-                            print("End detected for item {} at timestep {}".format(item_idx, idx))
-                            end_indices[item_idx] = idx
-
-                all_predictions.append(audio_codes_next)
-                audio_codes_input = torch.cat(
-                    [audio_codes_input, audio_codes_next.unsqueeze(-1)], dim=-1
-                )  # (B, C, T')
-                audio_codes_lens = audio_codes_lens + 1
-                audio_codes_mask = get_mask_from_lengths(audio_codes_lens)
-                if len(end_indices) == text.size(0):
-                    print("All ends reached")
-                    break
+            if not compact_finished:
+                active[item_indices[finished]] = False
+            elif finished.any():
+                keep = torch.nonzero(~finished, as_tuple=False).squeeze(1)
+                state = self.compact_inference_state(state, keep, use_cfg=use_cfg)
+
+    def infer_batch(
+        self,
+        batch,
+        max_decoder_steps=500,
+        temperature=0.7,
+        topk=80,
+        use_cfg=False,
+        cfg_scale=1.0,
+        compact_finished=True,
+    ):
+        with torch.no_grad():
+            context_tensors = self.prepare_context_tensors(batch)
+            text = context_tensors['text']
+            batch_size = text.size(0)
 
-            predicted_codes = torch.stack(all_predictions, dim=-1)  # (B, num_codebooks, T')
-            predicted_lens = [end_indices.get(idx, max_decoder_steps) for idx in range(text.size(0))]
-            predicted_codes_lens = torch.tensor(predicted_lens, device=text.device).long()
+            # Codes are written for the active items at each step, finished items keep zero padding
+            predicted_codes = torch.zeros(
+                batch_size, self.cfg.num_audio_codebooks, max_decoder_steps, dtype=torch.long, device=text.device
+            )
+            predicted_codes_lens = torch.full((batch_size,), max_decoder_steps, dtype=torch.long, device=text.device)
+
+            num_steps = 0
+            for step in self.generate_codes(
+                context_tensors,
+                max_decoder_steps=max_decoder_steps,
+                temperature=temperature,
+                topk=topk,
+                use_cfg=use_cfg,
+                cfg_scale=cfg_scale,
+                compact_finished=compact_finished,
+            ):
+                item_indices = step['item_indices']
+                predicted_codes[item_indices, :, num_steps] = step['audio_codes']
+                predicted_codes_lens[item_indices[step['finished']]] = num_steps
+                num_steps += 1
+
+            predicted_codes = predicted_codes[:, :, :num_steps]  # (B, num_codebooks, T')
 
             predicted_audio, predicted_audio_lens = self.codes_to_audio(predicted_codes, predicted_codes_lens)
 
             torch.cuda.empty_cache()
             return predicted_audio, predicted_audio_lens, predicted_codes, predicted_codes_lens
 
+    @torch.no_grad()
+    def infer_batch_streaming(
+        self,
+        batch,
+        max_decoder_steps=500,
+        temperature=0.7,
+        topk=80,
+        use_cfg=False,
+        cfg_scale=1.0,
+        chunk_size_frames=4,
+        left_context_frames=None,
+        lookahead_frames=None,
+    ):
+        """
+        Streaming version of `infer_batch`, which yields audio chunks while the codes are being generated.
+        Generated codes are passed to the codec every `chunk_size_frames` steps and decoded incrementally using
+        `AudioCodecModel.decode_chunk`, so the first audio is available after `chunk_size_frames + lookahead_frames`
+        decoding steps instead of after the complete utterance. By default, the context and lookahead cover
+        the receptive field of the codec decoder, and the audio matches `infer_batch`.
+
+        Yields tuples of:
+            audio <torch tensor> (B, T_chunk): Audio chunk for all items in the batch
+            audio_lens <torch tensor> (B,): Number of valid samples in the chunk for each item. This is zero for items
+                which finished in one of the previous chunks.
+        """
+        self._codec_model.eval()
+        context_tensors = self.prepare_context_tensors(batch)
+        text = context_tensors['text']
+        batch_size = text.size(0)
+        samples_per_frame = self._codec_model.samples_per_frame
+
+        predicted_codes_lens = torch.full((batch_size,), max_decoder_steps, dtype=torch.long, device=text.device)
+        pending_codes = []
+        codec_state = None
+        num_decoded_frames = 0
+
+        def _decode_pending_codes(is_final):
+            nonlocal codec_state, num_decoded_frames
+            if pending_codes:
+                codes = torch.stack(pending_codes, dim=-1)  # (B, num_codebooks, T_chunk)
+                pending_codes.clear()
+            else:
+                codes = torch.zeros(batch_size, self.cfg.num_audio_codebooks, 0, dtype=torch.long, device=text.device)
+            # Replace eos and bos tokens with padding, same as in codes_to_audio
+            codes[codes == self.audio_bos_id] = 0
+            codes[codes == self.audio_eos_id] = 0
+            audio, _, codec_state = self._codec_model.decode_chunk(
+                tokens=codes,
+                state=codec_state,
+                left_context_frames=left_context_frames,
+                lookahead_frames=lookahead_frames,
+                is_final=is_final,
+            )
+            num_chunk_frames = audio.size(-1) // samples_per_frame
+            valid_frames = torch.clamp(predicted_codes_lens - num_decoded_frames, min=0, max=num_chunk_frames)
+            num_decoded_frames += num_chunk_frames
+            return audio, valid_frames * samples_per_frame
+
+        for idx, step in enumerate(
+            self.generate_codes(
+                context_tensors,
+                max_decoder_steps=max_decoder_steps,
+                temperature=temperature,
+                topk=topk,
+                use_cfg=use_cfg,
+                cfg_scale=cfg_scale,
+            )
+        ):
+            item_indices = step['item_indices']
+            codes = torch.zeros(batch_size, self.cfg.num_audio_codebooks, dtype=torch.long, device=text.device)
+            codes[item_indices] = step['audio_codes']
+            predicted_codes_lens[item_indices[step['finished']]] = idx
+            pending_codes.append(codes)
+
+            if len(pending_codes) == chunk_size_frames:
+                audio, audio_lens = _decode_pending_codes(is_final=False)
+                if audio.size(-1) > 0:
+                    yield audio, audio_lens
+
+        # Decode the remaining frames, including the frames held back as lookahead
+        audio, audio_lens = _decode_pending_codes(is_final=True)
+        if audio.size(-1) > 0:
+            yield audio, audio_lens
+
+        torch.cuda.empty_cache()
+
     def test_step(self, batch, batch_idx):
         with torch.no_grad():
             test_dl_batch_size = self._test_dl.batch_size
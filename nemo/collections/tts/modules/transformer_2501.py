@@ -23,6 +23,13 @@ from nemo.utils import logging
 # as needed in the inference pipeline.
 
 
+def _select_cache_items(cache: Dict, indices: torch.Tensor) -> Dict:
+    return {
+        key: value.index_select(0, indices) if isinstance(value, torch.Tensor) else value
+        for key, value in cache.items()
+    }
+
+
 class ConvolutionLayer(torch.nn.Module):
     def __init__(
         self,
@@ -192,6 +199,10 @@ class Attention(torch.nn.Module):
         self.use_cache = use_cache
         self.cache = self._init_cache()
 
+    def reorder_cache(self, indices: torch.Tensor):
+        """Select batch items `indices` from the cached tensors, e.g., to drop finished items during inference."""
+        self.cache = _select_cache_items(self.cache, indices)
+
     def attn_naive(
         self,
         query: torch.Tensor,
@@ -475,6 +486,12 @@ class TransformerLayer(torch.nn.Module):
         if self.has_xattn:
             self.cross_attention.reset_cache(use_cache)
 
+    def reorder_cache(self, indices: torch.Tensor):
+        self.cache = _select_cache_items(self.cache, indices)
+        self.self_attention.reorder_cache(indices)
+        if self.has_xattn:
+            self.cross_attention.reorder_cache(indices)
+
     def forward(
         self,
         x: torch.Tensor,
@@ -628,6 +645,17 @@ class Transformer(torch.nn.Module):
         for layer in self.layers:
             layer.reset_cache(use_cache)
 
+    def reorder_cache(self, indices: torch.Tensor):
+        """
+        Keep only the batch items `indices` in the inference cache of all layers. This can be used to remove finished
+        items from the batch during autoregressive inference.
+
+        Args:
+            indices <torch tensor> (B',): Indices of the batch items to keep, in the order they should appear
+        """
+        for layer in self.layers:
+            layer.reorder_cache(indices)
+
     @staticmethod
     def _init_weights_gpt2(module):
         if isinstance(module, (torch.nn.Linear, torch.nn.Embedding, torch.nn.Conv1d)):
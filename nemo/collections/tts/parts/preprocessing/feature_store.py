@@ -0,0 +1,192 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+# Name of the store with alignment prior matrices, which are indexed by text and spectrogram lengths
+ALIGN_PRIOR_STORE_NAME = "align_prior"
+
+
+def get_align_prior_key(text_len: int, spec_len: int) -> str:
+    """Key of the alignment prior matrix with shape [spec_len, text_len] in the alignment prior store."""
+    return f"{text_len}_{spec_len}"
+
+
+class FeatureStore:
+    """
+    Read-only store with arrays of a single feature type, e.g., pitch or energy of all utterances in a dataset.
+
+    All arrays are concatenated in a single binary file, which is memory-mapped, and an index file contains the key,
+    offset and shape of each array. Compared to one file per utterance, this avoids opening a file for each
+    example, and the memory-mapped data is shared by all dataloader workers on the same node.
+
+    Files for a store with name `<name>` in directory `<store_dir>`:
+        <store_dir>/<name>.bin: concatenated array data
+        <store_dir>/<name>.index.npz: keys, offsets and shapes of arrays, dtype and optional metadata
+
+    Args:
+        store_dir: Directory with the store files.
+        name: Name of the store, e.g., feature name.
+    """
+
+    def __init__(self, store_dir: Union[str, Path], name: str):
+        self.data_path, self.index_path = self.get_paths(store_dir=store_dir, name=name)
+
+        with np.load(self.index_path, allow_pickle=False) as index:
+            keys = index["keys"].tolist()
+            self.offsets = index["offsets"]
+            self.shapes = index["shapes"]
+            self.dtype = np.dtype(str(index["dtype"]))
+            self.metadata = json.loads(str(index["metadata"]))
+
+        self._key_to_index = {key: i for i, key in enumerate(keys)}
+        if self.offsets[-1] > 0:
+            self._data = np.memmap(self.data_path, dtype=self.dtype, mode="r", shape=(int(self.offsets[-1]),))
+        else:
+            # memory-mapping an empty file is not supported
+            self._data = np.empty(0, dtype=self.dtype)
+
+    @staticmethod
+    def get_paths(store_dir: Union[str, Path], name: str):
+        store_dir = Path(store_dir)
+        return store_dir / f"{name}.bin", store_dir / f"{name}.index.npz"
+
+    @classmethod
+    def exists(cls, store_dir: Union[str, Path], name: str) -> bool:
+        return all(path.exists() for path in cls.get_paths(store_dir=store_dir, name=name))
+
+    def __len__(self) -> int:
+        return len(self._key_to_index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_index
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """
+        Get array for the input key.
+
+        Returns:
+            Read-only view of the memory-mapped data. Use `np.copy` to get an array which can be modified.
+        """
+        i = self._key_to_index[key]
+        return self._data[self.offsets[i] : self.offsets[i + 1]].reshape(self.shapes[i])
+
+
+class FeatureStoreWriter:
+    """
+    Writer for creating a `FeatureStore`. The store files are written to temporary files and moved into
+    place when the writer is closed, so that a partially written store is never used.
+
+    Example:
+        .. code-block:: python
+
+            with FeatureStoreWriter(store_dir=feature_dir, name="pitch") as writer:
+                for key, pitch in pitch_features.items():
+                    writer.add(key=key, array=pitch)
+
+    Args:
+        store_dir: Directory where the store files will be written.
+        name: Name of the store, e.g., feature name.
+        metadata: Optional JSON-serializable dictionary saved with the store.
+    """
+
+    def __init__(self, store_dir: Union[str, Path], name: str, metadata: Optional[Dict[str, Any]] = None):
+        self.data_path, self.index_path = FeatureStore.get_paths(store_dir=store_dir, name=name)
+        self.data_path.parent.mkdir(exist_ok=True, parents=True)
+        self.metadata = metadata or {}
+        self.keys = []
+        self._key_set = set()
+        self.offsets = [0]
+        self.shapes = []
+        self.dtype = None
+        self._data_file = open(f"{self.data_path}.tmp", "wb")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_set
+
+    def add(self, key: str, array: np.ndarray) -> None:
+        """Add array to the store. All arrays must have the same dtype and number of dimensions."""
+        if key in self._key_set:
+            raise ValueError(f"Key {key} already exists in {self.data_path}")
+
+        array = np.asarray(array)
+        if self.dtype is None:
+            self.dtype = array.dtype
+        elif array.dtype != self.dtype or array.ndim != len(self.shapes[0]):
+            raise ValueError(
+                f"Array for key {key} has dtype {array.dtype} and shape {array.shape}, expected dtype {self.dtype} "
+                f"and {len(self.shapes[0])} dimensions."
+            )
+
+        self._data_file.write(np.ascontiguousarray(array).tobytes())
+        self.keys.append(key)
+        self._key_set.add(key)
+        self.offsets.append(self.offsets[-1] + array.size)
+        self.shapes.append(array.shape)
+
+    def close(self) -> None:
+        """Write the index and move the store files into place."""
+        if self._data_file.closed:
+            return
+        self._data_file.close()
+
+        dtype = self.dtype if self.dtype is not None else np.dtype(np.float32)
+        shapes = np.asarray(self.shapes, dtype=np.int64) if self.shapes else np.zeros((0, 0), dtype=np.int64)
+        index_path_tmp = f"{self.index_path}.tmp.npz"
+        np.savez(
+            index_path_tmp,
+            keys=np.asarray(self.keys, dtype=str),
+            offsets=np.asarray(self.offsets, dtype=np.int64),
+            shapes=shapes,
+            dtype=np.asarray(dtype.str),
+            metadata=np.asarray(json.dumps(self.metadata)),
+        )
+        os.replace(f"{self.data_path}.tmp", self.data_path)
+        os.replace(index_path_tmp, self.index_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # discard the partially written store
+            self._data_file.close()
+            os.remove(f"{self.data_path}.tmp")
+
+
+def get_feature_store(store_dir: Union[str, Path], name: str) -> Optional[FeatureStore]:
+    """
+    Get the store with the input name in the input directory, or None if it does not exist.
+    Stores are opened once and shared by all callers in a process.
+    Note that the result is cached, so a store created after the first call in a process is not used.
+    """
+    return _get_feature_store(str(store_dir), name)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_feature_store(store_dir: str, name: str) -> Optional[FeatureStore]:
+    if not FeatureStore.exists(store_dir=store_dir, name=name):
+        return None
+    return FeatureStore(store_dir=store_dir, name=name)
@@ -24,6 +24,7 @@ import torch
 from torch import Tensor
 
 from nemo.collections.asr.modules import AudioToMelSpectrogramPreprocessor
+from nemo.collections.tts.parts.preprocessing.feature_store import get_feature_store
 from nemo.collections.tts.parts.utils.tts_dataset_utils import get_audio_filepaths, normalize_volume, stack_tensors
 from nemo.utils.decorators import experimental
 
@@ -77,6 +78,16 @@ def _get_feature_filepath(
     return feature_filepath
 
 
+def get_feature_key(manifest_entry: Dict[str, Any], audio_dir: Path) -> str:
+    """
+    Get the key of the feature corresponding to the input manifest entry in a feature store.
+
+    Example: audio_filepath "<audio_dir>/speaker1/audio1.wav" has key "speaker1/audio1"
+    """
+    _, audio_filepath_rel = get_audio_filepaths(manifest_entry=manifest_entry, audio_dir=audio_dir)
+    return audio_filepath_rel.with_suffix("").as_posix()
+
+
 def _features_exists(
     feature_names: List[Optional[str]], manifest_entry: Dict[str, Any], audio_dir: Path, feature_dir: Path,
 ) -> bool:
@@ -120,11 +131,22 @@ def _load_feature(
     indices: Optional[Tuple[int, int]] = None,
 ) -> None:
     """
-    If feature_name is provided, load feature into feature_dict from .npy file.
+    If feature_name is provided, load feature into feature_dict from a feature store created with
+    scripts/dataset_processing/tts/pack_features.py if it exists, otherwise from .npy file.
     """
     if feature_name is None:
         return
 
+    feature_store = get_feature_store(store_dir=feature_dir, name=feature_name)
+    if feature_store is not None:
+        feature_key = get_feature_key(manifest_entry=manifest_entry, audio_dir=audio_dir)
+        if feature_key in feature_store:
+            feature_array = feature_store[feature_key]
+            if indices:
+                feature_array = feature_array[indices[0] : indices[1]]
+            feature_dict[feature_name] = torch.from_numpy(np.copy(feature_array))
+            return
+
     feature_filepath = _get_feature_filepath(
         manifest_entry=manifest_entry, audio_dir=audio_dir, feature_dir=feature_dir, feature_name=feature_name
     )
@@ -22,6 +22,7 @@ import inspect
 import os
 import shutil
 import traceback
+import weakref
 from abc import ABC, abstractmethod
 from collections.abc import Mapping, Sequence
 from contextlib import contextmanager
@@ -53,6 +54,10 @@ __all__ = ['Typing', 'FileIO', 'Model', 'Serialization', 'typecheck', 'Pretraine
 
 _TYPECHECK_ENABLED = True
 _TYPECHECK_SEMANTIC_CHECK_ENABLED = True
+_TYPECHECK_CACHED_CHECKS_ENABLED = False
+# cached typecheck plans: instance -> {(typecheck decorator id, semantic checks flag, input signature): plan}
+_TYPECHECK_PLANS = weakref.WeakKeyDictionary()
+_TYPECHECK_MAX_PLANS_PER_INSTANCE = 64
 # TODO @blisc: Remove _HAS_HYDRA
 _HAS_HYDRA = True
 
@@ -123,6 +128,68 @@ def is_semantic_typecheck_enabled():
     return _TYPECHECK_SEMANTIC_CHECK_ENABLED
 
 
+def is_cached_typecheck_enabled():
+    """
+    Getter method for cached typechecking state.
+    """
+    return _TYPECHECK_CACHED_CHECKS_ENABLED
+
+
+def _typecheck_signature(value) -> tuple:
+    """
+    Signature of the value which determines the result of the type checks:
+    container structure, number of dimensions, dtype and attached neural type (by identity) of the elements.
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_typecheck_signature(elem) for elem in value)
+    shape = getattr(value, 'shape', None)
+    return (
+        type(value),
+        None if shape is None else len(shape),
+        getattr(value, 'dtype', None),
+        id(getattr(value, 'neural_type', None)),
+    )
+
+
+def _flatten_typecheck_values(value, leaves: list) -> tuple:
+    """
+    Flatten the nested structure of (list, tuple) containers, collecting leaves.
+
+    Returns:
+        signature of the structure (see `_typecheck_signature`) without neural types of the leaves
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_flatten_typecheck_values(elem, leaves) for elem in value)
+    leaves.append(value)
+    shape = getattr(value, 'shape', None)
+    return type(value), None if shape is None else len(shape), getattr(value, 'dtype', None)
+
+
+@dataclass
+class TypecheckPlan:
+    """
+    Cached result of the type checks for (instance, typed method, input signature).
+
+    # Attributes
+    input_types: Resolved input types (None if input types are not defined).
+
+    output_types: Resolved output types (None if output types are not defined).
+
+    pinned_neural_types: Neural types of the input values; references are kept to preserve
+        the identity of the objects used in the input signature.
+
+    output_signature: Signature of the output structure validated with the full check.
+
+    output_leaf_types: Neural types to attach to the flattened outputs with `output_signature`.
+    """
+
+    input_types: Optional[Dict[str, NeuralType]]
+    output_types: Optional[Dict[str, NeuralType]]
+    pinned_neural_types: List[Any] = field(default_factory=list)
+    output_signature: Optional[tuple] = None
+    output_leaf_types: List[Optional[NeuralType]] = field(default_factory=list)
+
+
 @dataclass
 class TypecheckMetadata:
     """
@@ -1096,6 +1163,19 @@ class typecheck:
                 if depth checks are skipped entirely.
 
         """
+        if is_cached_typecheck_enabled():
+            return self._cached_call(wrapped, instance, args, kwargs)
+
+        input_types, output_types = self._resolve_types(instance)
+        return self._checked_call(wrapped, instance, args, kwargs, input_types, output_types)
+
+    def _resolve_types(self, instance: Typing) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Check the instance and resolve global type or local overridden type.
+
+        Returns:
+            tuple of input types and output types
+        """
         if instance is None:
             raise RuntimeError("Only classes which inherit nemo.core.Typing can use this decorator !")
 
@@ -1126,6 +1206,10 @@ class typecheck:
         else:
             output_types = instance.output_types
 
+        return input_types, output_types
+
+    def _checked_call(self, wrapped, instance: Typing, args, kwargs, input_types, output_types):
+        """Call the wrapped method with full input and output type checks"""
         # If types are not defined, skip type checks and just call the wrapped method
         if input_types is None and output_types is None:
             return wrapped(*args, **kwargs)
@@ -1146,6 +1230,80 @@ class typecheck:
 
         return outputs
 
+    def _cached_call(self, wrapped, instance: Typing, args, kwargs):
+        """
+        Call the wrapped method using the cached typecheck plan.
+        The first call for the (instance, input signature) performs the full checks and caches the plan,
+        subsequent calls with the same signature skip input validation and only attach cached neural types
+        to the outputs (outputs with a new structure are validated with the full check).
+        """
+        try:
+            instance_plans = _TYPECHECK_PLANS.get(instance)
+        except TypeError:
+            # instance is not hashable or does not support weak references: caching is not possible
+            input_types, output_types = self._resolve_types(instance)
+            return self._checked_call(wrapped, instance, args, kwargs, input_types, output_types)
+
+        key = (
+            id(self),
+            is_semantic_typecheck_enabled(),
+            len(args),
+            tuple((name, _typecheck_signature(value)) for name, value in kwargs.items()),
+        )
+        plan = None if instance_plans is None else instance_plans.get(key)
+
+        if plan is None:
+            input_types, output_types = self._resolve_types(instance)
+            outputs = self._checked_call(wrapped, instance, args, kwargs, input_types, output_types)
+            # checks passed: cache the plan
+            input_leaves = []
+            _flatten_typecheck_values(list(kwargs.values()), input_leaves)
+            plan = TypecheckPlan(
+                input_types=input_types,
+                output_types=output_types,
+                pinned_neural_types=[getattr(value, 'neural_type', None) for value in input_leaves],
+            )
+            self._update_output_plan(plan, outputs)
+            if instance_plans is None:
+                instance_plans = _TYPECHECK_PLANS.setdefault(instance, {})
+            if len(instance_plans) >= _TYPECHECK_MAX_PLANS_PER_INSTANCE:
+                # evict the oldest plan
+                del instance_plans[next(iter(instance_plans))]
+            instance_plans[key] = plan
+            return outputs
+
+        # If types are not defined, skip type checks and just call the wrapped method
+        if plan.input_types is None and plan.output_types is None:
+            return wrapped(*args, **kwargs)
+
+        outputs = wrapped(*args, **kwargs)
+
+        if plan.output_types is not None:
+            output_leaves = []
+            output_signature = _flatten_typecheck_values(outputs, output_leaves)
+            if output_signature == plan.output_signature:
+                for leaf, leaf_type in zip(output_leaves, plan.output_leaf_types):
+                    if leaf_type is not None:
+                        try:
+                            leaf.neural_type = leaf_type
+                        except Exception:
+                            pass
+            else:
+                instance._attach_and_validate_output_types(
+                    output_types=plan.output_types, ignore_collections=self.ignore_collections, out_objects=outputs
+                )
+                self._update_output_plan(plan, outputs)
+        return outputs
+
+    @staticmethod
+    def _update_output_plan(plan: TypecheckPlan, outputs):
+        """Store the output structure and neural types attached by the full check in the plan"""
+        if plan.output_types is None:
+            return
+        output_leaves = []
+        plan.output_signature = _flatten_typecheck_values(outputs, output_leaves)
+        plan.output_leaf_types = [getattr(leaf, 'neural_type', None) for leaf in output_leaves]
+
     @staticmethod
     def set_typecheck_enabled(enabled: bool = True):
         """
@@ -1192,6 +1350,41 @@ class typecheck:
         finally:
             typecheck.set_semantic_check_enabled(enabled=True)
 
+    @staticmethod
+    def set_cached_checks_enabled(enabled: bool = True):
+        """
+        Global method to enable/disable cached typechecking.
+        In cached mode, the full checks are performed for the first call of the typed method
+        for each (instance, input signature), subsequent calls with the same container structure,
+        number of dimensions, dtypes and neural types of the inputs skip the checks.
+        Neural types of the module are assumed to be static.
+
+        Args:
+            enabled: bool, when True will enable cached typechecking.
+        """
+        global _TYPECHECK_CACHED_CHECKS_ENABLED
+        _TYPECHECK_CACHED_CHECKS_ENABLED = enabled
+
+    @staticmethod
+    @contextmanager
+    def cached_checks():
+        """
+        Context manager that temporarily enables cached type checking within its context.
+        """
+        cached_checks_enabled = is_cached_typecheck_enabled()
+        typecheck.set_cached_checks_enabled(enabled=True)
+        try:
+            yield
+        finally:
+            typecheck.set_cached_checks_enabled(enabled=cached_checks_enabled)
+
+    @staticmethod
+    def clear_cached_checks():
+        """
+        Clear cached typecheck plans (e.g., after changing neural types of the modules).
+        """
+        _TYPECHECK_PLANS.clear()
+
     @staticmethod
     def enable_wrapping(enabled: bool = True):
         typecheck.set_typecheck_enabled(enabled)
@@ -18,6 +18,7 @@
 
 import importlib
 import logging
+import sys
 import traceback
 from contextlib import contextmanager
 
@@ -399,3 +400,51 @@ def gpu_only_import_from(module, symbol, *, alt=None):
         msg=f"{module}.{symbol} is not enabled in non GPU-enabled installations or environments. {GPU_INSTALL_STRING}",
         alt=alt,
     )
+
+
+def lazy_import_attributes(package, attributes, *, submodules=()):
+    """A function used to create lazy (PEP 562) attribute loading for a package
+
+    The attributes of the package are imported from the corresponding submodules
+    on the first access, e.g. ``from package import Attribute`` or ``package.Attribute``,
+    instead of importing all the submodules in the package ``__init__``.
+
+    Parameters
+    ----------
+    package: str
+        The name of the package, usually ``__name__`` of the package ``__init__``.
+    attributes: dict
+        Mapping from the attribute name to the name of the submodule
+        (relative to the package) which defines the attribute.
+    submodules: iterable of str
+        Names of additional submodules (relative to the package) to be imported
+        on the first access as the package attributes.
+
+    Returns
+    -------
+    Tuple(function, function, function)
+        ``__getattr__`` and ``__dir__`` functions for the package, and a function
+        importing all the lazy attributes of the package.
+    """
+    package_globals = sys.modules[package].__dict__
+    submodules = set(submodules) | set(attributes.values())
+
+    def __getattr__(name):
+        if name in attributes:
+            value = getattr(importlib.import_module(f"{package}.{attributes[name]}"), name)
+        elif name in submodules:
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        package_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(package_globals) | set(attributes) | submodules)
+
+    def import_all():
+        for name in attributes:
+            if name not in package_globals:
+                __getattr__(name)
+
+    return __getattr__, __dir__, import_all
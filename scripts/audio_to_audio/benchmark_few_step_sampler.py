@@ -0,0 +1,171 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark accuracy and speed of few-step ODE samplers for generative audio-to-audio models
+(`ScoreBasedGenerativeAudioToAudioModel`, `FlowMatchingAudioToAudioModel` and `SchroedingerBridgeAudioToAudioModel`)
+on a held-out set described by a NeMo manifest with input and target audio.
+
+For each configuration, the script reports the number of estimator evaluations (NFE) per utterance,
+the real-time factor (processing time divided by audio duration) and SI-SDR with respect to the target audio.
+The first row is the default sampler of the model, configured in `model.sampler`.
+
+Usage:
+    python benchmark_few_step_sampler.py \
+        --model /path/to/model.nemo \
+        --manifest /path/to/test_manifest.json \
+        --solvers ddim heun dpm2m \
+        --num-steps 1 2 4 8 \
+        --batch-size 8
+"""
+import argparse
+import json
+import time
+
+import torch
+from torchmetrics.functional.audio import scale_invariant_signal_distortion_ratio
+
+from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
+from nemo.collections.audio.models import AudioToAudioModel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark few-step samplers for generative audio-to-audio models")
+    parser.add_argument("--model", type=str, required=True, help="Pretrained model name or path to .nemo")
+    parser.add_argument("--manifest", type=str, required=True, help="Manifest with input and target audio")
+    parser.add_argument("--input-key", type=str, default="audio_filepath", help="Key for the input audio")
+    parser.add_argument("--target-key", type=str, default="target_audio_filepath", help="Key for the target audio")
+    parser.add_argument("--max-utts", type=int, default=None, help="Maximum number of utterances to use")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--solvers", type=str, nargs="+", default=["ddim", "heun", "dpm2m"])
+    parser.add_argument("--num-steps", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def load_model(name: str, device: torch.device) -> AudioToAudioModel:
+    if name.endswith(".nemo"):
+        model = AudioToAudioModel.restore_from(name, map_location=device)
+    else:
+        model = AudioToAudioModel.from_pretrained(name, map_location=device)
+    if not hasattr(model, "forward_few_step"):
+        raise ValueError(f"Few-step sampling is not supported for {model.__class__.__name__}")
+    return model.eval()
+
+
+def load_data(args, sample_rate: int):
+    """Load input and target audio as lists of tensors with shape (C, T)."""
+    inputs, targets = [], []
+    with open(args.manifest, "r") as f:
+        for line in f:
+            if args.max_utts is not None and len(inputs) >= args.max_utts:
+                break
+            item = json.loads(line)
+            for key, signals in [(args.input_key, inputs), (args.target_key, targets)]:
+                samples = AudioSegment.from_file(item[key], target_sr=sample_rate).samples
+                samples = torch.as_tensor(samples, dtype=torch.float32)
+                signals.append(samples.unsqueeze(0) if samples.ndim == 1 else samples.T)
+    return inputs, targets
+
+
+def collate(signals, device: torch.device):
+    length = torch.tensor([s.size(-1) for s in signals], dtype=torch.long)
+    batch = torch.zeros(len(signals), signals[0].size(0), int(length.max()))
+    for n, signal in enumerate(signals):
+        batch[n, :, : signal.size(-1)] = signal
+    return batch.to(device), length.to(device)
+
+
+def count_nfe(estimator: torch.nn.Module, process_fn) -> int:
+    """Run `process_fn` and return the number of estimator forward calls, including calls with cached conditioning."""
+    counter = []
+    handle = estimator.register_forward_hook(lambda *args: counter.append(1))
+    forward_cached = getattr(estimator, "forward_cached", None)
+    if forward_cached is not None:
+
+        def counting_forward_cached(*args, **kwargs):
+            counter.append(1)
+            return forward_cached(*args, **kwargs)
+
+        estimator.forward_cached = counting_forward_cached
+    try:
+        process_fn()
+    finally:
+        handle.remove()
+        if forward_cached is not None:
+            del estimator.forward_cached
+    return len(counter)
+
+
+def evaluate(model, inputs, targets, batch_size: int, device: torch.device, process_batch):
+    """Process all utterances and return RTF and mean SI-SDR."""
+    sample_rate = model.sample_rate
+    duration = sum(s.size(-1) for s in inputs) / sample_rate
+    sisdr = []
+    elapsed = 0.0
+    for start in range(0, len(inputs), batch_size):
+        input_signal, input_length = collate(inputs[start : start + batch_size], device)
+
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+        t_start = time.perf_counter()
+        output_signal, _ = process_batch(input_signal, input_length)
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+        elapsed += time.perf_counter() - t_start
+
+        for n, target in enumerate(targets[start : start + batch_size]):
+            length = min(int(input_length[n]), target.size(-1))
+            estimate = output_signal[n, : target.size(0), :length].cpu()
+            sisdr.append(scale_invariant_signal_distortion_ratio(estimate, target[:, :length]).mean().item())
+    return elapsed / duration, sum(sisdr) / len(sisdr)
+
+
+def main():
+    args = parse_args()
+    device = torch.device(args.device)
+    model = load_model(args.model, device)
+    inputs, targets = load_data(args, sample_rate=model.sample_rate)
+    print(f"Loaded {len(inputs)} utterances, {sum(s.size(-1) for s in inputs) / model.sample_rate:.1f} seconds")
+
+    configs = [("default", None)]
+    configs += [(solver, num_steps) for solver in args.solvers for num_steps in args.num_steps]
+
+    print(f"{'solver':>10} {'steps':>6} {'NFE':>6} {'RTF':>8} {'SI-SDR':>8}")
+    for solver, num_steps in configs:
+        if solver == "default":
+
+            def process_batch(input_signal, input_length):
+                return model.forward(input_signal=input_signal, input_length=input_length)
+
+        else:
+
+            def process_batch(input_signal, input_length):
+                return model.forward_few_step(
+                    input_signal=input_signal, input_length=input_length, num_steps=num_steps, solver=solver
+                )
+
+        example_signal, example_length = collate(inputs[:1], device)
+        with torch.inference_mode():
+            # warmup and NFE for a single utterance
+            nfe = count_nfe(model.estimator, lambda: process_batch(example_signal, example_length))
+            torch.manual_seed(args.seed)
+            rtf, sisdr = evaluate(model, inputs, targets, args.batch_size, device, process_batch)
+
+        steps = '-' if num_steps is None else num_steps
+        print(f"{solver:>10} {steps:>6} {nfe:>6} {rtf:>8.4f} {sisdr:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
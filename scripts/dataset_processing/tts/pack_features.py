@@ -0,0 +1,156 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script packs features computed by compute_features.py, stored as one .npy file per utterance, into a single
+memory-mapped feature store per feature type. When a store exists in 'feature_dir', TextToSpeechDataset reads
+features from the store instead of the .npy files, which avoids opening a file for each feature of each example.
+
+$ python <nemo_root_path>/scripts/dataset_processing/tts/pack_features.py \
+    --manifest_path=<data_root_path>/manifest.json \
+    --audio_dir=<data_root_path>/audio \
+    --feature_dir=<data_root_path>/features \
+    --feature_names pitch voiced_mask energy
+
+Optionally, alignment prior matrices for all examples in the manifest can be precomputed and stored as well.
+Text and spectrogram lengths are computed in the same way as in TextToSpeechDataset, using the provided text
+tokenizer config, for example a YAML file with the 'text_tokenizer' section of the model config.
+Alignment priors missing from the store are computed on the fly during training.
+
+$ python <nemo_root_path>/scripts/dataset_processing/tts/pack_features.py \
+    --manifest_path=<data_root_path>/manifest.json \
+    --audio_dir=<data_root_path>/audio \
+    --feature_dir=<data_root_path>/features \
+    --text_tokenizer_config_path=<data_root_path>/text_tokenizer.yaml \
+    --sample_rate=22050 \
+    --align_prior_hop_length=256
+
+Note that the stores need to be recreated if features are recomputed.
+"""
+
+import argparse
+from pathlib import Path
+
+import librosa
+import numpy as np
+from hydra.utils import instantiate
+from omegaconf import OmegaConf
+from tqdm import tqdm
+
+from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
+from nemo.collections.tts.parts.preprocessing.feature_store import (
+    ALIGN_PRIOR_STORE_NAME,
+    FeatureStoreWriter,
+    get_align_prior_key,
+)
+from nemo.collections.tts.parts.preprocessing.features import _get_feature_filepath, get_feature_key
+from nemo.collections.tts.parts.utils.tts_dataset_utils import beta_binomial_prior_distribution, load_audio
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Pack TTS features into memory-mapped feature stores.",
+    )
+    parser.add_argument("--manifest_path", required=True, type=Path, help="Path to training manifest.")
+    parser.add_argument("--audio_dir", required=True, type=Path, help="Path to base directory with audio data.")
+    parser.add_argument(
+        "--feature_dir", required=True, type=Path, help="Path to directory where feature data is stored."
+    )
+    parser.add_argument(
+        "--feature_names", default=[], nargs="+", type=str, help="Names of features to pack, e.g., pitch energy."
+    )
+    parser.add_argument(
+        "--text_tokenizer_config_path",
+        default=None,
+        type=Path,
+        help="Path to text tokenizer config. If provided, alignment priors will be stored as well.",
+    )
+    parser.add_argument("--sample_rate", default=22050, type=int, help="Sample rate used for training.")
+    parser.add_argument(
+        "--align_prior_hop_length", default=256, type=int, help="Hop length of audio features used for training."
+    )
+    parser.add_argument(
+        "--prior_scaling_factor", default=1.0, type=float, help="Scaling factor of the alignment prior."
+    )
+    args = parser.parse_args()
+    return args
+
+
+def pack_feature(entries, audio_dir: Path, feature_dir: Path, feature_name: str):
+    with FeatureStoreWriter(store_dir=feature_dir, name=feature_name) as writer:
+        for entry in tqdm(entries):
+            feature_key = get_feature_key(manifest_entry=entry, audio_dir=audio_dir)
+            # utterances which are segments of the same audio file share the feature file
+            if feature_key in writer:
+                continue
+            feature_filepath = _get_feature_filepath(
+                manifest_entry=entry, audio_dir=audio_dir, feature_dir=feature_dir, feature_name=feature_name
+            )
+            writer.add(key=feature_key, array=np.load(feature_filepath))
+    return len(writer)
+
+
+def pack_align_prior(
+    entries, audio_dir: Path, feature_dir: Path, text_tokenizer, sample_rate: int, hop_length: int, scaling_factor
+):
+    metadata = {"scaling_factor": scaling_factor}
+    with FeatureStoreWriter(store_dir=feature_dir, name=ALIGN_PRIOR_STORE_NAME, metadata=metadata) as writer:
+        for entry in tqdm(entries):
+            text = entry["normalized_text"] if "normalized_text" in entry else entry["text"]
+            text_len = len(text_tokenizer(text))
+            audio, _, _ = load_audio(manifest_entry=entry, audio_dir=audio_dir, sample_rate=sample_rate)
+            spec_len = 1 + librosa.core.samples_to_frames(audio.shape[0], hop_length=hop_length)
+
+            prior_key = get_align_prior_key(text_len=text_len, spec_len=spec_len)
+            if prior_key in writer:
+                continue
+            align_prior = beta_binomial_prior_distribution(
+                phoneme_count=text_len, mel_count=spec_len, scaling_factor=scaling_factor
+            )
+            writer.add(key=prior_key, array=align_prior.astype(np.float32))
+    return len(writer)
+
+
+def main():
+    args = get_args()
+    if not args.manifest_path.exists():
+        raise ValueError(f"Manifest {args.manifest_path} does not exist.")
+
+    entries = read_manifest(args.manifest_path)
+
+    for feature_name in args.feature_names:
+        print(f"Packing: {feature_name}")
+        num_features = pack_feature(
+            entries=entries, audio_dir=args.audio_dir, feature_dir=args.feature_dir, feature_name=feature_name
+        )
+        print(f"Packed {num_features} {feature_name} features.")
+
+    if args.text_tokenizer_config_path is not None:
+        print(f"Packing: {ALIGN_PRIOR_STORE_NAME}")
+        text_tokenizer = instantiate(OmegaConf.load(args.text_tokenizer_config_path))
+        num_priors = pack_align_prior(
+            entries=entries,
+            audio_dir=args.audio_dir,
+            feature_dir=args.feature_dir,
+            text_tokenizer=text_tokenizer,
+            sample_rate=args.sample_rate,
+            hop_length=args.align_prior_hop_length,
+            scaling_factor=args.prior_scaling_factor,
+        )
+        print(f"Packed {num_priors} alignment priors.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark time-to-first-audio and real-time factor (RTF) of MagpieTTS with offline synthesis (`infer_batch`)
+and streaming synthesis with incremental codec decoding (`infer_batch_streaming`).
+
+The script uses the same configuration as the inference mode of `examples/tts/magpietts.py`, for example:
+
+    python scripts/magpietts/benchmark_streaming.py \
+        --config-name=magpietts_inference_en \
+        init_from_ptl_ckpt=/path/to/checkpoint.ckpt \
+        model.codecmodel_path=/path/to/codec.nemo \
+        test_ds_meta=/path/to/test_ds_meta.json \
+        batch_size=1 \
+        +num_batches=20 \
+        +streaming.chunk_size_frames=4 \
+        +streaming.left_context_frames=16 \
+        +streaming.lookahead_frames=4
+"""
+import time
+
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.tts.models import MagpieTTS_Model
+from nemo.core.config import hydra_runner
+from nemo.utils import logging
+
+
+def move_to_device(batch, device):
+    return {key: value.to(device) if isinstance(value, torch.Tensor) else value for key, value in batch.items()}
+
+
+def synchronize(device):
+    if device.type == 'cuda':
+        torch.cuda.synchronize(device)
+
+
+@hydra_runner(config_path="../../examples/tts/conf/magpietts", config_name="magpietts_inference_en")
+def main(cfg):
+    logging.info('\nConfig Params:\n%s', OmegaConf.to_yaml(cfg, resolve=True))
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+    model = MagpieTTS_Model(cfg=cfg.model)
+    model.maybe_init_from_pretrained_checkpoint(cfg=cfg)
+    model = model.to(device).eval()
+    model.setup_test_data(cfg.model.test_ds)
+
+    inference_kwargs = {
+        'max_decoder_steps': cfg.model.get('max_decoder_steps', 500),
+        'temperature': cfg.model.get('inference_temperature', 0.7),
+        'topk': cfg.model.get('inference_topk', 80),
+        'use_cfg': cfg.model.get('inference_use_cfg', False),
+        'cfg_scale': cfg.model.get('inference_cfg_scale', 1.0),
+    }
+    streaming_cfg = cfg.get('streaming', {})
+    streaming_kwargs = {
+        'chunk_size_frames': streaming_cfg.get('chunk_size_frames', 4),
+        'left_context_frames': streaming_cfg.get('left_context_frames', 16),
+        'lookahead_frames': streaming_cfg.get('lookahead_frames', 4),
+    }
+    num_batches = cfg.get('num_batches', None)
+    sample_rate = model.cfg.sample_rate
+
+    stats = {mode: {'first_audio': [], 'elapsed': 0.0, 'duration': 0.0} for mode in ['offline', 'streaming']}
+    for batch_idx, batch in enumerate(model._test_dl):
+        if num_batches is not None and batch_idx >= num_batches:
+            break
+        batch = move_to_device(batch, device)
+
+        # Offline synthesis, audio is available after the complete utterance has been generated
+        synchronize(device)
+        start = time.perf_counter()
+        _, audio_lens, _, _ = model.infer_batch(batch, **inference_kwargs)
+        synchronize(device)
+        elapsed = time.perf_counter() - start
+        stats['offline']['first_audio'].append(elapsed)
+        stats['offline']['elapsed'] += elapsed
+        stats['offline']['duration'] += audio_lens.sum().item() / sample_rate
+
+        # Streaming synthesis, time to first audio is measured until the first non-empty chunk
+        synchronize(device)
+        start = time.perf_counter()
+        first_audio = None
+        audio_lens = 0
+        for _, chunk_lens in model.infer_batch_streaming(batch, **inference_kwargs, **streaming_kwargs):
+            synchronize(device)
+            if first_audio is None and chunk_lens.max() > 0:
+                first_audio = time.perf_counter() - start
+            audio_lens = audio_lens + chunk_lens
+        synchronize(device)
+        elapsed = time.perf_counter() - start
+        stats['streaming']['first_audio'].append(first_audio if first_audio is not None else elapsed)
+        stats['streaming']['elapsed'] += elapsed
+        stats['streaming']['duration'] += audio_lens.sum().item() / sample_rate
+
+    for mode, mode_stats in stats.items():
+        first_audio = mode_stats['first_audio']
+        logging.info(
+            f'{mode}: batches={len(first_audio)}, '
+            f'time to first audio mean={sum(first_audio) / max(len(first_audio), 1):.3f}s '
+            f'max={max(first_audio, default=0.0):.3f}s, '
+            f'RTF={mode_stats["elapsed"] / max(mode_stats["duration"], 1e-8):.4f}'
+        )
+
+
+if __name__ == '__main__':
+    main()  # noqa pylint: disable=no-value-for-parameter
@@ -0,0 +1,123 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark the overhead of neural type checks on the chunked (streaming-like) inference loop,
+where the `forward` of the preprocessor, encoder and decoder is called for every small chunk of audio.
+
+Compares three modes:
+    * full: default type checks on each call
+    * cached: `typecheck.cached_checks()`, checks are performed only on the first call per input signature
+    * disabled: `typecheck.disable_checks()`
+
+Usage:
+    # small randomly initialized CTC model
+    python benchmark_typecheck_overhead.py --num-chunks 200 --chunk-sec 0.16
+
+    # pretrained model
+    python benchmark_typecheck_overhead.py --model stt_en_fastconformer_ctc_large --device cuda
+"""
+import argparse
+import time
+from contextlib import nullcontext
+
+import torch
+
+from nemo.collections.asr.modules import AudioToMelSpectrogramPreprocessor, ConformerEncoder, ConvASRDecoder
+from nemo.core import typecheck
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark neural type checks overhead per forward call")
+    parser.add_argument(
+        "--model", type=str, default=None, help="Pretrained CTC model name or path to .nemo (default: small model)"
+    )
+    parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--chunk-sec", type=float, default=0.16, help="Audio chunk duration in seconds")
+    parser.add_argument("--num-chunks", type=int, default=200, help="Number of chunks (forward calls) to measure")
+    parser.add_argument("--num-warmup", type=int, default=10, help="Number of warmup chunks")
+    return parser.parse_args()
+
+
+def build_modules(args):
+    if args.model is not None:
+        from nemo.collections.asr.models import ASRModel
+
+        if args.model.endswith(".nemo"):
+            model = ASRModel.restore_from(args.model, map_location="cpu")
+        else:
+            model = ASRModel.from_pretrained(args.model, map_location="cpu")
+        return model.preprocessor, model.encoder, model.decoder, model.cfg.sample_rate
+    sample_rate = 16000
+    preprocessor = AudioToMelSpectrogramPreprocessor(sample_rate=sample_rate, features=80, dither=0.0, pad_to=0)
+    encoder = ConformerEncoder(feat_in=80, n_layers=2, d_model=128, n_heads=4, subsampling_factor=4)
+    decoder = ConvASRDecoder(feat_in=128, num_classes=128)
+    return preprocessor, encoder, decoder, sample_rate
+
+
+def run_chunks(preprocessor, encoder, decoder, chunks, lengths, device) -> float:
+    """Run the pipeline on the chunks, returns average time per chunk in milliseconds"""
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for chunk in chunks:
+        features, features_len = preprocessor(input_signal=chunk, length=lengths)
+        encoded, encoded_len = encoder(audio_signal=features, length=features_len)
+        _ = decoder(encoder_output=encoded)
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / len(chunks) * 1000
+
+
+@torch.inference_mode()
+def main():
+    args = parse_args()
+    device = torch.device(args.device)
+    preprocessor, encoder, decoder, sample_rate = build_modules(args)
+    modules = [module.to(device).eval() for module in (preprocessor, encoder, decoder)]
+    num_forward_calls = len(modules)
+
+    chunk_samples = int(args.chunk_sec * sample_rate)
+    generator = torch.Generator().manual_seed(0)
+    chunks = [
+        torch.randn(args.batch_size, chunk_samples, generator=generator).to(device)
+        for _ in range(args.num_warmup + args.num_chunks)
+    ]
+    lengths = torch.full([args.batch_size], chunk_samples, dtype=torch.long, device=device)
+    warmup_chunks, chunks = chunks[: args.num_warmup], chunks[args.num_warmup :]
+
+    modes = {
+        "full": nullcontext,
+        "cached": typecheck.cached_checks,
+        "disabled": typecheck.disable_checks,
+    }
+    results = {}
+    for mode, context_manager in modes.items():
+        typecheck.clear_cached_checks()
+        with context_manager():
+            run_chunks(*modules, warmup_chunks, lengths, device)
+            results[mode] = run_chunks(*modules, chunks, lengths, device)
+
+    baseline = results["disabled"]
+    print(f"Forward calls per chunk: {num_forward_calls}, chunk: {args.chunk_sec}s, batch size: {args.batch_size}")
+    for mode, chunk_ms in results.items():
+        overhead_ms = (chunk_ms - baseline) / num_forward_calls
+        print(
+            f"{mode:>8}: {chunk_ms:8.3f} ms/chunk, "
+            f"type checks overhead {overhead_ms * 1000:8.1f} us/forward ({(chunk_ms / baseline - 1) * 100:6.2f}%)"
+        )
+
+
+if __name__ == '__main__':
+    main()  # noqa pylint: disable=no-value-for-parameter
@@ -27,6 +27,9 @@
 # Recommend to use --sort_in_shards to speedup the training by reducing the paddings in the batches
 # More info on how to use bucketing feature: https://docs.nvidia.com/deeplearning/nemo/user-guide/docs/en/main/asr/datasets.html
 
+# A sidecar index `audio_<shard_id>.tar.idx` with offsets and sizes of the members is written next to each tarball.
+# It allows random access to the utterances with IndexedTarredAudioToBPEDataset.
+
 # If valid NVIDIA DALI version is installed, will also generate the corresponding DALI index files that need to be
 # supplied to the config in order to utilize webdataset for efficient large dataset handling.
 # NOTE: DALI + Webdataset is NOT compatible with Bucketing support !
@@ -46,6 +49,12 @@ python convert_to_tarred_audio_dataset.py \
     --workers=-1
 
 
+   For segmented long recordings (manifest entries with `offset` and `duration` sliced with --slice_with_offset),
+   add --segment_aware to decode each source recording once and slice all its segments from memory.
+   Transcoding runs in --workers processes, in windows of at most --segment_window segments, and tar writing
+   in --tar_workers threads. The transcoded segments are spooled to a temporary directory in --target_dir
+   until all the members of their tarball are ready, which needs up to the size of the output in extra disk space.
+
 2) Concatenating more tarfiles to a pre-existing tarred dataset
 
 python convert_to_tarred_audio_dataset.py \
@@ -80,12 +89,16 @@ import copy
 import json
 import os
 import random
+import shutil
 import tarfile
+import tempfile
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from io import BytesIO
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
 import numpy as np
 import soundfile
@@ -94,6 +107,8 @@ from omegaconf import DictConfig, OmegaConf, open_dict
 from tabulate import tabulate
 from tqdm import tqdm
 
+from nemo.collections.asr.data.audio_to_text import write_tar_index
+
 try:
     import create_dali_tarred_dataset_index as dali_index
 
@@ -148,6 +163,159 @@ class ASRTarredDatasetMetadata:
         return ASRTarredDatasetMetadata.from_config(config=config)
 
 
+# float32 represents the 16- and 24-bit PCM samples exactly, at half the memory of the float64 default of soundfile.
+_AUDIO_READ_DTYPE = 'float32'
+# Segments of a recording separated by shorter gaps are decoded together: decoding the gap is cheaper than
+# seeking, which restarts the decoder of compressed formats.
+_MAX_DECODE_GAP_SECONDS = 1.0
+
+
+def _get_codec_kwargs(codec: str) -> dict:
+    """Returns soundfile.write format kwargs for the codec"""
+    if codec == "opus":
+        return {"format": "ogg", "subtype": "opus"}
+    return {"format": codec}
+
+
+def _add_bytes_to_tar(tar, arcname: str, data: bytes) -> None:
+    """Adds the in-memory file to the tar archive"""
+    ti = tarfile.TarInfo(arcname)
+    ti.size = len(data)
+    tar.addfile(ti, BytesIO(data))
+
+
+def _num_processes(num_workers: int) -> int:
+    """Converts joblib-style number of workers (negative values count from the number of CPUs) to a process count"""
+    if num_workers > 0:
+        return num_workers
+    if num_workers < 0:
+        return max(1, os.cpu_count() + 1 + num_workers)
+    return 1
+
+
+def _cluster_segments(
+    spans: List[Tuple[int, Optional[int]]], max_gap: int
+) -> List[Tuple[int, Optional[int], List[int]]]:
+    """
+    Groups the segments of a recording into clusters of (nearly) contiguous segments, which are decoded together.
+
+    Args:
+        spans: (start frame, end frame) of the segments, end frame is None for segments up to the end of recording.
+        max_gap: segments separated by at most `max_gap` frames are put into the same cluster.
+
+    Returns:
+        List of (start frame, end frame, indices of the segments in `spans`) of the clusters.
+    """
+    clusters = []
+    for idx in sorted(range(len(spans)), key=lambda idx: spans[idx][0]):
+        start, end = spans[idx]
+        if clusters and (clusters[-1][1] is None or start <= clusters[-1][1] + max_gap):
+            cluster_start, cluster_end, indices = clusters[-1]
+            cluster_end = None if cluster_end is None or end is None else max(cluster_end, end)
+            clusters[-1] = (cluster_start, cluster_end, indices + [idx])
+        else:
+            clusters.append((start, end, [idx]))
+    return clusters
+
+
+def _transcode_source_recording(
+    audio_filepath: str,
+    members: List[Tuple[int, int, str, Optional[float], float]],
+    force_codec: Optional[str],
+    spool_dir: str,
+) -> List[Tuple[int, int, str, str]]:
+    """
+    Decodes the segments of the source recording (each cluster of contiguous segments is decoded once,
+    see `_cluster_segments`), encodes the segments and writes them to the spool directory.
+
+    Args:
+        audio_filepath: path to the source recording.
+        members: (shard_id, member_idx, arcname, duration, offset) of the segments of the recording.
+        force_codec: codec to transcode the segments to, None keeps the codec of the source recording.
+        spool_dir: directory with a subdirectory per shard, where the encoded segments are written.
+
+    Returns:
+        List of (shard_id, member_idx, arcname, path to the encoded segment) for the segments.
+    """
+    results = []
+    with soundfile.SoundFile(audio_filepath) as f:
+        sampling_rate = f.samplerate
+        codec = force_codec if force_codec is not None else f.format.lower()
+        spans = []
+        for _, _, _, duration, offset in members:
+            start = int(offset * sampling_rate)
+            spans.append((start, start + int(duration * sampling_rate) if duration else None))
+
+        for cluster_start, cluster_end, indices in _cluster_segments(
+            spans, max_gap=int(_MAX_DECODE_GAP_SECONDS * sampling_rate)
+        ):
+            f.seek(min(cluster_start, f.frames))
+            num_frames = -1 if cluster_end is None else max(0, cluster_end - cluster_start)
+            audio = f.read(num_frames, dtype=_AUDIO_READ_DTYPE)
+            for idx in indices:
+                shard_id, member_idx, arcname, _, _ = members[idx]
+                start, end = spans[idx]
+                encoded_audio = BytesIO()
+                soundfile.write(
+                    encoded_audio,
+                    audio[start - cluster_start : None if end is None else end - cluster_start],
+                    sampling_rate,
+                    closefd=False,
+                    **_get_codec_kwargs(codec),
+                )
+                spool_filepath = os.path.join(spool_dir, str(shard_id), str(member_idx))
+                with open(spool_filepath, 'wb') as spool_file:
+                    spool_file.write(encoded_audio.getvalue())
+                results.append((shard_id, member_idx, f"{arcname.split('.')[0]}.{codec}", spool_filepath))
+    return results
+
+
+def _write_spooled_tarball(tar_filepath: str, members: List[Tuple[str, str, bool]]) -> None:
+    """
+    Writes the tarball from the (arcname, path, is_spooled) members, in the given order.
+    The spooled (transcoded) members are removed after they are written, other files are added as they are.
+    """
+    with tarfile.open(tar_filepath, mode='w', dereference=True) as tar:
+        for arcname, path, is_spooled in members:
+            if is_spooled:
+                with open(path, 'rb') as f:
+                    _add_bytes_to_tar(tar, arcname, f.read())
+                os.remove(path)
+            else:
+                tar.add(path, arcname=arcname)
+    write_tar_index(tar_filepath)
+
+
+def _plan_transcode_windows(
+    recording_members: dict, segment_window: int
+) -> List[List[Tuple[str, List[Tuple[int, int, str, Optional[float], float]]]]]:
+    """
+    Packs the segments grouped by the source recording into windows of at most `segment_window` segments.
+    All the segments of a recording are put into the same window, unless the recording alone has more than
+    `segment_window` segments: then its segments, ordered by offset, are split into several windows.
+
+    Args:
+        recording_members: mapping from the path of the source recording to the list of its
+            (shard_id, member_idx, arcname, duration, offset) segments.
+        segment_window: maximum number of segments in a window.
+
+    Returns:
+        List of windows, each is a list of (audio_filepath, segments) transcoding tasks.
+    """
+    windows = [[]]
+    window_size = 0
+    for audio_filepath, members in recording_members.items():
+        members = sorted(members, key=lambda member: member[4])
+        for chunk_start in range(0, len(members), segment_window):
+            chunk = members[chunk_start : chunk_start + segment_window]
+            if window_size + len(chunk) > segment_window:
+                windows.append([])
+                window_size = 0
+            windows[-1].append((audio_filepath, chunk))
+            window_size += len(chunk)
+    return [window for window in windows if window]
+
+
 class ASRTarredDatasetBuilder:
     """
     Helper class that constructs a tarred dataset from scratch, or concatenates tarred datasets
@@ -178,6 +346,9 @@ class ASRTarredDatasetBuilder:
         dynamic_buckets_num: int = 30,
         only_manifests: bool = False,
         dry_run: bool = False,
+        segment_aware: bool = False,
+        num_tar_workers: int = 1,
+        segment_window: int = 4096,
     ):
         """
         Creates a new tarred dataset from a given manifest file.
@@ -189,6 +360,11 @@ class ASRTarredDatasetBuilder:
             buckets_num (int, optional): Number of buckets for static bucketing. Defaults to 1 (no bucketing).
             dynamic_buckets_num (int, optional): Number of buckets to estimate for dynamic bucketing. Defaults to 30.
             only_manifests (bool, optional): If True, performs a dry run without creating actual tar files. Defaults to False.
+            segment_aware (bool, optional): If True, decodes each source recording once and slices all its segments
+                from memory (see `_create_shards_segment_aware`). Defaults to False.
+            num_tar_workers (int, optional): Number of threads writing tar files when `segment_aware` is set. Defaults to 1.
+            segment_window (int, optional): Maximum number of segments transcoded in a window when `segment_aware`
+                is set, the segments of a recording are kept in the same window if possible. Defaults to 4096.
 
         Raises:
             ValueError: If the configuration has not been set.
@@ -196,6 +372,7 @@ class ASRTarredDatasetBuilder:
 
         Output:
             - Creates tar files and a tarred dataset compatible manifest file in the specified `target_dir`.
+            - Writes a sidecar index `audio_<shard_id>.tar.idx` of member offsets and sizes for each tar file.
             - Preserves a record of the metadata used to construct the tarred dataset in `metadata.yaml`.
             - Optionally creates shard manifests if `config.shard_manifests` is enabled.
 
@@ -288,12 +465,19 @@ class ASRTarredDatasetBuilder:
 
         manifest_folder, _ = os.path.split(manifest_path)
 
-        with Parallel(n_jobs=num_workers, verbose=config.num_shards) as parallel:
-            # Call parallel tarfile construction
-            new_entries_list = parallel(
-                delayed(self._create_shard)(entries[start_idx:end_idx], target_dir, i, manifest_folder, only_manifests)
+        new_entries_list = self._create_shards(
+            shards=[
+                (entries[start_idx:end_idx], i)
                 for i, (start_idx, end_idx) in enumerate(zip(start_indices, end_indices))
-            )
+            ],
+            target_dir=target_dir,
+            manifest_folder=manifest_folder,
+            num_workers=num_workers,
+            only_manifests=only_manifests,
+            segment_aware=segment_aware,
+            num_tar_workers=num_tar_workers,
+            segment_window=segment_window,
+        )
 
         if config.shard_manifests:
             sharded_manifests_dir = target_dir + '/sharded_manifests'
@@ -376,6 +560,9 @@ class ASRTarredDatasetBuilder:
         num_workers: int = 1,
         only_manifests: bool = False,
         dry_run: bool = False,
+        segment_aware: bool = False,
+        num_tar_workers: int = 1,
+        segment_window: int = 4096,
     ):
         """
         Creates a concatenated tarred dataset from the base manifest and additional manifest files.
@@ -389,6 +576,11 @@ class ASRTarredDatasetBuilder:
             target_dir (str, optional): Output directory where tarred files and manifests will be saved. Defaults to "./tarred_concatenated/".
             num_workers (int, optional): Number of parallel worker processes for creating tar files. Defaults to 1.
             only_manifests (bool, optional): If True, performs a dry run without creating actual tar files. Defaults to False.
+            segment_aware (bool, optional): If True, decodes each source recording once and slices all its segments
+                from memory (see `_create_shards_segment_aware`). Defaults to False.
+            num_tar_workers (int, optional): Number of threads writing tar files when `segment_aware` is set. Defaults to 1.
+            segment_window (int, optional): Maximum number of segments transcoded in a window when `segment_aware`
+                is set, the segments of a recording are kept in the same window if possible. Defaults to 4096.
 
         Raises:
             FileNotFoundError: If the base manifest file or any of the additional manifest files does not exist.
@@ -492,14 +684,19 @@ class ASRTarredDatasetBuilder:
 
         manifest_folder, _ = os.path.split(base_manifest_path)
 
-        with Parallel(n_jobs=num_workers, verbose=num_added_shards) as parallel:
-            # Call parallel tarfile construction
-            new_entries_list = parallel(
-                delayed(self._create_shard)(
-                    entries[start_idx:end_idx], target_dir, shard_idx, manifest_folder, only_manifests
-                )
-                for i, (start_idx, end_idx, shard_idx) in enumerate(zip(start_indices, end_indices, shard_indices))
-            )
+        new_entries_list = self._create_shards(
+            shards=[
+                (entries[start_idx:end_idx], shard_idx)
+                for start_idx, end_idx, shard_idx in zip(start_indices, end_indices, shard_indices)
+            ],
+            target_dir=target_dir,
+            manifest_folder=manifest_folder,
+            num_workers=num_workers,
+            only_manifests=only_manifests,
+            segment_aware=segment_aware,
+            num_tar_workers=num_tar_workers,
+            segment_window=segment_window,
+        )
 
         if config.shard_manifests:
             sharded_manifests_dir = target_dir + '/sharded_manifests'
@@ -616,17 +813,14 @@ class ASRTarredDatasetBuilder:
         # Trim audio based on offset and duration.
         start_sample = int(offset * sampling_rate)
         num_frames = int(duration * sampling_rate) if duration else -1
-        audio, sampling_rate = soundfile.read(file_path, start=start_sample, frames=num_frames)
+        audio, sampling_rate = soundfile.read(
+            audio_filepath, start=start_sample, frames=num_frames, dtype=_AUDIO_READ_DTYPE
+        )
 
         # Determine codec parameters.
-        if codec is not None:
-            if codec == "opus":
-                kwargs = {"format": "ogg", "subtype": "opus"}
-            else:
-                kwargs = {"format": codec}
-        else:
+        if codec is None:
             codec = soundfile.info(audio_filepath).format.lower()
-            kwargs = {"format": codec}
+        kwargs = _get_codec_kwargs(codec)
 
         # Transcode and write audio to tar.
         encoded_audio = BytesIO()
@@ -636,24 +830,168 @@ class ASRTarredDatasetBuilder:
         encoded_squashed_filename = f"{squashed_filename.split('.')[0]}.{codec}"
 
         # Add the in-memory audio file to the tar archive.
-        ti = tarfile.TarInfo(encoded_squashed_filename)
-        encoded_audio.seek(0)
-        ti.size = len(encoded_audio.getvalue())
-        tar.addfile(ti, encoded_audio)
+        _add_bytes_to_tar(tar, encoded_squashed_filename, encoded_audio.getvalue())
+
+    def _create_shards(
+        self,
+        shards: List[Tuple[List[dict], int]],
+        target_dir: str,
+        manifest_folder: str = None,
+        num_workers: int = 1,
+        only_manifests: bool = False,
+        segment_aware: bool = False,
+        num_tar_workers: int = 1,
+        segment_window: int = 4096,
+    ) -> List[List[dict]]:
+        """
+        Creates tarballs for the shards given as (entries, shard_id) and reports the conversion throughput.
+
+        Returns:
+            List of the new manifest entries for each shard.
+        """
+        start_time = time.time()
+        if segment_aware and not only_manifests:
+            new_entries_list = self._create_shards_segment_aware(
+                shards,
+                target_dir,
+                manifest_folder,
+                num_workers=num_workers,
+                num_tar_workers=num_tar_workers,
+                segment_window=segment_window,
+            )
+        else:
+            with Parallel(n_jobs=num_workers, verbose=len(shards)) as parallel:
+                # Call parallel tarfile construction
+                new_entries_list = parallel(
+                    delayed(self._create_shard)(entries, target_dir, shard_id, manifest_folder, only_manifests)
+                    for entries, shard_id in shards
+                )
+        elapsed = time.time() - start_time
+        hours = sum(entry['duration'] for new_entries in new_entries_list for entry in new_entries) / 3600
+        print(
+            f"Converted {hours:.2f} hours of audio in {elapsed:.1f} s "
+            f"({hours / max(elapsed, 1e-9):.4f} hours of audio per second)"
+        )
+        return new_entries_list
+
+    def _create_shards_segment_aware(
+        self,
+        shards: List[Tuple[List[dict], int]],
+        target_dir: str,
+        manifest_folder: str = None,
+        num_workers: int = 1,
+        num_tar_workers: int = 1,
+        segment_window: int = 4096,
+    ) -> List[List[dict]]:
+        """
+        Creates tarballs for the shards given as (entries, shard_id), grouping the tar members by the source
+        recording: each cluster of contiguous segments of a recording is decoded once and all its segments are
+        sliced from memory. The recordings are transcoded in windows of at most `segment_window` segments,
+        and a recording is split between windows only if it alone has more segments than `segment_window`.
+        Transcoding runs in a pool of `num_workers` processes, which write the encoded segments to a temporary
+        spool directory in `target_dir`. Each tarball is written as soon as all its members are transcoded,
+        in a pool of `num_tar_workers` threads (so at most `num_tar_workers` tarballs are open at a time),
+        which keeps the order of the members in each tarball the same as `_create_shard`.
+
+        Returns:
+            List of the new manifest entries for each shard.
+        """
+        assert segment_window > 0, f"{segment_window=}"
+        force_codec = self.config.force_codec
+        new_entries_list = []
+        # members of the shards as (arcname, path, is_spooled), filled in as the members are transcoded
+        shard_members = {}
+        recording_members = defaultdict(list)
+        passthrough_members = []
+        for entries, shard_id in shards:
+            new_entries, members = self._plan_shard(entries, shard_id, manifest_folder)
+            new_entries_list.append(new_entries)
+            shard_members[shard_id] = [None] * len(members)
+            for member_idx, (audio_filepath, arcname, duration, offset) in enumerate(members):
+                to_transcode = not (force_codec is None or audio_filepath.endswith(f".{force_codec}"))
+                if duration is None and offset == 0 and not to_transcode:
+                    # Add existing file without transcoding, trimming, or re-encoding.
+                    passthrough_members.append((shard_id, member_idx, arcname, audio_filepath))
+                else:
+                    recording_members[audio_filepath].append((shard_id, member_idx, arcname, duration, offset))
+        remaining_members = {shard_id: len(members) for shard_id, members in shard_members.items()}
+        num_transcoded = sum(len(members) for members in recording_members.values())
+
+        spool_dir = tempfile.mkdtemp(prefix='.segment_aware_spool_', dir=target_dir)
+        try:
+            with (
+                ProcessPoolExecutor(max_workers=_num_processes(num_workers)) as transcode_pool,
+                ThreadPoolExecutor(max_workers=max(1, num_tar_workers)) as tar_pool,
+                tqdm(total=num_transcoded, desc="Transcoding segments..") as progress,
+            ):
+                tar_futures = []
+
+                def _add_member(shard_id, member_idx, arcname, path, is_spooled):
+                    shard_members[shard_id][member_idx] = (arcname, path, is_spooled)
+                    remaining_members[shard_id] -= 1
+                    if remaining_members[shard_id] == 0:
+                        tar_futures.append(_submit_tarball(shard_id))
+
+                def _submit_tarball(shard_id):
+                    tar_filepath = os.path.join(target_dir, f'audio_{shard_id}.tar')
+                    return tar_pool.submit(_write_spooled_tarball, tar_filepath, shard_members.pop(shard_id))
+
+                for shard_id in shard_members:
+                    os.makedirs(os.path.join(spool_dir, str(shard_id)))
+                for shard_id in [shard_id for shard_id, num_members in remaining_members.items() if num_members == 0]:
+                    tar_futures.append(_submit_tarball(shard_id))
+                for shard_id, member_idx, arcname, audio_filepath in passthrough_members:
+                    _add_member(shard_id, member_idx, arcname, audio_filepath, is_spooled=False)
+
+                for window in _plan_transcode_windows(recording_members, segment_window):
+                    transcode_futures = [
+                        transcode_pool.submit(
+                            _transcode_source_recording, audio_filepath, members, force_codec, spool_dir
+                        )
+                        for audio_filepath, members in window
+                    ]
+                    for future in as_completed(transcode_futures):
+                        results = future.result()
+                        for shard_id, member_idx, arcname, spool_filepath in results:
+                            _add_member(shard_id, member_idx, arcname, spool_filepath, is_spooled=True)
+                        progress.update(len(results))
+                for future in tar_futures:
+                    future.result()
+        finally:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+        return new_entries_list
 
     def _create_shard(self, entries, target_dir, shard_id, manifest_folder: str = None, only_manifests: bool = False):
         """Creates a tarball containing the audio files from `entries`."""
+        new_entries, members = self._plan_shard(entries, shard_id, manifest_folder, only_manifests)
+
+        if not only_manifests:
+            tar_filepath = os.path.join(target_dir, f'audio_{shard_id}.tar')
+            with tarfile.open(tar_filepath, mode='w', dereference=True) as tar:
+                for audio_filepath, arcname, duration, offset in tqdm(members, desc="Creating shard.."):
+                    self._write_to_tar(tar, audio_filepath, arcname, duration=duration, offset=offset)
+            write_tar_index(tar_filepath)
+        return new_entries
+
+    def _plan_shard(
+        self, entries, shard_id, manifest_folder: str = None, only_manifests: bool = False
+    ) -> Tuple[List[dict], List[Tuple[str, str, Optional[float], float]]]:
+        """
+        Computes the new manifest entries of the shard and the members of its tarball.
+
+        Returns:
+            Tuple of the new manifest entries and the list of (audio_filepath, arcname, duration, offset)
+            of the tarball members in the order of writing.
+        """
         if self.config.sort_in_shards:
             entries.sort(key=lambda x: x["duration"], reverse=False)
 
         new_entries = []
-
-        tar_filepath = os.path.join(target_dir, f'audio_{shard_id}.tar')
-        if not only_manifests:
-            tar = tarfile.open(tar_filepath, mode='w', dereference=True)
+        members = []
 
         count = dict()
-        for entry in tqdm(entries, desc="Creating shard.."):
+        for entry in entries:
             # We squash the filename since we do not preserve directory structure of audio files in the tarball.
             if os.path.exists(entry["audio_filepath"]) or only_manifests:
                 audio_filepath = entry["audio_filepath"]
@@ -699,18 +1037,14 @@ class ASRTarredDatasetBuilder:
                 entry_duration = "_".join(entry_duration)
 
                 to_write = base + "_" + entry_offset + "_" + entry_duration + ext
-                if not only_manifests:
-                    self._write_to_tar(
-                        tar, audio_filepath, to_write, duration=entry['duration'], offset=entry['offset']
-                    )
+                members.append((audio_filepath, to_write, entry['duration'], entry['offset']))
                 count[squashed_filename] += 1
 
                 entry['source_audio_offset'] = entry['offset']
                 del entry['offset']
             else:
                 if squashed_filename not in count:
-                    if not only_manifests:
-                        self._write_to_tar(tar, audio_filepath, squashed_filename)
+                    members.append((audio_filepath, squashed_filename, None, 0))
                     to_write = squashed_filename
                     count[squashed_filename] = 1
                 else:
@@ -728,9 +1062,7 @@ class ASRTarredDatasetBuilder:
             }
             new_entries.append(new_entry)
 
-        if not only_manifests:
-            tar.close()
-        return new_entries
+        return new_entries, members
 
     @classmethod
     def setup_history(cls, base_metadata: ASRTarredDatasetMetadata, history: List[Any]):
@@ -788,6 +1120,9 @@ def create_tar_datasets(
     slice_with_offset: bool = False,
     only_manifests: bool = False,
     dry_run: bool = False,
+    segment_aware: bool = False,
+    tar_workers: int = 1,
+    segment_window: int = 4096,
 ):
     builder = ASRTarredDatasetBuilder()
 
@@ -837,6 +1172,9 @@ def create_tar_datasets(
             dynamic_buckets_num=dynamic_buckets_num,
             only_manifests=only_manifests,
             dry_run=dry_run,
+            segment_aware=segment_aware,
+            num_tar_workers=tar_workers,
+            segment_window=segment_window,
         )
 
     else:
@@ -875,6 +1213,9 @@ def create_tar_datasets(
             slice_with_offset=slice_with_offset,
             only_manifests=only_manifests,
             dry_run=dry_run,
+            segment_aware=segment_aware,
+            num_tar_workers=tar_workers,
+            segment_window=segment_window,
         )
 
     if not dry_run and (DALI_INDEX_SCRIPT_AVAILABLE and dali_index.INDEX_CREATOR_AVAILABLE):
@@ -1016,6 +1357,28 @@ if __name__ == "__main__":
             "Run in simulation mode: calculate and display the number of shards and estimated data per shard without reading audio files or writing any output."
         ),
     )
+    parser.add_argument(
+        "--segment_aware",
+        action='store_true',
+        help=(
+            "Group the entries by the source recording, decode each recording once and slice all its segments "
+            "from memory instead of reading every segment separately. Recommended for long recordings segmented "
+            "into many utterances with --slice_with_offset. Transcoding runs in --workers processes and writing "
+            "of tar files in --tar_workers threads."
+        ),
+    )
+    parser.add_argument(
+        '--tar_workers', type=int, default=1, help='Number of threads writing tar files with --segment_aware'
+    )
+    parser.add_argument(
+        '--segment_window',
+        type=int,
+        default=4096,
+        help=(
+            'Maximum number of segments transcoded in a window with --segment_aware. The segments of a recording '
+            'are transcoded in the same window, unless the recording alone has more segments.'
+        ),
+    )
     parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
     args = parser.parse_args()
     main(args)
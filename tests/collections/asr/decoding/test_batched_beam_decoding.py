@@ -25,20 +25,25 @@ from tqdm import tqdm
 
 from nemo.collections.asr.models import ASRModel
 from nemo.collections.asr.models.ctc_models import EncDecCTCModel
+from nemo.collections.asr.modules import RNNTDecoder, RNNTJoint
+from nemo.collections.asr.parts.submodules.ctc_batched_beam_decoding import BatchedBeamCTCComputer
 from nemo.collections.asr.parts.submodules.ctc_beam_decoding import BeamBatchedCTCInfer
 from nemo.collections.asr.parts.submodules.ngram_lm import NGramGPULanguageModel
 from nemo.collections.asr.parts.submodules.rnnt_beam_decoding import BeamBatchedRNNTInfer
+from nemo.collections.asr.parts.submodules.rnnt_malsd_batched_computer import ModifiedALSDBatchedRNNTComputer
 from nemo.collections.asr.parts.submodules.tdt_beam_decoding import BeamBatchedTDTInfer
 from nemo.collections.asr.parts.utils import rnnt_utils
 from nemo.core.utils import numba_utils
 from nemo.core.utils.cuda_python_utils import skip_cuda_python_test_if_cuda_graphs_conditional_nodes_not_supported
 from nemo.core.utils.numba_utils import __NUMBA_MINIMUM_VERSION__
 from tests.collections.asr.decoding.utils import load_audio
+from tests.collections.asr.test_ngram_lm import write_random_arpa
 
 RNNT_MODEL = "stt_en_conformer_transducer_small"
 CTC_MODEL = "nvidia/stt_en_conformer_ctc_small"
 TDT_MODEL = "nvidia/stt_en_fastconformer_tdt_large"
 MAX_SAMPLES = 10
+SMALL_VOCAB_SIZE = 16
 
 DEVICES = [torch.device("cpu")]
 
@@ -108,6 +113,14 @@ def kenlm_model_path(tmp_path_factory, test_data_dir):
     return f"{lm_nemo_path}"
 
 
+@pytest.fixture(scope="module")
+def random_lm_path(tmp_path_factory):
+    """Small random n-gram LM (vocabulary size `SMALL_VOCAB_SIZE`)"""
+    lm_path = tmp_path_factory.mktemp("lm") / "random.arpa"
+    write_random_arpa(lm_path, vocab_size=SMALL_VOCAB_SIZE, order=3, num_sentences=100)
+    return f"{lm_path}"
+
+
 def get_transducer_model_encoder_output(
     test_audio_filenames,
     num_samples: int,
@@ -878,3 +891,83 @@ class TestCTCDecoding:
             check_res_best_hyps(num_samples, hyps)
             hyps = decode_text_from_hypotheses(hyps, model)
             print_res_best_hyps(hyps)
+
+
+def assert_nbest_hyps_equal(batch_nbest_hyps, batch_nbest_hyps_ref):
+    for nbest_hyps, nbest_hyps_ref in zip(batch_nbest_hyps, batch_nbest_hyps_ref, strict=True):
+        for hyp, hyp_ref in zip(nbest_hyps.n_best_hypotheses, nbest_hyps_ref.n_best_hypotheses, strict=True):
+            assert hyp.score == pytest.approx(hyp_ref.score, abs=1e-4)
+            assert hyp.y_sequence.tolist() == hyp_ref.y_sequence.tolist()
+
+
+class TestSparseLMFusion:
+    """Decoding with sparse LM queries (only for the top-k labels) should match decoding with dense LM queries"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("blank_lm_score_mode", ["no_score", "lm_weighted_full"])
+    def test_malsd_sparse_vs_dense_lm(self, monkeypatch, random_lm_path, blank_lm_score_mode):
+        torch.manual_seed(0)
+        decoder = RNNTDecoder({"pred_hidden": 8, "pred_rnn_layers": 1}, vocab_size=SMALL_VOCAB_SIZE).eval()
+        joint = RNNTJoint(
+            {"encoder_hidden": 8, "pred_hidden": 8, "joint_hidden": 16, "activation": "relu"},
+            num_classes=SMALL_VOCAB_SIZE,
+        ).eval()
+        computer = ModifiedALSDBatchedRNNTComputer(
+            decoder=decoder,
+            joint=joint,
+            blank_index=SMALL_VOCAB_SIZE,
+            beam_size=4,
+            max_symbols_per_step=3,
+            ngram_lm_model=random_lm_path,
+            ngram_lm_alpha=0.5,
+            blank_lm_score_mode=blank_lm_score_mode,
+            pruning_mode="early",
+            allow_cuda_graphs=False,
+        )
+        encoder_output = torch.randn(3, 12, 8) * 3
+        encoder_output_length = torch.tensor([12, 7, 10])
+
+        with torch.no_grad():
+            assert computer._use_sparse_lm(encoder_output.device)
+            nbest_hyps_sparse = computer(encoder_output, encoder_output_length).to_nbest_hyps_list(score_norm=False)
+            monkeypatch.setattr(computer, "_use_sparse_lm", lambda device: False)
+            nbest_hyps_dense = computer(encoder_output, encoder_output_length).to_nbest_hyps_list(score_norm=False)
+
+        assert any(len(nbest.n_best_hypotheses[0].y_sequence) > 0 for nbest in nbest_hyps_dense)
+        assert_nbest_hyps_equal(nbest_hyps_sparse, nbest_hyps_dense)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("ngram_lm_topk", [4, SMALL_VOCAB_SIZE])
+    def test_ctc_sparse_vs_dense_lm(self, random_lm_path, ngram_lm_topk):
+        torch.manual_seed(0)
+        batch_size, max_time = 3, 15
+        decoder_output = torch.randn(batch_size, max_time, SMALL_VOCAB_SIZE + 1) * 3
+        decoder_output_lengths = torch.tensor([15, 9, 12])
+        if ngram_lm_topk < SMALL_VOCAB_SIZE:
+            # labels outside the acoustic top-k are too unlikely to be selected with dense LM queries
+            top_k_mask = torch.zeros_like(decoder_output, dtype=torch.bool)
+            top_k_mask[..., :-1].scatter_(
+                dim=-1, index=decoder_output[..., :-1].topk(ngram_lm_topk, dim=-1).indices, value=True
+            )
+            top_k_mask[..., -1] = True
+            decoder_output.masked_fill_(~top_k_mask, -1000.0)
+        decoder_output = decoder_output.log_softmax(dim=-1)
+
+        nbest_hyps = []
+        for topk in (ngram_lm_topk, None):
+            computer = BatchedBeamCTCComputer(
+                blank_index=SMALL_VOCAB_SIZE,
+                beam_size=4,
+                return_best_hypothesis=False,
+                ngram_lm_model=random_lm_path,
+                ngram_lm_alpha=0.5,
+                allow_cuda_graphs=False,
+                ngram_lm_topk=topk,
+            )
+            with torch.no_grad():
+                batched_hyps = computer(decoder_output, decoder_output_lengths)
+            nbest_hyps.append(batched_hyps.to_nbest_hyps_list(score_norm=False))
+
+        nbest_hyps_sparse, nbest_hyps_dense = nbest_hyps
+        assert any(len(nbest.n_best_hypotheses[0].y_sequence) > 0 for nbest in nbest_hyps_dense)
+        assert_nbest_hyps_equal(nbest_hyps_sparse, nbest_hyps_dense)
@@ -21,10 +21,12 @@ from nemo.collections.asr.modules.transformer.transformer import TransformerDeco
 from nemo.collections.asr.modules.transformer.transformer_generators import (
     BeamSearchSequenceGenerator,
     BeamSearchSequenceGeneratorWithFusionModels,
+    DecoderPromptCache,
     GreedySequenceGenerator,
 )
 from nemo.collections.asr.parts.context_biasing import GPUBoostingTreeModel
 from nemo.collections.asr.parts.submodules.multitask_beam_decoding import TransformerAEDBeamInfer
+from nemo.collections.asr.parts.submodules.multitask_continuous_batching import AEDContinuousBatchingGreedyInfer
 from nemo.collections.asr.parts.submodules.multitask_greedy_decoding import TransformerAEDGreedyInfer
 from nemo.collections.asr.parts.submodules.ngram_lm import NGramGPULanguageModel
 from nemo.collections.asr.parts.submodules.token_classifier import TokenClassifier
@@ -259,3 +261,165 @@ def test_transformer_aed_greedy_infer_strips_prompt(prompted_inputs, decoder_nm,
     torch.testing.assert_close(
         untrimmed[decoder_input_ids.shape[1] :], best_path
     )  # stripped the prompt from the beggining
+
+
+@pytest.fixture()
+def nnet_mixed_lengths(deterministic_rng):
+    decoder_nm = TransformerDecoderNM(
+        vocab_size=8,
+        hidden_size=8,
+        num_layers=1,
+        inner_size=4,
+        num_attention_heads=1,
+        max_sequence_length=32,
+    ).eval()
+    return decoder_nm.embedding, decoder_nm.decoder, TokenClassifier(hidden_size=8, num_classes=8).eval()
+
+
+@pytest.mark.parametrize('with_confidence', [False, True])
+def test_greedy_decoding_compact_finished_matches_default(nnet_mixed_lengths, with_confidence):
+    B, T, C = 8, 5, 8
+    encoder_hidden_states = torch.randn(B, T, C)
+    encoder_input_mask = torch.ones(B, T, dtype=torch.float)
+    decoder_input_ids = torch.ones(B, 1, dtype=torch.long)
+
+    gen = GreedySequenceGenerator(*nnet_mixed_lengths, preserve_step_confidence=with_confidence)
+    gen_compact = GreedySequenceGenerator(
+        *nnet_mixed_lengths, preserve_step_confidence=with_confidence, compact_finished=True
+    )
+
+    best_path, _, confidence = gen(decoder_input_ids, encoder_hidden_states, encoder_input_mask)
+    best_path_compact, _, confidence_compact = gen_compact(
+        decoder_input_ids, encoder_hidden_states, encoder_input_mask
+    )
+
+    # the sequences in the batch are expected to end at different steps
+    assert (best_path[:, -1] == 0).any() and (best_path[:, -1] == 2).any()
+
+    assert best_path_compact.shape == best_path.shape
+    assert torch.equal(best_path_compact, best_path)
+    if with_confidence:
+        assert confidence_compact.shape == confidence.shape
+        # confidence values after <eos> are not computed in the compacted mode
+        is_valid = torch.ones_like(best_path, dtype=torch.bool)
+        is_valid[:, 1:] = (best_path[:, :-1] != 2).cumprod(dim=1).bool()
+        torch.testing.assert_close(confidence_compact[is_valid], confidence[is_valid])
+    else:
+        assert confidence_compact is None
+
+
+@pytest.mark.parametrize('max_slots', [1, 3, 8])
+def test_continuous_batching_greedy_matches_static_batch(nnet_mixed_lengths, tokenizer, max_slots):
+    B, T, C = 8, 5, 8
+    encoder_hidden_states = torch.randn(B, T, C)
+    encoder_input_mask = torch.ones(B, T, dtype=torch.float)
+    encoder_input_mask[::2, 3:] = 0.0
+    decoder_input_ids = torch.ones(B, 1, dtype=torch.long)
+    embedding, decoder, classifier = nnet_mixed_lengths
+    transformer_decoder = Mock(embedding=embedding, decoder=decoder, max_sequence_length=32)
+
+    static = TransformerAEDGreedyInfer(transformer_decoder, classifier, tokenizer, max_generation_delta=-1)
+    (expected,) = static(
+        encoder_hidden_states=encoder_hidden_states,
+        encoder_input_mask=encoder_input_mask,
+        decoder_input_ids=decoder_input_ids,
+    )
+
+    engine = AEDContinuousBatchingGreedyInfer(transformer_decoder, classifier, tokenizer, max_slots=max_slots)
+    hypotheses = engine(encoder_hidden_states, encoder_input_mask, decoder_input_ids)
+
+    assert engine.is_idle
+    assert len(hypotheses) == B
+    # the utterances are expected to finish at different steps
+    assert len({len(hyp.y_sequence) for hyp in hypotheses}) > 1
+    for hyp, ref in zip(hypotheses, expected):
+        assert torch.equal(hyp.y_sequence, ref.y_sequence)
+
+
+def test_continuous_batching_greedy_admits_into_free_slots(nnet_mixed_lengths, tokenizer):
+    B, T, C = 4, 5, 8
+    embedding, decoder, classifier = nnet_mixed_lengths
+    transformer_decoder = Mock(embedding=embedding, decoder=decoder, max_sequence_length=32)
+    engine = AEDContinuousBatchingGreedyInfer(transformer_decoder, classifier, tokenizer, max_slots=2)
+
+    engine.submit(
+        torch.randn(B, T, C),
+        torch.ones(B, T),
+        torch.ones(B, 1, dtype=torch.long),
+        request_ids=["a", "b", "c", "d"],
+    )
+    assert engine.num_pending == 4
+
+    finished = dict(engine.step())
+    assert engine.num_active + len(finished) == 2
+    assert engine.num_pending == 2
+
+    # new requests can be submitted while the others are decoded
+    engine.submit(torch.randn(1, T, C), torch.ones(1, T), torch.ones(1, 1, dtype=torch.long), request_ids=["e"])
+    while not engine.is_idle:
+        assert engine.num_active <= 2
+        finished.update(engine.step())
+    assert set(finished) == {"a", "b", "c", "d", "e"}
+
+
+@pytest.mark.parametrize('pre_ln', [False, True])
+@pytest.mark.parametrize('generator_cls', [GreedySequenceGenerator, BeamSearchSequenceGenerator])
+def test_prompt_cache_matches_uncached_decoding(deterministic_rng, pre_ln, generator_cls):
+    decoder_nm = TransformerDecoderNM(
+        vocab_size=8,
+        hidden_size=8,
+        num_layers=2,
+        inner_size=4,
+        num_attention_heads=1,
+        max_sequence_length=32,
+        pre_ln=pre_ln,
+    ).eval()
+    nnet = (decoder_nm.embedding, decoder_nm.decoder, TokenClassifier(hidden_size=8, num_classes=8).eval())
+    B, T, C = 4, 5, 8
+    encoder_hidden_states = torch.randn(B, T, C)
+    encoder_input_mask = torch.ones(B, T, dtype=torch.float)
+    # two distinct prompts in the batch
+    decoder_input_ids = torch.tensor([[1, 4, 5], [1, 6, 5], [1, 4, 5], [1, 6, 5]], dtype=torch.long)
+
+    kwargs = {'beam_size': 2} if generator_cls is BeamSearchSequenceGenerator else {}
+    gen = generator_cls(*nnet, **kwargs)
+    gen_cached = generator_cls(*nnet, prompt_cache_size=4, **kwargs)
+
+    expected = gen(decoder_input_ids, encoder_hidden_states, encoder_input_mask)[0]
+    for _ in range(2):
+        actual = gen_cached(decoder_input_ids, encoder_hidden_states, encoder_input_mask)[0]
+        assert len(gen_cached.prompt_cache) == 2
+        torch.testing.assert_close(actual, expected)
+
+    gen_cached.freeze()
+    assert len(gen_cached.prompt_cache) == 0
+
+
+def test_prompt_cache_device_and_dtype(deterministic_rng):
+    decoder_nm = TransformerDecoderNM(
+        vocab_size=8,
+        hidden_size=8,
+        num_layers=2,
+        inner_size=4,
+        num_attention_heads=1,
+        max_sequence_length=32,
+    ).eval()
+    prompt_cache = DecoderPromptCache(decoder_nm.embedding, decoder_nm.decoder)
+    decoder_input_ids = torch.tensor([[1, 4, 5], [1, 6, 5]], dtype=torch.long)
+
+    with torch.no_grad():
+        hidden_states, _ = prompt_cache(decoder_input_ids)
+        assert hidden_states.dtype == torch.float32
+        assert len(prompt_cache) == 2
+
+        # the cached states are recomputed with autocast
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            _, self_attn_output = prompt_cache(decoder_input_ids[:1])
+            assert self_attn_output.dtype == torch.bfloat16
+        assert len(prompt_cache) == 1
+
+        # and when the weights are converted
+        decoder_nm.double()
+        hidden_states, self_attn_output = prompt_cache(decoder_input_ids)
+        assert hidden_states.dtype == self_attn_output.dtype == torch.float64
+        assert len(prompt_cache) == 2
@@ -15,6 +15,7 @@
 
 import os
 import tempfile
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
@@ -93,6 +94,62 @@ class TestCTCWordSpotter:
         assert ws_results[0].end_frame == 19
         torch.testing.assert_close(ws_results[0].score, 8.9967, atol=1e-3, rtol=1e-4)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("cb_weight", [0.0, 3.0])
+    def test_run_word_spotter_batch_vs_reference(self, cb_weight):
+        vocab_size = 30
+        blank_idx = vocab_size
+        # tokenizer stub: each token is a separate word for word-level ctc alignment
+        asr_model = SimpleNamespace(tokenizer=SimpleNamespace(ids_to_tokens=lambda ids: [f"▁{i}" for i in ids]))
+        rng = np.random.default_rng(0)
+        context_biasing_list = [
+            [f"word{i}", [rng.integers(0, vocab_size, size=rng.integers(1, 5)).tolist() for _ in range(2)]]
+            for i in range(100)
+        ]
+        context_graph = context_biasing.ContextGraphCTC(blank_id=blank_idx)
+        context_graph.add_to_graph(context_biasing_list)
+
+        generator = torch.Generator().manual_seed(0)
+        batch_size, max_time = 4, 60
+        logits = torch.randn([batch_size, max_time, vocab_size + 1], generator=generator) * 2
+        logits[..., blank_idx] += 3
+        # insert keywords into logits
+        for i in range(batch_size):
+            for _ in range(4):
+                word_tokens = context_biasing_list[rng.integers(0, len(context_biasing_list))][1][0]
+                start = rng.integers(0, max_time - 10)
+                for j, token in enumerate(word_tokens):
+                    logits[i, start + 2 * j, token] += 8
+        logprobs = logits.log_softmax(dim=-1)
+        logprobs_lengths = torch.tensor([60, 50, 33, 60])
+
+        # beam pruning differs between the implementations, use a wide beam to compare
+        ws_results_batch = context_biasing.run_word_spotter_batch(
+            logprobs,
+            logprobs_lengths,
+            context_graph,
+            asr_model,
+            blank_idx=blank_idx,
+            beam_threshold=100.0,
+            cb_weight=cb_weight,
+        )
+        assert len(ws_results_batch) == batch_size
+        for i in range(batch_size):
+            ws_results = context_biasing.run_word_spotter(
+                logprobs[i, : logprobs_lengths[i]].numpy(),
+                context_graph,
+                asr_model,
+                blank_idx=blank_idx,
+                beam_threshold=100.0,
+                cb_weight=cb_weight,
+            )
+            assert len(ws_results_batch[i]) == len(ws_results)
+            for hyp_batch, hyp in zip(ws_results_batch[i], ws_results):
+                assert hyp_batch.word == hyp.word
+                assert hyp_batch.start_frame == hyp.start_frame
+                assert hyp_batch.end_frame == hyp.end_frame
+                assert hyp_batch.score == pytest.approx(hyp.score, abs=1e-3)
+
 
 class TestContextBiasingUtils:
     @pytest.mark.unit
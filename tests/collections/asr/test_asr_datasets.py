@@ -16,6 +16,7 @@ import filecmp
 import json
 import os
 import shutil
+import tarfile
 import tempfile
 from unittest import mock
 
@@ -29,9 +30,13 @@ from torch.utils.data import DataLoader
 from nemo.collections.asr.data import audio_to_text_dataset
 from nemo.collections.asr.data.audio_to_text import (
     DataStoreObject,
+    IndexedTarredAudioToBPEDataset,
     TarredAudioToBPEDataset,
     TarredAudioToCharDataset,
+    build_tar_index,
     cache_datastore_manifests,
+    read_tar_index,
+    write_tar_index,
 )
 from nemo.collections.asr.data.audio_to_text_dali import (
     __DALI_MINIMUM_VERSION__,
@@ -45,6 +50,7 @@ from nemo.collections.asr.models.ctc_models import EncDecCTCModel
 from nemo.collections.asr.parts.utils.manifest_utils import write_manifest
 from nemo.collections.common import tokenizers
 from nemo.collections.common.data.lhotse import get_lhotse_dataloader_from_config
+from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer, create_spt_model
 from nemo.utils import logging
 
 try:
@@ -198,6 +204,56 @@ class TestASRDatasets:
             count += 1
         assert count == 32
 
+    @pytest.mark.unit
+    def test_indexed_tarred_bpe_dataset(self, tmp_path):
+        text_path = tmp_path / "text.txt"
+        text_path.write_text("\n".join(map(chr, range(ord('a'), ord('z')))))
+        model_path, _ = create_spt_model(
+            text_path, vocab_size=32, sample_size=-1, do_lower_case=False, output_dir=str(tmp_path)
+        )
+        tokenizer = SentencePieceTokenizer(model_path)
+
+        rng = np.random.default_rng(0)
+        num_shards, num_samples_per_shard = 2, 4
+        manifest = []
+        tar_filepaths = []
+        for shard_id in range(num_shards):
+            tar_filepath = str(tmp_path / f"audio_{shard_id}.tar")
+            with tarfile.open(tar_filepath, mode='w') as tar:
+                for i in range(num_samples_per_shard):
+                    name = f"utt_{shard_id}_{i}.wav"
+                    duration = float(rng.integers(2, 10)) / 10
+                    sf.write(tmp_path / name, rng.uniform(-0.5, 0.5, int(duration * 16000)), 16000)
+                    tar.add(tmp_path / name, arcname=name)
+                    text = ''.join(rng.choice(list('abcdef'), size=5))
+                    manifest.append({"audio_filepath": name, "duration": duration, "text": text, "shard_id": shard_id})
+            tar_filepaths.append(tar_filepath)
+        manifest_path = str(tmp_path / "tarred_audio_manifest.json")
+        write_manifest(manifest_path, manifest)
+
+        # sidecar index for the first shard only: the index of the second shard is built from the headers
+        write_tar_index(tar_filepaths[0])
+        assert read_tar_index(tar_filepaths[0]) == build_tar_index(tar_filepaths[0])
+
+        ds_kwargs = dict(
+            manifest_filepath=manifest_path, tokenizer=tokenizer, sample_rate=16000, return_sample_id=True
+        )
+        ds_indexed = IndexedTarredAudioToBPEDataset(
+            audio_tar_filepaths=str(tmp_path / "audio__OP_0..1_CL_.tar"), **ds_kwargs
+        )
+        ds_tarred = TarredAudioToBPEDataset(audio_tar_filepaths=tar_filepaths, **ds_kwargs)
+        assert len(ds_indexed) == len(ds_tarred) == num_shards * num_samples_per_shard
+
+        for sample in ds_tarred:
+            indexed_sample = ds_indexed[sample[-1]]
+            assert indexed_sample[-1] == sample[-1]
+            for value, indexed_value in zip(sample[:-1], indexed_sample[:-1]):
+                assert torch.equal(value, indexed_value)
+
+        # random access to a subset of samples with the dataloader
+        loader = DataLoader(ds_indexed, batch_size=2, sampler=[5, 1, 6], collate_fn=ds_indexed._collate_fn)
+        assert [batch[-1].tolist() for batch in loader] == [[5, 1], [6]]
+
     @pytest.mark.skipif(not HAVE_DALI, reason="NVIDIA DALI is not installed or incompatible version")
     @pytest.mark.unit
     def test_dali_char_dataset(self, test_data_dir):
@@ -0,0 +1,137 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import nemo.collections.asr as nemo_asr
+from nemo.utils import logging
+
+# model families with heavy (optional) dependencies, which should not be imported with `nemo.collections.asr`
+HEAVY_MODULES = [
+    "nemo.collections.asr.models",
+    "nemo.collections.asr.models.k2_sequence_models",
+    "nemo.collections.asr.models.msdd_models",
+    "nemo.collections.asr.models.sortformer_diar_models",
+    "nemo.collections.asr.models.slu_models",
+    "nemo.collections.asr.models.ssl_models",
+    "nemo.collections.asr.models.clustering_diarizer",
+]
+
+STARTUP_BENCHMARK_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import nemo.collections.asr
+import_time = time.perf_counter() - start
+num_modules = len(sys.modules)
+heavy_modules = [name for name in {heavy_modules} if name in sys.modules]
+
+start = time.perf_counter()
+nemo.collections.asr.models._import_all()
+nemo.collections.asr.modules._import_all()
+nemo.collections.asr.data
+nemo.collections.asr.losses
+nemo.collections.asr.metrics
+nemo.collections.asr.parts
+full_import_time = import_time + time.perf_counter() - start
+
+print(
+    json.dumps(
+        {{
+            "import_time": import_time,
+            "num_modules": num_modules,
+            "heavy_modules": heavy_modules,
+            "full_import_time": full_import_time,
+            "full_num_modules": len(sys.modules),
+        }}
+    )
+)
+"""
+
+
+class TestASRLazyImports:
+    @pytest.mark.unit
+    def test_startup_benchmark(self):
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_BENCHMARK_SCRIPT.format(heavy_modules=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        logging.info(
+            f"import nemo.collections.asr: {stats['import_time']:.2f}s, {stats['num_modules']} modules; "
+            f"with all submodules: {stats['full_import_time']:.2f}s, {stats['full_num_modules']} modules"
+        )
+        assert stats["heavy_modules"] == []
+        assert stats["num_modules"] < stats["full_num_modules"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("package", [nemo_asr.models, nemo_asr.modules])
+    def test_public_api(self, package):
+        for name in package.__all__:
+            attribute = getattr(package, name)
+            assert attribute.__name__ == name
+            assert name in dir(package)
+
+        with pytest.raises(AttributeError):
+            _ = package.NonExistentModel
+
+    @pytest.mark.unit
+    def test_submodules_access(self):
+        from nemo.collections.asr.models import EncDecCTCModelBPE
+        from nemo.collections.asr.models.ctc_bpe_models import EncDecCTCModelBPE as SubmoduleEncDecCTCModelBPE
+
+        assert EncDecCTCModelBPE is SubmoduleEncDecCTCModelBPE
+        assert nemo_asr.models.ctc_bpe_models.EncDecCTCModelBPE is EncDecCTCModelBPE
+        assert nemo_asr.losses.CTCLoss is not None
+        assert nemo_asr.metrics.WER is not None
+
+        with pytest.raises(AttributeError):
+            _ = nemo_asr.non_existent_submodule
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("package", [nemo_asr, nemo_asr.parts])
+    def test_all_submodules_are_attributes(self, package):
+        # all submodules should be available as attributes, as with the eager imports of the submodules
+        submodules = {module.name for module in pkgutil.iter_modules(package.__path__)}
+        assert submodules <= set(dir(package))
+        for name in submodules:
+            assert getattr(package, name).__name__ == f"{package.__name__}.{name}"
+
+    @pytest.mark.unit
+    def test_nested_submodules_access(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import nemo.collections.asr as nemo_asr; print(nemo_asr.parts.utils.rnnt_utils.Hypothesis.__name__)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip().splitlines()[-1] == "Hypothesis"
+
+    @pytest.mark.unit
+    def test_list_available_models_includes_lazy_subclasses(self):
+        model_names = {model.pretrained_model_name for model in nemo_asr.models.ASRModel.list_available_models()}
+        assert any(name.startswith("stt_en_conformer_ctc") for name in model_names)
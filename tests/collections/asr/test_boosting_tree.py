@@ -176,6 +176,148 @@ class TestGPUBoostingTreeModel:
         )  # (1.69+0): 1.69 as max score for state 1 and 0 because it is not final state
         assert scores[1, 0] == 2.0  # (1+1): 1 as max score for state 2 and 1 because it is final state
 
+    @staticmethod
+    def _score_sequences(boosting_tree: GPUBoostingTreeModel, sentences_ids: list[list[int]]) -> torch.Tensor:
+        """Accumulated boosting scores (with final scores) for sentences of the same length"""
+        labels = torch.LongTensor(sentences_ids)
+        states = boosting_tree.get_init_states(batch_size=labels.shape[0])
+        scores = torch.zeros([labels.shape[0]])
+        for i in range(labels.shape[1]):
+            step_scores, next_states = boosting_tree.advance(states, eos_id=0)
+            scores += step_scores.gather(dim=1, index=labels[:, i : i + 1]).squeeze(-1)
+            states = next_states.gather(dim=1, index=labels[:, i : i + 1]).squeeze(-1)
+        return scores + boosting_tree.get_final(states)
+
+    @staticmethod
+    def _random_phrases(generator: torch.Generator, vocab_size: int, num_phrases: int):
+        """Random phrases with transcriptions of 1-4 tokens"""
+        phrases = [f"phrase{i}" for i in range(num_phrases)]
+        token_ids = [
+            torch.randint(1, vocab_size, [int(torch.randint(1, 5, [1], generator=generator))], generator=generator)
+            for _ in phrases
+        ]
+        return phrases, [transcription.tolist() for transcription in token_ids]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("compaction", [True, False])
+    def test_remove_phrases_vs_rebuild(self, compaction, monkeypatch):
+        """Test that tombstoned phrases are not boosted (the same scores as for the rebuilt tree)"""
+        generator = torch.Generator().manual_seed(0)
+        vocab_size = 6
+        phrases, token_ids = self._random_phrases(generator, vocab_size=vocab_size, num_phrases=30)
+        build_params = dict(vocab_size=vocab_size, final_eos_score=1.0, unk_score=-0.1, use_triton=False)
+        boosting_tree = GPUBoostingTreeModel.from_phrases(phrases=phrases, token_ids=token_ids, **build_params)
+        if not compaction:
+            # check the tombstones without the compacted tree
+            monkeypatch.setattr(boosting_tree, "compact", lambda blocking=False: None)
+        sentences_ids = torch.randint(0, vocab_size, [200, 10], generator=generator).tolist()
+        for removed_phrases in [phrases[:5], phrases[10:12], phrases[20:21]]:
+            boosting_tree.remove_phrases(removed_phrases)
+            phrases, token_ids = map(
+                list,
+                zip(*[(phrase, ids) for phrase, ids in zip(phrases, token_ids) if phrase not in removed_phrases]),
+            )
+            boosting_tree_rebuilt = GPUBoostingTreeModel.from_phrases(
+                phrases=phrases, token_ids=token_ids, **build_params
+            )
+            assert torch.allclose(
+                self._score_sequences(boosting_tree, sentences_ids),
+                self._score_sequences(boosting_tree_rebuilt, sentences_ids),
+                atol=1e-4,
+            )
+        boosting_tree.wait_for_compaction()
+
+    @pytest.mark.unit
+    def test_set_phrase_scores_in_place_vs_rebuild(self, monkeypatch):
+        """Test that changed scores are applied in-place at the start of decoding (the same as for the rebuilt tree)"""
+        generator = torch.Generator().manual_seed(0)
+        vocab_size = 6
+        phrases, token_ids = self._random_phrases(generator, vocab_size=vocab_size, num_phrases=30)
+        scores = [0.0] * len(phrases)
+        build_params = dict(vocab_size=vocab_size, final_eos_score=1.0, unk_score=-0.1, use_triton=False)
+        boosting_tree = GPUBoostingTreeModel.from_phrases(phrases=phrases, token_ids=token_ids, **build_params)
+        # check the in-place update without the compacted tree
+        monkeypatch.setattr(boosting_tree, "compact", lambda blocking=False: None)
+        sentences_ids = torch.randint(0, vocab_size, [200, 10], generator=generator).tolist()
+        for changed_phrases, new_score in [(phrases[:5], 3.0), (phrases[3:12:2], 0.5), (phrases[:2], 0.0)]:
+            arcs_weights = boosting_tree.arcs_weights.data.clone()
+            backoff_weights = boosting_tree.backoff_weights.data.clone()
+            boosting_tree.set_phrase_scores(changed_phrases, [new_score] * len(changed_phrases))
+            # the tree is not changed until the start of the next decoding
+            assert torch.equal(boosting_tree.arcs_weights.data, arcs_weights)
+            assert torch.equal(boosting_tree.backoff_weights.data, backoff_weights)
+            for phrase in changed_phrases:
+                scores[phrases.index(phrase)] = new_score
+            boosting_tree_rebuilt = GPUBoostingTreeModel.from_phrases(
+                phrases=phrases, token_ids=token_ids, scores=scores, **build_params
+            )
+            assert torch.allclose(
+                self._score_sequences(boosting_tree, sentences_ids),
+                self._score_sequences(boosting_tree_rebuilt, sentences_ids),
+                atol=1e-4,
+            )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("spare_capacity", [0.0, 2.0])
+    def test_add_phrases_and_scores(self, spare_capacity):
+        """Test adding phrases and changing scores with compaction"""
+        build_params = dict(vocab_size=10, final_eos_score=1.0, use_triton=False)
+        boosting_tree = GPUBoostingTreeModel.from_phrases(
+            phrases=["abc", "c"], token_ids=[[1, 2, 3], [3]], spare_capacity=spare_capacity, **build_params
+        )
+        arcs_weights_ptr = boosting_tree.arcs_weights.data_ptr()
+        boosting_tree.add_phrases(phrases=["bd", "xyz"], token_ids=[[2, 4], [[7, 8, 9], [7, 9]]], scores=[0.0, 2.0])
+        boosting_tree.set_phrase_scores(phrases=["c"], scores=[3.0])
+        boosting_tree.wait_for_compaction()
+        # compacted tree is swapped in at the start of decoding
+        boosting_tree.get_init_states(batch_size=1)
+        boosting_tree_rebuilt = GPUBoostingTreeModel.from_phrases(
+            phrases=["abc", "c", "bd", "xyz"],
+            token_ids=[[1, 2, 3], [3], [2, 4], [[7, 8, 9], [7, 9]]],
+            scores=[0.0, 3.0, 0.0, 2.0],
+            **build_params,
+        )
+        sentences_ids = [[1, 2, 3, 7, 8, 9], [2, 4, 3, 3, 7, 9], [1, 2, 4, 0, 0, 0]]
+        assert torch.allclose(
+            self._score_sequences(boosting_tree, sentences_ids),
+            self._score_sequences(boosting_tree_rebuilt, sentences_ids),
+        )
+        # tensors are updated in-place if spare capacity is enough
+        assert (boosting_tree.arcs_weights.data_ptr() == arcs_weights_ptr) == (spare_capacity > 0)
+
+    @pytest.mark.unit
+    def test_request_phrases(self):
+        """Test merging per-request phrases at decoding time"""
+        build_params = dict(vocab_size=10, final_eos_score=1.0, use_triton=False)
+        boosting_tree = GPUBoostingTreeModel.from_phrases(
+            phrases=["abc", "c"], token_ids=[[1, 2, 3], [3]], **build_params
+        )
+        request_boosting_tree = GPUBoostingTreeModel.from_phrases(
+            phrases=["xyz"], token_ids=[[7, 8, 9]], **build_params
+        )
+        sentences_ids = [[1, 2, 3, 7, 8, 9], [7, 8, 9, 3, 3, 0]]
+        expected_scores = self._score_sequences(boosting_tree, sentences_ids) + self._score_sequences(
+            request_boosting_tree, sentences_ids
+        )
+        with boosting_tree.request_phrases(phrases=["xyz"], token_ids=[[7, 8, 9]]):
+            scores = self._score_sequences(boosting_tree, sentences_ids)
+        assert torch.allclose(scores, expected_scores)
+
+    @pytest.mark.unit
+    def test_request_phrases_cuda_graphs_not_supported(self, monkeypatch):
+        """Test that request phrases are rejected after the tree is captured in CUDA graphs"""
+        boosting_tree = GPUBoostingTreeModel.from_phrases(
+            phrases=["abc", "c"], token_ids=[[1, 2, 3], [3]], vocab_size=10, use_triton=False
+        )
+        with monkeypatch.context() as m:
+            # emulate CUDA graphs capture
+            m.setattr(torch.cuda, "is_available", lambda: True)
+            m.setattr(torch.cuda, "is_current_stream_capturing", lambda: True)
+            boosting_tree.advance(boosting_tree.get_init_states(batch_size=2))
+        with pytest.raises(RuntimeError, match="CUDA graphs"):
+            with boosting_tree.request_phrases(phrases=["xyz"], token_ids=[[7, 8, 9]]):
+                pass
+
     @pytest.mark.unit
     # I need to test that the boosting tree model is built correctly from the config using model_path, key_phrases_file, key_phrases_list
     def test_boosting_tree_model_from_config(self, conformer_ctc_bpe_model, tmp_path):
@@ -0,0 +1,181 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import math
+import tarfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile
+
+SCRIPTS_DIR = Path(__file__).parents[3] / "scripts" / "speech_recognition"
+
+
+@pytest.fixture
+def convert_script(monkeypatch):
+    monkeypatch.syspath_prepend(str(SCRIPTS_DIR))
+    import convert_to_tarred_audio_dataset
+
+    return convert_to_tarred_audio_dataset
+
+
+@pytest.fixture
+def segmented_manifest(tmp_path) -> Path:
+    """
+    Two long recordings segmented into utterances, a recording with two distant segments,
+    and one recording used as a whole.
+    """
+    rng = np.random.default_rng(0)
+    sampling_rate = 16000
+    entries = []
+    for name, duration in (("rec_a", 6.0), ("rec_b", 4.5)):
+        path = tmp_path / f"{name}.wav"
+        audio = rng.uniform(-0.5, 0.5, int(duration * sampling_rate))
+        soundfile.write(path, audio, sampling_rate, subtype="PCM_16")
+        offset = 0.0
+        while offset + 0.5 < duration:
+            seg_duration = min(round(float(rng.uniform(0.3, 1.2)), 2), duration - offset)
+            entries.append(
+                {"audio_filepath": str(path), "duration": seg_duration, "offset": offset, "text": f"{name} {offset}"}
+            )
+            offset = round(offset + seg_duration + 0.1, 2)
+    path = tmp_path / "rec_d.wav"
+    soundfile.write(path, rng.uniform(-0.5, 0.5, 6 * sampling_rate), sampling_rate, subtype="PCM_16")
+    for offset in (0.5, 4.5):
+        entries.append({"audio_filepath": str(path), "duration": 0.8, "offset": offset, "text": f"rec_d {offset}"})
+    path = tmp_path / "rec_c.wav"
+    soundfile.write(path, rng.uniform(-0.5, 0.5, sampling_rate), sampling_rate, subtype="PCM_16")
+    entries.append({"audio_filepath": str(path), "duration": 1.0, "offset": 0, "text": "rec_c"})
+
+    manifest_path = tmp_path / "manifest.json"
+    with manifest_path.open("w") as f:
+        for entry in entries:
+            print(json.dumps(entry), file=f)
+    return manifest_path
+
+
+def _create_dataset(convert_script, manifest_path: Path, target_dir: Path, num_shards: int, **kwargs) -> None:
+    builder = convert_script.ASRTarredDatasetBuilder()
+    builder.configure(
+        convert_script.ASRTarredDatasetConfig(
+            num_shards=num_shards,
+            shuffle=True,
+            shuffle_seed=1,
+            sort_in_shards=False,
+            shard_manifests=False,
+            force_codec=kwargs.pop("force_codec", None),
+            slice_with_offset=True,
+        )
+    )
+    builder.create_new_dataset(
+        manifest_path=str(manifest_path), target_dir=str(target_dir), dynamic_buckets_num=2, **kwargs
+    )
+
+
+def _read_tarred_dataset(target_dir: Path, num_shards: int) -> tuple[list, list]:
+    tars = []
+    for shard_id in range(num_shards):
+        with tarfile.open(target_dir / f"audio_{shard_id}.tar") as tar:
+            tars.append([(member.name, tar.extractfile(member).read()) for member in tar])
+    manifest = (target_dir / "tarred_audio_manifest.json").read_text().splitlines()
+    return tars, manifest
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("force_codec", [None, "flac"])
+@pytest.mark.parametrize("segment_window", [3, 4096])
+def test_convert_to_tarred_audio_dataset_segment_aware_matches_plain(
+    tmp_path, convert_script, segmented_manifest, force_codec, segment_window
+):
+    num_shards = 2
+    outputs = []
+    for segment_aware in (False, True):
+        target_dir = tmp_path / f"tarred_{segment_aware}"
+        _create_dataset(
+            convert_script,
+            segmented_manifest,
+            target_dir,
+            num_shards,
+            force_codec=force_codec,
+            num_workers=2,
+            segment_aware=segment_aware,
+            num_tar_workers=2,
+            segment_window=segment_window,
+        )
+        outputs.append(_read_tarred_dataset(target_dir, num_shards))
+
+    (plain_tars, plain_manifest), (segment_aware_tars, segment_aware_manifest) = outputs
+    assert all(len(members) > 0 for members in plain_tars)
+    assert segment_aware_manifest == plain_manifest
+    assert segment_aware_tars == plain_tars
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("num_shards", [1, 5])
+@pytest.mark.parametrize("segment_window", [3, 4096])
+def test_convert_to_tarred_audio_dataset_segment_aware_decodes(
+    tmp_path, monkeypatch, convert_script, segmented_manifest, num_shards, segment_window
+):
+    # run the transcoding in threads to observe the decoding
+    monkeypatch.setattr(convert_script, "ProcessPoolExecutor", ThreadPoolExecutor)
+    num_decodes = Counter()
+    sound_file_read = soundfile.SoundFile.read
+
+    def _counting_read(self, *args, **kwargs):
+        num_decodes[Path(self.name).stem] += 1
+        return sound_file_read(self, *args, **kwargs)
+
+    monkeypatch.setattr(soundfile.SoundFile, "read", _counting_read)
+    num_open_tarballs, max_open_tarballs, lock = 0, 0, threading.Lock()
+    write_spooled_tarball = convert_script._write_spooled_tarball
+
+    def _counting_write_spooled_tarball(*args, **kwargs):
+        nonlocal num_open_tarballs, max_open_tarballs
+        with lock:
+            num_open_tarballs += 1
+            max_open_tarballs = max(max_open_tarballs, num_open_tarballs)
+        try:
+            return write_spooled_tarball(*args, **kwargs)
+        finally:
+            with lock:
+                num_open_tarballs -= 1
+
+    monkeypatch.setattr(convert_script, "_write_spooled_tarball", _counting_write_spooled_tarball)
+
+    target_dir = tmp_path / "tarred"
+    _create_dataset(
+        convert_script,
+        segmented_manifest,
+        target_dir,
+        num_shards,
+        num_workers=2,
+        segment_aware=True,
+        num_tar_workers=2,
+        segment_window=segment_window,
+    )
+
+    num_segments = Counter(
+        Path(json.loads(line)["audio_filepath"]).stem for line in segmented_manifest.read_text().splitlines()
+    )
+    # the segments of a recording are decoded together regardless of the shards, unless they do not fit
+    # into a window; distant segments are decoded separately
+    assert num_decodes == {
+        name: (2 if name == "rec_d" else math.ceil(count / segment_window)) for name, count in num_segments.items()
+    }
+    assert max_open_tarballs <= 2
+    assert sorted(path.name for path in target_dir.iterdir() if path.name.startswith(".")) == []
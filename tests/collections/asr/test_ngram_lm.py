@@ -29,6 +29,40 @@ if torch.cuda.is_available():
     DEVICES.append('cuda')
 
 
+def write_random_arpa(path: Path, vocab_size: int, order: int, num_sentences: int, token_offset: int = 100, seed=0):
+    """Write a random (not normalized) but consistent ARPA LM: all prefixes and suffixes of n-grams are present"""
+    rng = random.Random(seed)
+    ngrams = [set() for _ in range(order)]
+    for _ in range(num_sentences):
+        sentence = ["<s>"] + [chr(rng.randrange(vocab_size - 5) + token_offset) for _ in range(rng.randint(0, 12))]
+        sentence.append("</s>")
+        for n in range(1, order + 1):
+            for i in range(len(sentence) - n + 1):
+                ngrams[n - 1].add(tuple(sentence[i : i + n]))
+    ngrams[0].add(("<unk>",))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\\data\\\n")
+        for n in range(order):
+            f.write(f"ngram {n + 1}={len(ngrams[n])}\n")
+        for n in range(order):
+            f.write(f"\n\\{n + 1}-grams:\n")
+            for ngram in sorted(ngrams[n]):
+                weight = -99 if ngram == ("<s>",) else round(-rng.random() * 3, 6)
+                line = f"{weight}\t{' '.join(ngram)}"
+                if n + 1 < order and ngram[-1] != "</s>":
+                    line += f"\t{round(-rng.random(), 6)}"
+                f.write(line + "\n")
+        f.write("\n\\end\\\n")
+
+
+def assert_lm_equal(n_gpu_lm: NGramGPULanguageModel, n_gpu_lm_ref: NGramGPULanguageModel):
+    """Check that LM structure and weights are equal"""
+    state_dict_ref = n_gpu_lm_ref.state_dict()
+    for name, value in n_gpu_lm.state_dict().items():
+        assert value.shape == state_dict_ref[name].shape, name
+        assert (value == state_dict_ref[name]).all(), name
+
+
 @pytest.fixture(scope="module")
 def n_gpu_lm(test_data_dir):
     kenlm_model_path = Path(test_data_dir) / "asr/kenlm_ngram_lm/parakeet-tdt_ctc-110m-libri-1024.kenlm.tmp.arpa"
@@ -207,3 +241,64 @@ class TestNGramGPULanguageModel:
         assert (n_gpu_lm_loaded.backoff_to_states == n_gpu_lm.backoff_to_states).all()
         assert torch.allclose(n_gpu_lm_loaded.backoff_weights, n_gpu_lm.backoff_weights)
         assert torch.allclose(n_gpu_lm_loaded.final_weights, n_gpu_lm.final_weights)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("order", [2, 3, 5])
+    @pytest.mark.parametrize("num_workers", [1, 2])
+    def test_fast_compile_vs_reference(self, tmp_path, order: int, num_workers: int):
+        vocab_size = 64
+        arpa_path = tmp_path / "random.arpa"
+        write_random_arpa(arpa_path, vocab_size=vocab_size, order=order, num_sentences=200, seed=order)
+        n_gpu_lm_ref = NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size, fast_compile=False)
+        n_gpu_lm = NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size, num_workers=num_workers)
+        assert n_gpu_lm.num_states == n_gpu_lm_ref.num_states
+        assert n_gpu_lm.num_arcs == n_gpu_lm_ref.num_arcs
+        assert_lm_equal(n_gpu_lm, n_gpu_lm_ref)
+
+    @pytest.mark.unit
+    def test_fast_compile_invalid_arpa(self, tmp_path):
+        vocab_size = 64
+        arpa_path = tmp_path / "random.arpa"
+        write_random_arpa(arpa_path, vocab_size=vocab_size, order=3, num_sentences=10)
+        lines = arpa_path.read_text(encoding="utf-8").splitlines()
+        # remove the first bigram: context or suffix for some trigrams is missing
+        lines.pop(lines.index("\\2-grams:") + 1)
+        num_bigrams = int(lines[2].split("=")[1])
+        lines[2] = f"ngram 2={num_bigrams - 1}"
+        arpa_path.write_text("\n".join(lines), encoding="utf-8")
+        with pytest.raises(ValueError, match="not found"):
+            NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("device", DEVICES)
+    def test_save_load_binary(self, tmp_path, device: torch.device):
+        vocab_size = 64
+        arpa_path = tmp_path / "random.arpa"
+        write_random_arpa(arpa_path, vocab_size=vocab_size, order=4, num_sentences=200)
+        n_gpu_lm = NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size, normalize_unk=False)
+        binary_path = tmp_path / "ngram_lm.bin"
+        n_gpu_lm.save_binary(binary_path)
+        n_gpu_lm_loaded = NGramGPULanguageModel.from_file(binary_path, vocab_size=vocab_size)
+        assert_lm_equal(n_gpu_lm_loaded, n_gpu_lm)
+
+        n_gpu_lm = n_gpu_lm.to(device)
+        n_gpu_lm_loaded = n_gpu_lm_loaded.to(device)
+        labels = torch.randint(0, vocab_size, [3, 10], device=device)
+        assert torch.allclose(n_gpu_lm_loaded(labels=labels, eos=True), n_gpu_lm(labels=labels, eos=True))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("device", DEVICES)
+    @pytest.mark.parametrize("eos_id", [None, 3])
+    def test_advance_sparse_vs_full(self, tmp_path, device: torch.device, eos_id):
+        vocab_size = 64
+        arpa_path = tmp_path / "random.arpa"
+        write_random_arpa(arpa_path, vocab_size=vocab_size, order=4, num_sentences=300)
+        n_gpu_lm = NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size).to(device)
+        torch.manual_seed(777)
+        states = torch.randint(0, n_gpu_lm.num_states, [20], device=device)
+        labels = torch.randint(0, vocab_size, [20, 5], device=device)
+        with torch.no_grad():
+            scores, next_states = n_gpu_lm.advance(states=states, eos_id=eos_id)
+            scores_sparse, next_states_sparse = n_gpu_lm.advance_sparse(states=states, labels=labels, eos_id=eos_id)
+        assert (next_states_sparse == next_states.gather(dim=1, index=labels)).all()
+        assert torch.allclose(scores_sparse, scores.gather(dim=1, index=labels))
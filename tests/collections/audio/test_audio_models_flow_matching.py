@@ -259,6 +259,27 @@ def test_flow_matching_model_forward(flow_matching_model, batch_size, sample_len
     assert torch.all(input_signal_length == output_length_batch), "Input and output lengths must match"
 
 
+@pytest.mark.parametrize("p_cond", [0, 1.0])
+@pytest.mark.parametrize("solver", ["ddim", "heun", "dpm2m"])
+def test_flow_matching_model_forward_few_step(flow_matching_model, solver, p_cond):
+    model = flow_matching_model.eval()
+    model.p_cond = p_cond
+
+    sampling_rate = model.sample_rate
+    rng = torch.Generator()
+    rng.manual_seed(0)
+    input_signal = torch.randn(size=(3, 1, 2 * sampling_rate), generator=rng)
+    input_signal_length = torch.LongTensor([2 * sampling_rate, sampling_rate, 50 * 128])
+
+    output_batch, output_length_batch = model.forward_few_step(
+        input_signal=input_signal, input_length=input_signal_length, num_steps=[2, 1, 3], solver=solver
+    )
+
+    assert input_signal.shape == output_batch.shape, "Input and output batch shapes must match"
+    assert torch.all(input_signal_length == output_length_batch), "Input and output lengths must match"
+    assert torch.all(torch.isfinite(output_batch))
+
+
 def test_flow_matching_model_step(flow_matching_model_with_trainer_and_mock_dataset):
     model, _ = flow_matching_model_with_trainer_and_mock_dataset
     model = model.train()
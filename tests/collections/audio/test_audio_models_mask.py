@@ -318,6 +318,46 @@ class TestMaskModelRNN:
         diff = torch.max(torch.abs(output_instance - output_batch))
         assert diff <= abs_tol
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("window_length, window_overlap", [(1.0, 0.25), (0.7, 0.3), (10.0, 0.5)])
+    def test_process_overlap_add(self, mask_model_rnn, tmp_path, window_length, window_overlap):
+        """Test long-form processing with windowed overlap-add."""
+        model = mask_model_rnn.eval()
+        rng = np.random.default_rng(0)
+        audio_files = []
+        for i, (num_samples, sample_rate) in enumerate([(16000 * 3 + 123, 16000), (5000, 16000), (8000 + 7, 8000)]):
+            audio_file = str(tmp_path / f"input_{i}.wav")
+            sf.write(audio_file, rng.uniform(-0.5, 0.5, (num_samples, 2)), sample_rate, subtype='FLOAT')
+            audio_files.append(audio_file)
+
+        processed_files = model.process(
+            audio_files,
+            output_dir=str(tmp_path / "output"),
+            batch_size=3,
+            input_channel_selector=0,
+            window_length=window_length,
+            window_overlap=window_overlap,
+            num_writer_workers=2,
+        )
+        for audio_file, processed_file in zip(audio_files, processed_files):
+            input_info, output_info = sf.info(audio_file), sf.info(processed_file)
+            assert output_info.samplerate == model.sample_rate
+            assert output_info.frames == int(np.ceil(input_info.frames * model.sample_rate / input_info.samplerate))
+
+        # With a pointwise model, the overlap-add reconstruction must be exact
+        model.forward = lambda input_signal, input_length: (2 * input_signal, input_length)
+        processed_files = model.process(
+            audio_files[:2],
+            output_dir=str(tmp_path / "output_pointwise"),
+            batch_size=4,
+            window_length=window_length,
+            window_overlap=window_overlap,
+        )
+        for audio_file, processed_file in zip(audio_files, processed_files):
+            input_signal, _ = sf.read(audio_file, always_2d=True)
+            output_signal, _ = sf.read(processed_file, always_2d=True)
+            assert np.allclose(output_signal, 2 * input_signal, atol=1e-6)
+
     def test_training_step(self, mask_model_rnn_with_trainer_and_mock_dataset):
         model, _ = mask_model_rnn_with_trainer_and_mock_dataset
         model = model.train()
@@ -259,6 +259,25 @@ class TestSchroedingerBridgeModelNCSN:
         assert output_instance.shape == output_batch.shape
         assert output_length_instance.shape == output_length_batch.shape
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("solver", ["ddim", "heun", "dpm2m"])
+    def test_forward_few_step(self, schroedinger_bridge_model_ncsn, solver):
+        """Test few-step inference with a different number of steps for each example."""
+        model = schroedinger_bridge_model_ncsn.eval()
+        sampling_rate = model.sample_rate
+        rng = torch.Generator()
+        rng.manual_seed(0)
+        input_signal = torch.randn(size=(3, 1, 2 * sampling_rate), generator=rng)
+        input_signal_length = torch.LongTensor([2 * sampling_rate, sampling_rate, 50 * 128])
+
+        output_batch, output_length_batch = model.forward_few_step(
+            input_signal=input_signal, input_length=input_signal_length, num_steps=[2, 1, 3], solver=solver
+        )
+
+        assert input_signal.shape == output_batch.shape
+        assert torch.all(input_signal_length == output_length_batch)
+        assert torch.all(torch.isfinite(output_batch))
+
     def test_training_step(self, schroedinger_bridge_model_ncsn_with_trainer_and_mock_dataset):
         model, _ = schroedinger_bridge_model_ncsn_with_trainer_and_mock_dataset
         model = model.train()
@@ -0,0 +1,210 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import torch
+
+from nemo.collections.audio.parts.submodules.diffusion import OrnsteinUhlenbeckVarianceExplodingSDE
+from nemo.collections.audio.parts.submodules.flow import ConditionalFlowMatchingEulerSampler, OptimalTransportFlow
+from nemo.collections.audio.parts.submodules.ncsnpp import SpectrogramNoiseConditionalScoreNetworkPlusPlus
+from nemo.collections.audio.parts.submodules.ode_sampler import (
+    FewStepODESampler,
+    FlowMatchingODEProcess,
+    SchroedingerBridgeODEProcess,
+    ScoreBasedODEProcess,
+)
+from nemo.collections.audio.parts.submodules.schroedinger_bridge import SBNoiseScheduleVE
+from nemo.collections.audio.parts.submodules.transformerunet import SpectrogramTransformerUNet
+
+B, D, T = 3, 64, 40
+
+
+def get_estimator(name):
+    with torch.random.fork_rng():
+        torch.random.manual_seed(0)
+        if name == 'transformerunet':
+            estimator = SpectrogramTransformerUNet(
+                in_channels=2,
+                out_channels=1,
+                freq_dim=D,
+                dim=32,
+                depth=2,
+                heads=2,
+                ff_mult=2,
+                time_hidden_dim=64,
+                conv_pos_embed_kernel_size=3,
+            )
+        elif name == 'ncsnpp':
+            estimator = SpectrogramNoiseConditionalScoreNetworkPlusPlus(
+                in_channels=2,
+                out_channels=1,
+                conditioned_on_time=True,
+                channels=[8, 8, 8, 8],
+                num_res_blocks=1,
+                num_resolutions=3,
+                pad_time_to=16,
+                pad_dimension_to=0,
+            )
+            # randomize weights, since the default initialization of the output projection is zero
+            with torch.no_grad():
+                for param in estimator.parameters():
+                    param.normal_(0, 0.05)
+        else:
+            raise ValueError(f'Unexpected estimator: {name}')
+    return estimator.eval()
+
+
+def get_process(name):
+    if name == 'flow':
+        return FlowMatchingODEProcess(flow=OptimalTransportFlow(), time_min=1e-8, time_max=1.0)
+    elif name == 'score':
+        return ScoreBasedODEProcess(
+            sde=OrnsteinUhlenbeckVarianceExplodingSDE(stiffness=1.5, std_min=0.05, std_max=0.5)
+        )
+    elif name == 'schroedinger_bridge':
+        return SchroedingerBridgeODEProcess(noise_schedule=SBNoiseScheduleVE(k=2.6, c=0.4, time_min=1e-4))
+    raise ValueError(f'Unexpected process: {name}')
+
+
+def get_inputs(seed=0):
+    rng = torch.Generator()
+    rng.manual_seed(seed)
+    prior_mean = torch.randn(B, 1, D, T, dtype=torch.cfloat, generator=rng)
+    initial_state = torch.randn(B, 1, D, T, dtype=torch.cfloat, generator=rng)
+    length = torch.LongTensor([T, T - 7, T // 2])
+    return prior_mean, initial_state, length
+
+
+@pytest.mark.parametrize('estimator_name', ['transformerunet', 'ncsnpp'])
+def test_condition_cache(estimator_name):
+    """Cached conditioning should match concatenation of the conditioning to the input."""
+    estimator = get_estimator(estimator_name)
+    condition, state, length = get_inputs()
+    time = torch.rand(B) + 0.1
+
+    with torch.no_grad():
+        ref, ref_length = estimator(input=torch.cat([state, condition], dim=1), input_length=length, condition=time)
+        cache = estimator.cache_input_condition(input_condition=condition)
+        out, out_length = estimator.forward_cached(
+            input=state, input_condition_cache=cache, input_length=length, condition=time
+        )
+
+    assert torch.allclose(out, ref, atol=1e-5)
+    assert torch.equal(out_length, ref_length)
+
+
+def test_flow_matches_euler_sampler():
+    """For a rectified flow, the first-order solver is equivalent to the Euler sampler."""
+    estimator = get_estimator('transformerunet')
+    flow = OptimalTransportFlow(sigma_start=1.0, sigma_end=0.0)
+    prior_mean, initial_state, length = get_inputs()
+    num_steps = 5
+
+    euler_sampler = ConditionalFlowMatchingEulerSampler(estimator=estimator, num_steps=num_steps)
+    ref, _ = euler_sampler(state=initial_state, estimator_condition=prior_mean, state_length=length)
+
+    process = FlowMatchingODEProcess(flow=flow, time_min=1e-8, time_max=1.0)
+    process.initial_state = lambda prior_mean: initial_state
+    sampler = FewStepODESampler(estimator=estimator, process=process, num_steps=num_steps, solver='ddim')
+    out, _ = sampler(prior_mean=prior_mean, estimator_condition=prior_mean, state_length=length)
+
+    assert torch.allclose(out, ref, atol=1e-5)
+
+
+@pytest.mark.parametrize('solver', FewStepODESampler.SOLVERS)
+@pytest.mark.parametrize('num_steps', [1, 3])
+def test_nfe(solver, num_steps):
+    """Check the number of estimator evaluations for each solver."""
+
+    class StateEstimator(torch.nn.Module):
+        def forward(self, input, input_length, condition):
+            # drop the conditioning channel
+            return input[:, :1], input_length
+
+    estimator = StateEstimator()
+    counter = []
+    estimator.register_forward_hook(lambda *args: counter.append(1))
+    prior_mean, _, length = get_inputs()
+
+    sampler = FewStepODESampler(estimator=estimator, process=get_process('flow'), num_steps=num_steps, solver=solver)
+    sampler(prior_mean=prior_mean, estimator_condition=prior_mean, state_length=length)
+
+    expected_nfe = 2 * num_steps if solver == 'heun' else num_steps
+    assert len(counter) == expected_nfe
+
+
+@pytest.mark.parametrize('solver', FewStepODESampler.SOLVERS)
+@pytest.mark.parametrize('process_name', ['flow', 'score', 'schroedinger_bridge'])
+def test_per_example_num_steps(solver, process_name):
+    """Batch with a different number of steps for each example should match processing examples one by one."""
+    estimator = get_estimator('ncsnpp' if process_name != 'flow' else 'transformerunet')
+    process = get_process(process_name)
+    prior_mean, _, length = get_inputs()
+    initial_state = process.initial_state(prior_mean)
+    num_steps = [3, 1, 5]
+
+    sampler = FewStepODESampler(estimator=estimator, process=process, solver=solver)
+
+    process.initial_state = lambda prior_mean: initial_state
+    batch_output, batch_length = sampler(
+        prior_mean=prior_mean, estimator_condition=prior_mean, state_length=length, num_steps=num_steps
+    )
+    assert torch.equal(batch_length, length)
+    assert torch.all(torch.isfinite(torch.view_as_real(batch_output)))
+
+    for b in range(B):
+        process.initial_state = lambda prior_mean: initial_state[b : b + 1]
+        output, _ = sampler(
+            prior_mean=prior_mean[b : b + 1],
+            estimator_condition=prior_mean[b : b + 1],
+            state_length=length[b : b + 1],
+            num_steps=num_steps[b],
+        )
+        assert torch.allclose(batch_output[b : b + 1], output, atol=1e-5)
+
+
+@pytest.mark.parametrize('process_name', ['flow', 'score'])
+def test_second_order_solvers(process_name):
+    """Second-order solvers should be closer to the reference solution than the first-order solver."""
+    estimator = get_estimator('ncsnpp' if process_name != 'flow' else 'transformerunet')
+    process = get_process(process_name)
+    prior_mean, _, length = get_inputs()
+    initial_state = process.initial_state(prior_mean)
+    process.initial_state = lambda prior_mean: initial_state
+
+    def solve(solver, num_steps):
+        sampler = FewStepODESampler(estimator=estimator, process=process, num_steps=num_steps, solver=solver)
+        output, _ = sampler(prior_mean=prior_mean, estimator_condition=prior_mean, state_length=length)
+        return output
+
+    ref = solve('ddim', num_steps=200)
+    error = {solver: (solve(solver, num_steps=8) - ref).abs().mean() for solver in FewStepODESampler.SOLVERS}
+
+    assert error['heun'] < error['ddim']
+    assert error['dpm2m'] < error['ddim']
+
+
+def test_invalid_arguments():
+    estimator = get_estimator('transformerunet')
+    process = get_process('flow')
+
+    with pytest.raises(ValueError):
+        FewStepODESampler(estimator=estimator, process=process, solver='rk4')
+
+    with pytest.raises(ValueError):
+        FewStepODESampler(estimator=estimator, process=process, num_steps=0)
+
+    prior_mean, _, length = get_inputs()
+    sampler = FewStepODESampler(estimator=estimator, process=process)
+    with pytest.raises(ValueError):
+        sampler(prior_mean=prior_mean, state_length=length, num_steps=[1, 2])
@@ -0,0 +1,150 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+
+from nemo.collections.common.tokenizers.aggregate_tokenizer import AggregateTokenizer, TokenizerWrapper
+from nemo.collections.common.tokenizers.canary_tokenizer import CanaryTokenizer
+from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer, create_spt_model
+
+TEXTS = {
+    "en": "the quick brown fox jumps over the lazy dog\nhello world\n",
+    "es": "el rapido zorro marron salta sobre el perro perezoso\nhola mundo\n",
+}
+
+
+@pytest.fixture(scope="module")
+def aggregate_tokenizer(tmp_path_factory):
+    tokenizers = {}
+    for lang, text in TEXTS.items():
+        tmpdir = tmp_path_factory.mktemp(f"{lang}_tokenizer")
+        text_path = tmpdir / "text.txt"
+        text_path.write_text(text)
+        create_spt_model(str(text_path), vocab_size=32, sample_size=-1, do_lower_case=False, output_dir=str(tmpdir))
+        tokenizers[lang] = SentencePieceTokenizer(str(tmpdir / "tokenizer.model"))
+    return AggregateTokenizer(tokenizers)
+
+
+@pytest.fixture(scope="module")
+def canary_tokenizer(aggregate_tokenizer, tmp_path_factory):
+    tmpdir = tmp_path_factory.mktemp("spl_tokens")
+    spl_tokens = CanaryTokenizer.build_special_tokenizer(["transcribe", "en", "es", "0", "3", "5"], tmpdir)
+    return CanaryTokenizer(tokenizers={"spl_tokens": spl_tokens, **aggregate_tokenizer.tokenizers_dict})
+
+
+def reference_ids_to_tokens(tokenizer: AggregateTokenizer, ids):
+    # per-token sub-tokenizer lookup, as done before the lookup tables were introduced
+    tokens = []
+    for id in ids:
+        sub_tokenizer = tokenizer.tokenizers_by_token_id[id]
+        tokens.extend(sub_tokenizer.ids_to_tokens([tokenizer.offset_token_ids_by_token_id[id]]))
+    return tokens
+
+
+def mixed_ids(tokenizer: AggregateTokenizer):
+    return (
+        tokenizer.text_to_ids("hello world", "en")
+        + tokenizer.text_to_ids("hola mundo", "es")
+        + tokenizer.text_to_ids("the lazy dog", "en")
+    )
+
+
+class TestAggregateTokenizer:
+    @pytest.mark.unit
+    def test_ids_to_tokens_and_text(self, aggregate_tokenizer):
+        ids = mixed_ids(aggregate_tokenizer)
+        tokens = reference_ids_to_tokens(aggregate_tokenizer, ids)
+        assert aggregate_tokenizer.ids_to_tokens(ids) == tokens
+        assert aggregate_tokenizer.ids_to_text(ids) == ''.join(tokens).replace('▁', ' ')
+        assert aggregate_tokenizer.ids_to_text(torch.tensor(ids)) == aggregate_tokenizer.ids_to_text(ids)
+        assert aggregate_tokenizer.ids_to_text([]) == ''
+
+    @pytest.mark.unit
+    def test_ids_to_text_and_langs(self, aggregate_tokenizer):
+        en_ids = aggregate_tokenizer.text_to_ids("hello", "en")
+        es_ids = aggregate_tokenizer.text_to_ids("hola", "es")
+        text_and_langs = aggregate_tokenizer.ids_to_text_and_langs(en_ids + es_ids)
+        assert [x['lang'] for x in text_and_langs] == ['en'] * len(en_ids) + ['es'] * len(es_ids)
+        tokens = reference_ids_to_tokens(aggregate_tokenizer, en_ids + es_ids)
+        assert [x['char'] for x in text_and_langs] == [t.replace('▁', ' ').strip() for t in tokens]
+
+    @pytest.mark.unit
+    def test_ids_to_words_and_langs(self, aggregate_tokenizer):
+        words_and_langs = aggregate_tokenizer.ids_to_words_and_langs(mixed_ids(aggregate_tokenizer))
+        assert words_and_langs == [
+            {'word': 'hello', 'lang': 'en'},
+            {'word': 'world', 'lang': 'en'},
+            {'word': 'hola', 'lang': 'es'},
+            {'word': 'mundo', 'lang': 'es'},
+            {'word': 'the', 'lang': 'en'},
+            {'word': 'lazy', 'lang': 'en'},
+            {'word': 'dog', 'lang': 'en'},
+        ]
+        assert aggregate_tokenizer.ids_to_words_and_langs([]) == []
+
+    @pytest.mark.unit
+    def test_ids_to_lang(self, aggregate_tokenizer):
+        en_ids = aggregate_tokenizer.text_to_ids("the lazy dog", "en")
+        es_ids = aggregate_tokenizer.text_to_ids("el", "es")
+        assert aggregate_tokenizer.ids_to_lang(en_ids + es_ids) == 'en'
+        assert aggregate_tokenizer.ids_to_lang(es_ids + en_ids) == 'en'
+        # on ties, the language that appears first wins
+        assert aggregate_tokenizer.ids_to_lang([en_ids[0], es_ids[0]]) == 'en'
+        assert aggregate_tokenizer.ids_to_lang([es_ids[0], en_ids[0]]) == 'es'
+        assert aggregate_tokenizer.ids_to_lang([]) == ''
+
+    @pytest.mark.unit
+    def test_batch_ids_to_text(self, aggregate_tokenizer):
+        sequences = [
+            aggregate_tokenizer.text_to_ids("hello world", "en"),
+            aggregate_tokenizer.text_to_ids("hola mundo", "es"),
+            mixed_ids(aggregate_tokenizer),
+            [],
+        ]
+        expected = [aggregate_tokenizer.ids_to_text(seq) for seq in sequences]
+        assert aggregate_tokenizer.batch_ids_to_text(sequences) == expected
+
+        max_len = max(len(seq) for seq in sequences)
+        padded = torch.zeros(len(sequences), max_len, dtype=torch.long)
+        for i, seq in enumerate(sequences):
+            padded[i, : len(seq)] = torch.tensor(seq, dtype=torch.long)
+        lengths = torch.tensor([len(seq) for seq in sequences])
+        assert aggregate_tokenizer.batch_ids_to_text(padded, lengths) == expected
+        assert aggregate_tokenizer.batch_ids_to_text(padded[:1, : lengths[0]]) == expected[:1]
+
+    @pytest.mark.unit
+    def test_batch_text_to_ids(self, aggregate_tokenizer):
+        texts = ["hello world", "hola mundo", "the lazy dog", ""]
+        langs = ["en", "es", "en", "es"]
+        expected = [aggregate_tokenizer.text_to_ids(text, lang) for text, lang in zip(texts, langs)]
+        assert aggregate_tokenizer.batch_text_to_ids(texts, langs) == expected
+        assert aggregate_tokenizer.batch_text_to_ids(texts, "en") == [
+            aggregate_tokenizer.text_to_ids(text, "en") for text in texts
+        ]
+        assert TokenizerWrapper(aggregate_tokenizer).batch(texts, langs) == expected
+        with pytest.raises(ValueError):
+            aggregate_tokenizer.batch_text_to_ids(texts, langs[:2])
+
+    @pytest.mark.unit
+    def test_canary_batch_text_to_ids(self, canary_tokenizer):
+        texts = [
+            "hello world",
+            "hola mundo<|endoftext|>",
+            "<|startoftranscript|><|en|><|transcribe|><|en|>",
+            "<|0|> hello <|3|> world <|5|>",
+        ]
+        langs = ["en", "es", "spl_tokens", "en"]
+        expected = [canary_tokenizer.text_to_ids(text, lang) for text, lang in zip(texts, langs)]
+        assert canary_tokenizer.batch_text_to_ids(texts, langs) == expected
@@ -0,0 +1,161 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from copy import deepcopy
+
+import torch
+
+from nemo.collections.common.data.lhotse.adaptive_batch_size import (
+    AdaptiveBatchSizeController,
+    AdaptiveBucketBatchSizes,
+)
+from nemo.collections.common.data.lhotse.sampling import FixedBucketBatchSizeConstraint2D
+
+GB = 1024**3
+
+
+def run_steps(controller, bucket_idx, num_steps, static_memory=10 * GB, memory_per_example=1 * GB, time_fn=None):
+    for _ in range(num_steps):
+        batch_size = controller.batch_sizes[bucket_idx]
+        controller.observe(
+            bucket_idx,
+            num_examples=batch_size,
+            peak_memory=static_memory + memory_per_example * batch_size,
+            static_memory=static_memory,
+            step_time=time_fn(batch_size) if time_fn is not None else 0.1 + 0.01 * batch_size,
+        )
+
+
+def test_adaptive_bucket_batch_sizes_shared_by_constraint_copies():
+    batch_sizes = AdaptiveBucketBatchSizes([4, 2])
+    constraint = FixedBucketBatchSizeConstraint2D(max_seq_len_buckets=[5.0, 10.0], batch_sizes=batch_sizes)
+    constraint_copy = deepcopy(constraint)
+    batch_sizes.set(0, 8)
+    assert constraint_copy.batch_sizes[0] == 8
+    assert constraint_copy.batch_sizes.tolist() == [8, 2]
+
+
+def test_adaptive_bucket_batch_sizes_batch_log():
+    batch_sizes = AdaptiveBucketBatchSizes([4, 2], batch_log_size=4)
+    batch_sizes.start_iteration()
+    assert batch_sizes.pop_batch_info() is None
+    batch_sizes.record_batch(1, 2)
+    batch_sizes.record_batch(0, 3)
+    assert batch_sizes.pop_batch_info() == (1, 2)
+    assert batch_sizes.pop_batch_info() == (0, 3)
+    assert batch_sizes.pop_batch_info() is None
+    # the oldest entries have been overwritten
+    for num_examples in range(1, 7):
+        batch_sizes.record_batch(0, num_examples)
+    assert batch_sizes.pop_batch_info() == (0, 3)
+
+
+def test_adaptive_bucket_batch_sizes_batch_log_skips_previous_iterators():
+    batch_sizes = AdaptiveBucketBatchSizes([4, 2])
+    batch_sizes.start_iteration()
+    batch_sizes.record_batch(0, 4)
+    batch_sizes.record_batch(1, 2)
+    assert batch_sizes.pop_batch_info() == (0, 4)
+    # the second mini-batch was prefetched, but a new iterator was created before it was consumed
+    batch_sizes.start_iteration()
+    batch_sizes.record_batch(1, 1)
+    assert batch_sizes.pop_batch_info() == (1, 1)
+
+
+def test_adaptive_batch_size_controller_grows_up_to_memory_budget():
+    batch_sizes = AdaptiveBucketBatchSizes([4, 2])
+    controller = AdaptiveBatchSizeController(
+        batch_sizes, memory_budget=30 * GB, update_interval=2, max_batch_size_factor=10.0
+    )
+    run_steps(controller, bucket_idx=0, num_steps=40)
+    # (30 GB budget - 10 GB static memory) / 1 GB per example
+    assert batch_sizes[0] == 20
+    # other buckets are unaffected
+    assert batch_sizes[1] == 2
+
+
+def test_adaptive_batch_size_controller_max_batch_size_factor():
+    batch_sizes = AdaptiveBucketBatchSizes([4])
+    controller = AdaptiveBatchSizeController(batch_sizes, memory_budget=100 * GB, update_interval=2)
+    run_steps(controller, bucket_idx=0, num_steps=40)
+    assert batch_sizes[0] == 16
+
+
+def test_adaptive_batch_size_controller_stops_growing_without_speedup():
+    batch_sizes = AdaptiveBucketBatchSizes([4])
+    controller = AdaptiveBatchSizeController(batch_sizes, memory_budget=100 * GB, update_interval=2)
+    # throughput doesn't improve above 6 examples per step
+    run_steps(controller, bucket_idx=0, num_steps=40, time_fn=lambda bs: 1.0 if bs <= 6 else bs / 6)
+    assert batch_sizes[0] == 6
+
+
+def test_adaptive_batch_size_controller_shrinks_when_exceeding_memory_budget():
+    batch_sizes = AdaptiveBucketBatchSizes([16])
+    controller = AdaptiveBatchSizeController(batch_sizes, memory_budget=20 * GB, update_interval=2)
+    run_steps(controller, bucket_idx=0, num_steps=1)
+    assert batch_sizes[0] == 10
+    # the batch size is not increased again
+    run_steps(controller, bucket_idx=0, num_steps=20)
+    assert batch_sizes[0] == 10
+
+
+def test_adaptive_batch_size_controller_state_dict():
+    controller = AdaptiveBatchSizeController(
+        AdaptiveBucketBatchSizes([4, 2]), memory_budget=30 * GB, update_interval=2
+    )
+    run_steps(controller, bucket_idx=0, num_steps=5)
+    state = controller.state_dict()
+
+    restored = AdaptiveBatchSizeController(AdaptiveBucketBatchSizes([4, 2]), memory_budget=30 * GB, update_interval=2)
+    restored.load_state_dict(state)
+    assert restored.batch_sizes.tolist() == controller.batch_sizes.tolist()
+    assert restored.state_dict() == state
+
+    run_steps(controller, bucket_idx=0, num_steps=7)
+    run_steps(restored, bucket_idx=0, num_steps=7)
+    assert restored.batch_sizes.tolist() == controller.batch_sizes.tolist()
+
+
+def _run_rank(rank: int, world_size: int, init_file: str, results_dir: str):
+    torch.distributed.init_process_group("gloo", init_method=f"file://{init_file}", rank=rank, world_size=world_size)
+    try:
+        batch_sizes = AdaptiveBucketBatchSizes([4, 4])
+        controller = AdaptiveBatchSizeController(
+            batch_sizes, memory_budget=30 * GB, update_interval=2, max_batch_size_factor=10.0
+        )
+        for step in range(40):
+            # The ranks see different buckets at the same step, and rank 1 uses more memory per example.
+            # The log of rank 1 sometimes misses the mini-batch.
+            bucket_idx = (step + rank) % 2
+            batch_size = batch_sizes[bucket_idx]
+            batch_info = None if rank == 1 and step % 5 == 0 else (bucket_idx, batch_size)
+            controller.observe_all_ranks(
+                batch_info,
+                peak_memory=10 * GB + (1 + rank) * GB * batch_size,
+                static_memory=10 * GB,
+                step_time=0.1 + 0.01 * batch_size,
+            )
+        torch.save(controller.state_dict(), f"{results_dir}/{rank}.pt")
+    finally:
+        torch.distributed.destroy_process_group()
+
+
+def test_adaptive_batch_size_controller_keeps_ranks_in_sync(tmp_path):
+    world_size = 2
+    torch.multiprocessing.spawn(
+        _run_rank, args=(world_size, str(tmp_path / "init"), str(tmp_path)), nprocs=world_size, join=True
+    )
+    states = [torch.load(tmp_path / f"{rank}.pt") for rank in range(world_size)]
+    assert states[0] == states[1]
+    # (30 GB budget - 10 GB static memory) / 2 GB per example on rank 1
+    assert states[0]["batch_sizes"] == [10, 10]
@@ -2135,6 +2135,68 @@ def test_dataloader_bucket_batch_size(nemo_tarred_manifest_path_multi: tuple[str
         assert len(b) == 2
 
 
+@pytest.fixture(scope="session")
+def two_bucket_cutset_path(tmp_path_factory) -> Path:
+    """40 utterances without audio data, alternating between 1s and 3s durations."""
+    from lhotse.testing.dummies import dummy_cut
+
+    cuts = CutSet([dummy_cut(i, duration=1.0 if i % 2 == 0 else 3.0) for i in range(40)])
+    p = tmp_path_factory.mktemp("two_bucket_data") / "cuts.jsonl.gz"
+    cuts.to_file(p)
+    return p
+
+
+@pytest.mark.parametrize("force_iterable_dataset", [False, True])
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_dataloader_adaptive_bucket_batch_size(two_bucket_cutset_path: Path, force_iterable_dataset, num_workers):
+    config = OmegaConf.create(
+        {
+            "cuts_path": str(two_bucket_cutset_path),
+            "force_iterable_dataset": force_iterable_dataset,
+            "shuffle": True,
+            "use_lhotse": True,
+            "num_workers": num_workers,
+            # lhotse specific
+            "use_bucketing": True,
+            "concurrent_bucketing": False,
+            # Note: 1s cuts belong to the first bucket and 3s cuts to the second bucket.
+            "bucket_duration_bins": [2.0, 4.0],
+            "bucket_batch_size": [3, 2],
+            "adaptive_bucket_batch_size": True,
+            "drop_last": False,
+            "shuffle_buffer_size": 10,
+            "bucket_buffer_size": 100,
+            "seed": 0,
+            "shard_seed": 0,
+        }
+    )
+
+    dl = get_lhotse_dataloader_from_config(config=config, global_rank=0, world_size=1, dataset=Identity())
+    sampler = dl.dataset.sampler if force_iterable_dataset else dl.sampler
+    batch_sizes = sampler.constraint.batch_sizes
+    assert batch_sizes.tolist() == [3, 2]
+
+    def check_batch(b):
+        bucket_idx = 0 if b[0].duration < 2.0 else 1
+        assert all((c.duration < 2.0) == (bucket_idx == 0) for c in b)
+        # The sampler logs the bucket and size of each mini-batch in the order of consumption.
+        assert batch_sizes.pop_batch_info() == (bucket_idx, len(b))
+        return bucket_idx, len(b)
+
+    # A partially consumed iterator: the mini-batches prefetched for it are never consumed.
+    for b in islice(dl, 3):
+        check_batch(b)
+
+    seen = [check_batch(b) for b in dl]
+    assert {bucket_idx for bucket_idx, _ in seen} == {0, 1}
+
+    # The update is visible in the dataloading workers.
+    batch_sizes.set(0, 4)
+    seen = [check_batch(b) for b in dl]
+    assert (0, 4) in seen
+    assert all(num_examples <= (4 if bucket_idx == 0 else 2) for bucket_idx, num_examples in seen)
+
+
 def test_dataloader_2d_bucketing(nemo_tarred_manifest_path_multi: tuple[str, str], en_es_tokenizer):
     json_mft, tar_mft = nemo_tarred_manifest_path_multi
     config = OmegaConf.create(
@@ -118,6 +118,20 @@ class TestSentencePieceTokenizerLegacy:
         for i in range(len(result)):
             assert result[i] == tokens[i]
 
+    @pytest.mark.unit
+    def test_batch_text_to_ids(self, test_data_dir):
+        tokenizer = SentencePieceTokenizer(test_data_dir + self.model_name, legacy=True)
+        special_tokens = MODEL_SPECIAL_TOKENS
+        tokenizer.add_special_tokens(special_tokens)
+
+        texts = [
+            "[CLS] a b c [MASK] e f [SEP] g h i [SEP]",
+            "a b c",
+            "[SEP][SEP] a[MASK]b",
+            "",
+        ]
+        assert tokenizer.batch_text_to_ids(texts) == [tokenizer.text_to_ids(text) for text in texts]
+
 
 class TestSentencePieceTokenizer:
     model_name = "/m_new.model"
@@ -193,3 +207,11 @@ class TestSentencePieceTokenizer:
 
         for i in range(len(result)):
             assert result[i] == tokens[i]
+
+    @pytest.mark.unit
+    def test_batch_text_to_ids(self, test_data_dir):
+        tokenizer = SentencePieceTokenizer(test_data_dir + self.model_name)
+
+        texts = ["<cls> a b c <sep> e f g h i </s>", "a b c", ""]
+        assert tokenizer.batch_text_to_ids(texts) == [tokenizer.text_to_ids(text) for text in texts]
+        assert tokenizer.batch_text_to_ids(texts, num_threads=-1) == [tokenizer.text_to_ids(text) for text in texts]
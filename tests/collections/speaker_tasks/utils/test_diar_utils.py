@@ -21,13 +21,19 @@ from scipy.optimize import linear_sum_assignment as scipy_linear_sum_assignment
 from nemo.collections.asr.data.audio_to_label import repeat_signal
 from nemo.collections.asr.parts.utils.longform_clustering import LongFormSpeakerClustering
 from nemo.collections.asr.parts.utils.offline_clustering import (
+    NMESC,
     SpeakerClustering,
     get_scale_interpolated_embs,
+    getAffinityGraphMat,
+    getAffinityGraphMatBatch,
     getCosAffinityMatrix,
     getKneighborsConnections,
+    getLaplacian,
+    lanczosEigValues,
     split_input_data,
 )
 from nemo.collections.asr.parts.utils.online_clustering import (
+    IncrementalSpeakerClustering,
     OnlineSpeakerClustering,
     get_closest_embeddings,
     get_merge_quantity,
@@ -374,6 +380,12 @@ class TestClassExport:
         online_clus = torch.jit.script(online_clus)
         isinstance(online_clus, torch.jit._script.RecursiveScriptClass)
 
+    @pytest.mark.unit
+    def test_incremental_speaker_clustering_instance_export(self):
+        incremental_clus = IncrementalSpeakerClustering(max_num_speakers=8, sparse_search_volume=30, buffer_size=150)
+        incremental_clus = torch.jit.script(incremental_clus)
+        isinstance(incremental_clus, torch.jit._script.RecursiveScriptClass)
+
     @pytest.mark.unit
     def test_online_speaker_clustering_instance_export(self):
         offline_speaker_clustering = SpeakerClustering(maj_vote_spk_count=False, min_samples_for_nmesc=0, cuda=True)
@@ -707,6 +719,54 @@ class TestClusteringUtilFunctions:
         elif mask_method == 'drop':
             assert all(binarized_affinity_mat.sum(dim=0) <= float(p_value))
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("N", [9, 20])
+    def test_get_affinity_graph_mat_batch(self, N: int, seed=0):
+        torch.manual_seed(seed)
+        random_mat = torch.rand(N, N)
+        affinity_mat = 0.5 * (random_mat + random_mat.T)
+        p_value_list = torch.tensor([1, 2, 5, N])
+        batch_mats = getAffinityGraphMatBatch(affinity_mat, p_value_list)
+        assert batch_mats.shape == (len(p_value_list), N, N)
+        for p_idx, p_value in enumerate(p_value_list):
+            assert torch.equal(batch_mats[p_idx], getAffinityGraphMat(affinity_mat, int(p_value)))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("N, num_iters", [(20, 20), (64, 24)])
+    def test_lanczos_eig_values(self, N: int, num_iters: int, seed=0):
+        torch.manual_seed(seed)
+        random_mat = torch.rand(N, N)
+        affinity_mat = 0.5 * (random_mat + random_mat.T)
+        p_value_list = torch.tensor([2, 4])
+        laplacians = torch.stack([getLaplacian(mat) for mat in getAffinityGraphMatBatch(affinity_mat, p_value_list)])
+        ritz_values = lanczosEigValues(laplacians, num_iters=num_iters, block_size=4, cuda=False, device=None)
+        lambdas = torch.linalg.eigvalsh(laplacians)
+        assert ritz_values.shape == (len(p_value_list), num_iters)
+        # the extreme eigenvalues converge first
+        assert torch.allclose(ritz_values[:, 0], lambdas[:, 0], atol=1e-3)
+        assert torch.allclose(ritz_values[:, -1], lambdas[:, -1], rtol=1e-2)
+        if num_iters == N:
+            assert torch.allclose(ritz_values, lambdas, atol=1e-3)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks", [1, 3, 7])
+    def test_nmesc_eigen_solvers(self, n_spks: int, seed=0):
+        em, ts, mc, mw, spk_ts, gt = generate_toy_data(
+            n_spks=n_spks, spk_dur=30 / n_spks, perturb_sigma=0.1, torch_seed=seed
+        )
+        mat = getCosAffinityMatrix(em[-mc[-1] :])
+        outputs = {}
+        for eigen_solver in ['default', 'batched', 'lanczos']:
+            nmesc = NMESC(mat, max_num_speakers=8, sparse_search_volume=10, eigen_solver=eigen_solver)
+            outputs[eigen_solver] = nmesc.forward()
+        assert outputs['batched'] == outputs['default']
+        assert outputs['lanczos'][0] == outputs['default'][0] == n_spks
+
+    @pytest.mark.unit
+    def test_nmesc_unknown_eigen_solver(self):
+        with pytest.raises(ValueError):
+            NMESC(torch.eye(4), eigen_solver='qr')
+
     @pytest.mark.unit
     @pytest.mark.parametrize("Y_aggr", [torch.tensor([0, 1, 0, 1])])
     @pytest.mark.parametrize("chunk_cluster_count, embeddings_per_chunk", [(2, 50)])
@@ -764,12 +824,14 @@ class TestSpeakerClustering:
     @pytest.mark.parametrize("n_spks", [1, 2, 3, 4, 5, 6, 7])
     @pytest.mark.parametrize("total_sec, SSV, perturb_sigma, seed", [(30, 10, 0.1, 0)])
     @pytest.mark.parametrize("jit_script", [False, True])
-    def test_offline_speaker_clustering(self, n_spks, total_sec, SSV, perturb_sigma, seed, jit_script, cuda=True):
+    def test_offline_speaker_clustering(
+        self, n_spks, total_sec, SSV, perturb_sigma, seed, jit_script, cuda=True, eigen_solver='default'
+    ):
         spk_dur = total_sec / n_spks
         em, ts, mc, mw, spk_ts, gt = generate_toy_data(
             n_spks=n_spks, spk_dur=spk_dur, perturb_sigma=perturb_sigma, torch_seed=seed
         )
-        offline_speaker_clustering = SpeakerClustering(maj_vote_spk_count=False, cuda=cuda)
+        offline_speaker_clustering = SpeakerClustering(maj_vote_spk_count=False, cuda=cuda, eigen_solver=eigen_solver)
         assert isinstance(offline_speaker_clustering, SpeakerClustering)
         if jit_script:
             offline_speaker_clustering = torch.jit.script(offline_speaker_clustering)
@@ -801,6 +863,19 @@ class TestSpeakerClustering:
     def test_offline_speaker_clustering_cpu(self, n_spks, total_sec, SSV, perturb_sigma, seed, jit_script, cuda=False):
         self.test_offline_speaker_clustering(n_spks, total_sec, SSV, perturb_sigma, seed, jit_script, cuda=cuda)
 
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks", [1, 4, 7])
+    @pytest.mark.parametrize("total_sec, SSV, perturb_sigma, seed", [(30, 10, 0.1, 0)])
+    @pytest.mark.parametrize("jit_script", [False, True])
+    @pytest.mark.parametrize("eigen_solver", ['batched', 'lanczos'])
+    def test_offline_speaker_clustering_eigen_solver_cpu(
+        self, n_spks, total_sec, SSV, perturb_sigma, seed, jit_script, eigen_solver
+    ):
+        self.test_offline_speaker_clustering(
+            n_spks, total_sec, SSV, perturb_sigma, seed, jit_script, cuda=False, eigen_solver=eigen_solver
+        )
+
     @pytest.mark.run_only_on('CPU')
     @pytest.mark.unit
     @pytest.mark.parametrize("n_spks", [1])
@@ -1044,6 +1119,48 @@ class TestSpeakerClustering:
     def test_online_speaker_clustering_cpu(self, n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda=False):
         self.test_online_speaker_clustering(n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda)
 
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks", [1, 2, 3])
+    @pytest.mark.parametrize("num_turns, buffer_size, step_per_frame, sigma, seed", [(30, 60, 4, 0.1, 0)])
+    @pytest.mark.parametrize("jit_script", [False, True])
+    def test_incremental_speaker_clustering_cpu(
+        self, n_spks, num_turns, buffer_size, step_per_frame, sigma, seed, jit_script
+    ):
+        torch.manual_seed(seed)
+        speaker_embs = generate_orthogonal_embs(n_spks, sigma, 192)
+        gt = torch.cat([torch.full((int(torch.randint(10, 30, (1,))),), turn % n_spks) for turn in range(num_turns)])
+        emb_gen = speaker_embs[gt] + 0.1 * torch.rand(gt.shape[0], 192)
+
+        incremental_clus = IncrementalSpeakerClustering(
+            max_num_speakers=8, sparse_search_volume=30, buffer_size=buffer_size, cuda=False
+        )
+        if jit_script:
+            incremental_clus = torch.jit.script(incremental_clus)
+
+        # The session is much longer than the ring buffer
+        n_frames = gt.shape[0] // step_per_frame
+        assert n_frames * step_per_frame > 4 * buffer_size
+        for frame_index in range(n_frames):
+            new_emb = emb_gen[frame_index * step_per_frame : (frame_index + 1) * step_per_frame]
+            Y_out = incremental_clus.forward_infer(
+                new_emb=new_emb, max_num_speakers=8, sparse_search_volume=30, frame_index=frame_index
+            )
+            assert Y_out.shape[0] == (frame_index + 1) * step_per_frame
+            assert incremental_clus.emb_buffer.shape[0] == buffer_size
+            assert incremental_clus.affinity_buffer.shape == (buffer_size, buffer_size)
+
+        # The incrementally updated affinity matrix matches the one computed from scratch
+        emb_buffer = incremental_clus.emb_buffer
+        full_affinity = (emb_buffer @ emb_buffer.T).fill_diagonal_(1)
+        assert torch.allclose(incremental_clus.affinity_buffer, full_affinity, atol=1e-5)
+        # All the evicted embeddings are accumulated in the speaker centroid statistics
+        assert int(incremental_clus.centroid_count.sum()) == Y_out.shape[0] - buffer_size
+
+        Y_out = stitch_cluster_labels(Y_old=gt[: Y_out.shape[0]], Y_new=Y_out)
+        cumul_label_acc = (Y_out == gt[: Y_out.shape[0]]).float().mean()
+        assert cumul_label_acc > 0.9
+
 
 class TestLinearSumAssignmentAlgorithm:
     @pytest.mark.unit
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import pytest
 import torch
 
 from nemo.collections.speechlm2.models.salm import replace_placeholders_and_build_targets
@@ -77,3 +78,15 @@ def test_replace_placeholders():
         ])
     )
     # fmt: on
+
+
+def test_replace_placeholders_number_of_replacements_mismatch():
+    input_ids = torch.tensor([[7, 100, 1]])
+    with pytest.raises(ValueError):
+        replace_placeholders_and_build_targets(
+            input_ids=input_ids,
+            embeds=torch.ones(1, 3, 2),
+            padding_id=0,
+            placeholder_id=100,
+            replacements=[torch.ones(2, 2), torch.ones(3, 2)],
+        )
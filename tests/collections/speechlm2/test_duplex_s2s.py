@@ -17,10 +17,12 @@ import pytest
 import torch
 from lhotse import CutSet, SupervisionSegment
 from lhotse.testing.dummies import dummy_cut, dummy_recording
+from omegaconf import DictConfig
 
 from nemo.collections.common.data.utils import move_data_to_device
 from nemo.collections.speechlm2.data import DuplexS2SDataset
 from nemo.collections.speechlm2.models import DuplexS2SModel
+from nemo.collections.speechlm2.modules import AudioPerceptionModule
 
 if torch.cuda.is_available():
     torch.set_default_device('cuda')
@@ -225,3 +227,88 @@ def test_s2s_offline_generation(model):
 
     gen_audio = ans["audio"]
     assert gen_audio.dtype == torch.float32
+
+
+def test_s2s_fused_audio_embedding(model):
+    audio_codes = torch.randint(0, model.speech_vocab_size, (2, 3, model._num_codebooks))
+    with torch.no_grad():
+        expected = model._embed_audio_codes(audio_codes)
+        fused_embedding = model._fuse_audio_embeddings()
+        torch.testing.assert_close(model._embed_audio_codes(audio_codes, fused_embedding=fused_embedding), expected)
+
+    # the per-codebook lookups are used with tensor parallelism
+    model._use_tp = True
+    try:
+        assert model._fuse_audio_embeddings() is None
+    finally:
+        model._use_tp = False
+
+
+def test_s2s_streaming_session(model):
+    # Streaming requires a perception encoder with limited right context, e.g. 80ms lookahead
+    perception_cfg = DictConfig(
+        {
+            "output_dim": model.embed_tokens.embedding_dim,
+            "encoder": {
+                "_target_": "nemo.collections.asr.modules.ConformerEncoder",
+                "feat_in": 128,
+                "n_layers": 2,
+                "d_model": 64,
+                "n_heads": 4,
+                "subsampling": "dw_striding",
+                "subsampling_factor": 8,
+                "subsampling_conv_channels": 32,
+                "causal_downsampling": True,
+                "att_context_size": [70, 1],
+                "att_context_style": "chunked_limited",
+                "conv_kernel_size": 9,
+                "conv_context_size": "causal",
+            },
+            "modality_adapter": {
+                "_target_": "nemo.collections.asr.modules.ConformerEncoder",
+                "feat_in": 64,
+                "n_layers": 1,
+                "d_model": 64,
+                "n_heads": 4,
+                "subsampling_factor": 1,
+                "att_context_size": [70, 1],
+                "att_context_style": "chunked_limited",
+                "conv_kernel_size": 9,
+                "conv_context_size": "causal",
+            },
+            "preprocessor": {
+                "_target_": "nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor",
+                "dither": 0.0,
+                "features": 128,
+                "n_fft": 512,
+                "normalize": "NA",
+                "pad_to": 0,
+                "sample_rate": 16000,
+                "window_size": 0.025,
+                "window_stride": 0.01,
+            },
+        }
+    )
+    offline_perception = model.perception
+    model.perception = AudioPerceptionModule(perception_cfg).to(model.device).eval()
+    try:
+        audio = torch.randn(1, 16000)
+        expected = model.offline_inference(input_signal=audio, input_signal_lens=torch.tensor([16000]))
+
+        session = model.start_streaming_session(batch_size=1)
+        for start in range(0, audio.shape[1], 1280):
+            ans = session.step(audio[:, start : start + 1280])
+            assert ans["tokens_text"].shape[1] == ans["tokens_audio"].shape[1]
+        ans = session.finalize()
+    finally:
+        model.perception = offline_perception
+
+    assert ans.keys() == expected.keys()
+    assert torch.equal(ans["tokens_text"], expected["tokens_text"])
+    assert torch.equal(ans["tokens_audio"], expected["tokens_audio"])
+    assert ans["audio"].shape == expected["audio"].shape
+
+    stats = session.latency_stats()
+    assert stats["frame_duration"] == pytest.approx(0.08)
+    assert 0 <= stats["frames_within_budget"] <= 1
+    assert len(session.frame_latencies) == ans["tokens_text"].shape[1]
@@ -0,0 +1,87 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import torch
+from omegaconf import DictConfig
+
+from nemo.collections.speechlm2.modules.perception import (
+    AudioPerceptionModule,
+    encode_audio_in_length_buckets,
+    make_length_buckets,
+)
+
+
+@pytest.fixture(scope="module")
+def perception():
+    cfg = DictConfig(
+        {
+            "output_dim": 48,
+            "encoder": {
+                "_target_": "nemo.collections.asr.modules.ConformerEncoder",
+                "feat_in": 128,
+                "n_layers": 2,
+                "d_model": 64,
+                "n_heads": 4,
+                "subsampling": "dw_striding",
+                "subsampling_factor": 8,
+                "subsampling_conv_channels": 32,
+                "att_context_size": [-1, -1],
+                "conv_kernel_size": 9,
+                "conv_norm_type": "batch_norm",
+                "self_attention_model": "rel_pos",
+            },
+            "modality_adapter": {
+                "_target_": "nemo.collections.speechlm2.modules.perception.IdentityConnector",
+                "d_model": 64,
+            },
+            "preprocessor": {
+                "_target_": "nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor",
+                "dither": 1e-05,
+                "features": 128,
+                "n_fft": 512,
+                "normalize": "per_feature",
+                "pad_to": 0,
+                "sample_rate": 16000,
+                "window_size": 0.025,
+                "window_stride": 0.01,
+            },
+        }
+    )
+    torch.manual_seed(0)
+    return AudioPerceptionModule(cfg).eval()
+
+
+def test_make_length_buckets():
+    lengths = [100, 10, 12, 105, 11, 0, 200, 0]
+    buckets = make_length_buckets(lengths, max_batch_size=2, max_length_ratio=1.25)
+    assert buckets == [[5, 7], [1, 4], [2], [0, 3], [6]]
+
+
+def test_encode_audio_in_length_buckets_matches_batch_size_1(perception):
+    audio_lens = torch.tensor([16000, 4000, 15000, 32123, 4100, 8000, 31000])
+    audios = torch.randn(len(audio_lens), audio_lens.max()) * (
+        torch.arange(audio_lens.max())[None] < audio_lens[:, None]
+    )
+
+    with torch.no_grad():
+        expected = []
+        for audio, audio_len in zip(audios, audio_lens):
+            encoded, encoded_len = perception(audio[None, :audio_len], audio_len[None])
+            expected.append(encoded[0, : encoded_len[0]])
+        encoded = encode_audio_in_length_buckets(perception, audios, audio_lens, max_batch_size=2)
+
+    assert len(encoded) == len(expected)
+    for enc, exp in zip(encoded, expected):
+        assert enc.shape == exp.shape
+        torch.testing.assert_close(enc, exp, atol=1e-5, rtol=1e-5)
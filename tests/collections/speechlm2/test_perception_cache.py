@@ -0,0 +1,83 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import torch
+from omegaconf import DictConfig
+
+from nemo.collections.speechlm2.parts.perception_cache import PerceptionCache
+
+
+class FramePerception(torch.nn.Module):
+    """Splits audio into frames of 10 samples and counts the calls."""
+
+    def __init__(self, hidden_size: int = 10):
+        super().__init__()
+        self.cfg = DictConfig({"hidden_size": hidden_size})
+        self.num_encoded = 0
+
+    def forward(self, audios, audio_lens):
+        self.num_encoded += audios.shape[0]
+        frames = audios[:, : audios.shape[1] // 10 * 10].reshape(audios.shape[0], -1, 10)
+        return frames, audio_lens // 10
+
+
+def test_perception_cache_reuses_embeddings():
+    perception = FramePerception()
+    cache = PerceptionCache()
+    audios = torch.randn(2, 100)
+    audio_lens = torch.tensor([100, 50])
+
+    embeds = cache(perception, audios, audio_lens)
+    assert [emb.shape for emb in embeds] == [(10, 10), (5, 10)]
+    assert perception.num_encoded == 2
+
+    # the second audio padded differently and a new audio
+    new_audios = torch.cat([audios[1:, :60], torch.randn(1, 60)])
+    embeds2 = cache(perception, new_audios, torch.tensor([50, 60]))
+    assert perception.num_encoded == 3
+    torch.testing.assert_close(embeds2[0], embeds[1])
+    assert cache.hits == 1
+    assert cache.misses == 3
+    assert len(cache) == 3
+    assert cache.size_bytes == (10 + 5 + 6) * 10 * 4
+
+
+def test_perception_cache_evicts_least_recently_used():
+    perception = FramePerception()
+    # room for 2 embeddings of 10 frames
+    cache = PerceptionCache(max_size_bytes=2 * 10 * 10 * 4)
+    audios = torch.randn(3, 100)
+    audio_lens = torch.tensor([100])
+
+    cache(perception, audios[0:1], audio_lens)
+    cache(perception, audios[1:2], audio_lens)
+    cache(perception, audios[0:1], audio_lens)  # hit, audio 1 becomes the least recently used
+    cache(perception, audios[2:3], audio_lens)  # evicts audio 1
+    assert len(cache) == 2
+    assert cache.size_bytes == 2 * 10 * 10 * 4
+    assert perception.num_encoded == 3
+
+    cache(perception, audios[0:1], audio_lens)
+    assert perception.num_encoded == 3
+    cache(perception, audios[1:2], audio_lens)
+    assert perception.num_encoded == 4
+
+
+def test_perception_cache_key_depends_on_perception_config():
+    cache = PerceptionCache()
+    audios, audio_lens = torch.randn(1, 100), torch.tensor([100])
+    cache(FramePerception(hidden_size=10), audios, audio_lens)
+    other = FramePerception(hidden_size=20)
+    cache(other, audios, audio_lens)
+    assert other.num_encoded == 1
+    assert len(cache) == 2
@@ -0,0 +1,112 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import torch
+from omegaconf import DictConfig
+
+from nemo.collections.speechlm2.modules.perception import AudioPerceptionModule, CacheAwareStreamingPerception
+
+
+def streaming_perception_config(conformer_adapter: bool, att_context_size=(70, 1), output_dim: int = 48) -> DictConfig:
+    encoder = {
+        "_target_": "nemo.collections.asr.modules.ConformerEncoder",
+        "feat_in": 64,
+        "n_layers": 2,
+        "d_model": 32,
+        "n_heads": 4,
+        "subsampling": "dw_striding",
+        "subsampling_factor": 8,
+        "subsampling_conv_channels": 16,
+        "causal_downsampling": True,
+        "att_context_size": list(att_context_size),
+        "att_context_style": "chunked_limited",
+        "conv_kernel_size": 9,
+        "conv_context_size": "causal",
+    }
+    if conformer_adapter:
+        modality_adapter = {
+            "_target_": "nemo.collections.asr.modules.ConformerEncoder",
+            "feat_in": 32,
+            "n_layers": 2,
+            "d_model": 32,
+            "n_heads": 4,
+            "subsampling_factor": 1,
+            "att_context_size": [70, 1],
+            "att_context_style": "chunked_limited",
+            "conv_kernel_size": 9,
+            "conv_context_size": "causal",
+        }
+    else:
+        modality_adapter = {
+            "_target_": "nemo.collections.speechlm2.modules.perception.IdentityConnector",
+            "d_model": 32,
+        }
+    return DictConfig(
+        {
+            "output_dim": output_dim,
+            "encoder": encoder,
+            "modality_adapter": modality_adapter,
+            "preprocessor": {
+                "_target_": "nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor",
+                "dither": 0.0,
+                "features": 64,
+                "n_fft": 512,
+                "normalize": "NA",
+                "pad_to": 0,
+                "sample_rate": 16000,
+                "window_size": 0.025,
+                "window_stride": 0.01,
+            },
+        }
+    )
+
+
+@pytest.mark.parametrize("conformer_adapter", [False, True])
+@pytest.mark.parametrize("att_context_size", [(70, 1), (12, 2)])
+@pytest.mark.parametrize("chunk_size", [1280, 777])
+def test_streaming_perception_matches_offline(conformer_adapter, att_context_size, chunk_size):
+    torch.manual_seed(0)
+    perception = AudioPerceptionModule(streaming_perception_config(conformer_adapter, att_context_size)).eval()
+    audio = torch.randn(2, 32123)
+
+    with torch.no_grad():
+        expected, expected_len = perception(
+            input_signal=audio, input_signal_length=torch.full((2,), audio.shape[1], dtype=torch.long)
+        )
+
+    streaming_perception = CacheAwareStreamingPerception(perception, batch_size=2)
+    outputs = [streaming_perception(audio[:, i : i + chunk_size]) for i in range(0, audio.shape[1], chunk_size)]
+    outputs.append(streaming_perception(audio[:, :0], is_final=True))
+    streamed = torch.cat(outputs, dim=1)
+
+    assert streamed.shape == expected.shape
+    assert (expected_len == streamed.shape[1]).all()
+    torch.testing.assert_close(streamed, expected, atol=1e-5, rtol=1e-5)
+
+
+def test_streaming_perception_emits_frames_with_lookahead():
+    perception = AudioPerceptionModule(streaming_perception_config(conformer_adapter=False)).eval()
+    streaming_perception = CacheAwareStreamingPerception(perception, batch_size=1)
+    # 80ms chunks with a lookahead of one 80ms frame: the first output is delayed by one chunk
+    num_frames = [streaming_perception(torch.randn(1, 1280)).shape[1] for _ in range(6)]
+    assert num_frames[0] == 0
+    assert sum(num_frames) > 0
+
+
+def test_streaming_perception_requires_limited_right_context():
+    cfg = streaming_perception_config(conformer_adapter=False, att_context_size=(-1, -1))
+    cfg.encoder.att_context_style = "regular"
+    perception = AudioPerceptionModule(cfg)
+    with pytest.raises(ValueError):
+        CacheAwareStreamingPerception(perception.eval(), batch_size=1)
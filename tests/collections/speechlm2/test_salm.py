@@ -25,6 +25,7 @@ from nemo.collections.common.data.utils import move_data_to_device
 from nemo.collections.common.prompts import PromptFormatter
 from nemo.collections.speechlm2.data import SALMDataset
 from nemo.collections.speechlm2.models import SALM
+from nemo.collections.speechlm2.parts.perception_cache import PerceptionCache
 
 if torch.cuda.is_available():
     torch.set_default_device('cuda')
@@ -229,3 +230,99 @@ def test_salm_generation_prompts_as_tensor(model):
     assert answer.dtype == torch.long
     assert (answer >= 0).all()
     assert (answer < model.text_vocab_size).all()
+
+
+def test_salm_generation_with_perception_cache(model):
+    was_training = model.training
+    model.eval()
+    try:
+        cache = PerceptionCache()
+        audios, audio_lens = torch.randn(2, 16000), torch.tensor([16000, 12000])
+        prompts = [
+            [{"role": "user", "slots": {"message": f"Repeat after me: {AUDIO_LOCATOR_TAG}"}}],
+            [{"role": "user", "slots": {"message": f"Transcribe: {AUDIO_LOCATOR_TAG}"}}],
+        ]
+        expected = model.generate(prompts=prompts, audios=audios, audio_lens=audio_lens, max_new_tokens=4)
+        for _ in range(2):
+            answer = model.generate(
+                prompts=prompts, audios=audios, audio_lens=audio_lens, perception_cache=cache, max_new_tokens=4
+            )
+            assert torch.equal(answer, expected)
+    finally:
+        model.train(was_training)
+    assert len(cache) == 2
+    assert cache.misses == 2
+    assert cache.hits == 2
+
+
+def _trim_after_eos(tokens: torch.Tensor, eos_id: int) -> torch.Tensor:
+    eos_positions = (tokens == eos_id).nonzero()
+    if len(eos_positions) == 0:
+        return tokens
+    return tokens[: eos_positions[0].item() + 1]
+
+
+def test_salm_generation_with_prompt_prefix(model):
+    was_training = model.training
+    model.eval()
+    try:
+        audios, audio_lens = torch.randn(1, 16000), torch.tensor([16000])
+        prefix_turns = [{"role": "user", "slots": {"message": f"Listen to this: {AUDIO_LOCATOR_TAG}"}}]
+        questions = [
+            [
+                {"role": "assistant", "slots": {"message": "OK"}},
+                {"role": "user", "slots": {"message": "Transcribe it."}},
+            ],
+            [
+                {"role": "assistant", "slots": {"message": "OK"}},
+                {"role": "user", "slots": {"message": "What is the main topic of the recording?"}},
+            ],
+        ]
+        prefix = model.prepare_prompt_prefix(prefix_turns, audios=audios, audio_lens=audio_lens)
+        expected_answers = []
+        for question in questions:
+            expected = model.generate(
+                prompts=[prefix_turns + question], audios=audios, audio_lens=audio_lens, max_new_tokens=4
+            )
+            answer = model.generate(prompts=[question], prompt_prefix=prefix, max_new_tokens=4)
+            assert torch.equal(answer, expected)
+            expected_answers.append(expected[0])
+        # follow-up prompts of different lengths in a single batch
+        answer = model.generate(prompts=questions, prompt_prefix=prefix, max_new_tokens=4)
+        assert answer.shape[0] == 2
+        for row, expected in zip(answer, expected_answers):
+            # the finished rows are padded after EOS in the batch
+            assert torch.equal(_trim_after_eos(row, model.text_eos_id), _trim_after_eos(expected, model.text_eos_id))
+    finally:
+        model.train(was_training)
+
+
+def test_salm_generate_in_buckets(model):
+    was_training = model.training
+    model.eval()
+    try:
+        prompts = [
+            [{"role": "user", "slots": {"message": f"Repeat after me: {AUDIO_LOCATOR_TAG}"}}],
+            [{"role": "user", "slots": {"message": f"Transcribe: {AUDIO_LOCATOR_TAG}"}}],
+            [{"role": "user", "slots": {"message": f"Compare {AUDIO_LOCATOR_TAG} and {AUDIO_LOCATOR_TAG}"}}],
+            [{"role": "user", "slots": {"message": f"Transcribe: {AUDIO_LOCATOR_TAG}"}}],
+        ]
+        audio_lens = torch.tensor([16000, 4000, 3000, 2000, 15000])
+        audios = torch.randn(len(audio_lens), audio_lens.max())
+        prompt_audio_indices = [[0], [1], [2, 3], [4]]
+        answers = model.generate_in_buckets(
+            prompts=prompts, audios=audios, audio_lens=audio_lens, batch_size=2, max_new_tokens=4
+        )
+        assert len(answers) == len(prompts)
+        for prompt, indices, answer in zip(prompts, prompt_audio_indices, answers):
+            prompt_audio_lens = audio_lens[indices]
+            expected = model.generate(
+                prompts=[prompt],
+                audios=audios[indices, : prompt_audio_lens.max()],
+                audio_lens=prompt_audio_lens,
+                max_new_tokens=4,
+            )[0]
+            # generation of a single prompt may stop earlier than of a batch
+            assert torch.equal(answer[: len(expected)], expected)
+    finally:
+        model.train(was_training)
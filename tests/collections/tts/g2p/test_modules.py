@@ -17,6 +17,7 @@ import unicodedata
 
 import pytest
 
+from nemo.collections.tts.g2p.models.en_us_arpabet import EnglishG2p
 from nemo.collections.tts.g2p.models.i18n_ipa import IpaG2p
 from nemo.collections.tts.g2p.utils import GRAPHEME_CASE_LOWER, GRAPHEME_CASE_MIXED, GRAPHEME_CASE_UPPER
 
@@ -406,3 +407,66 @@ class TestIpaG2p:
 
         phonemes = g2p(input_text)
         assert phonemes == expected_output
+
+
+class TestEnglishG2p:
+
+    PHONEME_DICT = {
+        "hello": [["HH", "AH0", "L", "OW1"]],
+        "world": [["W", "ER1", "L", "D"]],
+        "lead": [["L", "EH1", "D"], ["L", "IY1", "D"]],
+        "nvidia": [["EH0", "N", "V", "IH1", "D", "IY0", "AH0"]],
+        "well": [["W", "EH1", "L"]],
+        "known": [["N", "OW1", "N"]],
+        "worlds": [["W", "ER1", "L", "D", "Z"]],
+    }
+    INPUT_TEXTS = [
+        "Hello world, hello NVIDIA!",
+        "Lead the well-known worlds.",
+        "",
+        "Hello kitty, hello world.",
+    ]
+
+    @staticmethod
+    def _create_g2p(phoneme_dict=PHONEME_DICT, word_cache_size=65536):
+        return EnglishG2p(
+            phoneme_dict=phoneme_dict, heteronyms=[], apply_to_oov_word=None, word_cache_size=word_cache_size
+        )
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_forward_call_with_cache(self):
+        g2p_ref = self._create_g2p(word_cache_size=0)
+        expected_output = [g2p_ref(text) for text in self.INPUT_TEXTS]
+        assert expected_output[0][:4] == ["HH", "AH0", "L", "OW1"]
+
+        for g2p in [self._create_g2p(), self._create_g2p(word_cache_size=2)]:
+            # repeat to use cached words
+            for _ in range(2):
+                assert [g2p(text) for text in self.INPUT_TEXTS] == expected_output
+            assert len(g2p._word_cache) <= g2p.word_cache_size
+            assert g2p.phonemize_batch(self.INPUT_TEXTS) == expected_output
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_word_cache_cleared_on_assignment(self):
+        # the cache is disabled by default
+        assert EnglishG2p(phoneme_dict=self.PHONEME_DICT, heteronyms=[]).word_cache_size == 0
+
+        g2p = self._create_g2p()
+        assert g2p("hello") == ["HH", "AH0", "L", "OW1"]
+
+        g2p.phoneme_dict = {**self.PHONEME_DICT, "hello": [["HH", "EH0", "L", "OW1"]]}
+        assert g2p("hello") == ["HH", "EH0", "L", "OW1"]
+
+        g2p.heteronyms = {"hello"}
+        assert g2p("hello") == list("hello")
+
+        g2p.heteronyms = set()
+        g2p.ignore_ambiguous_words = False
+        assert g2p("lead") == ["L", "EH1", "D"]
+        g2p.ignore_ambiguous_words = True
+        assert g2p("lead") == list("lead")
+
+        g2p.apply_to_oov_word = lambda word: ["<unk>"]
+        assert g2p("kitty") == ["<unk>"]
@@ -0,0 +1,152 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.tts.models import AudioCodecModel
+
+
+def get_codec_model(decoder_target):
+    samples_per_frame = 64
+    cfg = {
+        'sample_rate': 16000,
+        'samples_per_frame': samples_per_frame,
+        'loss_resolutions': [[64, 16, 64], [128, 32, 128]],
+        'mel_loss_dims': [16, 32],
+        'commit_loss_scale': 0.0,
+        'audio_encoder': {
+            '_target_': 'nemo.collections.tts.modules.audio_codec_modules.HiFiGANEncoder',
+            'down_sample_rates': [8, 8],
+            'encoded_dim': 4,
+            'base_channels': 8,
+        },
+        'vector_quantizer': {
+            '_target_': 'nemo.collections.tts.modules.audio_codec_modules.GroupFiniteScalarQuantizer',
+            'num_groups': 2,
+            'num_levels_per_group': [4, 4],
+        },
+        'audio_decoder': {
+            '_target_': decoder_target,
+            'up_sample_rates': [8, 8],
+            'input_dim': 4,
+            'base_channels': 16,
+        },
+        'discriminator': {
+            '_target_': 'nemo.collections.tts.modules.audio_codec_modules.Discriminator',
+            'discriminators': [
+                {'_target_': 'nemo.collections.tts.modules.audio_codec_modules.MultiPeriodDiscriminator'}
+            ],
+        },
+        'generator_loss': {'_target_': 'nemo.collections.tts.losses.audio_codec_loss.GeneratorSquaredLoss'},
+        'discriminator_loss': {'_target_': 'nemo.collections.tts.losses.audio_codec_loss.DiscriminatorSquaredLoss'},
+    }
+    torch.manual_seed(0)
+    return AudioCodecModel(cfg=OmegaConf.create(cfg)).eval()
+
+
+class TestAudioCodecModel:
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        'decoder_target',
+        [
+            'nemo.collections.tts.modules.audio_codec_modules.HiFiGANDecoder',
+            'nemo.collections.tts.modules.audio_codec_modules.CausalHiFiGANDecoder',
+        ],
+    )
+    @pytest.mark.parametrize('chunk_size', [4, 7])
+    @pytest.mark.parametrize(
+        'left_context_frames,lookahead_frames,atol',
+        [
+            # enough context and lookahead for the receptive field of the decoders
+            (32, 16, 1e-5),
+            # defaults of decode_chunk cover the receptive field of the decoders
+            (None, None, 1e-5),
+            # context and lookahead smaller than the receptive field, the error is small
+            (8, 2, 1e-2),
+        ],
+    )
+    def test_decode_chunk(self, decoder_target, chunk_size, left_context_frames, lookahead_frames, atol):
+        """Incremental decoding should match decoding the complete sequence."""
+        model = get_codec_model(decoder_target)
+        batch_size, num_codebooks, num_frames = 2, 2, 37
+        tokens = torch.randint(0, 16, (batch_size, num_codebooks, num_frames))
+        # by default, the lookahead is the right receptive field of the decoder
+        held_back_frames = lookahead_frames
+        if held_back_frames is None:
+            _, held_back_frames = model._get_decoder_receptive_field(num_codebooks=num_codebooks)
+
+        with torch.no_grad():
+            ref_audio, _ = model.decode(tokens=tokens, tokens_len=torch.full((batch_size,), num_frames))
+
+            state = None
+            audio_chunks = []
+            for start in range(0, num_frames, chunk_size):
+                is_final = start + chunk_size >= num_frames
+                audio, audio_len, state = model.decode_chunk(
+                    tokens=tokens[..., start : start + chunk_size],
+                    state=state,
+                    left_context_frames=left_context_frames,
+                    lookahead_frames=lookahead_frames,
+                    is_final=is_final,
+                )
+                assert audio.size(-1) % model.samples_per_frame == 0
+                assert torch.all(audio_len == audio.size(-1))
+                if not is_final:
+                    # lookahead frames are held back
+                    assert audio.size(-1) <= max(start + chunk_size - held_back_frames, 0) * model.samples_per_frame
+                audio_chunks.append(audio)
+
+        audio = torch.cat(audio_chunks, dim=-1)
+        assert audio.shape == ref_audio.shape
+        assert torch.allclose(audio, ref_audio, atol=atol)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        'decoder_target',
+        [
+            'nemo.collections.tts.modules.audio_codec_modules.HiFiGANDecoder',
+            'nemo.collections.tts.modules.audio_codec_modules.CausalHiFiGANDecoder',
+        ],
+    )
+    def test_decoder_receptive_field(self, decoder_target):
+        """Only the tokens within the receptive field should affect the decoded audio of a frame."""
+        model = get_codec_model(decoder_target)
+        batch_size, num_codebooks, num_frames = 1, 2, 80
+        left, right = model._get_decoder_receptive_field(num_codebooks=num_codebooks)
+        if decoder_target.endswith('CausalHiFiGANDecoder'):
+            assert right == 0
+        frame = num_frames // 2
+        frame_samples = slice(frame * model.samples_per_frame, (frame + 1) * model.samples_per_frame)
+        tokens = torch.randint(0, 16, (batch_size, num_codebooks, num_frames))
+        tokens_len = torch.full((batch_size,), num_frames)
+        # the effect of the frames at the boundary of the receptive field is tiny,
+        # use double precision and a large change of the input to observe it
+        model = model.double()
+        with torch.no_grad():
+            inputs = model.dequantize(tokens=tokens, tokens_len=tokens_len).double()
+            audio, _ = model.decode_audio(inputs=inputs, input_len=tokens_len)
+
+        def frame_audio_changed(changed_frame):
+            changed_inputs = inputs.clone()
+            changed_inputs[..., changed_frame] += 1e8
+            with torch.no_grad():
+                changed_audio, _ = model.decode_audio(inputs=changed_inputs, input_len=tokens_len)
+            return not torch.equal(audio[:, frame_samples], changed_audio[:, frame_samples])
+
+        assert frame_audio_changed(frame - left)
+        assert not frame_audio_changed(frame - left - 1)
+        assert frame_audio_changed(frame + right)
+        assert not frame_audio_changed(frame + right + 1)
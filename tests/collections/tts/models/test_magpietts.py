@@ -0,0 +1,223 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+
+import pytest
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.tts.models import MagpieTTS_Model
+from tests.collections.tts.models.test_audio_codec import get_codec_model
+
+NUM_AUDIO_TOKENS_PER_CODEBOOK = 83  # 80 codes for the default top-k sampling, BOS and EOS
+MAX_DECODER_STEPS = 12
+
+
+def get_transformer_config(**kwargs):
+    cfg = {
+        'n_layers': 2,
+        'd_model': 16,
+        'd_ffn': 32,
+        'sa_n_heads': 2,
+        'kernel_size': 3,
+        'p_dropout': 0.0,
+        'p_dropout_out': 0.0,
+        'max_length_causal_mask': 256,
+        'use_learnable_pos_emb': True,
+    }
+    cfg.update(kwargs)
+    return cfg
+
+
+@pytest.fixture(scope='module')
+def codec_model_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('codec') / 'codec.nemo'
+    get_codec_model('nemo.collections.tts.modules.audio_codec_modules.CausalHiFiGANDecoder').save_to(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def model(codec_model_path):
+    cfg = {
+        'model_type': 'decoder_context_tts',
+        'use_text_conditioning_encoder': False,
+        'num_audio_codebooks': 2,
+        'num_audio_tokens_per_codebook': NUM_AUDIO_TOKENS_PER_CODEBOOK,
+        'embedding_dim': 16,
+        'codecmodel_path': codec_model_path,
+        'sample_rate': 16000,
+        'codec_model_downsample_factor': 64,
+        'prior_scaling_factor': 0.5,
+        'prior_end_step': 0,
+        'prior_scaledown_start_step': 0,
+        'alignment_loss_scale': 0.0,
+        'text_tokenizers': {
+            'english_chars': {
+                '_target_': 'nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers.EnglishCharsTokenizer'
+            }
+        },
+        'encoder': get_transformer_config(has_xattn=False, is_causal=False, apply_norm_out=True),
+        'decoder': get_transformer_config(
+            has_xattn=True, xa_d_memory=16, xa_n_heads=2, is_causal=True, apply_norm_to_cond=True, apply_norm_out=True
+        ),
+    }
+    torch.manual_seed(0)
+    model = MagpieTTS_Model(cfg=OmegaConf.create(cfg)).eval()
+    # make the outputs of the randomly initialized decoder depend on the conditioning
+    with torch.no_grad():
+        for layer in model.decoder.layers:
+            layer.cross_attention.o_net.weight *= 100
+    return model
+
+
+@pytest.fixture
+def batch():
+    torch.manual_seed(0)
+    return {
+        'text': torch.randint(0, 20, (3, 7)),
+        'text_lens': torch.tensor([7, 5, 3]),
+        'context_audio_codes': torch.randint(0, 16, (3, 2, 4)),
+        'context_audio_codes_lens': torch.tensor([4, 2, 3]),
+    }
+
+
+@contextmanager
+def force_eos_at_steps(model, batch, steps_before_eos):
+    """
+    Makes the items of the batch predict the audio EOS (in the first codebook) after the given number of steps,
+    and never before. The items of the decoder batch are identified by their text conditioning, so that the items
+    are tracked when the finished items are removed from the batch.
+    """
+    context_tensors = model.prepare_context_tensors(batch)
+    text_cond = context_tensors['cond']
+    dec_context_size = context_tensors['additional_decoder_input'].size(1)
+    eos_id = model.audio_eos_id
+    # decoding step and items of the conditional rows of the decoder batch (None for other rows)
+    step_items = None
+
+    def _find_items(module, args, kwargs):
+        nonlocal step_items
+        step = args[0].size(1) - dec_context_size - 1
+        items = [
+            next((item for item, item_cond in enumerate(text_cond) if torch.equal(row_cond, item_cond)), None)
+            for row_cond in kwargs['cond']
+        ]
+        step_items = step, items
+
+    def _set_eos_logits(module, inputs, logits):
+        step, items = step_items
+        num_items = sum(item is not None for item in items)
+        for row, item in enumerate(items[:num_items]):
+            eos_logit = 1e4 if step == steps_before_eos[item] else -1e4
+            # the same logit for the unconditional row with CFG
+            logits[row::num_items, eos_id] = eos_logit
+
+    handles = [
+        model.decoder.register_forward_pre_hook(_find_items, with_kwargs=True),
+        model.final_proj.register_forward_hook(_set_eos_logits),
+    ]
+    try:
+        yield
+    finally:
+        for handle in handles:
+            handle.remove()
+
+
+class TestMagpieTTSModel:
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_cfg', [False, True])
+    def test_generate_codes(self, model, batch, use_cfg):
+        """Finished items should be removed from the batch, the codes should match `infer_batch`"""
+        steps_before_eos = torch.tensor([5, 2, 8])
+        inference_kwargs = {'max_decoder_steps': MAX_DECODER_STEPS, 'use_cfg': use_cfg, 'cfg_scale': 2.0}
+        with force_eos_at_steps(model, batch, steps_before_eos):
+            torch.manual_seed(1)
+            steps = list(model.generate_codes(model.prepare_context_tensors(batch), **inference_kwargs))
+            torch.manual_seed(1)
+            _, _, predicted_codes, predicted_codes_lens = model.infer_batch(batch, **inference_kwargs)
+
+        assert len(steps) == steps_before_eos.max() + 1
+        for idx, step in enumerate(steps):
+            expected_item_indices = torch.nonzero(steps_before_eos >= idx).squeeze(1)
+            assert torch.equal(step['item_indices'], expected_item_indices)
+            assert step['audio_codes'].shape == (len(expected_item_indices), model.cfg.num_audio_codebooks)
+            assert torch.equal(step['finished'], steps_before_eos[expected_item_indices] == idx)
+            assert torch.all(step['audio_codes'][step['finished'], 0] == model.audio_eos_id)
+
+        assert torch.equal(predicted_codes_lens, steps_before_eos)
+        assert predicted_codes.size(-1) == len(steps)
+        for idx, step in enumerate(steps):
+            # EOS is replaced with padding in the predicted codes
+            expected_codes = step['audio_codes'].masked_fill(step['audio_codes'] == model.audio_eos_id, 0)
+            assert torch.equal(predicted_codes[step['item_indices'], :, idx], expected_codes)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_cfg', [False, True])
+    @pytest.mark.parametrize('chunk_size_frames', [1, 4])
+    def test_infer_batch_streaming(self, model, batch, use_cfg, chunk_size_frames):
+        """Streaming inference should produce the same audio as `infer_batch`"""
+        steps_before_eos = torch.tensor([5, 2, 8])
+        inference_kwargs = {'max_decoder_steps': MAX_DECODER_STEPS, 'use_cfg': use_cfg, 'cfg_scale': 2.0}
+        samples_per_frame = model._codec_model.samples_per_frame
+
+        with force_eos_at_steps(model, batch, steps_before_eos):
+            torch.manual_seed(1)
+            predicted_audio, predicted_audio_lens, _, _ = model.infer_batch(batch, **inference_kwargs)
+
+            torch.manual_seed(1)
+            audio_chunks, audio_lens_chunks = [], []
+            # default context and lookahead cover the receptive field of the codec decoder
+            for audio, audio_lens in model.infer_batch_streaming(
+                batch, chunk_size_frames=chunk_size_frames, **inference_kwargs
+            ):
+                assert audio.size(0) == batch['text'].size(0)
+                assert audio.size(-1) % samples_per_frame == 0
+                assert torch.all(audio_lens <= audio.size(-1))
+                audio_chunks.append(audio)
+                audio_lens_chunks.append(audio_lens)
+        # audio is available before the end of generation
+        assert len(audio_chunks) > 1
+
+        streaming_audio = torch.cat(audio_chunks, dim=-1)
+        streaming_audio_lens = torch.stack(audio_lens_chunks).sum(dim=0)
+        assert torch.equal(streaming_audio_lens, predicted_audio_lens)
+        for item_idx, audio_len in enumerate(predicted_audio_lens.tolist()):
+            assert torch.allclose(
+                streaming_audio[item_idx, :audio_len], predicted_audio[item_idx, :audio_len], atol=1e-5
+            )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_cfg', [False, True])
+    @pytest.mark.parametrize('use_kv_cache', [False, True])
+    def test_infer_batch_compact_finished(self, model, batch, use_cfg, use_kv_cache):
+        """Removing the finished items from the batch should not change the codes of the other items"""
+        model.use_kv_cache_for_inference = use_kv_cache
+        steps_before_eos = torch.tensor([5, 2, 8])
+        # nearly greedy sampling does not depend on the random numbers consumed by the finished items
+        inference_kwargs = {
+            'max_decoder_steps': MAX_DECODER_STEPS,
+            'temperature': 1e-4,
+            'use_cfg': use_cfg,
+            'cfg_scale': 2.0,
+        }
+        with force_eos_at_steps(model, batch, steps_before_eos):
+            _, _, predicted_codes, predicted_codes_lens = model.infer_batch(batch, **inference_kwargs)
+            _, _, expected_codes, expected_codes_lens = model.infer_batch(
+                batch, compact_finished=False, **inference_kwargs
+            )
+
+        assert torch.equal(expected_codes_lens, steps_before_eos)
+        assert torch.equal(predicted_codes_lens, expected_codes_lens)
+        assert torch.equal(predicted_codes, expected_codes)
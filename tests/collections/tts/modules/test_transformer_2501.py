@@ -795,3 +795,44 @@ class TestTransformer:
                 expected_output["attn_probabilities"][i]["cross_attn_probabilities"][0],
                 atol=1e-4,
             )
+
+    def test_reorder_cache(self):
+        set_seed(0)
+        model = Transformer(
+            n_layers=2,
+            d_model=self.d_model,
+            d_ffn=self.d_ffn,
+            sa_n_heads=self.sa_n_heads,
+            kernel_size=self.kernel_size,
+            p_dropout=self.p_dropout,
+            p_dropout_out=self.p_dropout_out,
+            has_xattn=True,
+            xa_d_memory=4,
+            xa_n_heads=2,
+            is_causal=self.is_causal,
+            max_length_causal_mask=self.max_length_causal_mask,
+        )
+        batch_size, num_steps = 3, self.max_length_causal_mask
+        x = torch.randn(batch_size, num_steps, self.d_model)
+        x_mask = torch.ones(batch_size, num_steps).bool()
+        cond = torch.randn(batch_size, 5, 4)
+        cond_mask = torch.ones(batch_size, 5).bool()
+        cond_mask[1, 3:] = False
+
+        with torch.no_grad():
+            expected_output = model(x=x, x_mask=x_mask, cond=cond, cond_mask=cond_mask)['output']
+
+            # Decode step by step with the cache, dropping items from the batch halfway through
+            model.reset_cache(use_cache=True)
+            keep = torch.tensor([2, 1])
+            for step in range(num_steps):
+                if step == num_steps // 2:
+                    model.reorder_cache(keep)
+                    x, x_mask, cond, cond_mask = x[keep], x_mask[keep], cond[keep], cond_mask[keep]
+                    expected_output = expected_output[keep]
+                output = model(x=x[:, : step + 1], x_mask=x_mask[:, : step + 1], cond=cond, cond_mask=cond_mask)[
+                    'output'
+                ]
+            model.reset_cache(use_cache=False)
+
+        assert torch.allclose(output, expected_output, atol=1e-5)
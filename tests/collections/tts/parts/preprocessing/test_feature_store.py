@@ -0,0 +1,96 @@
+# Copyright (c) 2025, NVIDIA CORPORATION & AFFILIATES.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import torch
+
+from nemo.collections.tts.data.text_to_speech_dataset import TextToSpeechDataset
+from nemo.collections.tts.parts.preprocessing.feature_store import (
+    ALIGN_PRIOR_STORE_NAME,
+    FeatureStore,
+    FeatureStoreWriter,
+    get_align_prior_key,
+    get_feature_store,
+)
+from nemo.collections.tts.parts.utils.tts_dataset_utils import beta_binomial_prior_distribution
+
+
+class TestFeatureStore:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("shapes", [[(5,), (0,), (17,)], [(3, 4), (3, 1), (3, 9)]])
+    @pytest.mark.parametrize("dtype", [np.float32, np.bool_, np.int64])
+    def test_write_and_read(self, tmp_path, shapes, dtype):
+        rng = np.random.default_rng(0)
+        arrays = {
+            f"speaker{i}/audio{i}": (10 * rng.uniform(size=shape)).astype(dtype) for i, shape in enumerate(shapes)
+        }
+
+        with FeatureStoreWriter(store_dir=tmp_path, name="feature", metadata={"hop_length": 256}) as writer:
+            for key, array in arrays.items():
+                writer.add(key=key, array=array)
+
+        store = FeatureStore(store_dir=tmp_path, name="feature")
+        assert len(store) == len(arrays)
+        assert store.metadata == {"hop_length": 256}
+        assert "missing" not in store
+        for key, array in arrays.items():
+            assert key in store
+            assert store[key].dtype == array.dtype
+            np.testing.assert_array_equal(store[key], array)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_writer_errors(self, tmp_path):
+        with FeatureStoreWriter(store_dir=tmp_path, name="feature") as writer:
+            writer.add(key="a", array=np.zeros(3, dtype=np.float32))
+            with pytest.raises(ValueError):
+                writer.add(key="a", array=np.zeros(3, dtype=np.float32))
+            with pytest.raises(ValueError):
+                writer.add(key="b", array=np.zeros(3, dtype=np.float64))
+            with pytest.raises(ValueError):
+                writer.add(key="c", array=np.zeros((3, 1), dtype=np.float32))
+
+        # a store is not created if writing fails
+        with pytest.raises(RuntimeError):
+            with FeatureStoreWriter(store_dir=tmp_path, name="failed") as writer:
+                writer.add(key="a", array=np.zeros(3, dtype=np.float32))
+                raise RuntimeError()
+        assert not FeatureStore.exists(store_dir=tmp_path, name="failed")
+        assert get_feature_store(store_dir=tmp_path, name="failed") is None
+        assert sorted(tmp_path.iterdir()) == [tmp_path / "feature.bin", tmp_path / "feature.index.npz"]
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_align_prior_store(self, tmp_path):
+        text_len, spec_len = 7, 20
+        stored_prior = np.random.uniform(size=(spec_len, text_len)).astype(np.float32)
+        with FeatureStoreWriter(
+            store_dir=tmp_path, name=ALIGN_PRIOR_STORE_NAME, metadata={"scaling_factor": 1.0}
+        ) as writer:
+            writer.add(key=get_align_prior_key(text_len=text_len, spec_len=spec_len), array=stored_prior)
+
+        align_prior = TextToSpeechDataset._get_align_prior(feature_dir=tmp_path, text_len=text_len, spec_len=spec_len)
+        torch.testing.assert_close(align_prior, torch.from_numpy(stored_prior))
+
+        # priors which are not in the store, or were stored with a different scaling factor, are computed
+        for text_len, spec_len, scaling_factor in [(8, 20, 1.0), (7, 20, 0.5)]:
+            align_prior = TextToSpeechDataset._get_align_prior(
+                feature_dir=tmp_path, text_len=text_len, spec_len=spec_len, scaling_factor=scaling_factor
+            )
+            expected_prior = beta_binomial_prior_distribution(
+                phoneme_count=text_len, mel_count=spec_len, scaling_factor=scaling_factor
+            )
+            torch.testing.assert_close(align_prior, torch.tensor(expected_prior, dtype=torch.float32))
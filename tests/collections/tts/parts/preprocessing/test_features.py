@@ -22,10 +22,13 @@ import pytest
 import soundfile as sf
 import torch
 
+from nemo.collections.tts.parts.preprocessing.feature_store import FeatureStoreWriter
 from nemo.collections.tts.parts.preprocessing.features import (
     EnergyFeaturizer,
     MelSpectrogramFeaturizer,
     PitchFeaturizer,
+    _get_feature_filepath,
+    get_feature_key,
 )
 
 
@@ -307,3 +310,44 @@ class TestTTSFeatures:
 
         torch.testing.assert_close(energy_segment1, energy[start1:end1])
         torch.testing.assert_close(energy_segment2, energy[start2:end2])
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_load_energy_from_feature_store(self):
+        energy_name = "energy_test"
+        manifest_entry_segment = {"audio_filepath": self.audio_filename, "offset": 1.0, "duration": 1.5}
+        start, end = self._compute_start_end_frames(offset=1.0, duration=1.5)
+
+        mel_featurizer = MelSpectrogramFeaturizer(
+            mel_dim=self.spec_dim, hop_length=self.hop_len, sample_rate=self.sample_rate
+        )
+        energy_featurizer = EnergyFeaturizer(feature_name=energy_name, spec_featurizer=mel_featurizer)
+
+        with self._create_test_dir() as test_dir:
+            feature_dir = test_dir / "feature"
+            energy_featurizer.save(manifest_entry=self.manifest_entry, audio_dir=test_dir, feature_dir=feature_dir)
+            energy_filepath = _get_feature_filepath(
+                manifest_entry=self.manifest_entry,
+                audio_dir=test_dir,
+                feature_dir=feature_dir,
+                feature_name=energy_name,
+            )
+            energy = torch.from_numpy(np.load(energy_filepath))
+
+            with FeatureStoreWriter(store_dir=feature_dir, name=energy_name) as writer:
+                writer.add(
+                    key=get_feature_key(manifest_entry=self.manifest_entry, audio_dir=test_dir),
+                    array=np.load(energy_filepath),
+                )
+            # features are loaded from the store without opening the .npy file
+            energy_filepath.unlink()
+
+            energy_dict = energy_featurizer.load(
+                manifest_entry=self.manifest_entry, audio_dir=test_dir, feature_dir=feature_dir
+            )
+            energy_dict_segment = energy_featurizer.load(
+                manifest_entry=manifest_entry_segment, audio_dir=test_dir, feature_dir=feature_dir
+            )
+
+        torch.testing.assert_close(energy_dict[energy_name], energy)
+        torch.testing.assert_close(energy_dict_segment[energy_name], energy[start:end])
@@ -1190,3 +1190,86 @@ class TestNeuralTypeCheckSystem:
             # assert that even if semantic types are disabled, output is attached with appropriate types
             assert result.sum() == torch.tensor(10.0)
             assert result.neural_type.compare(NeuralType(('B',), LabelsType())) == NeuralTypeComparisonResult.SAME
+
+    @pytest.mark.unit
+    def test_cached_checks_input_output(self):
+        class InputOutputTypes(Typing):
+            def __init__(self):
+                self.num_input_validations = 0
+
+            @property
+            def input_types(self):
+                self.num_input_validations += 1
+                return {"x": NeuralType(('B', 'T'), LogprobsType())}
+
+            @property
+            def output_types(self):
+                return {"y": NeuralType(('B', 'T'), LabelsType())}
+
+            @typecheck()
+            def __call__(self, x):
+                return x + 1
+
+        obj = InputOutputTypes()
+        with typecheck.cached_checks():
+            _ = obj(x=torch.zeros(2, 10))
+            num_first_call_validations = obj.num_input_validations
+            for _ in range(3):
+                result = obj(x=torch.zeros(2, 10))
+                assert result.sum() == torch.tensor(20.0)
+                assert (
+                    result.neural_type.compare(NeuralType(('B', 'T'), LabelsType())) == NeuralTypeComparisonResult.SAME
+                )
+            # input types are resolved only for the first call with the signature
+            assert obj.num_input_validations == num_first_call_validations
+
+            # same number of dimensions, different shape: plan is reused
+            result = obj(x=torch.zeros(3, 5))
+            assert obj.num_input_validations == num_first_call_validations
+            assert result.neural_type.compare(NeuralType(('B', 'T'), LabelsType())) == NeuralTypeComparisonResult.SAME
+
+            # new signature is validated
+            with pytest.raises(TypeError):
+                _ = obj(x=torch.zeros(10))
+
+            # incompatible neural type of the input is validated
+            with pytest.raises(TypeError):
+                input_data = torch.zeros(2, 10)
+                input_data.neural_type = NeuralType(('B', 'T'), LabelsType())
+                _ = obj(x=input_data)
+
+            # positional arguments are still rejected
+            with pytest.raises(TypeError):
+                _ = obj(torch.zeros(2, 10))
+
+        typecheck.clear_cached_checks()
+        num_validations = obj.num_input_validations
+        obj(x=torch.zeros(2, 10))
+        assert obj.num_input_validations > num_validations
+
+    @pytest.mark.unit
+    def test_cached_checks_nested_outputs(self):
+        class NestedOutputTypes(Typing):
+            @property
+            def input_types(self):
+                return {"x": [NeuralType(('B', 'D'), LogprobsType())]}
+
+            @property
+            def output_types(self):
+                return {"y": [NeuralType(('B', 'D'), LabelsType())], "z": NeuralType(('B',), LengthsType())}
+
+            @typecheck()
+            def __call__(self, x):
+                return [xi + 1 for xi in x], torch.zeros(x[0].shape[0])
+
+        obj = NestedOutputTypes()
+        with typecheck.cached_checks():
+            for num_items in [2, 2, 3]:
+                y, z = obj(x=[torch.zeros(4, 3) for _ in range(num_items)])
+                assert len(y) == num_items
+                for yi in y:
+                    assert (
+                        yi.neural_type.compare(NeuralType(('B', 'D'), LabelsType())) == NeuralTypeComparisonResult.SAME
+                    )
+                assert z.neural_type.compare(NeuralType(('B',), LengthsType())) == NeuralTypeComparisonResult.SAME
+        typecheck.clear_cached_checks()